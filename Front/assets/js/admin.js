@@ -2,6 +2,15 @@ const API_URL = 'http://localhost:8000/api/v1';
 let allPlayers = [];
 let editingPlayerId = null;
 
+// Búsqueda en el servidor: códigos de posición → filtro ?position=, texto → /players/search
+const PLAYERS_PAGE_SIZE = 100;
+const SEARCH_MIN_LENGTH = 3;
+const SEARCH_LIMIT = 25;           // máximo que acepta /players/search
+const SEARCH_DEBOUNCE_MS = 300;
+const POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C'];
+let searchTimer = null;
+let playersRequestId = 0;   // descarta respuestas de búsquedas anteriores que lleguen tarde
+
 // Verificar autenticación
 function checkAuth() {
     const token = localStorage.getItem('token');
@@ -24,11 +33,32 @@ function checkAuth() {
     return { token, user: userData };
 }
 
-// Cargar jugadores
-async function loadPlayers() {
+// URL del listado según el texto buscado (null si todavía es muy corto para buscar)
+function buildPlayersUrl(searchTerm) {
+    const term = searchTerm.trim();
+    if (!term) {
+        return `${API_URL}/players/?skip=0&limit=${PLAYERS_PAGE_SIZE}`;
+    }
+    if (POSITIONS.includes(term.toUpperCase())) {
+        const params = new URLSearchParams({ skip: 0, limit: PLAYERS_PAGE_SIZE, position: term.toUpperCase() });
+        return `${API_URL}/players/?${params.toString()}`;
+    }
+    if (term.length >= SEARCH_MIN_LENGTH) {
+        const params = new URLSearchParams({ q: term, limit: SEARCH_LIMIT });
+        return `${API_URL}/players/search?${params.toString()}`;
+    }
+    return null;
+}
+
+// Cargar jugadores (sin texto: primera página; con texto: filtrados por el servidor)
+async function loadPlayers(searchTerm = '') {
     const auth = checkAuth();
     if (!auth) return;
 
+    const url = buildPlayersUrl(searchTerm);
+    if (url === null) return;
+    const requestId = ++playersRequestId;
+
     const loading = document.getElementById('loading');
     const playersGrid = document.getElementById('players-grid');
     const errorMessage = document.getElementById('error-message');
@@ -40,7 +70,7 @@ async function loadPlayers() {
     emptyState.style.display = 'none';
 
     try {
-        const response = await fetch(`${API_URL}/players/?skip=0&limit=100`, {
+        const response = await fetch(url, {
             headers: {
                 'Authorization': `Bearer ${auth.token}`
             }
@@ -50,9 +80,14 @@ async function loadPlayers() {
             throw new Error('Error al cargar jugadores');
         }
 
-        allPlayers = await response.json();
-        displayPlayers(allPlayers);
-        updateStats(allPlayers);
+        const players = await response.json();
+        if (requestId !== playersRequestId) return;
+
+        displayPlayers(players);
+        if (!searchTerm.trim()) {
+            allPlayers = players;
+            updateStats(allPlayers);
+        }
 
     } catch (error) {
         errorMessage.textContent = error.message;
@@ -68,9 +103,11 @@ function displayPlayers(players) {
     const emptyState = document.getElementById('empty-state');
 
     if (players.length === 0) {
+        playersGrid.innerHTML = '';
         emptyState.style.display = 'flex';
         return;
     }
+    emptyState.style.display = 'none';
 
     playersGrid.innerHTML = players.map(player => `
         <div class="player-card admin-card">
@@ -86,6 +123,7 @@ function displayPlayers(players) {
                 <i class="fas fa-basketball-ball"></i>
                 ${player.team}
             </p>
+            ${player.height_m !== undefined ? `
             <div class="player-stats">
                 <div class="stat">
                     <i class="fas fa-ruler-vertical"></i>
@@ -95,7 +133,7 @@ function displayPlayers(players) {
                     <i class="fas fa-weight"></i>
                     <span>${player.weight_kg}kg</span>
                 </div>
-            </div>
+            </div>` : ''}
             <div class="player-actions">
                 <button class="btn-edit" onclick="editPlayer(${player.id})">
                     <i class="fas fa-edit"></i>
@@ -241,16 +279,14 @@ document.getElementById('player-form').addEventListener('submit', async (e) => {
     }
 });
 
-// Buscar jugadores
-document.getElementById('search-input').addEventListener('input', (e) => {
-    const searchTerm = e.target.value.toLowerCase();
-    const filtered = allPlayers.filter(player => 
-        player.name.toLowerCase().includes(searchTerm) ||
-        player.team.toLowerCase().includes(searchTerm) ||
-        player.position.toLowerCase().includes(searchTerm)
-    );
-    displayPlayers(filtered);
-});
+// Buscar jugadores en el servidor (con espera para no consultar en cada tecla)
+function onSearchInput(e) {
+    const searchTerm = e.target.value;
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => loadPlayers(searchTerm), SEARCH_DEBOUNCE_MS);
+}
+
+document.getElementById('search-input').addEventListener('input', onSearchInput);
 
 // Cerrar modales
 document.getElementById('close-player-modal').addEventListener('click', () => {
@@ -302,17 +338,27 @@ async function loadUsers() {
     errorMessage.style.display = 'none';
 
     try {
-        const response = await fetch(`${API_URL}/users/all`, {
-            headers: {
-                'Authorization': `Bearer ${auth.token}`
+        // El listado está paginado por cursor: se recorren las páginas con X-Next-Cursor
+        allUsers = [];
+        let cursor = null;
+        do {
+            const params = new URLSearchParams({ limit: 200 });
+            if (cursor !== null) params.append('cursor', cursor);
+
+            const response = await fetch(`${API_URL}/users/all?${params.toString()}`, {
+                headers: {
+                    'Authorization': `Bearer ${auth.token}`
+                }
+            });
+
+            if (!response.ok) {
+                throw new Error('Error al cargar usuarios');
             }
-        });
 
-        if (!response.ok) {
-            throw new Error('Error al cargar usuarios');
-        }
+            allUsers = allUsers.concat(await response.json());
+            cursor = response.headers.get('X-Next-Cursor');
+        } while (cursor !== null);
 
-        allUsers = await response.json();
         displayUsers(allUsers);
 
     } catch (error) {
@@ -519,15 +565,7 @@ function showPlayersView() {
         document.getElementById('player-modal').style.display = 'flex';
     });
 
-    document.getElementById('search-input').addEventListener('input', (e) => {
-        const searchTerm = e.target.value.toLowerCase();
-        const filtered = allPlayers.filter(player =>
-            player.name.toLowerCase().includes(searchTerm) ||
-            player.team.toLowerCase().includes(searchTerm) ||
-            player.position.toLowerCase().includes(searchTerm)
-        );
-        displayPlayers(filtered);
-    });
+    document.getElementById('search-input').addEventListener('input', onSearchInput);
 
     loadPlayers();
 }
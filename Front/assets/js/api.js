@@ -5,6 +5,7 @@ import { Storage } from './utils.js';
 export class ApiService {
     constructor() {
         this.baseURL = CONFIG.API_BASE_URL;
+        this.refreshPromise = null;
     }
 
     // Obtener headers con autenticación
@@ -38,6 +39,7 @@ export class ApiService {
         if (response.status === 401) {
             // Token expirado o inválido
             Storage.remove(CONFIG.TOKEN_KEY);
+            Storage.remove(CONFIG.REFRESH_TOKEN_KEY);
             Storage.remove(CONFIG.USER_KEY);
             throw new Error(MESSAGES.ERROR.UNAUTHORIZED);
         }
@@ -58,6 +60,14 @@ export class ApiService {
             };
 
             const response = await fetch(url, config);
+
+            // Access token vencido: renovar con el refresh token y reintentar una vez
+            if (response.status === 401 && options.auth !== false && !options.retried) {
+                if (await this.refreshSession()) {
+                    return await this.request(endpoint, { ...options, retried: true });
+                }
+            }
+
             return await this.handleResponse(response);
         } catch (error) {
             if (error.name === 'TypeError' && error.message.includes('fetch')) {
@@ -76,6 +86,48 @@ export class ApiService {
         });
     }
 
+    // Renovar la sesión sin contraseña. Las peticiones concurrentes comparten
+    // una sola renovación: el refresh token es de un solo uso y reutilizarlo
+    // revocaría la sesión completa.
+    async refreshSession() {
+        const refreshToken = Storage.get(CONFIG.REFRESH_TOKEN_KEY);
+        if (!refreshToken) {
+            return false;
+        }
+
+        if (!this.refreshPromise) {
+            this.refreshPromise = fetch(`${this.baseURL}${ENDPOINTS.AUTH.REFRESH}`, {
+                method: 'POST',
+                headers: this.getHeaders(false),
+                body: JSON.stringify({ refresh_token: refreshToken })
+            })
+                .then(async (response) => {
+                    if (!response.ok) {
+                        Storage.remove(CONFIG.REFRESH_TOKEN_KEY);
+                        return false;
+                    }
+                    const data = await response.json();
+                    Storage.set(CONFIG.TOKEN_KEY, data.access_token);
+                    Storage.set(CONFIG.REFRESH_TOKEN_KEY, data.refresh_token);
+                    return true;
+                })
+                .catch(() => false)
+                .finally(() => {
+                    this.refreshPromise = null;
+                });
+        }
+
+        return await this.refreshPromise;
+    }
+
+    // Revocar el access token y el refresh token en el servidor
+    async logout() {
+        return await this.request(ENDPOINTS.AUTH.LOGOUT, {
+            method: 'POST',
+            body: JSON.stringify({ refresh_token: Storage.get(CONFIG.REFRESH_TOKEN_KEY) })
+        });
+    }
+
     async register(userData) {
         return await this.request(ENDPOINTS.AUTH.REGISTER, {
             method: 'POST',
@@ -89,8 +141,22 @@ export class ApiService {
     }
 
     // Métodos de jugadores
-    async getPlayers(skip = 0, limit = CONFIG.PLAYERS_PER_PAGE) {
-        return await this.request(`${ENDPOINTS.PLAYERS.LIST}?skip=${skip}&limit=${limit}`);
+    // filters: { team, position, min_height, max_height, min_weight, max_weight,
+    //           born_after, born_before, sort_by, order } (todos opcionales)
+    async getPlayers(skip = 0, limit = CONFIG.PLAYERS_PER_PAGE, filters = {}) {
+        const params = new URLSearchParams({ skip, limit });
+        Object.entries(filters).forEach(([key, value]) => {
+            if (value !== undefined && value !== null && value !== '') {
+                params.append(key, value);
+            }
+        });
+        return await this.request(`${ENDPOINTS.PLAYERS.LIST}?${params.toString()}`);
+    }
+
+    // Autocompletado por nombre (resultados acotados por el servidor)
+    async searchPlayers(query, limit = 10) {
+        const params = new URLSearchParams({ q: query, limit });
+        return await this.request(`${ENDPOINTS.PLAYERS.SEARCH}?${params.toString()}`);
     }
 
     async getPlayer(id) {
@@ -2,13 +2,19 @@ import { auth } from './auth.js';
 import { players } from './players.js';
 import { api } from './api.js';
 import { ui } from './ui.js';
-import { CONFIG, MESSAGES } from './config.js';
+import { CONFIG, ENDPOINTS, MESSAGES } from './config.js';
+import { Storage, Events } from './utils.js';
+
+// Eventos del servidor que cambian el listado de jugadores
+const PLAYER_EVENTS = ['player.created', 'player.updated', 'player.deleted'];
 
 // Clase principal de la aplicación
 class App {
     constructor() {
+        this.eventSource = null;
         this.initializeApp();
         this.setupGlobalErrorHandling();
+        this.setupEventStream();
         this.startHealthCheck();
     }
 
@@ -44,14 +50,77 @@ class App {
         });
     }
 
+    // Cambios en tiempo real (Server-Sent Events) en lugar de volver a pedir los datos
+    setupEventStream() {
+        Events.on('auth:login', () => this.openEventStream());
+        Events.on('auth:logout', () => this.closeEventStream());
+        if (auth.isAuthenticated()) {
+            this.openEventStream();
+        }
+    }
+
+    openEventStream() {
+        if (!window.EventSource) return;
+        this.closeEventStream();
+
+        // EventSource no permite headers: el access token va en el query string
+        const token = Storage.get(CONFIG.TOKEN_KEY);
+        const url = `${CONFIG.API_BASE_URL}${ENDPOINTS.EVENTS.STREAM}?token=${encodeURIComponent(token)}`;
+        const source = new EventSource(url);
+        this.eventSource = source;
+        // Otros módulos (ej. nba-map.js) usan esta conexión en lugar de abrir la suya
+        document.documentElement.dataset.eventStream = 'app';
+
+        PLAYER_EVENTS.forEach((type) => {
+            source.addEventListener(type, (e) => {
+                Events.dispatch('players:changed', { type, player: JSON.parse(e.data) });
+            });
+        });
+        source.addEventListener('weather.updated', (e) => {
+            Events.dispatch('weather:updated', JSON.parse(e.data));
+        });
+        // Se perdieron eventos: recargar los datos completos una vez
+        source.addEventListener('resync', () => {
+            Events.dispatch('players:changed', { type: 'resync' });
+        });
+        source.addEventListener('token-expired', () => this.reconnectWithFreshToken());
+
+        source.onerror = () => {
+            // El navegador reintenta solo; si cerró la conexión (ej. 401) se renueva el token
+            if (source.readyState === EventSource.CLOSED && this.eventSource === source) {
+                setTimeout(() => this.reconnectWithFreshToken(), 5000);
+            }
+        };
+    }
+
+    async reconnectWithFreshToken() {
+        this.closeEventStream();
+        if (!auth.isAuthenticated()) return;
+        if (await api.refreshSession()) {
+            this.openEventStream();
+        }
+    }
+
+    closeEventStream() {
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+            delete document.documentElement.dataset.eventStream;
+        }
+    }
+
+    isEventStreamOpen() {
+        return this.eventSource !== null && this.eventSource.readyState === EventSource.OPEN;
+    }
+
     // Verificar estado del servidor periódicamente
     startHealthCheck() {
         // Verificar inmediatamente
         this.checkServerHealth();
         
-        // Verificar cada 30 segundos
+        // Verificar cada 30 segundos (con el stream de eventos abierto no hace falta)
         setInterval(() => {
-            if (auth.isAuthenticated()) {
+            if (auth.isAuthenticated() && !this.isEventStreamOpen()) {
                 this.checkServerHealth();
             }
         }, 30000);
@@ -75,6 +75,7 @@ export class AuthManager {
             };
             
             Storage.set(CONFIG.TOKEN_KEY, APP_STATE.authToken);
+            Storage.set(CONFIG.REFRESH_TOKEN_KEY, response.refresh_token);
             Storage.set(CONFIG.USER_KEY, APP_STATE.currentUser);
             
             // Mostrar éxito y cambiar vista
@@ -135,6 +136,9 @@ export class AuthManager {
 
     // Cerrar sesión
     logout() {
+        // Revocar la sesión en el servidor (no bloquea el cierre local)
+        api.logout().catch((error) => console.warn('No se pudo revocar la sesión:', error));
+        
         // Limpiar estado
         APP_STATE.authToken = null;
         APP_STATE.currentUser = null;
@@ -144,6 +148,7 @@ export class AuthManager {
         
         // Limpiar almacenamiento
         Storage.remove(CONFIG.TOKEN_KEY);
+        Storage.remove(CONFIG.REFRESH_TOKEN_KEY);
         Storage.remove(CONFIG.USER_KEY);
         
         // Cambiar vista
@@ -3,6 +3,7 @@ export const CONFIG = {
     API_BASE_URL: 'http://localhost:8000/api/v1',
     PLAYERS_PER_PAGE: 10,
     TOKEN_KEY: 'auth_token',
+    REFRESH_TOKEN_KEY: 'refresh_token',
     USER_KEY: 'current_user'
 };
 
@@ -19,16 +20,22 @@ export const APP_STATE = {
 export const ENDPOINTS = {
     AUTH: {
         LOGIN: '/auth/login',
+        REFRESH: '/auth/refresh',
+        LOGOUT: '/auth/logout',
         REGISTER: '/auth/register',
         PROFILE: '/auth/profile'
     },
     PLAYERS: {
         LIST: '/players/',
+        SEARCH: '/players/search',
         GET: (id) => `/players/${id}`,
         CREATE: '/players/',
         UPDATE: (id) => `/players/${id}`,
         DELETE: (id) => `/players/${id}`
     },
+    EVENTS: {
+        STREAM: '/events/stream'
+    },
     HEALTH: '/health'
 };
 
@@ -5,10 +5,11 @@
  * Utiliza Leaflet.js para renderizar mapas y marcadores
  * 
  * Funcionalidades:
- * - Cargar ubicaciones de equipos desde la API
+ * - Cargar ubicaciones de equipos desde la API (GeoJSON con propiedades livianas)
  * - Mostrar marcadores en el mapa
- * - Popups con información de equipos
+ * - Popups con información de equipos (se piden a la API al abrirlos)
  * - Estadísticas de jugadores por equipo
+ * - Cambios en tiempo real (SSE): clima en los tooltips y popups sin datos viejos
  * 
  * Autor: NBA API Team
  * Fecha: 2025-11-02
@@ -31,10 +32,16 @@ const API_URL = 'http://localhost:8000/api/v1';
 let nbaMap = null;
 
 /**
- * Array con todas las ubicaciones de equipos
+ * Features GeoJSON de los equipos (propiedades livianas)
  * @type {Array}
  */
-let teamsLocations = [];
+let teamsFeatures = [];
+
+/**
+ * Detalle de popups ya descargados, por nombre de equipo
+ * @type {Map<string, Object>}
+ */
+const teamDetailsCache = new Map();
 
 /**
  * Capa de marcadores para controlar visibilidad
@@ -42,6 +49,24 @@ let teamsLocations = [];
  */
 let markersLayer = null;
 
+/**
+ * Marcador de cada equipo, por nombre (para actualizar tooltips y popups)
+ * @type {Map<string, L.Marker>}
+ */
+const teamMarkers = new Map();
+
+/**
+ * Conexión de eventos propia del mapa (solo si la página no abrió otra)
+ * @type {EventSource|null}
+ */
+let mapEventSource = null;
+
+/**
+ * Eventos de jugadores que emite /events/stream
+ * @constant {Array<string>}
+ */
+const MAP_PLAYER_EVENTS = ['player.created', 'player.updated', 'player.deleted'];
+
 // ========================================
 // FUNCIONES DE AUTENTICACIÓN
 // ========================================
@@ -75,14 +100,15 @@ function checkAuth() {
 // ========================================
 
 /**
- * Carga las ubicaciones de los equipos NBA desde la API
+ * Carga los equipos NBA desde la API como FeatureCollection GeoJSON
+ * Cada feature trae solo lo necesario para el marcador; el popup se pide aparte
  * Requiere autenticación JWT
  * 
  * @async
- * @returns {Promise<Array>} - Array con las ubicaciones de equipos
+ * @returns {Promise<Array>} - Array con las features de los equipos
  * @throws {Error} - Si falla la petición a la API
  */
-async function loadTeamsLocations() {
+async function loadTeamsGeoJSON() {
     const auth = checkAuth();
     if (!auth) {
         console.error('❌ No se puede cargar ubicaciones sin autenticación');
@@ -90,22 +116,19 @@ async function loadTeamsLocations() {
     }
 
     try {
-        console.log('🔄 Cargando ubicaciones de equipos NBA...');
-        console.log('🔑 Token:', auth.token.substring(0, 20) + '...');
+        console.log('🔄 Cargando ubicaciones de equipos NBA (GeoJSON)...');
         
-        const url = `${API_URL}/nba-map/teams-locations`;
+        const url = `${API_URL}/nba-map/teams.geojson`;
         console.log('🌐 URL:', url);
         
         const response = await fetch(url, {
             method: 'GET',
             headers: {
-                'Authorization': `Bearer ${auth.token}`,
-                'Content-Type': 'application/json'
+                'Authorization': `Bearer ${auth.token}`
             }
         });
 
         console.log('📡 Response status:', response.status);
-        console.log('📡 Response ok:', response.ok);
 
         if (!response.ok) {
             const errorText = await response.text();
@@ -113,11 +136,10 @@ async function loadTeamsLocations() {
             throw new Error(`Error HTTP: ${response.status} - ${errorText}`);
         }
 
-        const locations = await response.json();
-        console.log(`✅ ${locations.length} equipos cargados exitosamente`);
-        console.log('📦 Primer equipo:', locations[0]);
+        const collection = await response.json();
+        console.log(`✅ ${collection.features.length} equipos cargados exitosamente`);
         
-        return locations;
+        return collection.features;
 
     } catch (error) {
         console.error('❌ Error al cargar ubicaciones:', error);
@@ -125,6 +147,42 @@ async function loadTeamsLocations() {
     }
 }
 
+/**
+ * Obtiene el contenido del popup de un equipo (estadio, jugadores y clima)
+ * Se pide solo al abrir el popup y se guarda para las siguientes aperturas
+ * 
+ * @async
+ * @param {string} teamName - Nombre del equipo
+ * @returns {Promise<Object>} - Detalle del equipo
+ * @throws {Error} - Si falla la petición a la API
+ */
+async function loadTeamDetails(teamName) {
+    if (teamDetailsCache.has(teamName)) {
+        return teamDetailsCache.get(teamName);
+    }
+
+    const auth = checkAuth();
+    if (!auth) {
+        throw new Error('No hay autenticación válida');
+    }
+
+    const url = `${API_URL}/nba-map/team-details/${encodeURIComponent(teamName)}`;
+    const response = await fetch(url, {
+        method: 'GET',
+        headers: {
+            'Authorization': `Bearer ${auth.token}`
+        }
+    });
+
+    if (!response.ok) {
+        throw new Error(`Error HTTP: ${response.status}`);
+    }
+
+    const details = await response.json();
+    teamDetailsCache.set(teamName, details);
+    return details;
+}
+
 // ========================================
 // FUNCIONES DE MAPA
 // ========================================
@@ -281,69 +339,189 @@ function getMarkerColor(playersCount) {
 
 /**
  * Agrega marcadores al mapa para cada equipo
- * Crea popups con información del equipo
+ * El popup muestra un indicador de carga y se completa con /team-details al abrirlo
  * 
- * @param {Array} locations - Array de ubicaciones de equipos
+ * @param {Array} features - Features GeoJSON de los equipos
  */
-function addMarkersToMap(locations) {
-    console.log(`📍 Agregando ${locations.length} marcadores al mapa...`);
-    console.log('📦 Datos recibidos:', locations);
+function addMarkersToMap(features) {
+    console.log(`📍 Agregando ${features.length} marcadores al mapa...`);
     
     // Limpiar marcadores previos
     if (markersLayer) {
         markersLayer.clearLayers();
     }
+    teamMarkers.clear();
 
     // Verificar que tenemos datos válidos
-    if (!locations || locations.length === 0) {
+    if (!features || features.length === 0) {
         console.warn('⚠️ No hay ubicaciones para mostrar');
         return;
     }
 
-    // Agregar un marcador por cada equipo
-    locations.forEach((team, index) => {
-        console.log(`🏀 Procesando equipo ${index + 1}:`, team.team);
-        console.log(`   📍 Coordenadas: [${team.latitude}, ${team.longitude}]`);
-        console.log(`   👥 Jugadores: ${team.players_count}`);
-        
-        // Validar coordenadas
-        if (!team.latitude || !team.longitude) {
-            console.error(`❌ Coordenadas inválidas para ${team.team}`);
-            return;
-        }
-        
+    const geoJsonLayer = L.geoJSON(features, {
         // Crear ícono personalizado según cantidad de jugadores
-        const markerColor = getMarkerColor(team.players_count);
-        console.log(`   🎨 Color del marcador: ${markerColor}`);
-        
-        const customIcon = L.AwesomeMarkers.icon({
-            icon: 'basketball-ball',
-            prefix: 'fa',
-            markerColor: markerColor,
-            iconColor: 'white'
-        });
-
-        // Crear marcador
-        const marker = L.marker(
-            [team.latitude, team.longitude],
-            { icon: customIcon }
-        );
-
-        // Agregar popup con información del equipo
-        const popupContent = createPopupContent(team);
-        marker.bindPopup(popupContent, {
-            maxWidth: 300,
-            className: 'nba-team-popup'
-        });
+        pointToLayer: (feature, latlng) => L.marker(latlng, {
+            icon: L.AwesomeMarkers.icon({
+                icon: 'basketball-ball',
+                prefix: 'fa',
+                markerColor: getMarkerColor(feature.properties.players_count),
+                iconColor: 'white'
+            })
+        }),
+        onEachFeature: (feature, marker) => {
+            const props = feature.properties;
+            teamMarkers.set(props.team, marker);
+            marker.bindTooltip(tooltipText(props.team, props.temperature));
+
+            marker.bindPopup(`
+                <div class="team-popup">
+                    <div class="team-popup-header">
+                        <h3 class="team-name">
+                            <i class="fas fa-basketball-ball"></i>
+                            ${props.team}
+                        </h3>
+                    </div>
+                    <div class="team-popup-body">
+                        <i class="fas fa-spinner fa-spin"></i> Cargando...
+                    </div>
+                </div>
+            `, {
+                maxWidth: 300,
+                className: 'nba-team-popup'
+            });
 
-        // Agregar marcador a la capa
-        marker.addTo(markersLayer);
-        console.log(`   ✅ Marcador agregado para ${team.team}`);
+            // Contenido del popup bajo demanda
+            marker.on('popupopen', () => refreshPopup(props.team, marker));
+        }
     });
 
+    geoJsonLayer.addTo(markersLayer);
     console.log('✅ Todos los marcadores agregados exitosamente');
 }
 
+/**
+ * Texto del tooltip de un equipo: nombre y temperatura si se conoce
+ * 
+ * @param {string} team - Nombre del equipo
+ * @param {number|null|undefined} temperature - Temperatura en °C
+ * @returns {string}
+ */
+function tooltipText(team, temperature) {
+    return temperature !== null && temperature !== undefined ? `${team} · ${temperature}°C` : team;
+}
+
+/**
+ * Completa el popup de un equipo con su detalle (del cache o de la API)
+ * 
+ * @async
+ * @param {string} team - Nombre del equipo
+ * @param {L.Marker} marker - Marcador del equipo
+ */
+async function refreshPopup(team, marker) {
+    try {
+        const details = await loadTeamDetails(team);
+        marker.setPopupContent(createPopupContent(details));
+    } catch (error) {
+        console.error(`❌ Error al cargar detalle de ${team}:`, error);
+        marker.setPopupContent(`<p class="no-players"><em>No se pudo cargar la información de ${team}</em></p>`);
+    }
+}
+
+// ========================================
+// CAMBIOS EN TIEMPO REAL
+// ========================================
+
+/**
+ * Descarta el detalle guardado de los equipos indicados (todos si no se indican)
+ * y vuelve a pedir el de los popups abiertos
+ * 
+ * @param {Array<string>|null} teams - Equipos afectados
+ */
+function invalidateTeamDetails(teams = null) {
+    const affected = teams || Array.from(teamMarkers.keys());
+    if (!teams) {
+        teamDetailsCache.clear();
+    }
+    affected.forEach((team) => {
+        teamDetailsCache.delete(team);
+        const marker = teamMarkers.get(team);
+        if (marker && marker.isPopupOpen()) {
+            refreshPopup(team, marker);
+        }
+    });
+}
+
+/**
+ * weather.updated: actualiza los tooltips con la temperatura nueva y
+ * descarta el detalle guardado de esos equipos
+ * 
+ * @param {CustomEvent} e - detail: {teams: {equipo: {temperature, description, icon}}}
+ */
+function onWeatherUpdated(e) {
+    const teams = (e.detail && e.detail.teams) || {};
+    Object.entries(teams).forEach(([team, weather]) => {
+        const marker = teamMarkers.get(team);
+        if (marker) {
+            marker.setTooltipContent(tooltipText(team, weather.temperature));
+        }
+        const feature = teamsFeatures.find((f) => f.properties.team === team);
+        if (feature) {
+            feature.properties.temperature = weather.temperature;
+        }
+    });
+    invalidateTeamDetails(Object.keys(teams));
+}
+
+/**
+ * Altas, cambios y bajas de jugadores: un cambio puede mover al jugador
+ * de equipo (y una baja no trae el equipo), así que se descarta todo el detalle
+ */
+function onPlayersChanged() {
+    invalidateTeamDetails();
+}
+
+document.addEventListener('weather:updated', onWeatherUpdated);
+document.addEventListener('players:changed', onPlayersChanged);
+
+/**
+ * Abre /events/stream y reenvía los eventos como 'players:changed' y
+ * 'weather:updated' (los mismos que despacha app.js). No hace nada si la
+ * página ya tiene su propia conexión de eventos.
+ */
+function openMapEventStream() {
+    if (!window.EventSource || mapEventSource || document.documentElement.dataset.eventStream) return;
+    const auth = checkAuth();
+    if (!auth) return;
+
+    // EventSource no permite headers: el access token va en el query string
+    const source = new EventSource(`${API_URL}/events/stream?token=${encodeURIComponent(auth.token)}`);
+    mapEventSource = source;
+
+    const dispatch = (name, detail) => document.dispatchEvent(new CustomEvent(name, { detail }));
+    MAP_PLAYER_EVENTS.forEach((type) => {
+        source.addEventListener(type, (e) => dispatch('players:changed', { type, player: JSON.parse(e.data) }));
+    });
+    source.addEventListener('weather.updated', (e) => dispatch('weather:updated', JSON.parse(e.data)));
+    source.addEventListener('resync', () => dispatch('players:changed', { type: 'resync' }));
+    // Token vencido o revocado: se cierra; al volver a cargar el mapa se abre con el token vigente
+    source.addEventListener('token-expired', closeMapEventStream);
+    source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED) {
+            closeMapEventStream();
+        }
+    };
+}
+
+/**
+ * Cierra la conexión de eventos del mapa
+ */
+function closeMapEventStream() {
+    if (mapEventSource) {
+        mapEventSource.close();
+        mapEventSource = null;
+    }
+}
+
 // ========================================
 // FUNCIONES DE ESTADÍSTICAS
 // ========================================
@@ -352,11 +530,11 @@ function addMarkersToMap(locations) {
  * Actualiza las estadísticas en la interfaz
  * Muestra total de equipos y total de jugadores
  * 
- * @param {Array} locations - Array de ubicaciones de equipos
+ * @param {Array} features - Features GeoJSON de los equipos
  */
-function updateMapStats(locations) {
-    const totalTeams = locations.length;
-    const totalPlayers = locations.reduce((sum, team) => sum + team.players_count, 0);
+function updateMapStats(features) {
+    const totalTeams = features.length;
+    const totalPlayers = features.reduce((sum, feature) => sum + feature.properties.players_count, 0);
 
     // Actualizar elementos en el DOM - usar IDs correctos
     const teamsElement = document.getElementById('map-total-teams');
@@ -420,8 +598,9 @@ async function initNBAMap() {
 
         // Cargar ubicaciones
         console.log('📡 Cargando ubicaciones desde API...');
-        teamsLocations = await loadTeamsLocations();
-        console.log('📊 Ubicaciones cargadas:', teamsLocations.length);
+        teamsFeatures = await loadTeamsGeoJSON();
+        teamDetailsCache.clear();
+        console.log('📊 Ubicaciones cargadas:', teamsFeatures.length);
 
         // Ocultar loading
         if (loadingElement) {
@@ -429,7 +608,7 @@ async function initNBAMap() {
         }
 
         // Verificar que tenemos datos
-        if (!teamsLocations || teamsLocations.length === 0) {
+        if (!teamsFeatures || teamsFeatures.length === 0) {
             console.warn('⚠️ No se encontraron equipos');
             showError('No se encontraron equipos para mostrar en el mapa');
             return;
@@ -437,11 +616,14 @@ async function initNBAMap() {
 
         // Agregar marcadores al mapa
         console.log('📍 Agregando marcadores...');
-        addMarkersToMap(teamsLocations);
+        addMarkersToMap(teamsFeatures);
 
         // Actualizar estadísticas
         console.log('📊 Actualizando estadísticas...');
-        updateMapStats(teamsLocations);
+        updateMapStats(teamsFeatures);
+
+        // Clima y plantillas al día sin recargar el mapa
+        openMapEventStream();
 
         console.log('✅ NBA Map inicializado completamente');
 
@@ -481,4 +663,4 @@ function showError(message) {
 // ========================================
 
 // Si estás usando módulos ES6, descomenta esto:
-// export { initNBAMap, loadTeamsLocations, checkAuth };
+// export { initNBAMap, loadTeamsGeoJSON, loadTeamDetails, checkAuth };
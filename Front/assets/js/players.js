@@ -28,6 +28,28 @@ export class PlayersManager {
         // Event listeners personalizados
         Events.on('auth:login', () => this.loadPlayers());
         Events.on('auth:logout', () => this.clearPlayers());
+        
+        // Cambios publicados por el servidor (stream de eventos)
+        this.reloadFromEvents = Utils.debounce(() => this.loadPlayers(), 500);
+        Events.on('players:changed', (e) => this.applyPlayerEvent(e.detail));
+    }
+
+    // Aplicar un cambio recibido en tiempo real
+    applyPlayerEvent({ type, player }) {
+        if (!auth.isAuthenticated()) return;
+
+        // Una actualización de un jugador visible se aplica sin pedir la página
+        if (type === 'player.updated') {
+            const current = APP_STATE.players.find((p) => p.id === player.id);
+            if (current) {
+                Object.assign(current, player);
+                this.renderPlayers();
+            }
+            return;
+        }
+
+        // Altas, bajas y resync cambian la paginación: se recarga la página actual
+        this.reloadFromEvents();
     }
 
     // Configurar validación en tiempo real
@@ -7,13 +7,29 @@ class TokenResponse(BaseModel):
     access_token: str = Field(..., description="Token JWT de acceso")
     token_type: str = Field(default="bearer", description="Tipo de token")
     expires_in: int = Field(..., description="Tiempo de expiración en segundos")
+    refresh_token: Optional[str] = Field(default=None, description="Refresh token opaco (un solo uso, rota en cada renovación)")
+    refresh_expires_in: Optional[int] = Field(default=None, description="Tiempo de expiración del refresh token en segundos")
     
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
                 "access_token": "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9...",
                 "token_type": "bearer", 
-                "expires_in": 3600
+                "expires_in": 3600,
+                "refresh_token": "3q2-7wEAAAB0aGlzIGlzIGFuIGV4YW1wbGU...",
+                "refresh_expires_in": 604800
+            }
+        }
+    )
+
+class RefreshRequest(BaseModel):
+    """Esquema para renovar la sesión con un refresh token"""
+    refresh_token: str = Field(..., min_length=20, max_length=255, description="Refresh token recibido en el login o la última renovación")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "refresh_token": "3q2-7wEAAAB0aGlzIGlzIGFuIGV4YW1wbGU..."
             }
         }
     )
@@ -32,6 +48,18 @@ class LoginRequest(BaseModel):
         }
     )
 
+class LogoutRequest(BaseModel):
+    """Esquema para cerrar sesión (el refresh token es opcional)"""
+    refresh_token: Optional[str] = Field(default=None, max_length=255, description="Refresh token de la sesión a cerrar")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "refresh_token": "3q2-7wEAAAB0aGlzIGlzIGFuIGV4YW1wbGU..."
+            }
+        }
+    )
+
 class RegisterRequest(BaseModel):
     """Esquema para el registro de usuario"""
     username: str = Field(..., min_length=3, max_length=50, description="Nombre de usuario único")
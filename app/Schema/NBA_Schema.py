@@ -140,6 +140,17 @@ class PlayerResponse(PlayerBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class PlayerSearchResult(BaseModel):
+    """
+    Esquema liviano para resultados de búsqueda por nombre (autocompletado).
+    """
+    id: int = Field(..., example=1, description="Identificador único del jugador")
+    name: str = Field(..., example="LeBron James", description="Nombre completo del jugador")
+    team: str = Field(..., example="Los Angeles Lakers", description="Equipo actual del jugador")
+    position: str = Field(..., example="Small Forward", description="Posición del jugador")
+
+    model_config = ConfigDict(from_attributes=True)
+
 class ErrorResponse(BaseModel):
     """
     Esquema estándar para respuestas de error.
@@ -0,0 +1,64 @@
+"""
+Schemas Pydantic para estadísticas de jugadores por partido y por temporada
+"""
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, List, Optional
+from datetime import date
+
+
+class GameStatsResponse(BaseModel):
+    """Box score de un jugador en un partido"""
+    season: int = Field(..., description="Año de inicio de la temporada (2024 = 2024-25)")
+    player_id: int
+    game_id: str
+    game_date: date
+    team: Optional[str] = None
+    opponent: Optional[str] = None
+    seconds: int = Field(..., description="Segundos jugados")
+    points: int
+    rebounds: int
+    assists: int
+    steals: int
+    blocks: int
+    turnovers: int
+    fgm: int
+    fga: int
+    fg3m: int
+    fg3a: int
+    ftm: int
+    fta: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SeasonAveragesResponse(BaseModel):
+    """Promedios por partido de un jugador en una temporada"""
+    season: int
+    games: int
+    minutes: float
+    points: float
+    rebounds: float
+    assists: float
+    steals: float
+    blocks: float
+    turnovers: float
+    fg_pct: Optional[float] = Field(None, description="Tiros de campo convertidos / intentados")
+    fg3_pct: Optional[float] = None
+    ft_pct: Optional[float] = None
+    totals: Dict[str, int] = Field(..., description="Sumas de la temporada")
+
+
+class IngestError(BaseModel):
+    """Registro rechazado (line = 0 cuando el error se detecta al escribir el lote)"""
+    line: int
+    error: str
+
+
+class IngestResponse(BaseModel):
+    """Resumen de una carga de box scores"""
+    received: int = Field(..., description="Registros leídos")
+    inserted: int = Field(..., description="Partidos nuevos")
+    duplicates: int = Field(..., description="Partidos ya cargados (ignorados)")
+    rejected: int = Field(..., description="Registros inválidos o de jugadores inexistentes")
+    errors: List[IngestError] = Field(..., description="Detalle de los primeros errores (STATS_INGEST_MAX_ERRORS)")
+    elapsed_ms: float
@@ -39,6 +39,7 @@ class RoleResponse(RoleBase):
     """Schema de respuesta de rol"""
     id: int
     is_active: bool
+    permissions_version: int = Field(default=1, description="Versión de permisos (cambia al modificarlos)")
     created_at: datetime
     updated_at: datetime
 
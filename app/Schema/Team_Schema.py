@@ -3,7 +3,7 @@ Schemas Pydantic para equipos NBA
 Define los modelos de validación y serialización
 """
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -66,3 +66,32 @@ class TeamWithPlayers(TeamResponse):
     
     class Config:
         from_attributes = True
+
+
+class RoadTripRequest(BaseModel):
+    """Schema para planificar una gira entre estadios"""
+    start_team_id: int = Field(..., description="Equipo (estadio) de salida")
+    team_ids: List[int] = Field(..., min_length=1, max_length=100, description="Equipos a visitar")
+    return_to_start: bool = Field(False, description="Si la gira regresa al estadio de salida")
+    time_limit_ms: int = Field(200, ge=1, le=5000, description="Tiempo máximo de optimización (ms)")
+
+
+class RoadTripStop(BaseModel):
+    """Parada de la gira"""
+    id: int
+    team: str
+    city: str
+    latitude: float
+    longitude: float
+    leg_km: float = Field(..., description="Distancia desde la parada anterior (km)")
+
+
+class RoadTripResponse(BaseModel):
+    """Schema para respuesta de la gira optimizada"""
+    itinerary: List[RoadTripStop]
+    total_km: float
+    initial_km: float = Field(..., description="Distancia del recorrido inicial (vecino más cercano)")
+    return_to_start: bool
+    improvements: int = Field(..., description="Mejoras 2-opt aplicadas")
+    converged: bool = Field(..., description="False si se agotó el tiempo antes de un óptimo local")
+    elapsed_ms: float
@@ -77,6 +77,11 @@ class UserUpdate(BaseModel):
         example=1,
         description="Nuevo rol del usuario (opcional)"
     )
+    is_active: Optional[bool] = Field(
+        None,
+        example=True,
+        description="Activar o desactivar el usuario (opcional); desactivarlo revoca sus sesiones"
+    )
 
     model_config = ConfigDict(
         from_attributes=True,
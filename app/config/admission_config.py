@@ -0,0 +1,58 @@
+import os
+
+
+def _csv(name: str, default: str) -> list:
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+class AdmissionConfig:
+    """Configuración del control de admisión (límite de concurrencia y descarte de carga)"""
+    # Peticiones simultáneas por clase de ruta. La suma debería quedar por debajo de los
+    # 40 hilos del threadpool donde corren los endpoints síncronos.
+    ADMISSION_LIMIT_AUTH: int = int(os.getenv("ADMISSION_LIMIT_AUTH", "4"))    # login/refresh (bcrypt)
+    ADMISSION_LIMIT_MAP: int = int(os.getenv("ADMISSION_LIMIT_MAP", "6"))      # mapa (clima externo)
+    ADMISSION_LIMIT_WRITE: int = int(os.getenv("ADMISSION_LIMIT_WRITE", "8"))  # POST/PUT/PATCH/DELETE
+    ADMISSION_LIMIT_READ: int = int(os.getenv("ADMISSION_LIMIT_READ", "20"))   # resto de lecturas
+    # Exportaciones e ingesta masiva: duran lo que dure la transferencia y, en las clases
+    # de lectura/escritura, dejarían sin cupo a las peticiones cortas
+    ADMISSION_LIMIT_BULK: int = int(os.getenv("ADMISSION_LIMIT_BULK", "2"))
+    # Peticiones que pueden esperar turno por clase; el resto se descarta con 503 al instante
+    ADMISSION_QUEUE_SIZE: int = int(os.getenv("ADMISSION_QUEUE_SIZE", "50"))
+    # Segundos máximos de espera en la cola antes de responder 503
+    ADMISSION_QUEUE_TIMEOUT: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2.0"))
+    # Valor del header Retry-After en las respuestas 503
+    ADMISSION_RETRY_AFTER: int = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+    # Rutas que nunca se limitan (monitoreo, documentación y el stream de eventos,
+    # cuyas conexiones duran horas y ocuparían un lugar de lectura todo ese tiempo)
+    ADMISSION_EXEMPT_PATHS: list = _csv(
+        "ADMISSION_EXEMPT_PATHS",
+        "/health,/metrics,/docs,/redoc,/openapi.json,/scalar,/favicon.ico,/api/v1/events/stream"
+    )
+
+    @classmethod
+    def get_route_class_limits(cls) -> dict:
+        return {
+            "auth": cls.ADMISSION_LIMIT_AUTH,
+            "map": cls.ADMISSION_LIMIT_MAP,
+            "write": cls.ADMISSION_LIMIT_WRITE,
+            "read": cls.ADMISSION_LIMIT_READ,
+            "bulk": cls.ADMISSION_LIMIT_BULK,
+        }
+
+    @classmethod
+    def get_queue_size(cls) -> int:
+        return cls.ADMISSION_QUEUE_SIZE
+
+    @classmethod
+    def get_queue_timeout(cls) -> float:
+        return cls.ADMISSION_QUEUE_TIMEOUT
+
+    @classmethod
+    def get_retry_after(cls) -> int:
+        return cls.ADMISSION_RETRY_AFTER
+
+    @classmethod
+    def get_exempt_paths(cls) -> list:
+        return cls.ADMISSION_EXEMPT_PATHS
+
+admission_config = AdmissionConfig()
@@ -0,0 +1,14 @@
+import os
+
+
+class AnalyticsConfig:
+    """Configuración de las estadísticas agregadas de la plantilla (rollups)"""
+    # Segundos entre verificaciones de los rollups contra la tabla players. Detecta cambios
+    # hechos fuera de la API (scripts, SQL, otros workers caídos a mitad) y reconstruye si difieren.
+    ANALYTICS_ROLLUP_RECONCILE_SECONDS: float = float(os.getenv("ANALYTICS_ROLLUP_RECONCILE_SECONDS", "300"))
+
+    @classmethod
+    def get_rollup_reconcile_seconds(cls) -> float:
+        return cls.ANALYTICS_ROLLUP_RECONCILE_SECONDS
+
+analytics_config = AnalyticsConfig()
@@ -0,0 +1,38 @@
+import os
+
+
+class CompressionConfig:
+    """Configuración de la compresión de respuestas HTTP (gzip / Brotli)"""
+    # Tamaño mínimo (bytes) para comprimir; respuestas más pequeñas no compensan el costo de CPU
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    # Nivel gzip (1 = más rápido, 9 = más compresión)
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    # Calidad Brotli (0-11); 4-5 da mejor tamaño que gzip 6 con CPU similar
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    # Tipos de contenido que se comprimen (las imágenes o streams SSE se excluyen)
+    COMPRESSION_CONTENT_TYPES: list = [
+        content_type.strip()
+        for content_type in os.getenv(
+            "COMPRESSION_CONTENT_TYPES",
+            "application/json,application/geo+json,text/html,text/plain,text/css,application/javascript"
+        ).split(",")
+        if content_type.strip()
+    ]
+
+    @classmethod
+    def get_minimum_size(cls) -> int:
+        return cls.COMPRESSION_MINIMUM_SIZE
+
+    @classmethod
+    def get_gzip_level(cls) -> int:
+        return cls.COMPRESSION_GZIP_LEVEL
+
+    @classmethod
+    def get_brotli_quality(cls) -> int:
+        return cls.COMPRESSION_BROTLI_QUALITY
+
+    @classmethod
+    def get_content_types(cls) -> list:
+        return cls.COMPRESSION_CONTENT_TYPES
+
+compression_config = CompressionConfig()
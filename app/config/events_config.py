@@ -0,0 +1,32 @@
+import os
+
+
+class EventsConfig:
+    """Configuración del canal de eventos en tiempo real (Server-Sent Events)"""
+    # Eventos pendientes por suscriptor; si un cliente lento se atrasa más se descartan
+    # los más viejos y se le pide recargar los datos (evento "resync")
+    EVENTS_QUEUE_SIZE: int = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+    # Últimos eventos que se conservan para reenviar al reconectar (Last-Event-ID)
+    EVENTS_REPLAY_SIZE: int = int(os.getenv("EVENTS_REPLAY_SIZE", "500"))
+    # Segundos entre comentarios keep-alive en conexiones sin eventos
+    EVENTS_HEARTBEAT_SECONDS: float = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+    # Conexiones simultáneas por worker; las siguientes reciben 503
+    EVENTS_MAX_SUBSCRIBERS: int = int(os.getenv("EVENTS_MAX_SUBSCRIBERS", "10000"))
+
+    @classmethod
+    def get_queue_size(cls) -> int:
+        return cls.EVENTS_QUEUE_SIZE
+
+    @classmethod
+    def get_replay_size(cls) -> int:
+        return cls.EVENTS_REPLAY_SIZE
+
+    @classmethod
+    def get_heartbeat_seconds(cls) -> float:
+        return cls.EVENTS_HEARTBEAT_SECONDS
+
+    @classmethod
+    def get_max_subscribers(cls) -> int:
+        return cls.EVENTS_MAX_SUBSCRIBERS
+
+events_config = EventsConfig()
@@ -0,0 +1,19 @@
+import os
+
+
+class ExportConfig:
+    """Configuración de las exportaciones columnares (Arrow IPC / Parquet)"""
+    # Filas por lote leído de la base de datos y escrito como RecordBatch / row group
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "50000"))
+    # Códec de compresión de Parquet: zstd, snappy, gzip o none
+    EXPORT_PARQUET_COMPRESSION: str = os.getenv("EXPORT_PARQUET_COMPRESSION", "zstd").lower()
+
+    @classmethod
+    def get_batch_size(cls) -> int:
+        return cls.EXPORT_BATCH_SIZE
+
+    @classmethod
+    def get_parquet_compression(cls) -> str:
+        return cls.EXPORT_PARQUET_COMPRESSION
+
+export_config = ExportConfig()
@@ -6,9 +6,16 @@ class JWTConfig:
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "tu_clave_secreta_jwt_por_defecto")
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRES: timedelta = timedelta(seconds=3600)  # 1 hora
+    # Refresh tokens opacos y rotativos: renuevan la sesión sin verificar la contraseña (bcrypt)
+    JWT_REFRESH_TOKEN_EXPIRES: timedelta = timedelta(days=int(os.getenv("JWT_REFRESH_TOKEN_DAYS", "7")))
     JWT_TOKEN_LOCATION: list = ["headers"]
     JWT_HEADER_NAME: str = "Authorization"
     JWT_HEADER_TYPE: str = "Bearer"
+    # Segundos que se confía en la versión de permisos de un rol antes de volver a consultarla
+    ROLE_PERMISSIONS_CACHE_TTL: int = int(os.getenv("ROLE_PERMISSIONS_CACHE_TTL", "30"))
+    # Segundos entre sincronizaciones de la lista de revocación en memoria con la base de datos.
+    # Es también la demora máxima con la que una revocación hecha en otro worker se aplica en este.
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = float(os.getenv("TOKEN_REVOCATION_REFRESH_SECONDS", "5"))
     
     @classmethod
     def get_secret_key(cls) -> str:
@@ -22,4 +29,16 @@ class JWTConfig:
     def get_expires_delta(cls) -> timedelta:
         return cls.JWT_ACCESS_TOKEN_EXPIRES
 
+    @classmethod
+    def get_refresh_expires_delta(cls) -> timedelta:
+        return cls.JWT_REFRESH_TOKEN_EXPIRES
+
+    @classmethod
+    def get_role_permissions_cache_ttl(cls) -> int:
+        return cls.ROLE_PERMISSIONS_CACHE_TTL
+
+    @classmethod
+    def get_revocation_refresh_seconds(cls) -> float:
+        return cls.TOKEN_REVOCATION_REFRESH_SECONDS
+
 jwt_config = JWTConfig()
\ No newline at end of file
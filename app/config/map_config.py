@@ -0,0 +1,14 @@
+import os
+
+
+class MapConfig:
+    """Configuración del mapa interactivo de equipos (snapshot en memoria)"""
+    # Segundos entre verificaciones del snapshot contra la base de datos. Detecta cambios
+    # hechos por otros workers o fuera de la API (scripts, SQL) y reconstruye si difieren.
+    MAP_SNAPSHOT_RECONCILE_SECONDS: float = float(os.getenv("MAP_SNAPSHOT_RECONCILE_SECONDS", "30"))
+
+    @classmethod
+    def get_snapshot_reconcile_seconds(cls) -> float:
+        return cls.MAP_SNAPSHOT_RECONCILE_SECONDS
+
+map_config = MapConfig()
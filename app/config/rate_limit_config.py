@@ -0,0 +1,41 @@
+import os
+
+
+class RateLimitConfig:
+    """Configuración del limitador de intentos de login"""
+    # Backend del estado: "memory" (un proceso) o "database" (compartido entre workers)
+    LOGIN_RATE_LIMIT_BACKEND: str = os.getenv("LOGIN_RATE_LIMIT_BACKEND", "memory").strip().lower()
+    # Token bucket por IP: ráfaga máxima y recarga por minuto
+    LOGIN_IP_CAPACITY: int = int(os.getenv("LOGIN_IP_CAPACITY", "20"))
+    LOGIN_IP_REFILL_PER_MINUTE: float = float(os.getenv("LOGIN_IP_REFILL_PER_MINUTE", "10"))
+    # Token bucket por username
+    LOGIN_USER_CAPACITY: int = int(os.getenv("LOGIN_USER_CAPACITY", "5"))
+    LOGIN_USER_REFILL_PER_MINUTE: float = float(os.getenv("LOGIN_USER_REFILL_PER_MINUTE", "2"))
+    # Ventana deslizante de fallos y máximos tolerados antes de bloquear
+    LOGIN_FAILURE_WINDOW_SECONDS: int = int(os.getenv("LOGIN_FAILURE_WINDOW_SECONDS", "900"))
+    LOGIN_MAX_FAILURES_PER_IP: int = int(os.getenv("LOGIN_MAX_FAILURES_PER_IP", "50"))
+    LOGIN_MAX_FAILURES_PER_USER: int = int(os.getenv("LOGIN_MAX_FAILURES_PER_USER", "10"))
+    # Segundos entre limpiezas de los contadores inactivos
+    LOGIN_RATE_LIMIT_CLEANUP_SECONDS: float = float(os.getenv("LOGIN_RATE_LIMIT_CLEANUP_SECONDS", "300"))
+
+    @classmethod
+    def get_backend(cls) -> str:
+        return cls.LOGIN_RATE_LIMIT_BACKEND
+
+    @classmethod
+    def get_cleanup_seconds(cls) -> float:
+        return cls.LOGIN_RATE_LIMIT_CLEANUP_SECONDS
+
+    @classmethod
+    def get_throttle_settings(cls) -> dict:
+        return {
+            "ip_capacity": cls.LOGIN_IP_CAPACITY,
+            "ip_refill_per_minute": cls.LOGIN_IP_REFILL_PER_MINUTE,
+            "user_capacity": cls.LOGIN_USER_CAPACITY,
+            "user_refill_per_minute": cls.LOGIN_USER_REFILL_PER_MINUTE,
+            "failure_window_seconds": cls.LOGIN_FAILURE_WINDOW_SECONDS,
+            "max_failures_per_ip": cls.LOGIN_MAX_FAILURES_PER_IP,
+            "max_failures_per_user": cls.LOGIN_MAX_FAILURES_PER_USER,
+        }
+
+rate_limit_config = RateLimitConfig()
@@ -0,0 +1,63 @@
+"""
+Actualización del esquema de bases de datos existentes.
+
+`Base.metadata.create_all` solo crea las tablas que faltan: no agrega
+columnas ni índices nuevos a tablas que ya existen. Este paso, idempotente,
+se ejecuta al iniciar la aplicación después de create_all y agrega lo que
+falte con ALTER TABLE ... ADD COLUMN ... DEFAULT y CREATE INDEX.
+"""
+import logging
+from typing import List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.config.NBA_database import Base
+
+logger = logging.getLogger('nba_api.config.schema_upgrade')
+
+# (tabla, columna, definición compatible con PostgreSQL y SQLite, UPDATE posterior opcional).
+# SQLite no admite defaults no constantes en ADD COLUMN: las fechas se agregan con un
+# valor fijo y luego se completan con el UPDATE.
+ADDED_COLUMNS: List[Tuple[str, str, str, Optional[str]]] = [
+    ("players", "updated_at", "TIMESTAMP NOT NULL DEFAULT '1970-01-01 00:00:00'",
+     "UPDATE players SET updated_at = CURRENT_TIMESTAMP"),
+    # Máscara 0: sync_permission_masks la recompila al iniciar
+    ("roles", "permissions_mask", "INTEGER NOT NULL DEFAULT 0", None),
+    ("roles", "permissions_version", "INTEGER NOT NULL DEFAULT 1", None),
+    # Se resuelve en la próxima actualización del clima (consulta por nombre de ciudad)
+    ("teams", "owm_city_id", "INTEGER", None),
+]
+
+
+def ensure_schema_upgrades(engine: Engine) -> List[str]:
+    """
+    Agrega las columnas e índices de los modelos que falten en tablas existentes.
+    Retorna la lista de cambios aplicados (vacía si el esquema ya estaba al día).
+    """
+    applied = []
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table, column, definition, backfill in ADDED_COLUMNS:
+            if table not in tables:
+                continue
+            if column in {existing["name"] for existing in inspector.get_columns(table)}:
+                continue
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+            if backfill:
+                conn.execute(text(backfill))
+            applied.append(f"{table}.{column}")
+
+    # Índices declarados en los modelos (checkfirst: solo los que faltan)
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine, checkfirst=True)
+                applied.append(f"index {index.name}")
+
+    return applied
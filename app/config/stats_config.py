@@ -0,0 +1,19 @@
+import os
+
+
+class StatsConfig:
+    """Configuración de la carga de estadísticas por partido (box scores)"""
+    # Registros por transacción: un INSERT masivo + la actualización de los agregados por temporada
+    STATS_INGEST_BATCH_SIZE: int = int(os.getenv("STATS_INGEST_BATCH_SIZE", "5000"))
+    # Errores de validación que se detallan en la respuesta (el resto solo se cuenta)
+    STATS_INGEST_MAX_ERRORS: int = int(os.getenv("STATS_INGEST_MAX_ERRORS", "50"))
+
+    @classmethod
+    def get_batch_size(cls) -> int:
+        return cls.STATS_INGEST_BATCH_SIZE
+
+    @classmethod
+    def get_max_errors(cls) -> int:
+        return cls.STATS_INGEST_MAX_ERRORS
+
+stats_config = StatsConfig()
@@ -0,0 +1,120 @@
+import os
+
+
+class WeatherConfig:
+    """Configuración de la actualización del clima en segundo plano (OpenWeatherMap)"""
+    # URL base de la API (se puede apuntar al servidor de prueba app/scripts/weather_stub_server.py)
+    OPENWEATHER_BASE_URL: str = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5").rstrip("/")
+    OPENWEATHER_API_KEY: str = os.getenv("OPENWEATHER_API_KEY", "3d4ed16bf828ee79b0b0fa9176dd9a12")
+    # Timeout de cada llamada HTTP a la API
+    WEATHER_TIMEOUT_SECONDS: float = float(os.getenv("WEATHER_TIMEOUT_SECONDS", "5"))
+    # Circuit breaker: fracción de fallos en la ventana que abre el circuito, tamaño de la
+    # ventana, llamadas mínimas para evaluar y segundos que permanece abierto
+    WEATHER_BREAKER_FAILURE_RATE: float = float(os.getenv("WEATHER_BREAKER_FAILURE_RATE", "0.5"))
+    WEATHER_BREAKER_WINDOW_SECONDS: float = float(os.getenv("WEATHER_BREAKER_WINDOW_SECONDS", "60"))
+    WEATHER_BREAKER_MIN_CALLS: int = int(os.getenv("WEATHER_BREAKER_MIN_CALLS", "5"))
+    WEATHER_BREAKER_OPEN_SECONDS: float = float(os.getenv("WEATHER_BREAKER_OPEN_SECONDS", "30"))
+    # Peticiones cubiertas (hedging): si la llamada no respondió en este tiempo se lanza
+    # una segunda idéntica y se usa la primera que responda. Duplica llamadas en la cola lenta.
+    WEATHER_HEDGE_ENABLED: bool = os.getenv("WEATHER_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+    WEATHER_HEDGE_DELAY_SECONDS: float = float(os.getenv("WEATHER_HEDGE_DELAY_SECONDS", "1.0"))
+    # Si está desactivado, el mapa consulta el clima en vivo dentro de cada petición
+    WEATHER_PREFETCH_ENABLED: bool = os.getenv("WEATHER_PREFETCH_ENABLED", "true").lower() in ("1", "true", "yes")
+    # Segundos entre actualizaciones del clima de cada equipo
+    WEATHER_REFRESH_SECONDS: float = float(os.getenv("WEATHER_REFRESH_SECONDS", "600"))
+    # Variación aleatoria del intervalo (fracción): reparte las llamadas en el tiempo
+    WEATHER_REFRESH_JITTER: float = float(os.getenv("WEATHER_REFRESH_JITTER", "0.1"))
+    # Presupuesto de llamadas a la API por minuto (el plan gratuito permite 60)
+    WEATHER_RATE_LIMIT_PER_MINUTE: float = float(os.getenv("WEATHER_RATE_LIMIT_PER_MINUTE", "30"))
+    # Espera inicial y máxima (segundos) tras errores o respuestas 429
+    WEATHER_BACKOFF_INITIAL_SECONDS: float = float(os.getenv("WEATHER_BACKOFF_INITIAL_SECONDS", "30"))
+    WEATHER_BACKOFF_MAX_SECONDS: float = float(os.getenv("WEATHER_BACKOFF_MAX_SECONDS", "1800"))
+    # Antigüedad (segundos) a partir de la cual el clima de un equipo se reporta como no fresco
+    WEATHER_MAX_AGE_SECONDS: float = float(os.getenv("WEATHER_MAX_AGE_SECONDS", "1800"))
+    # Histórico de clima: una fila por equipo y bucket, escrita por lotes
+    WEATHER_HISTORY_ENABLED: bool = os.getenv("WEATHER_HISTORY_ENABLED", "true").lower() in ("1", "true", "yes")
+    WEATHER_HISTORY_BUCKET_MINUTES: int = int(os.getenv("WEATHER_HISTORY_BUCKET_MINUTES", "60"))
+    # Días que se conservan las observaciones (las más antiguas se purgan)
+    WEATHER_HISTORY_RETENTION_DAYS: int = int(os.getenv("WEATHER_HISTORY_RETENTION_DAYS", "90"))
+    # Segundos entre escrituras del lote pendiente y tamaño que fuerza una escritura anticipada
+    WEATHER_HISTORY_FLUSH_SECONDS: float = float(os.getenv("WEATHER_HISTORY_FLUSH_SECONDS", "30"))
+    WEATHER_HISTORY_BATCH_SIZE: int = int(os.getenv("WEATHER_HISTORY_BATCH_SIZE", "200"))
+
+    @classmethod
+    def is_history_enabled(cls) -> bool:
+        return cls.WEATHER_HISTORY_ENABLED
+
+    @classmethod
+    def get_history_bucket_seconds(cls) -> int:
+        return cls.WEATHER_HISTORY_BUCKET_MINUTES * 60
+
+    @classmethod
+    def get_history_retention_days(cls) -> int:
+        return cls.WEATHER_HISTORY_RETENTION_DAYS
+
+    @classmethod
+    def get_history_flush_seconds(cls) -> float:
+        return cls.WEATHER_HISTORY_FLUSH_SECONDS
+
+    @classmethod
+    def get_history_batch_size(cls) -> int:
+        return cls.WEATHER_HISTORY_BATCH_SIZE
+
+    @classmethod
+    def get_base_url(cls) -> str:
+        return cls.OPENWEATHER_BASE_URL
+
+    @classmethod
+    def get_api_key(cls) -> str:
+        return cls.OPENWEATHER_API_KEY
+
+    @classmethod
+    def get_timeout_seconds(cls) -> float:
+        return cls.WEATHER_TIMEOUT_SECONDS
+
+    @classmethod
+    def get_breaker_settings(cls) -> dict:
+        return {
+            "failure_rate_threshold": cls.WEATHER_BREAKER_FAILURE_RATE,
+            "window_seconds": cls.WEATHER_BREAKER_WINDOW_SECONDS,
+            "min_calls": cls.WEATHER_BREAKER_MIN_CALLS,
+            "open_seconds": cls.WEATHER_BREAKER_OPEN_SECONDS,
+        }
+
+    @classmethod
+    def is_hedge_enabled(cls) -> bool:
+        return cls.WEATHER_HEDGE_ENABLED
+
+    @classmethod
+    def get_hedge_delay_seconds(cls) -> float:
+        return cls.WEATHER_HEDGE_DELAY_SECONDS
+
+    @classmethod
+    def is_prefetch_enabled(cls) -> bool:
+        return cls.WEATHER_PREFETCH_ENABLED
+
+    @classmethod
+    def get_refresh_seconds(cls) -> float:
+        return cls.WEATHER_REFRESH_SECONDS
+
+    @classmethod
+    def get_refresh_jitter(cls) -> float:
+        return cls.WEATHER_REFRESH_JITTER
+
+    @classmethod
+    def get_rate_limit_per_minute(cls) -> float:
+        return cls.WEATHER_RATE_LIMIT_PER_MINUTE
+
+    @classmethod
+    def get_backoff_initial_seconds(cls) -> float:
+        return cls.WEATHER_BACKOFF_INITIAL_SECONDS
+
+    @classmethod
+    def get_backoff_max_seconds(cls) -> float:
+        return cls.WEATHER_BACKOFF_MAX_SECONDS
+
+    @classmethod
+    def get_max_age_seconds(cls) -> float:
+        return cls.WEATHER_MAX_AGE_SECONDS
+
+weather_config = WeatherConfig()
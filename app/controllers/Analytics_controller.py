@@ -0,0 +1,98 @@
+"""
+Controlador de estadísticas agregadas de la plantilla NBA
+Conteos, medias y percentiles de altura, peso y edad por equipo, posición y conferencia
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Dict, List
+import logging
+
+from app.config.NBA_database import get_db
+from app.dependencies.permission_dependencies import can_read_players, is_admin
+from app.models.User_model import User
+from app.services.Analytics_service import AnalyticsService
+
+logger = logging.getLogger('nba_api.controllers.analytics')
+
+router = APIRouter(
+    prefix="/api/v1/analytics",
+    tags=["Analytics"],
+    responses={
+        401: {"description": "No autorizado - Token JWT requerido"},
+        403: {"description": "Prohibido"}
+    }
+)
+
+GROUP_BY_DESCRIPTION = "Agrupación: team, position, conference o all"
+
+
+def _bad_request(error: ValueError) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+
+
+@router.get(
+    "/players",
+    response_model=List[Dict],
+    summary="Estadísticas de la plantilla calculadas en vivo",
+    description="""
+    **Estadísticas por grupo calculadas en este momento con GROUP BY en la base de datos.**
+
+    - Por grupo: `players` y, para `height_m`, `weight_kg` y `age`: mean, std, min, p10, p25, median, p75, p90, max
+    - PostgreSQL calcula los percentiles con `percentile_cont`; en SQLite se calculan sobre los valores ordenados
+    - Para tableros conviene `/analytics/rollups`, que lee números precalculados
+    """
+)
+def get_live_stats(
+    group_by: str = Query("team", description=GROUP_BY_DESCRIPTION),
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """GET /analytics/players"""
+    try:
+        return AnalyticsService(db).get_live_stats(group_by)
+    except ValueError as ve:
+        raise _bad_request(ve)
+
+
+@router.get(
+    "/rollups",
+    response_model=List[Dict],
+    summary="Estadísticas de la plantilla precalculadas",
+    description="""
+    **Mismas estadísticas que `/analytics/players`, leídas de la tabla de rollups.**
+
+    - Conteos y sumas se actualizan en cada alta, cambio o baja de jugador; los percentiles de
+      los grupos afectados los recalcula una tarea de fondo y, mientras tanto, se calculan en vivo
+    - La lectura no escribe en la base
+    - La reconciliación periódica corrige cambios hechos fuera de la API y cambios de conferencia
+    """
+)
+def get_rollup_stats(
+    group_by: str = Query("team", description=GROUP_BY_DESCRIPTION),
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """GET /analytics/rollups"""
+    try:
+        return AnalyticsService(db).get_rollup_stats(group_by)
+    except ValueError as ve:
+        raise _bad_request(ve)
+
+
+@router.post(
+    "/rollups/rebuild",
+    summary="Reconstruir los rollups (solo admin)",
+    description="""
+    **Recalcula todos los rollups desde la tabla players.**
+
+    Útil después de cargas masivas por SQL o scripts.
+    """
+)
+def rebuild_rollups(
+    current_user: User = Depends(is_admin),
+    db: Session = Depends(get_db)
+):
+    """POST /analytics/rollups/rebuild"""
+    groups = AnalyticsService(db).rebuild_rollups()
+    logger.info(f"📊 ACCIÓN: Rollups reconstruidos por '{current_user.username}'")
+    return {"message": "Rollups reconstruidos", "groups": groups}
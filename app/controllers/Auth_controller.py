@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.config.NBA_database import get_db
 from app.services.Auth_service import AuthService
-from app.Schema.Auth_Schema import LoginRequest, RegisterRequest, TokenResponse, UserProfile
-from app.dependencies.auth_dependencies import get_current_user
+from typing import Any, Dict, Optional
+from app.Schema.Auth_Schema import LoginRequest, LogoutRequest, RegisterRequest, RefreshRequest, TokenResponse, UserProfile
+from app.dependencies.auth_dependencies import get_current_user, get_token_claims
+from app.dependencies.rate_limit_dependencies import enforce_login_rate_limit, login_throttle
 from app.models.User_model import User
+from app.utils.jwt_utils import jwt_manager
 import logging
 
 logger = logging.getLogger('nba_api.controllers.auth')
@@ -21,16 +24,25 @@ router = APIRouter(
     }
 )
 
-@router.post("/login", response_model=TokenResponse)
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    responses={429: {"description": "Demasiados intentos de inicio de sesión"}}
+)
 def login(
     login_data: LoginRequest,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     POST /auth/login
     Autentica un usuario y genera un token JWT.
     Equivalente al endpoint /login del repositorio de referencia.
+    Los intentos excedidos por IP o usuario reciben 429 sin verificar la contraseña.
     """
+    # Limitador antes de cualquier hash de contraseña
+    client_ip = enforce_login_rate_limit(request, login_data.username)
+    
     try:
         service = AuthService(db)
         
@@ -38,14 +50,17 @@ def login(
         user = service.authenticate_user(login_data.username, login_data.password)
         
         if not user:
+            login_throttle.record_failure(client_ip, login_data.username)
             logger.warning(f"Intento de login fallido para: {login_data.username}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Credenciales incorrectas"
             )
         
-        # Crear token JWT
-        token_response = service.create_access_token(user)
+        login_throttle.record_success(user.username)
+        
+        # Crear token JWT y refresh token (nueva sesión)
+        token_response = service.create_session_tokens(user)
         
         # Log detallado del login exitoso
         logger.info(f"🔐 ACCIÓN: El usuario '{user.username}' (ID: {user.id}) ha iniciado sesión exitosamente")
@@ -66,6 +81,64 @@ def login(
             detail="Error interno del servidor"
         )
 
+@router.post("/refresh", response_model=TokenResponse)
+def refresh(
+    refresh_data: RefreshRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    POST /auth/refresh
+    Renueva la sesión con un refresh token sin volver a enviar la contraseña.
+    El refresh token es de un solo uso: la respuesta incluye uno nuevo.
+    Reutilizar un token ya usado revoca toda la sesión.
+    """
+    try:
+        service = AuthService(db)
+        token_response = service.refresh_session(refresh_data.refresh_token)
+        
+        if not token_response:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token inválido, vencido o revocado",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        return token_response
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error al renovar sesión: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+@router.post("/logout", response_model=dict)
+def logout(
+    logout_data: Optional[LogoutRequest] = None,
+    claims: Dict[str, Any] = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+):
+    """
+    POST /auth/logout
+    Cierra la sesión: el access token queda revocado de inmediato y,
+    si se envía, también el refresh token (y toda su sesión).
+    """
+    try:
+        service = AuthService(db)
+        service.logout(claims, refresh_token=logout_data.refresh_token if logout_data else None)
+        
+        logger.info(f"🚪 ACCIÓN: El usuario '{claims.get('sub')}' cerró sesión")
+        return {"message": "Sesión cerrada exitosamente"}
+        
+    except Exception as e:
+        logger.error(f"Error al cerrar sesión: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
 @router.post("/register", response_model=dict)
 def register(
     register_data: RegisterRequest,
@@ -136,17 +209,27 @@ def get_profile(
             detail="Error interno del servidor"
         )
 
-@router.post("/login-test", response_model=TokenResponse)
+@router.post(
+    "/login-test",
+    response_model=TokenResponse,
+    responses={429: {"description": "Demasiados intentos de inicio de sesión"}}
+)
 def login_test(
     login_data: LoginRequest,
-    expires_in_seconds: int = 10,  # Por defecto 10 segundos para pruebas rápidas
+    request: Request,
+    # Por defecto 10 segundos para pruebas rápidas. Nunca más que un access token normal:
+    # la revocación por usuario solo dura ese tiempo y un token más largo la sobreviviría
+    expires_in_seconds: int = Query(10, ge=1, le=jwt_manager.get_token_expires_seconds()),
     db: Session = Depends(get_db)
 ):
     """
     POST /auth/login-test
     Endpoint de prueba para generar tokens con expiración personalizada.
     ¡SOLO PARA DESARROLLO/PRUEBAS!
+    Comparte el limitador de intentos con /auth/login.
     """
+    client_ip = enforce_login_rate_limit(request, login_data.username)
+    
     try:
         service = AuthService(db)
         
@@ -154,12 +237,15 @@ def login_test(
         user = service.authenticate_user(login_data.username, login_data.password)
         
         if not user:
+            login_throttle.record_failure(client_ip, login_data.username)
             logger.warning(f"Intento de login de prueba fallido para: {login_data.username}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Credenciales incorrectas"
             )
         
+        login_throttle.record_success(user.username)
+        
         # Crear token JWT con expiración personalizada
         token_response = service.create_access_token_custom(user, expires_in_seconds)
         
@@ -0,0 +1,93 @@
+"""
+Controlador del canal de eventos en tiempo real
+Envía por Server-Sent Events los cambios de jugadores y del clima del mapa
+"""
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+import logging
+
+from app.config.NBA_database import get_db
+from app.dependencies.auth_dependencies import get_token_claims_from_query
+from app.dependencies.permission_dependencies import can_read_players_from_query, still_can_read_players
+from app.models.User_model import User
+from app.services.Events_service import event_broadcaster, event_stream
+from app.utils.broadcaster import BroadcasterFullError
+
+logger = logging.getLogger('nba_api.controllers.events')
+
+router = APIRouter(
+    prefix="/api/v1/events",
+    tags=["Events"],
+    responses={
+        401: {"description": "No autorizado - Token JWT requerido"},
+        403: {"description": "Prohibido"}
+    }
+)
+
+
+@router.get(
+    "/stream",
+    summary="Eventos en tiempo real (SSE)",
+    description="""
+    **Conexión `text/event-stream` con los cambios de jugadores y del clima.**
+    
+    ### Eventos:
+    - `player.created` / `player.updated`: `{id, name, team, position}`
+    - `player.deleted`: `{id}`
+    - `weather.updated`: `{teams: {equipo: {temperature, description, icon}}}`, solo los equipos que cambiaron
+    - `resync`: se perdieron eventos; el cliente debe recargar sus datos
+    - `token-expired`: venció o se revocó el access token (o se perdió el permiso); reconectar con uno nuevo
+    
+    ### Conexión:
+    - El access token va en `?token=` porque `EventSource` no permite enviar headers
+    - Al reconectar, el navegador envía `Last-Event-ID` y se reenvían los eventos perdidos
+    - Comentario keep-alive cada `EVENTS_HEARTBEAT_SECONDS`; con la misma frecuencia se vuelve a
+      verificar que el token no esté revocado y conserve el permiso de lectura
+    - La conexión dura como máximo la vida de un access token normal
+    - Requiere permiso de lectura de jugadores (can_read_players)
+    """,
+    responses={
+        200: {"content": {"text/event-stream": {}}},
+        503: {"description": "Máximo de conexiones del worker alcanzado"}
+    }
+)
+async def stream_events(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(can_read_players_from_query),
+    claims: Dict[str, Any] = Depends(get_token_claims_from_query),
+    db: Session = Depends(get_db)
+):
+    """
+    GET /events/stream
+    
+    Abre el stream de eventos del usuario autenticado.
+    """
+    # La conexión dura horas: la sesión de base de datos se libera antes de empezar
+    db.close()
+    
+    # Solo se verifica el cupo: la suscripción la abre (y la cierra) el stream
+    try:
+        event_broadcaster.check_capacity()
+    except BroadcasterFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "30"}
+        )
+    
+    logger.info(f"📡 El usuario '{current_user.username}' (ID: {current_user.id}) abrió el stream de eventos")
+    
+    return StreamingResponse(
+        event_stream(
+            last_event_id,
+            float(claims["exp"]),
+            lambda: still_can_read_players(claims, current_user),
+        ),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Sin buffer en proxies nginx
+        }
+    )
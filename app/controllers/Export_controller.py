@@ -0,0 +1,68 @@
+"""
+Controlador de exportaciones columnares
+Descarga de jugadores y equipos en Apache Arrow IPC (stream) o Parquet
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+import logging
+
+from app.config.NBA_database import get_db
+from app.dependencies.permission_dependencies import can_read_players
+from app.models.User_model import User
+from app.services.Export_service import stream_export, validate_export
+
+logger = logging.getLogger('nba_api.controllers.export')
+
+router = APIRouter(
+    prefix="/api/v1/export",
+    tags=["Export"],
+    responses={
+        401: {"description": "No autorizado - Token JWT requerido"},
+        403: {"description": "Prohibido"}
+    }
+)
+
+
+@router.get(
+    "/{table}",
+    summary="Exportar jugadores o equipos (Arrow / Parquet)",
+    description="""
+    **Descarga la tabla completa (`players` o `teams`) en formato columnar.**
+    
+    - `format=arrow`: Apache Arrow IPC en formato stream (`.arrows`), `pyarrow.ipc.open_stream`
+    - `format=parquet`: Parquet comprimido (`EXPORT_PARQUET_COMPRESSION`, zstd por defecto)
+    - Esquema tipado: altura y peso `float32`, nacimiento `date32`, equipo, posición,
+      conferencia y división como diccionario
+    - Se lee por lotes con cursor del lado del servidor y se envía mientras se genera
+    - Requiere permiso de lectura de jugadores (can_read_players)
+    """,
+    responses={
+        200: {"content": {"application/vnd.apache.arrow.stream": {}, "application/vnd.apache.parquet": {}}},
+        400: {"description": "Tabla o formato no soportado"}
+    }
+)
+def export_table(
+    table: str,
+    format: str = Query("parquet", description="arrow o parquet"),
+    batch_size: Optional[int] = Query(None, ge=1000, le=1000000, description="Filas por lote (por defecto EXPORT_BATCH_SIZE)"),
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """GET /export/{table}"""
+    # La exportación abre su propia sesión mientras se envía la respuesta
+    db.close()
+
+    try:
+        media_type, filename = validate_export(table, format)
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
+
+    logger.info(f"📦 El usuario '{current_user.username}' (ID: {current_user.id}) exporta {filename}")
+
+    return StreamingResponse(
+        stream_export(table, format, batch_size),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
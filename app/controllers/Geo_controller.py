@@ -0,0 +1,125 @@
+"""
+Controlador de consultas geográficas entre estadios NBA
+Proximidad a un punto, equipos dentro de un radio, matriz de distancias y giras
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+from typing import Dict, List
+import logging
+
+from app.config.NBA_database import get_db
+from app.dependencies.permission_dependencies import can_read_players
+from app.models.User_model import User
+from app.Schema.Team_Schema import RoadTripRequest, RoadTripResponse
+from app.services.TeamGeo_service import TeamGeoService
+from app.utils.http_cache import build_weak_etag, is_not_modified, not_modified_response, set_cache_headers
+
+logger = logging.getLogger('nba_api.controllers.geo')
+
+router = APIRouter(
+    prefix="/api/v1/geo",
+    tags=["NBA Geo"],
+    responses={
+        401: {"description": "No autorizado - Token JWT requerido"},
+        403: {"description": "Prohibido"}
+    }
+)
+
+
+@router.get(
+    "/nearest",
+    response_model=List[Dict],
+    summary="Estadios más cercanos a un punto",
+    description="""
+    **Retorna los N estadios más cercanos a unas coordenadas, ordenados por distancia.**
+    
+    - Distancia de círculo máximo (haversine) en km
+    - Se calcula en memoria sobre todos los estadios a la vez (NumPy); los resultados quedan en caché
+      hasta que cambian los equipos
+    """
+)
+def get_nearest_teams(
+    lat: float = Query(..., ge=-90, le=90, description="Latitud del punto"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitud del punto"),
+    limit: int = Query(5, ge=1, le=100, description="Cantidad de estadios"),
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """GET /geo/nearest"""
+    return TeamGeoService(db).get_nearest_teams(lat, lon, limit)
+
+
+@router.get(
+    "/within",
+    response_model=List[Dict],
+    summary="Estadios dentro de un radio",
+    description="""
+    **Retorna los estadios a una distancia menor o igual a `radius_km` del punto, ordenados por distancia.**
+    """
+)
+def get_teams_within(
+    lat: float = Query(..., ge=-90, le=90, description="Latitud del punto"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitud del punto"),
+    radius_km: float = Query(..., gt=0, le=20040, description="Radio en km"),
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """GET /geo/within"""
+    return TeamGeoService(db).get_teams_within(lat, lon, radius_km)
+
+
+@router.get(
+    "/distance-matrix",
+    summary="Matriz de distancias entre todos los estadios",
+    description="""
+    **Matriz N×N de distancias en km entre todos los estadios.**
+    
+    - `teams[i]` corresponde a la fila y columna `i` de `distances_km`
+    - La respuesta se serializa una vez por versión de los equipos y se reutiliza
+    - Incluye `ETag`: con `If-None-Match` vigente responde `304 Not Modified`
+    """
+)
+def get_distance_matrix(
+    request: Request,
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """GET /geo/distance-matrix"""
+    service = TeamGeoService(db)
+    etag = build_weak_etag("distance-matrix", service.get_version())
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    response = Response(content=service.get_distance_matrix_payload(), media_type="application/json")
+    set_cache_headers(response, etag)
+    return response
+
+
+@router.post(
+    "/road-trip",
+    response_model=RoadTripResponse,
+    summary="Planificar una gira entre estadios",
+    description="""
+    **Retorna un orden de visita corto para una gira de visitante.**
+    
+    - Parte del estadio `start_team_id` y visita cada equipo de `team_ids` una vez
+    - Recorrido inicial por vecino más cercano, mejorado con 2-opt sobre la matriz de distancias en memoria
+    - La optimización se corta a los `time_limit_ms`; `converged=false` indica que se agotó el tiempo
+    - Con `return_to_start` la gira termina en el estadio de salida
+    """
+)
+def plan_road_trip(
+    trip: RoadTripRequest,
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """POST /geo/road-trip"""
+    try:
+        return TeamGeoService(db).plan_road_trip(
+            trip.start_team_id, trip.team_ids, trip.return_to_start, trip.time_limit_ms
+        )
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(ve)
+        )
@@ -2,9 +2,10 @@
 Controlador para el mapa interactivo de equipos NBA
 Proporciona endpoints para obtener las ubicaciones geográficas de los equipos NBA
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta, timezone
 import logging
 
 from app.config.NBA_database import get_db
@@ -12,6 +13,9 @@ from app.dependencies.auth_dependencies import get_current_user
 from app.dependencies.permission_dependencies import can_read_players
 from app.models.User_model import User
 from app.services.NBA_Map_service import NBAMapService
+from app.services.WeatherHistory_service import WeatherHistoryService
+from app.utils.http_cache import build_weak_etag, is_not_modified, not_modified_response, set_cache_headers
+from app.utils.fast_serialization import fast_json_response
 
 logger = logging.getLogger('nba_api.controllers.nba_map')
 
@@ -38,7 +42,7 @@ router = APIRouter(
     - Agrupa jugadores por equipo
     - Devuelve coordenadas (latitud, longitud) de cada ciudad
     - Incluye contador de jugadores por equipo
-    - **NUEVO**: Información del clima en tiempo real (OpenWeatherMap API)
+    - **NUEVO**: Información del clima (OpenWeatherMap API), actualizada en segundo plano
     - Solo equipos con jugadores registrados
     
     ### Respuesta:
@@ -46,6 +50,17 @@ router = APIRouter(
     - Datos meteorológicos de cada ciudad
     - Útil para visualización en mapas interactivos
     
+    ### Clima:
+    - Se lee de un caché que una tarea de fondo actualiza periódicamente: la petición nunca espera a la API externa
+    - El campo `weather.timestamp` indica cuándo se obtuvo; ver `/weather-status` para la frescura por equipo
+    
+    ### Coalescencia:
+    - Peticiones simultáneas idénticas comparten una sola consulta a la BD y al clima
+    
+    ### Peticiones condicionales:
+    - Incluye `ETag` calculado a partir del snapshot en memoria (equipos y jugadores) y la versión del caché de clima
+    - Con `If-None-Match` vigente responde `304 Not Modified` sin construir la respuesta
+    
     ### Seguridad:
     - Requiere autenticación JWT
     - Permiso de lectura de jugadores (can_read_players)
@@ -78,6 +93,7 @@ router = APIRouter(
     }
 )
 async def get_teams_locations(
+    request: Request,
     current_user: User = Depends(can_read_players),  # ← Requiere permiso de lectura
     db: Session = Depends(get_db)
 ):
@@ -100,8 +116,14 @@ async def get_teams_locations(
         # Crear instancia del servicio
         service = NBAMapService(db)
         
-        # Obtener ubicaciones de equipos CON CLIMA (ahora es async)
-        locations = await service.get_teams_locations()
+        # Si el cliente ya tiene la versión actual no se consulta nada más
+        etag = build_weak_etag("teams-locations", await service.get_locations_version())
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        
+        # Obtener ubicaciones de equipos CON CLIMA. Las peticiones simultáneas con la
+        # misma versión comparten una sola ejecución (consulta + llamadas al clima)
+        locations = await service.get_teams_locations_coalesced("can_read_players", etag)
         
         # Log de auditoría
         logger.info(
@@ -109,7 +131,10 @@ async def get_teams_locations(
             f"consultó las ubicaciones de equipos NBA con clima - Total equipos: {len(locations)}"
         )
         
-        return locations
+        # Los diccionarios ya están construidos por el servicio: se serializan directo con orjson
+        json_response = fast_json_response(locations)
+        set_cache_headers(json_response, etag)
+        return json_response
         
     except Exception as e:
         logger.error(f"Error al obtener ubicaciones de equipos: {str(e)}")
@@ -120,6 +145,104 @@ async def get_teams_locations(
         )
 
 
+@router.get(
+    "/teams.geojson",
+    summary="Equipos NBA como GeoJSON",
+    description="""
+    **FeatureCollection con un punto por equipo, pensado para dibujar el mapa.**
+    
+    ### Características:
+    - `geometry`: punto `[longitud, latitud]` del estadio; `id`: ID del equipo
+    - `properties` livianas: equipo, ciudad, cantidad de jugadores, temperatura e ícono del clima
+    - El contenido del popup (estadio, jugadores, clima completo) se pide al abrirlo con `/team-details/{team_name}`
+    - El cuerpo se serializa una vez por versión de datos y se reutiliza
+    
+    ### Peticiones condicionales:
+    - Mismo esquema de `ETag` que `/teams-locations`; con `If-None-Match` vigente responde `304 Not Modified`
+    
+    ### Seguridad:
+    - Requiere autenticación JWT
+    - Permiso de lectura de jugadores (can_read_players)
+    """,
+    responses={200: {"content": {"application/geo+json": {}}}}
+)
+async def get_teams_geojson(
+    request: Request,
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """
+    GET /nba-map/teams.geojson
+    
+    Retorna las ubicaciones de los equipos como FeatureCollection GeoJSON.
+    """
+    try:
+        service = NBAMapService(db)
+        
+        etag = build_weak_etag("teams-geojson", await service.get_locations_version())
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        
+        payload = await service.get_teams_geojson_coalesced("can_read_players", etag)
+        
+        response = Response(content=payload, media_type="application/geo+json")
+        set_cache_headers(response, etag)
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error al obtener GeoJSON de equipos: {str(e)}")
+        logger.exception(e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
+@router.get(
+    "/team-details/{team_name}",
+    response_model=Dict,
+    summary="Contenido del popup de un equipo",
+    description="""
+    **Detalle de un equipo para el popup del mapa, pedido al abrirlo.**
+    
+    ### Respuesta:
+    - Ciudad, estado, estadio, conferencia y división
+    - Nombres de los jugadores y cantidad
+    - Clima completo (el mismo caché que `/teams-locations`)
+    
+    Se sirve desde el snapshot en memoria. Soporta `If-None-Match` (ETag).
+    """,
+    responses={404: {"description": "Equipo no encontrado"}}
+)
+async def get_team_details(
+    team_name: str,
+    request: Request,
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """
+    GET /nba-map/team-details/{team_name}
+    
+    Retorna el contenido del popup de un equipo.
+    """
+    service = NBAMapService(db)
+    
+    etag = build_weak_etag("team-details", team_name, await service.get_locations_version())
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    details = await service.get_team_details(team_name)
+    if details is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Equipo '{team_name}' no encontrado"
+        )
+    
+    response = fast_json_response(details)
+    set_cache_headers(response, etag)
+    return response
+
+
 @router.get(
     "/team-info/{team_name}",
     response_model=Dict,
@@ -135,6 +258,8 @@ async def get_teams_locations(
     - Ubicación geográfica
     - Lista de jugadores
     - Estadísticas del equipo
+    
+    Soporta `If-None-Match` (ETag): responde `304 Not Modified` si el equipo y sus jugadores no cambiaron.
     """,
     responses={
         200: {
@@ -147,6 +272,8 @@ async def get_teams_locations(
 )
 def get_team_info(
     team_name: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(can_read_players),
     db: Session = Depends(get_db)
 ):
@@ -169,8 +296,15 @@ def get_team_info(
     try:
         service = NBAMapService(db)
         
+        # Versión del equipo y sus jugadores (sin cargar las filas)
+        version = service.get_team_info_version(team_name)
+        if version is not None:
+            etag = build_weak_etag("team-info", team_name, version)
+            if is_not_modified(request, etag):
+                return not_modified_response(etag)
+        
         # Obtener información del equipo
-        team_info = service.get_team_info(team_name)
+        team_info = service.get_team_info(team_name) if version is not None else None
         
         if not team_info:
             raise HTTPException(
@@ -178,6 +312,8 @@ def get_team_info(
                 detail=f"Equipo '{team_name}' no encontrado"
             )
         
+        set_cache_headers(response, etag)
+        
         # Log de auditoría
         logger.info(
             f"📊 ACCIÓN: El usuario '{current_user.username}' (ID: {current_user.id}) "
@@ -194,3 +330,113 @@ def get_team_info(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error interno del servidor"
         )
+
+
+@router.get(
+    "/weather-status",
+    response_model=Dict,
+    summary="Frescura del clima por equipo",
+    description="""
+    **Estado de la actualización del clima en segundo plano.**
+    
+    ### Respuesta:
+    - Por equipo: antigüedad del clima, si está fresco, próximo intento y errores consecutivos
+    - Global: llamadas y errores de la API, pausa activa por límite de tasa (429)
+    
+    ### Seguridad:
+    - Requiere autenticación JWT
+    - Permiso de lectura de jugadores (can_read_players)
+    """
+)
+def get_weather_status(
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """
+    GET /nba-map/weather-status
+    
+    Retorna la frescura del clima en caché de cada equipo.
+    """
+    return NBAMapService(db).get_weather_status()
+
+
+@router.get(
+    "/weather-history/latest",
+    response_model=List[Dict],
+    summary="Último clima guardado de cada equipo",
+    description="""
+    **Última observación del histórico de clima de cada equipo.**
+    
+    Se sirve solo desde la base de datos local (tabla `weather_history`), sin llamar a OpenWeatherMap.
+    
+    ### Seguridad:
+    - Requiere autenticación JWT
+    - Permiso de lectura de jugadores (can_read_players)
+    """
+)
+def get_latest_weather_history(
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """
+    GET /nba-map/weather-history/latest
+    
+    Retorna la observación más reciente guardada para cada equipo.
+    """
+    return WeatherHistoryService(db).get_latest()
+
+
+@router.get(
+    "/weather-history/{team_name}",
+    response_model=Dict,
+    summary="Histórico de clima de un equipo",
+    description="""
+    **Observaciones de clima de un equipo en un rango de fechas.**
+    
+    ### Parámetros:
+    - **team_name**: Nombre del equipo (ej: "Los Angeles Lakers")
+    - **start** / **end**: Rango en ISO 8601 (por defecto, los últimos 7 días)
+    
+    ### Respuesta:
+    - Una observación por bucket de tiempo (la última registrada en ese intervalo)
+    - Se sirve solo desde la base de datos local, sin llamar a OpenWeatherMap
+    
+    ### Seguridad:
+    - Requiere autenticación JWT
+    - Permiso de lectura de jugadores (can_read_players)
+    """,
+    responses={
+        400: {"description": "Rango de fechas inválido"},
+        404: {"description": "Equipo no encontrado"}
+    }
+)
+def get_team_weather_history(
+    team_name: str,
+    start: Optional[datetime] = Query(None, description="Inicio del rango (ISO 8601)"),
+    end: Optional[datetime] = Query(None, description="Fin del rango (ISO 8601)"),
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """
+    GET /nba-map/weather-history/{team_name}
+    
+    Retorna el histórico de clima de un equipo entre dos fechas.
+    """
+    # Fechas sin zona horaria se interpretan como UTC
+    end = end or datetime.now(timezone.utc)
+    end = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+    start = start or end - timedelta(days=7)
+    start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="La fecha de inicio debe ser anterior a la de fin"
+        )
+    
+    history = WeatherHistoryService(db).get_team_history(team_name, start, end)
+    if history is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Equipo '{team_name}' no encontrado"
+        )
+    return history
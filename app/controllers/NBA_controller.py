@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Literal
 from datetime import date
 
 from app.config.NBA_database import get_db
-from app.services.NBA_service import PlayerService
+from app.services.NBA_service import NAME_SEARCH_MIN_LENGTH, PlayerService
 from app.Schema.NBA_Schema import (
     PlayerCreate, 
     PlayerUpdate, 
     PlayerResponse, 
+    PlayerSearchResult,
     MessageResponse, 
     ErrorResponse
 )
@@ -21,6 +22,8 @@ from app.dependencies.permission_dependencies import (
     can_delete_players
 )
 from app.models.User_model import User
+from app.utils.http_cache import build_weak_etag, is_not_modified, not_modified_response, set_cache_headers
+from app.utils.fast_serialization import fast_json_response
 import logging
 
 logger = logging.getLogger('nba_api.controllers.nba')
@@ -51,6 +54,19 @@ router = APIRouter(
     ### Parámetros de consulta:
     - **skip**: Número de registros a omitir (para paginación)
     - **limit**: Máximo número de registros a retornar (1-100)
+    - **team** / **position**: Filtros exactos por equipo y posición
+    - **min_height** / **max_height**: Rango de altura en metros
+    - **min_weight** / **max_weight**: Rango de peso en kilogramos
+    - **born_after** / **born_before**: Rango de fecha de nacimiento (YYYY-MM-DD)
+    - **sort_by**: Campo de ordenamiento (id, name, team, position, height_m, weight_kg, birth_date, created_at)
+    - **order**: Dirección del ordenamiento (asc, desc)
+    
+    Los filtros y el ordenamiento se resuelven en la base de datos usando índices,
+    por lo que solo se transfieren las filas solicitadas.
+    
+    ### Peticiones condicionales:
+    La respuesta incluye un `ETag` débil. Si el cliente lo reenvía en `If-None-Match`
+    y el listado no cambió, se responde `304 Not Modified` sin cuerpo.
     
     ### Casos de uso:
     - Mostrar todos los jugadores en una interfaz
@@ -80,6 +96,7 @@ router = APIRouter(
     }
 )
 def get_players(
+    request: Request,
     current_user: User = Depends(can_read_players),  # ← Requiere permiso de lectura
     skip: int = Query(
         0, 
@@ -94,6 +111,18 @@ def get_players(
         description="Máximo número de jugadores a retornar (limitado a 100)",
         example=10
     ),
+    team: Optional[str] = Query(None, max_length=50, description="Filtrar por equipo exacto"),
+    position: Optional[str] = Query(None, max_length=20, description="Filtrar por posición exacta"),
+    min_height: Optional[float] = Query(None, ge=1.0, le=3.0, description="Altura mínima en metros"),
+    max_height: Optional[float] = Query(None, ge=1.0, le=3.0, description="Altura máxima en metros"),
+    min_weight: Optional[float] = Query(None, ge=50.0, le=200.0, description="Peso mínimo en kilogramos"),
+    max_weight: Optional[float] = Query(None, ge=50.0, le=200.0, description="Peso máximo en kilogramos"),
+    born_after: Optional[date] = Query(None, description="Nacidos en esta fecha o después (YYYY-MM-DD)"),
+    born_before: Optional[date] = Query(None, description="Nacidos en esta fecha o antes (YYYY-MM-DD)"),
+    sort_by: Literal["id", "name", "team", "position", "height_m", "weight_kg", "birth_date", "created_at"] = Query(
+        "id", description="Campo por el cual ordenar"
+    ),
+    order: Literal["asc", "desc"] = Query("asc", description="Dirección del ordenamiento"),
     db: Session = Depends(get_db)
 ):
     """
@@ -104,13 +133,44 @@ def get_players(
     """
     try:
         service = PlayerService(db)
-        players = service.listar_jugadores(skip=skip, limit=limit)
+        filters = {
+            "team": team,
+            "position": position,
+            "min_height": min_height,
+            "max_height": max_height,
+            "min_weight": min_weight,
+            "max_weight": max_weight,
+            "born_after": born_after,
+            "born_before": born_before,
+        }
+        
+        # ETag a partir de la versión del listado filtrado (sin cargar las filas)
+        version = service.obtener_version_listado(**filters)
+        etag = build_weak_etag("players", skip, limit, sort_by, order, sorted(filters.items()), version)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        
+        # Camino rápido: filas livianas serializadas con orjson, sin segunda pasada de Pydantic
+        players = service.listar_jugadores_serializados(
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            order=order,
+            **filters
+        )
+        json_response = fast_json_response(players)
+        set_cache_headers(json_response, etag)
         
         # Log detallado con información del usuario
         logger.info(f"🏀 ACCIÓN: El usuario '{current_user.username}' (ID: {current_user.id}) generó el listado completo de jugadores (skip={skip}, limit={limit}) - Total encontrados: {len(players)}")
         
-        return players
+        return json_response
         
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(ve)
+        )
     except Exception as e:
         logger.error(f"Error al listar jugadores: {str(e)}")
         raise HTTPException(
@@ -119,6 +179,77 @@ def get_players(
         )
 
 
+# -------------------------------
+# GET /players/search → Buscar jugadores por nombre (PROTEGIDO)
+# -------------------------------
+@router.get(
+    "/search",
+    response_model=list[PlayerSearchResult],
+    summary="Buscar jugadores por nombre",
+    description="""
+    **Busca jugadores por nombre para autocompletado.**
+    
+    ### Parámetros de consulta:
+    - **q**: Texto a buscar (mínimo 3 caracteres)
+    - **limit**: Máximo número de resultados (1-25)
+    
+    ### Ranking:
+    1. Nombres que empiezan por el texto buscado
+    2. Nombres con una palabra que empieza por el texto buscado
+    3. Coincidencias aproximadas (tolerantes a errores de escritura en PostgreSQL)
+    
+    La búsqueda usa un índice GIN `pg_trgm` en PostgreSQL y una tabla FTS5 en SQLite.
+    """,
+    responses={
+        200: {
+            "description": "Resultados de la búsqueda",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "id": 1,
+                            "name": "LeBron James",
+                            "team": "Los Angeles Lakers",
+                            "position": "Small Forward"
+                        }
+                    ]
+                }
+            }
+        }
+    }
+)
+def search_players(
+    current_user: User = Depends(can_read_players),  # ← Requiere permiso de lectura
+    q: str = Query(..., min_length=NAME_SEARCH_MIN_LENGTH, max_length=100, description="Texto a buscar en el nombre", example="lebron"),
+    limit: int = Query(10, ge=1, le=25, description="Máximo número de resultados (limitado a 25)"),
+    db: Session = Depends(get_db)
+):
+    """
+    GET /players/search
+    Busca jugadores por nombre (USUARIOS CON PERMISO DE LECTURA)
+    Requiere token JWT válido y permiso can_read_players.
+    """
+    try:
+        service = PlayerService(db)
+        results = service.buscar_jugadores(q, limit=limit)
+        
+        logger.info(f"🔍 ACCIÓN: El usuario '{current_user.username}' (ID: {current_user.id}) buscó jugadores con '{q}' - Resultados: {len(results)}")
+        
+        return fast_json_response(results)
+        
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(ve)
+        )
+    except Exception as e:
+        logger.error(f"Error al buscar jugadores: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
 # -------------------------------
 # GET /players/{player_id} → Obtener jugador por ID
 # -------------------------------
@@ -136,6 +267,10 @@ def get_players(
     - Mostrar perfil detallado de un jugador
     - Verificar existencia de un jugador
     - Obtener datos para edición
+    
+    ### Peticiones condicionales:
+    Soporta `If-None-Match` (ETag) e `If-Modified-Since` (Last-Modified).
+    Si el jugador no cambió se responde `304 Not Modified` sin leer la fila completa.
     """,
     responses={
         200: {
@@ -167,6 +302,8 @@ def get_players(
 )
 def get_player(
     player_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(can_read_players),  # ← Requiere permiso de lectura
     db: Session = Depends(get_db)
 ):
@@ -177,7 +314,15 @@ def get_player(
     """
     try:
         service = PlayerService(db)
-        player = service.obtener_jugador(player_id)
+        
+        # Validar la versión del jugador antes de cargar la fila completa
+        updated_at = service.obtener_version_jugador(player_id)
+        player = None
+        if updated_at is not None:
+            etag = build_weak_etag("player", player_id, updated_at)
+            if is_not_modified(request, etag, updated_at):
+                return not_modified_response(etag, updated_at)
+            player = service.obtener_jugador(player_id)
         
         if not player:
             logger.warning(f"❌ El usuario '{current_user.username}' (ID: {current_user.id}) intentó acceder al jugador ID: {player_id} que no existe")
@@ -186,6 +331,9 @@ def get_player(
                 detail=f"Jugador con ID {player_id} no encontrado"
             )
         
+        # Validadores a partir de la fila leída (por si cambió entre ambas consultas)
+        set_cache_headers(response, build_weak_etag("player", player_id, player.updated_at), player.updated_at)
+        
         # Log detallado con información del usuario
         logger.info(f"🔍 ACCIÓN: El usuario '{current_user.username}' (ID: {current_user.id}) consultó los detalles del jugador '{player.name}' (ID: {player_id})")
         
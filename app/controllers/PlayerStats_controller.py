@@ -0,0 +1,145 @@
+"""
+Controlador de estadísticas de jugadores por partido
+Carga masiva de box scores (NDJSON/CSV), partidos y promedios por temporada
+"""
+import codecs
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.config.NBA_database import get_db
+from app.dependencies.permission_dependencies import can_create_players, can_read_players
+from app.models.User_model import User
+from app.Schema.PlayerStats_Schema import GameStatsResponse, IngestResponse, SeasonAveragesResponse
+from app.services.PlayerStats_service import BoxScoreIngestor, PlayerStatsService
+from app.utils.box_scores import BOX_SCORE_FORMATS
+
+logger = logging.getLogger('nba_api.controllers.player_stats')
+
+router = APIRouter(
+    prefix="/api/v1/stats",
+    tags=["Player Stats"],
+    responses={
+        401: {"description": "No autorizado - Token JWT requerido"},
+        403: {"description": "Prohibido"}
+    }
+)
+
+# Content-Type → formato cuando no se indica ?format=
+_CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json": "ndjson",
+}
+
+# Líneas que se acumulan antes de procesarlas en el threadpool
+_LINES_PER_CHUNK = 2000
+
+
+def _resolve_format(fmt: Optional[str], content_type: str) -> str:
+    if fmt is None:
+        fmt = _CONTENT_TYPE_FORMATS.get(content_type.split(";")[0].strip().lower())
+    if fmt not in BOX_SCORE_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Formato no soportado. Usar ?format= ({', '.join(BOX_SCORE_FORMATS)}) o Content-Type text/csv / application/x-ndjson"
+        )
+    return fmt
+
+
+@router.post(
+    "/games/ingest",
+    response_model=IngestResponse,
+    summary="Cargar box scores (NDJSON o CSV)",
+    description="""
+    **Carga estadísticas por partido enviadas en el cuerpo de la petición.**
+
+    - Formato por `?format=ndjson|csv` o por `Content-Type` (`application/x-ndjson`, `text/csv`)
+    - Campos: `player_id`, `game_id`, `game_date` (obligatorios), `season`, `team`, `opponent`,
+      `minutes` (`"34:12"` o decimal), `points`, `rebounds`, `assists`, `steals`, `blocks`, `turnovers`,
+      `fgm`, `fga`, `fg3m`, `fg3a`, `ftm`, `fta`
+    - El cuerpo se lee en streaming y se escribe por lotes (`STATS_INGEST_BATCH_SIZE`)
+    - Idempotente: un partido ya cargado (temporada, jugador, game_id) se ignora
+    - Los promedios por temporada se actualizan en la misma transacción
+    - Requiere permiso de creación de jugadores (can_create_players)
+    """
+)
+async def ingest_box_scores(
+    request: Request,
+    format: Optional[str] = Query(None, description="ndjson o csv"),
+    current_user: User = Depends(can_create_players),
+    db: Session = Depends(get_db)
+):
+    """POST /stats/games/ingest"""
+    fmt = _resolve_format(format, request.headers.get("content-type", ""))
+    ingestor = BoxScoreIngestor(db, fmt)
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    lines: List[str] = []
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        lines.extend(complete)
+        if len(lines) >= _LINES_PER_CHUNK:
+            # Validación e INSERT son síncronos: fuera del event loop
+            await run_in_threadpool(ingestor.feed, lines)
+            lines = []
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        lines.append(pending)
+    if lines:
+        await run_in_threadpool(ingestor.feed, lines)
+    summary = await run_in_threadpool(ingestor.finish)
+
+    logger.info(
+        f"📥 El usuario '{current_user.username}' cargó {summary['inserted']} box scores "
+        f"({summary['rejected']} rechazados)"
+    )
+    return summary
+
+
+@router.get(
+    "/players/{player_id}/seasons",
+    response_model=List[SeasonAveragesResponse],
+    summary="Promedios por temporada de un jugador",
+    description="""
+    **Promedios por partido y totales de cada temporada del jugador.**
+
+    - Se leen de los agregados por temporada (una fila por temporada), sin recorrer los partidos
+    - `season` filtra una temporada (año de inicio: 2024 = 2024-25)
+    """
+)
+def get_season_averages(
+    player_id: int,
+    season: Optional[int] = Query(None, ge=1946, le=2100, description="Año de inicio de la temporada"),
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """GET /stats/players/{player_id}/seasons"""
+    return PlayerStatsService(db).get_season_averages(player_id, season)
+
+
+@router.get(
+    "/players/{player_id}/games",
+    response_model=List[GameStatsResponse],
+    summary="Partidos de un jugador",
+    description="""
+    **Box scores del jugador, más recientes primero, con paginación.**
+    """
+)
+def get_player_games(
+    player_id: int,
+    season: Optional[int] = Query(None, ge=1946, le=2100, description="Año de inicio de la temporada"),
+    skip: int = Query(0, ge=0, description="Registros a omitir"),
+    limit: int = Query(100, ge=1, le=1000, description="Cantidad máxima de partidos"),
+    current_user: User = Depends(can_read_players),
+    db: Session = Depends(get_db)
+):
+    """GET /stats/players/{player_id}/games"""
+    return PlayerStatsService(db).get_player_games(player_id, season, skip=skip, limit=limit)
@@ -77,6 +77,49 @@ def get_roles(
         )
 
 
+# -------------------------------
+# GET /roles/with-users → Listar roles con conteo de usuarios (SOLO ADMIN)
+# -------------------------------
+@router.get(
+    "/with-users",
+    response_model=List[RoleWithUsers],
+    summary="Obtener roles con cantidad de usuarios",
+    description="""
+    **Obtiene todos los roles con la cantidad de usuarios asignados a cada uno.**
+    
+    **Restricción:** Solo administradores pueden acceder.
+    
+    El conteo se calcula en la base de datos con un único `GROUP BY`,
+    sin cargar los usuarios en memoria.
+    """
+)
+def get_roles_with_users(
+    current_user: User = Depends(is_admin),
+    skip: int = Query(0, ge=0, description="Registros a omitir"),
+    limit: int = Query(100, ge=1, le=100, description="Máximo de registros"),
+    db: Session = Depends(get_db)
+):
+    """
+    GET /roles/with-users
+    Lista los roles con su cantidad de usuarios (SOLO ADMINISTRADORES)
+    """
+    try:
+        service = RoleService(db)
+        roles = service.get_all_roles_with_users(skip=skip, limit=limit)
+        
+        logger.info(f"Admin '{current_user.username}' listó {len(roles)} roles con conteo de usuarios")
+        return roles
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error al listar roles con usuarios: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
 # -------------------------------
 # GET /roles/{role_id} → Obtener rol por ID (SOLO ADMIN)
 # -------------------------------
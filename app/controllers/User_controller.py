@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.config.NBA_database import get_db
 from app.services.User_service import UserService
@@ -81,15 +81,25 @@ def get_my_profile(
         # Log detallado con información del usuario
         logger.info(f"📋 ACCIÓN: El usuario '{current_user.username}' (ID: {current_user.id}) consultó su propio perfil")
         
+        # El usuario autenticado se resuelve desde el token: el perfil completo se lee aquí
+        user = UserService(db).obtener_usuario(current_user.id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Usuario no encontrado"
+            )
+        
         # Devolver toda la información del usuario incluyendo role_id
         return UserResponse(
-            id=current_user.id,
-            username=current_user.username,
-            role_id=current_user.role_id,
-            role=current_user.role,
-            created_at=current_user.created_at
+            id=user.id,
+            username=user.username,
+            role_id=user.role_id,
+            role=user.role,
+            created_at=user.created_at
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error al obtener perfil: {str(e)}")
         raise HTTPException(
@@ -113,6 +123,15 @@ def get_my_profile(
     - Incluye contraseñas hasheadas y toda la información del usuario
     - Requiere permiso can_manage_users
     
+    ### Paginación por cursor:
+    - **cursor**: ID del último usuario recibido (omitir para la primera página)
+    - **limit**: Máximo de usuarios por página (1-200)
+    - **is_active** / **role_id**: Filtros opcionales
+    
+    La respuesta incluye los headers:
+    - `X-Next-Cursor`: cursor para la siguiente página (ausente en la última)
+    - `X-Total-Count`: total de usuarios con los filtros (solo en la primera página)
+    
     ### Casos de uso:
     - Panel de administración de usuarios
     - Auditoría del sistema
@@ -142,7 +161,12 @@ def get_my_profile(
     }
 )
 def get_all_users(
+    response: Response,
     current_user: User = Depends(can_manage_users),  # ← Solo admin
+    cursor: Optional[int] = Query(None, ge=0, description="ID del último usuario de la página anterior"),
+    limit: int = Query(50, ge=1, le=200, description="Máximo número de usuarios por página"),
+    is_active: Optional[bool] = Query(None, description="Filtrar por estado activo"),
+    role_id: Optional[int] = Query(None, ge=1, description="Filtrar por ID de rol"),
     db: Session = Depends(get_db)
 ):
     """
@@ -153,10 +177,17 @@ def get_all_users(
     """
     try:
         service = UserService(db)
-        users = service.listar_usuarios()
+        users, next_cursor, total = service.listar_usuarios_paginado(
+            cursor=cursor, limit=limit, is_active=is_active, role_id=role_id
+        )
+        
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = str(next_cursor)
+        if total is not None:
+            response.headers["X-Total-Count"] = str(total)
         
         # Log detallado
-        logger.info(f"👥 ACCIÓN: El admin '{current_user.username}' (ID: {current_user.id}) consultó la lista completa de usuarios - Total: {len(users)}")
+        logger.info(f"👥 ACCIÓN: El admin '{current_user.username}' (ID: {current_user.id}) consultó la lista de usuarios (cursor={cursor}, limit={limit}) - En página: {len(users)}")
         
         # Convertir a UserAdminResponse incluyendo password
         return [
@@ -418,6 +449,11 @@ def create_user(
     ### Campos opcionales para actualizar:
     - **username**: Nuevo nombre de usuario (debe ser único)
     - **password**: Nueva contraseña (se hasheará automáticamente)
+    - **role_id**: Nuevo rol
+    - **is_active**: Activar o desactivar el usuario
+    
+    Cambiar la contraseña o desactivar el usuario revoca de inmediato todas sus sesiones;
+    cambiar el username o el rol revoca sus access tokens (puede renovarlos con el refresh token).
     
     ### Validaciones:
     - El usuario debe existir
@@ -453,7 +489,8 @@ def update_user(
             user_id=user_id,
             username=user_data.username,
             password=user_data.password,
-            role_id=user_data.role_id
+            role_id=user_data.role_id,
+            is_active=user_data.is_active
         )
         
         logger.info(f"Usuario {current_user.username} actualizó usuario ID: {user_id}")
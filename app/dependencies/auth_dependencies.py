@@ -1,8 +1,13 @@
-from fastapi import Depends, HTTPException, status
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Union
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.utils.jwt_utils import jwt_manager
+from app.utils.token_revocation import token_revocation_list
 from app.repositories.User_repository import UserRepository
+from app.repositories.RevokedToken_repository import RevokedTokenRepository
 from app.config.NBA_database import get_db
 from app.models.User_model import User
 import logging
@@ -10,26 +15,91 @@ import logging
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
-def get_current_user(
+
+@dataclass(frozen=True)
+class TokenPrincipal:
+    """
+    Usuario autenticado construido a partir de los claims del token, sin leer la tabla users.
+    Expone los mismos atributos de identidad que el modelo User usados por los controladores.
+    """
+    id: int
+    username: str
+    role_id: int
+    is_active: bool = True
+
+
+def is_token_revoked(payload: Dict[str, Any], db: Session) -> bool:
+    """
+    Consulta la lista de revocación: el filtro de Bloom en memoria descarta el caso
+    común sin SQL; solo los posibles positivos se confirman en la base de datos
+    """
+    repository = RevokedTokenRepository(db)
+    token_revocation_list.refresh(lambda after_id: repository.get_entries_after(after_id, datetime.utcnow()))
+
+    jti = payload.get("jti")
+    user_id = payload.get("user_id")
+    if not token_revocation_list.might_be_revoked(jti, user_id):
+        return False
+
+    return repository.is_revoked(jti, user_id, jwt_manager.get_issued_at(payload))
+
+
+def _claims_from_token(token: str, db: Session) -> Dict[str, Any]:
+    """Decodifica el token JWT, verifica que no esté revocado y retorna los claims"""
+    payload = jwt_manager.verify_token(token)
+
+    if not payload:
+        logger.warning("Token JWT inválido o expirado")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido o expirado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if is_token_revoked(payload, db):
+        logger.warning(f"Token revocado usado por: {payload.get('sub')}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revocado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return payload
+
+
+def get_token_claims(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> Dict[str, Any]:
     """
-    Dependency que actúa como @jwt_required() de Flask
-    Valida el token JWT y retorna el usuario actual
+    Decodifica y valida el token JWT una sola vez por petición
+    Verifica que no esté revocado y retorna los claims
+    (FastAPI reutiliza el resultado entre dependencias)
+    """
+    return _claims_from_token(credentials.credentials, db)
+
+
+def get_token_claims_from_query(
+    token: str = Query(..., description="Access token JWT (EventSource no permite enviar headers)"),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Igual que get_token_claims, pero con el token en el query string.
+    Solo para conexiones que no pueden enviar el header Authorization (SSE).
+    """
+    return _claims_from_token(token, db)
+
+
+def _resolve_current_user(payload: Dict[str, Any], db: Session) -> Union[TokenPrincipal, User]:
+    """
+    Construye el usuario actual a partir de los claims del token
+
+    Los tokens actuales traen la identidad completa en sus claims y se resuelven sin
+    leer la base de datos: la desactivación, eliminación o cambio de contraseña/rol
+    de un usuario revoca sus tokens (ver get_token_claims). Los tokens emitidos antes
+    de existir la lista de revocación (sin "jti") siguen leyendo el usuario.
     """
     try:
-        token = credentials.credentials
-        payload = jwt_manager.verify_token(token)
-        
-        if not payload:
-            logger.warning("Token JWT inválido o expirado")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token inválido o expirado",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
         username: str = payload.get("sub")
         if username is None:
             logger.warning("Token JWT malformado - sin username")
@@ -38,10 +108,17 @@ def get_current_user(
                 detail="Token malformado",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        
+
+        if "jti" in payload and payload.get("user_id") is not None and payload.get("role_id") is not None:
+            return TokenPrincipal(
+                id=payload["user_id"],
+                username=username,
+                role_id=payload["role_id"]
+            )
+
         user_repo = UserRepository(db)
         user = user_repo.get_user_by_username(username)
-        
+
         if user is None:
             logger.warning(f"Usuario no encontrado en token: {username}")
             raise HTTPException(
@@ -49,7 +126,7 @@ def get_current_user(
                 detail="Usuario no encontrado",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        
+
         if not user.is_active:
             logger.warning(f"Usuario inactivo intentó acceder: {username}")
             raise HTTPException(
@@ -57,9 +134,9 @@ def get_current_user(
                 detail="Usuario inactivo",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        
+
         return user
-        
+
     except HTTPException:
         raise
     except Exception as e:
@@ -68,4 +145,23 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Error de autenticación",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+
+
+def get_current_user(
+    payload: Dict[str, Any] = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+) -> Union[TokenPrincipal, User]:
+    """
+    Dependency que actúa como @jwt_required() de Flask
+    Valida el token JWT y retorna el usuario actual
+    """
+    return _resolve_current_user(payload, db)
+
+
+def get_current_user_from_query(
+    payload: Dict[str, Any] = Depends(get_token_claims_from_query),
+    db: Session = Depends(get_db)
+) -> Union[TokenPrincipal, User]:
+    """Usuario actual a partir del token en el query string (ver get_token_claims_from_query)"""
+    return _resolve_current_user(payload, db)
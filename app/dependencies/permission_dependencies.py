@@ -1,132 +1,191 @@
 """
 Dependencias de permisos
 Verifican que el usuario tenga los permisos necesarios para realizar acciones
+
+Los permisos viajan en el token como máscara de bits (claim "perms") junto con la
+versión del rol ("role_ver"). Cada verificación es una operación de bits sobre los
+claims; la versión se compara contra un cache en proceso con TTL, de modo que si
+los permisos del rol cambian, los tokens anteriores pasan a usar los permisos vigentes.
 """
+from typing import Any, Dict, Tuple
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.config.NBA_database import get_db
-from app.dependencies.auth_dependencies import get_current_user
+from app.config.NBA_database import SessionLocal, get_db
+from app.dependencies.auth_dependencies import (
+    get_current_user,
+    get_current_user_from_query,
+    get_token_claims,
+    get_token_claims_from_query,
+    is_token_revoked,
+)
 from app.models.User_model import User
-from app.models.Role_model import Role
+from app.repositories.Role_repository import RoleRepository
+from app.utils.permissions import has_permission, role_permissions_cache
+
+
+def _resolve_permissions(claims: Dict[str, Any], current_user: User, db: Session) -> Tuple[int, str]:
+    """
+    Obtiene (máscara de permisos, nombre del rol) vigentes para el usuario
+
+    Usa los claims del token si corresponden al rol y versión actuales; en caso
+    contrario (permisos modificados, rol reasignado o token sin claims de permisos)
+    usa los permisos vigentes del rol.
+    """
+    role_id = current_user.role_id
+    snapshot = role_permissions_cache.get(
+        role_id,
+        lambda: RoleRepository(db).get_role_permissions(role_id)
+    )
+
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Usuario sin rol asignado"
+        )
+
+    mask, version, role_name = snapshot
+    if (
+        "perms" in claims
+        and claims.get("role_id") == role_id
+        and claims.get("role_ver") == version
+    ):
+        return int(claims["perms"]), claims.get("role", role_name)
+
+    return mask, role_name
+
+
+def _check_permission(
+    claims: Dict[str, Any],
+    current_user: User,
+    db: Session,
+    permission_name: str,
+    detail: str
+) -> None:
+    """Lanza 403 si la máscara de permisos vigente no incluye el permiso"""
+    mask, _ = _resolve_permissions(claims, current_user, db)
+    if not has_permission(mask, permission_name):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
 
 
 def require_permission(permission_name: str):
     """
     Factory para crear dependencias que verifican permisos específicos
-    
+
     Args:
         permission_name: Nombre del permiso a verificar
-        
+
     Returns:
         Función de dependencia que verifica el permiso
     """
     async def permission_dependency(
         current_user: User = Depends(get_current_user),
+        claims: Dict[str, Any] = Depends(get_token_claims),
         db: Session = Depends(get_db)
     ) -> User:
         """Verifica que el usuario tenga el permiso especificado"""
-        
-        # Obtener el rol del usuario con sus permisos
-        role = db.query(Role).filter(Role.id == current_user.role_id).first()
-        
-        if not role:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Usuario sin rol asignado"
-            )
-        
-        # Verificar si el rol tiene el permiso
-        has_permission = getattr(role, permission_name, False)
-        
-        if not has_permission:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"No tienes permiso para realizar esta acción. Se requiere: {permission_name}"
-            )
-        
+        _check_permission(
+            claims, current_user, db, permission_name,
+            f"No tienes permiso para realizar esta acción. Se requiere: {permission_name}"
+        )
         return current_user
-    
+
     return permission_dependency
 
 
 # Dependencias específicas para cada permiso
 def can_create_players(
     current_user: User = Depends(get_current_user),
+    claims: Dict[str, Any] = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ) -> User:
     """Verifica permiso para crear jugadores"""
-    role = db.query(Role).filter(Role.id == current_user.role_id).first()
-    if not role or not role.can_create_players:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para crear jugadores"
-        )
+    _check_permission(claims, current_user, db, "can_create_players", "No tienes permiso para crear jugadores")
     return current_user
 
 
 def can_update_players(
     current_user: User = Depends(get_current_user),
+    claims: Dict[str, Any] = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ) -> User:
     """Verifica permiso para actualizar jugadores"""
-    role = db.query(Role).filter(Role.id == current_user.role_id).first()
-    if not role or not role.can_update_players:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para actualizar jugadores"
-        )
+    _check_permission(claims, current_user, db, "can_update_players", "No tienes permiso para actualizar jugadores")
     return current_user
 
 
 def can_delete_players(
     current_user: User = Depends(get_current_user),
+    claims: Dict[str, Any] = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ) -> User:
     """Verifica permiso para eliminar jugadores"""
-    role = db.query(Role).filter(Role.id == current_user.role_id).first()
-    if not role or not role.can_delete_players:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para eliminar jugadores"
-        )
+    _check_permission(claims, current_user, db, "can_delete_players", "No tienes permiso para eliminar jugadores")
     return current_user
 
 
 def can_read_players(
     current_user: User = Depends(get_current_user),
+    claims: Dict[str, Any] = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ) -> User:
     """Verifica permiso para leer jugadores"""
-    role = db.query(Role).filter(Role.id == current_user.role_id).first()
-    if not role or not role.can_read_players:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para ver jugadores"
-        )
+    _check_permission(claims, current_user, db, "can_read_players", "No tienes permiso para ver jugadores")
+    return current_user
+
+
+def can_read_players_from_query(
+    current_user: User = Depends(get_current_user_from_query),
+    claims: Dict[str, Any] = Depends(get_token_claims_from_query),
+    db: Session = Depends(get_db)
+) -> User:
+    """Verifica permiso para leer jugadores con el token en el query string (SSE)"""
+    _check_permission(claims, current_user, db, "can_read_players", "No tienes permiso para ver jugadores")
     return current_user
 
 
+def still_can_read_players(claims: Dict[str, Any], current_user: User) -> bool:
+    """
+    Repite la verificación de un token ya aceptado: revocación (filtro de Bloom y
+    confirmación en la base) y permiso de lectura de jugadores vigente.
+    Para conexiones largas (SSE) que se autentican una sola vez al abrir; usa una
+    sesión propia porque la de la petición ya se cerró.
+    """
+    db = SessionLocal()
+    try:
+        if is_token_revoked(claims, db):
+            return False
+        _check_permission(claims, current_user, db, "can_read_players", "No tienes permiso para ver jugadores")
+        return True
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+
 def can_manage_users(
     current_user: User = Depends(get_current_user),
+    claims: Dict[str, Any] = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ) -> User:
     """Verifica permiso para gestionar usuarios (solo admins)"""
-    role = db.query(Role).filter(Role.id == current_user.role_id).first()
-    if not role or not role.can_manage_users:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para gestionar usuarios. Solo administradores."
-        )
+    _check_permission(
+        claims, current_user, db, "can_manage_users",
+        "No tienes permiso para gestionar usuarios. Solo administradores."
+    )
     return current_user
 
 
 def is_admin(
     current_user: User = Depends(get_current_user),
+    claims: Dict[str, Any] = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ) -> User:
     """Verifica que el usuario sea administrador"""
-    role = db.query(Role).filter(Role.id == current_user.role_id).first()
-    if not role or role.name.lower() != "admin":
+    _, role_name = _resolve_permissions(claims, current_user, db)
+    if not role_name or role_name.lower() != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Solo los administradores pueden realizar esta acción"
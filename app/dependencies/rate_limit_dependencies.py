@@ -0,0 +1,64 @@
+"""
+Dependencias de limitación de intentos de login
+Rechazan los intentos excedidos con 429 antes de verificar la contraseña
+"""
+import asyncio
+import logging
+import math
+from fastapi import HTTPException, Request, status
+from app.config.NBA_database import SessionLocal
+from app.config.rate_limit_config import rate_limit_config
+from app.repositories.RateLimit_repository import DatabaseRateLimitBackend
+from app.utils.rate_limiter import InMemoryRateLimitBackend, LoginThrottle
+
+logger = logging.getLogger('nba_api.dependencies.rate_limit')
+
+
+def _build_login_throttle() -> LoginThrottle:
+    if rate_limit_config.get_backend() == "database":
+        backend = DatabaseRateLimitBackend(SessionLocal)
+    else:
+        backend = InMemoryRateLimitBackend()
+    return LoginThrottle(backend, **rate_limit_config.get_throttle_settings())
+
+
+login_throttle = _build_login_throttle()
+
+
+async def run_rate_limit_cleanup(interval: float) -> None:
+    """
+    Tarea de fondo: elimina cada `interval` segundos los contadores del
+    limitador que ya no limitan a nadie. La limpieza corre en un hilo.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            deleted = await asyncio.to_thread(login_throttle.prune)
+            if deleted:
+                logger.info(f"🧹 ACCIÓN: {deleted} contadores de login inactivos eliminados")
+        except Exception as e:
+            logger.error(f"❌ Error al limpiar los contadores de login: {e}")
+
+
+def get_client_ip(request: Request) -> str:
+    """IP del cliente según la conexión (detrás de un proxy, uvicorn --proxy-headers la corrige)"""
+    return request.client.host if request.client else "unknown"
+
+
+def enforce_login_rate_limit(request: Request, username: str) -> str:
+    """
+    Verifica el limitador para un intento de login y retorna la IP del cliente
+    Lanza 429 con Retry-After si la IP o el username excedieron su límite
+    """
+    client_ip = get_client_ip(request)
+    retry_after = login_throttle.check(client_ip, username)
+
+    if retry_after is not None:
+        logger.warning(f"🚫 Intento de login limitado: IP {client_ip}, usuario '{username}' (reintentar en {retry_after:.0f}s)")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Demasiados intentos de inicio de sesión. Intenta nuevamente más tarde.",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    return client_ip
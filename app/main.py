@@ -1,15 +1,48 @@
+import asyncio
 from contextlib import asynccontextmanager
+from datetime import datetime
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.models.NBA_model import Base
 from app.models.User_model import User  # Importar modelo User
 from app.models.Role_model import Role  # Importar modelo Role
-from app.config.NBA_database import engine
+from app.models.RefreshToken_model import RefreshToken  # Importar modelo RefreshToken
+from app.models.RevokedToken_model import RevokedToken  # Importar modelo RevokedToken
+from app.models.RateLimit_model import RateLimitCounter  # Importar modelo RateLimitCounter
+from app.models.WeatherHistory_model import WeatherHistory  # Importar modelo WeatherHistory
+from app.models.RosterRollup_model import RosterRollup  # Importar modelo RosterRollup
+from app.models.PlayerGameStats_model import PlayerGameStats, PlayerSeasonStats  # Importar modelos de estadísticas por partido
+from app.config.NBA_database import engine, SessionLocal
+from app.config.schema_upgrade import ensure_schema_upgrades
+from app.repositories.NBA_repository import ensure_name_search_index
+from app.repositories.Role_repository import RoleRepository
+from app.repositories.RevokedToken_repository import RevokedTokenRepository
+from app.repositories.RefreshToken_repository import RefreshTokenRepository
+from app.utils.token_revocation import token_revocation_list
+from app.dependencies.rate_limit_dependencies import run_rate_limit_cleanup
+from app.config.rate_limit_config import rate_limit_config
+from app.services.MapSnapshot_service import map_snapshot, run_snapshot_reconciler
+from app.config.map_config import map_config
+from app.services.WeatherPrefetch_service import weather_prefetcher
+from app.services.WeatherHistory_service import weather_history
+from app.config.weather_config import weather_config
+from app.services.NBA_Map_service import teams_locations_flight
+from app.services.Weather_service import weather_circuit_breaker, hedge_stats
+from app.services.Events_service import event_broadcaster
+from app.services.Analytics_service import run_rollup_reconciler
+from app.config.analytics_config import analytics_config
+from app.utils.metrics import MetricsText
 from app.controllers.NBA_controller import router as nba_router
 from app.controllers.User_controller import router as user_router
 from app.controllers.Auth_controller import router as auth_router
 from app.controllers.Role_controller import router as role_router
 from app.controllers.NBA_Map_controller import router as nba_map_router  # Router del mapa NBA
+from app.controllers.Geo_controller import router as geo_router  # Router de consultas geográficas
+from app.controllers.Events_controller import router as events_router  # Router de eventos en tiempo real
+from app.controllers.Analytics_controller import router as analytics_router  # Router de estadísticas de la plantilla
+from app.controllers.Export_controller import router as export_router  # Router de exportaciones Arrow/Parquet
+from app.controllers.PlayerStats_controller import router as player_stats_router  # Router de estadísticas por partido
 from app.config.documentation import (
     TAGS_METADATA, 
     CONTACT_INFO, 
@@ -20,6 +53,10 @@ from scalar_fastapi import get_scalar_api_reference
 import logging
 from app.config.logging_config import setup_nba_logging
 from app.middleware.logging_middleware import LoggingMiddleware
+from app.middleware.compression_middleware import CompressionMiddleware
+from app.config.compression_config import compression_config
+from app.middleware.admission_middleware import AdmissionControlMiddleware, admission_registry
+from app.config.admission_config import admission_config
 
 # Configuración de logging mejorada
 logger = setup_nba_logging()
@@ -38,11 +75,96 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Error al crear tablas: {e}")
 
+    # Columnas e índices nuevos en tablas que ya existían (create_all no los agrega)
+    try:
+        upgrades = ensure_schema_upgrades(engine)
+        if upgrades:
+            logger.info(f"🛠️ ACCIÓN: Esquema actualizado: {', '.join(upgrades)}")
+    except Exception as e:
+        logger.error(f"❌ Error al actualizar el esquema: {e}")
+
+    # Máscaras de permisos de roles (roles creados por SQL o antes de existir la columna)
+    try:
+        db = SessionLocal()
+        try:
+            synced = RoleRepository(db).sync_permission_masks()
+        finally:
+            db.close()
+        if synced:
+            logger.info(f"🔐 ACCIÓN: Máscaras de permisos recompiladas para {synced} roles")
+    except Exception as e:
+        logger.error(f"❌ Error al sincronizar permisos de roles: {e}")
+
+    # Limpieza de tokens vencidos y carga inicial de la lista de revocación en memoria
+    try:
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            revoked_repository = RevokedTokenRepository(db)
+            expired = revoked_repository.delete_expired(now)
+            expired += RefreshTokenRepository(db).delete_expired(now)
+            token_revocation_list.refresh(lambda after_id: revoked_repository.get_entries_after(after_id, now), force=True)
+        finally:
+            db.close()
+        if expired:
+            logger.info(f"🧹 ACCIÓN: {expired} tokens vencidos eliminados")
+    except Exception as e:
+        logger.error(f"❌ Error al preparar la lista de revocación de tokens: {e}")
+
+    # Limpieza periódica de los contadores del limitador de login
+    rate_limit_cleanup = asyncio.create_task(run_rate_limit_cleanup(rate_limit_config.get_cleanup_seconds()))
+
+    # Índice de búsqueda por nombre de jugador (pg_trgm / FTS5)
+    search_backend = ensure_name_search_index(engine)
+    logger.info(f"🔍 ACCIÓN: Búsqueda de jugadores por nombre usando: {search_backend or 'LIKE'}")
+
+    # Snapshot en memoria de equipos y jugadores del mapa (lectura sin SQL)
+    try:
+        db = SessionLocal()
+        try:
+            map_snapshot.build(db)
+        finally:
+            db.close()
+    except Exception as e:
+        logger.error(f"❌ Error al construir el snapshot del mapa: {e}")
+    snapshot_reconciler = asyncio.create_task(
+        run_snapshot_reconciler(map_config.get_snapshot_reconcile_seconds())
+    )
+
+    # Clima de los equipos actualizado en segundo plano (coordenadas desde el snapshot)
+    weather_task = None
+    if weather_config.is_prefetch_enabled():
+        weather_task = asyncio.create_task(weather_prefetcher.run(map_snapshot.get_weather_targets))
+        logger.info("🌤️ ACCIÓN: Actualización del clima en segundo plano iniciada")
+
+    # Histórico de clima: escritura por lotes y purga por retención
+    history_task = None
+    if weather_config.is_history_enabled():
+        history_task = asyncio.create_task(weather_history.run(weather_config.get_history_flush_seconds()))
+
+    # Rollups de la plantilla: se verifican (y reconstruyen si hace falta) al iniciar y periódicamente
+    rollup_reconciler = asyncio.create_task(
+        run_rollup_reconciler(analytics_config.get_rollup_reconcile_seconds())
+    )
+
+    # Eventos en tiempo real: los publicadores de otros hilos reparten en este event loop
+    event_broadcaster.bind(asyncio.get_running_loop())
+
     logger.info("🎯 ACCIÓN: NBA API lista para recibir peticiones en http://127.0.0.1:8000")
     yield
 
     # Shutdown
     logger.info("⏹️ ACCIÓN: Cerrando aplicación NBA API...")
+    event_broadcaster.close()
+    snapshot_reconciler.cancel()
+    rollup_reconciler.cancel()
+    rate_limit_cleanup.cancel()
+    if weather_task is not None:
+        weather_task.cancel()
+    if history_task is not None:
+        # Se espera a la tarea para que escriba las observaciones pendientes
+        history_task.cancel()
+        await asyncio.gather(history_task, return_exceptions=True)
 
 # Configuración de la aplicación FastAPI
 app = FastAPI(
@@ -66,6 +188,7 @@ app = FastAPI(
     ### 📊 Endpoints disponibles:
     
     * `GET /api/v1/players/` - Lista todos los jugadores (con paginación)
+    * `GET /api/v1/players/search?q=` - Busca jugadores por nombre (autocompletado)
     * `GET /api/v1/players/{id}` - Obtiene un jugador específico
     * `POST /api/v1/players/` - Crea un nuevo jugador
     * `PUT /api/v1/players/{id}` - Actualiza un jugador existente
@@ -93,11 +216,31 @@ app = FastAPI(
     openapi_tags=TAGS_METADATA,
     servers=SERVERS,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # Serialización JSON con orjson
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json"
 )
 
+# Middleware de compresión (Brotli/gzip) para respuestas grandes
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=compression_config.get_minimum_size(),
+    gzip_level=compression_config.get_gzip_level(),
+    brotli_quality=compression_config.get_brotli_quality(),
+    content_types=compression_config.get_content_types(),
+)
+
+# Control de admisión: límite de concurrencia por clase de ruta y 503 ante sobrecarga
+app.add_middleware(
+    AdmissionControlMiddleware,
+    limits=admission_config.get_route_class_limits(),
+    queue_size=admission_config.get_queue_size(),
+    queue_timeout=admission_config.get_queue_timeout(),
+    retry_after=admission_config.get_retry_after(),
+    exempt_paths=admission_config.get_exempt_paths(),
+)
+
 # Middleware de logging personalizado
 app.add_middleware(LoggingMiddleware)
 
@@ -108,6 +251,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag", "Retry-After"],  # Paginación, caché y reintentos legibles desde el frontend
 )
 
 # Incluir routers
@@ -116,6 +260,11 @@ app.include_router(nba_router)      # Router de jugadores NBA
 app.include_router(user_router)     # Router de usuarios
 app.include_router(role_router)     # Router de roles (solo admins)
 app.include_router(nba_map_router)  # Router del mapa interactivo NBA
+app.include_router(geo_router)      # Router de proximidad y distancias entre estadios
+app.include_router(events_router)   # Router de eventos en tiempo real (SSE)
+app.include_router(analytics_router)  # Router de estadísticas de la plantilla
+app.include_router(export_router)   # Router de exportaciones columnares
+app.include_router(player_stats_router)  # Router de estadísticas por partido y temporada
 
 # Configurar Scalar para documentación de API
 @app.get("/scalar", include_in_schema=False)
@@ -179,3 +328,55 @@ async def health_check():
         },
         "version": "1.2.0"
     }
+
+
+@app.get("/metrics", tags=["System"], response_class=PlainTextResponse)
+async def metrics():
+    """
+    **Métricas en formato de texto de Prometheus**
+    
+    - Control de admisión: peticiones activas, en espera, admitidas y descartadas por clase de ruta
+    - Coalescencia del mapa: ejecuciones en curso, ejecutadas y peticiones unidas
+    - Dependencia de clima: estado del circuit breaker, resultados, peticiones cubiertas (hedging)
+      y frescura del caché actualizado en segundo plano
+    """
+    output = MetricsText()
+    
+    # El stack de middlewares se construye con la primera petición: se usa la instancia vigente
+    if admission_registry:
+        for route_class, data in admission_registry[-1].snapshot().items():
+            labels = {"route_class": route_class}
+            output.add("nba_admission_limit", data["limit"], "Peticiones simultáneas permitidas", labels=labels)
+            output.add("nba_admission_active", data["active"], "Peticiones en curso", labels=labels)
+            output.add("nba_admission_waiting", data["waiting"], "Peticiones esperando turno", labels=labels)
+            output.add("nba_admission_admitted_total", data["admitted"], "Peticiones admitidas", "counter", labels)
+            output.add("nba_admission_shed_total", data["shed"], "Peticiones descartadas con 503", "counter", labels)
+    
+    flight = teams_locations_flight.snapshot()
+    labels = {"name": teams_locations_flight.name}
+    output.add("nba_single_flight_inflight", flight["inflight"], "Ejecuciones compartidas en curso", labels=labels)
+    output.add("nba_single_flight_executions_total", flight["executions"], "Ejecuciones realizadas", "counter", labels)
+    output.add("nba_single_flight_coalesced_total", flight["coalesced"], "Peticiones unidas a una ejecución en curso", "counter", labels)
+    
+    breaker = weather_circuit_breaker.snapshot()
+    labels = {"dependency": weather_circuit_breaker.name}
+    output.add("nba_circuit_state", breaker["state_value"], "Estado del circuito (0 cerrado, 1 half-open, 2 abierto)", labels=labels)
+    for result in ("successes", "failures", "rejected"):
+        output.add("nba_circuit_calls_total", breaker[result], "Llamadas por resultado", "counter", {**labels, "result": result})
+    output.add("nba_circuit_opened_total", breaker["times_opened"], "Veces que se abrió el circuito", "counter", labels)
+    output.add("nba_weather_hedges_sent_total", hedge_stats["sent"], "Peticiones cubiertas lanzadas", "counter")
+    output.add("nba_weather_hedges_won_total", hedge_stats["won"], "Peticiones cubiertas que respondieron primero", "counter")
+    
+    prefetch = weather_prefetcher.get_status()
+    output.add("nba_weather_prefetch_api_calls_total", prefetch["api_calls"], "Llamadas a la API de clima en segundo plano", "counter")
+    output.add("nba_weather_prefetch_api_errors_total", prefetch["api_errors"], "Llamadas en segundo plano fallidas", "counter")
+    output.add("nba_weather_fresh_teams", prefetch["fresh_teams"], "Equipos con clima fresco en caché")
+    output.add("nba_weather_teams", prefetch["total_teams"], "Equipos con clima en seguimiento")
+    
+    events = event_broadcaster.snapshot()
+    output.add("nba_events_subscribers", events["subscribers"], "Conexiones SSE abiertas")
+    output.add("nba_events_published_total", events["published"], "Eventos publicados", "counter")
+    output.add("nba_events_dropped_total", events["dropped"], "Eventos descartados por clientes lentos", "counter")
+    output.add("nba_events_rejected_total", events["rejected"], "Conexiones rechazadas por límite", "counter")
+    
+    return PlainTextResponse(output.render(), media_type="text/plain; version=0.0.4")
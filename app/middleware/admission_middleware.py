@@ -0,0 +1,156 @@
+"""
+Middleware de control de admisión (load shedding)
+Limita las peticiones simultáneas por clase de ruta y descarta el exceso con 503
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger('nba_api.middleware.admission')
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# (prefijo de ruta, clase); la primera coincidencia gana. Sin coincidencia se clasifica por método.
+DEFAULT_ROUTE_CLASSES: List[Tuple[str, str]] = [
+    ("/api/v1/export", "bulk"),
+    ("/api/v1/stats/games/ingest", "bulk"),
+    ("/api/v1/auth", "auth"),
+    ("/api/v1/nba-map", "map"),
+]
+
+
+class _RouteClassLimiter:
+    """Semáforo de una clase de ruta con cola de espera acotada y contadores"""
+
+    def __init__(self, name: str, limit: int, queue_size: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+class AdmissionControlMiddleware:
+    """
+    Middleware ASGI de control de admisión.
+
+    - Cada clase de ruta (auth, map, write, read, bulk) tiene un máximo de peticiones en curso.
+    - Las transferencias masivas (exportación, ingesta) van en su propia clase `bulk`:
+      una descarga larga no ocupa cupos de lectura ni de escritura.
+    - Si no hay cupo, la petición espera en una cola acotada hasta `queue_timeout` segundos.
+    - Si la cola está llena o vence la espera, se responde 503 con Retry-After
+      sin ocupar un hilo del threadpool: la latencia de las admitidas se mantiene acotada.
+    - Las rutas exentas (health, metrics, documentación) nunca se limitan.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: Dict[str, int],
+        queue_size: int = 50,
+        queue_timeout: float = 2.0,
+        retry_after: int = 1,
+        exempt_paths: Optional[Sequence[str]] = None,
+        route_classes: Optional[Sequence[Tuple[str, str]]] = None,
+    ):
+        self.app = app
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.exempt_paths = tuple(exempt_paths or ())
+        self.route_classes = list(route_classes or DEFAULT_ROUTE_CLASSES)
+        self.limiters = {
+            name: _RouteClassLimiter(name, limit, queue_size)
+            for name, limit in limits.items()
+        }
+        admission_registry.append(self)
+
+    def _is_exempt(self, path: str) -> bool:
+        return any(path == exempt or path.startswith(exempt + "/") for exempt in self.exempt_paths)
+
+    def _classify(self, scope: Scope) -> Optional[_RouteClassLimiter]:
+        path = scope.get("path", "")
+        for prefix, name in self.route_classes:
+            if path.startswith(prefix):
+                return self.limiters.get(name)
+        name = "write" if scope.get("method") in WRITE_METHODS else "read"
+        return self.limiters.get(name)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("method") == "OPTIONS" or self._is_exempt(scope.get("path", "")):
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self._classify(scope)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self._acquire(limiter):
+            limiter.shed += 1
+            logger.warning(
+                f"🚦 Petición descartada (503): {scope.get('method')} {scope.get('path')} "
+                f"[clase {limiter.name}: {limiter.active} activas, {limiter.waiting} en cola]"
+            )
+            await self._send_overloaded(send)
+            return
+
+        limiter.active += 1
+        limiter.admitted += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.active -= 1
+            limiter.semaphore.release()
+
+    async def _acquire(self, limiter: _RouteClassLimiter) -> bool:
+        """Toma un cupo: inmediato si hay, si no espera en la cola acotada"""
+        if not limiter.semaphore.locked():
+            await limiter.semaphore.acquire()
+            return True
+
+        if limiter.waiting >= limiter.queue_size:
+            return False
+
+        limiter.waiting += 1
+        try:
+            await asyncio.wait_for(limiter.semaphore.acquire(), timeout=self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            limiter.waiting -= 1
+
+    async def _send_overloaded(self, send: Send) -> None:
+        body = b'{"detail":"Servidor saturado, intenta nuevamente en unos segundos"}'
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(self.retry_after).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Estado de cada clase de ruta (para /metrics)"""
+        return {name: limiter.snapshot() for name, limiter in self.limiters.items()}
+
+
+# Instancias creadas por la aplicación (Starlette construye el stack de middlewares de forma perezosa)
+admission_registry: List[AdmissionControlMiddleware] = []
@@ -15,7 +15,8 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         
         # Obtener información del request
         method = request.method
-        url = str(request.url)
+        # El stream de eventos recibe el access token en el query string: no se registra
+        url = str(request.url.remove_query_params("token"))
         client_ip = request.client.host if request.client else "unknown"
         
         # Filtrar logs de endpoints que no necesitamos ver
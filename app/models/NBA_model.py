@@ -3,11 +3,12 @@
 # - sqlalchemy: proporciona herramientas para definir modelos de bases de datos mediante ORM.
 #   - Column: define columnas de la tabla.
 #   - String, Float, Date, DateTime, Integer: tipos de datos que se pueden usar en columnas.
+#   - Index: define índices (simples o compuestos) sobre las columnas de la tabla.
 # - app.config.NBA_database:
 #   - Base: clase base declarativa de SQLAlchemy de la cual heredan todos los modelos ORM.
 
 from datetime import datetime
-from sqlalchemy import Column, String, Float, Date, DateTime, Integer
+from sqlalchemy import Column, String, Float, Date, DateTime, Integer, Index
 from app.config.NBA_database import Base
 
 
@@ -25,6 +26,23 @@ Este modelo está mapeado a la tabla 'players' en la base de datos y se diseñó
 class Player(Base):
     __tablename__ = "players"
 
+    # Índices compuestos para los filtros y ordenamientos del listado de jugadores.
+    # - (team, position): filtro por equipo, o por equipo + posición.
+    # - (position, height_m): filtro por posición con rango/orden por altura.
+    # - height_m, weight_kg, birth_date: rangos y ordenamientos individuales.
+    # - name, created_at: ordenamientos del listado (sort_by=name / created_at).
+    # - updated_at: max(updated_at) para calcular la versión del listado (ETag).
+    __table_args__ = (
+        Index("ix_players_team_position", "team", "position"),
+        Index("ix_players_position_height", "position", "height_m"),
+        Index("ix_players_height_m", "height_m"),
+        Index("ix_players_weight_kg", "weight_kg"),
+        Index("ix_players_birth_date", "birth_date"),
+        Index("ix_players_name", "name"),
+        Index("ix_players_created_at", "created_at"),
+        Index("ix_players_updated_at", "updated_at"),
+    )
+
     # Identificador único del jugador (numérico).
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
 
@@ -49,3 +67,6 @@ class Player(Base):
 
     # Fecha de creación del registro → útil para trazabilidad/auditoría.
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Fecha de última actualización → versión de la fila para ETag/Last-Modified.
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
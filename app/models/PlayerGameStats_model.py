@@ -0,0 +1,89 @@
+"""
+Modelos de estadísticas por partido y de los agregados por temporada
+Una fila por jugador y partido (box score) y una fila por jugador y temporada con las sumas
+"""
+from datetime import datetime
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, SmallInteger, String
+from app.config.NBA_database import Base
+
+# Columnas de conteo del box score (se suman en los agregados por temporada)
+STAT_COLUMNS = (
+    "seconds", "points", "rebounds", "assists", "steals", "blocks", "turnovers",
+    "fgm", "fga", "fg3m", "fg3a", "ftm", "fta",
+)
+
+
+class PlayerGameStats(Base):
+    """
+    Estadísticas de un jugador en un partido.
+
+    La clave primaria (season, player_id, game_id) incluye la temporada: en
+    PostgreSQL la tabla puede crearse particionada por season (PARTITION BY
+    LIST o RANGE), que exige que la clave contenga la columna de partición.
+    La misma clave descarta un box score repetido al reingestar un archivo.
+
+    Los minutos se guardan como segundos jugados (entero).
+    """
+    __tablename__ = "player_game_stats"
+    __table_args__ = (
+        # Consultas por rango de fechas dentro de una temporada (y purgas por partición)
+        Index("ix_player_game_stats_season_date", "season", "game_date"),
+        # Partidos de un jugador en una temporada
+        Index("ix_player_game_stats_player_season", "player_id", "season", "game_date"),
+    )
+
+    season = Column(SmallInteger, primary_key=True)          # año de inicio (2024 = temporada 2024-25)
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    game_id = Column(String(32), primary_key=True)
+    game_date = Column(Date, nullable=False)
+    team = Column(String(255), nullable=True)
+    opponent = Column(String(255), nullable=True)
+
+    seconds = Column(Integer, nullable=False, default=0)
+    points = Column(SmallInteger, nullable=False, default=0)
+    rebounds = Column(SmallInteger, nullable=False, default=0)
+    assists = Column(SmallInteger, nullable=False, default=0)
+    steals = Column(SmallInteger, nullable=False, default=0)
+    blocks = Column(SmallInteger, nullable=False, default=0)
+    turnovers = Column(SmallInteger, nullable=False, default=0)
+    fgm = Column(SmallInteger, nullable=False, default=0)
+    fga = Column(SmallInteger, nullable=False, default=0)
+    fg3m = Column(SmallInteger, nullable=False, default=0)
+    fg3a = Column(SmallInteger, nullable=False, default=0)
+    ftm = Column(SmallInteger, nullable=False, default=0)
+    fta = Column(SmallInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PlayerGameStats(player_id={self.player_id}, game_id='{self.game_id}', points={self.points})>"
+
+
+class PlayerSeasonStats(Base):
+    """
+    Sumas de un jugador en una temporada, actualizadas en la misma transacción
+    que inserta sus partidos. Los promedios se calculan con una lectura por
+    clave primaria, sin recorrer player_game_stats.
+    """
+    __tablename__ = "player_season_stats"
+
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    season = Column(SmallInteger, primary_key=True)
+    games = Column(Integer, nullable=False, default=0)
+
+    seconds = Column(Integer, nullable=False, default=0)
+    points = Column(Integer, nullable=False, default=0)
+    rebounds = Column(Integer, nullable=False, default=0)
+    assists = Column(Integer, nullable=False, default=0)
+    steals = Column(Integer, nullable=False, default=0)
+    blocks = Column(Integer, nullable=False, default=0)
+    turnovers = Column(Integer, nullable=False, default=0)
+    fgm = Column(Integer, nullable=False, default=0)
+    fga = Column(Integer, nullable=False, default=0)
+    fg3m = Column(Integer, nullable=False, default=0)
+    fg3a = Column(Integer, nullable=False, default=0)
+    ftm = Column(Integer, nullable=False, default=0)
+    fta = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<PlayerSeasonStats(player_id={self.player_id}, season={self.season}, games={self.games})>"
@@ -0,0 +1,32 @@
+"""
+Modelo de contadores de limitación de intentos
+Estado compartido del limitador de login cuando hay varios workers
+"""
+from sqlalchemy import Column, String, Float
+from app.config.NBA_database import Base
+
+
+class RateLimitCounter(Base):
+    """
+    Estado de una clave del limitador (ver app/utils/rate_limiter.py)
+
+    - Claves "bucket:*": token bucket → `tokens` y `updated_at`.
+    - Claves "fail:*": ventana deslizante → `window_start`, `current` y `previous`.
+    Los tiempos son segundos epoch (float) para compartir la referencia entre procesos.
+    """
+    __tablename__ = "rate_limit_counters"
+
+    # Clave del contador (ej. "bucket:ip:10.0.0.1", "fail:user:admin")
+    key = Column(String(191), primary_key=True, nullable=False)
+
+    # Token bucket
+    tokens = Column(Float, nullable=True)
+    updated_at = Column(Float, index=True, nullable=False)
+
+    # Ventana deslizante
+    window_start = Column(Float, nullable=True)
+    current = Column(Float, nullable=True)
+    previous = Column(Float, nullable=True)
+
+    def __repr__(self):
+        return f"<RateLimitCounter(key='{self.key}', tokens={self.tokens}, current={self.current})>"
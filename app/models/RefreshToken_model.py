@@ -0,0 +1,46 @@
+"""
+Modelo de Refresh Tokens
+Almacena los refresh tokens opacos (solo su hash) para renovar sesiones sin re-login
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from app.config.NBA_database import Base
+
+
+class RefreshToken(Base):
+    """
+    Modelo de Refresh Token
+
+    - El token se entrega una sola vez al cliente; aquí solo se guarda su SHA-256.
+    - Cada uso rota el token: el anterior queda revocado y apunta a su reemplazo.
+    - Todos los tokens de una misma sesión comparten `family_id`; si un token ya
+      rotado se vuelve a presentar (reutilización), se revoca la familia completa.
+    """
+    __tablename__ = "refresh_tokens"
+
+    # ID único del refresh token
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
+
+    # Usuario dueño de la sesión
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+
+    # Hash SHA-256 (hex) del token entregado al cliente
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+
+    # Identificador de la sesión (cadena de rotaciones)
+    family_id = Column(String(32), index=True, nullable=False)
+
+    # Vencimiento absoluto del token
+    expires_at = Column(DateTime, nullable=False)
+
+    # Revocación: al rotar, al detectar reutilización o al cerrar sesión
+    revoked_at = Column(DateTime, nullable=True)
+
+    # Token que reemplazó a este al rotar
+    replaced_by_id = Column(Integer, ForeignKey("refresh_tokens.id", ondelete="SET NULL"), nullable=True)
+
+    # Auditoría
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id}, family_id='{self.family_id}', revoked_at='{self.revoked_at}')>"
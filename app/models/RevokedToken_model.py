@@ -0,0 +1,43 @@
+"""
+Modelo de Tokens Revocados
+Lista de revocación (deny-list) de access tokens JWT
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime
+from app.config.NBA_database import Base
+
+
+class RevokedToken(Base):
+    """
+    Modelo de revocación de tokens
+
+    Cada fila revoca:
+    - un access token puntual (`jti`), por ejemplo al cerrar sesión, o
+    - todos los tokens de un usuario emitidos hasta `revoked_at` (`jti` nulo),
+      por ejemplo al desactivarlo, eliminarlo o cambiar su contraseña o rol.
+
+    `expires_at` indica desde cuándo la fila ya no es necesaria (todos los tokens
+    que revoca están vencidos) y puede eliminarse.
+    """
+    __tablename__ = "revoked_tokens"
+
+    # ID incremental: permite sincronizar el filtro en memoria por id > último visto
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
+
+    # Identificador del token revocado (claim "jti"); nulo en revocaciones por usuario
+    jti = Column(String(32), index=True, nullable=True)
+
+    # Usuario afectado (sin FK: la revocación debe sobrevivir a la eliminación del usuario)
+    user_id = Column(Integer, index=True, nullable=True)
+
+    # Motivo (logout, user_deleted, user_deactivated, password_changed, ...)
+    reason = Column(String(50), nullable=True)
+
+    # Momento de la revocación
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Momento a partir del cual la fila puede eliminarse
+    expires_at = Column(DateTime, index=True, nullable=False)
+
+    def __repr__(self):
+        return f"<RevokedToken(id={self.id}, jti='{self.jti}', user_id={self.user_id}, reason='{self.reason}')>"
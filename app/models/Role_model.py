@@ -31,6 +31,12 @@ class Role(Base):
     can_delete_players = Column(Boolean, default=False, nullable=False)
     can_manage_users = Column(Boolean, default=False, nullable=False)
 
+    # Permisos compilados en máscara de bits (ver app/utils/permissions.py) y versión.
+    # La versión se incrementa cada vez que cambian los permisos: los tokens emitidos
+    # con una versión anterior dejan de usar su claim "perms".
+    permissions_mask = Column(Integer, default=0, nullable=False)
+    permissions_version = Column(Integer, default=1, nullable=False)
+
     # Estado activo del rol
     is_active = Column(Boolean, default=True, nullable=False)
 
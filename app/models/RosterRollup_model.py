@@ -0,0 +1,45 @@
+"""
+Modelo de los agregados precalculados de la plantilla (rollups)
+Una fila por dimensión (team, position, conference, all) y valor del grupo
+"""
+from datetime import datetime
+from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text, UniqueConstraint
+from app.config.NBA_database import Base
+
+
+class RosterRollup(Base):
+    """
+    Agregados de los jugadores de un grupo.
+
+    - players y las sumas (`*_sum`, `*_sumsq`) se actualizan de forma
+      incremental en cada alta, cambio o baja de jugador: media y desviación
+      estándar se leen sin recorrer la tabla players.
+    - Mínimos, máximos y percentiles no admiten deltas: se guardan en
+      `quantiles` (JSON) y se recalculan solo para los grupos marcados con
+      `quantiles_stale` por una escritura.
+    - La fecha de nacimiento se guarda como días desde 1970-01-01: la edad
+      se calcula al leer, así no envejece con el tiempo.
+    """
+    __tablename__ = "roster_rollups"
+    __table_args__ = (
+        UniqueConstraint("dimension", "key", name="uq_roster_rollups_dimension_key"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
+    dimension = Column(String(20), nullable=False)     # team | position | conference | all
+    key = Column(String(255), nullable=False)          # valor del grupo (ej. "Boston Celtics", "PG")
+
+    players = Column(Integer, nullable=False, default=0)
+    height_sum = Column(Float, nullable=False, default=0.0)
+    height_sumsq = Column(Float, nullable=False, default=0.0)
+    weight_sum = Column(Float, nullable=False, default=0.0)
+    weight_sumsq = Column(Float, nullable=False, default=0.0)
+    birth_sum = Column(Float, nullable=False, default=0.0)
+    birth_sumsq = Column(Float, nullable=False, default=0.0)
+
+    quantiles = Column(Text, nullable=True)            # {"height_m": {"min": .., "p10": .., ...}, ...}
+    quantiles_stale = Column(Boolean, nullable=False, default=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<RosterRollup(dimension='{self.dimension}', key='{self.key}', players={self.players})>"
@@ -20,6 +20,7 @@ class Team(Base):
         longitude (float): Longitud de la ubicación del estadio
         conference (str): Conferencia (East/West)
         division (str): División dentro de la conferencia
+        owm_city_id (int): ID de ciudad en OpenWeatherMap (se resuelve una vez; permite consultas agrupadas)
         created_at (datetime): Fecha de creación del registro
         updated_at (datetime): Fecha de última actualización
     """
@@ -36,6 +37,7 @@ class Team(Base):
     longitude = Column(Float, nullable=False)
     conference = Column(String(20), nullable=False)  # "East" o "West"
     division = Column(String(50), nullable=False)    # "Atlantic", "Central", etc.
+    owm_city_id = Column(Integer, nullable=True)     # ID de ciudad de OpenWeatherMap
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -62,6 +64,7 @@ class Team(Base):
             "longitude": self.longitude,
             "conference": self.conference,
             "division": self.division,
+            "owm_city_id": self.owm_city_id,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
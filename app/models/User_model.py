@@ -35,8 +35,8 @@ class User(Base):
     # Contraseña del usuario (se almacenará hasheada).
     password = Column(String(255), nullable=False)
 
-    # Relación con roles (Foreign Key)
-    role_id = Column(Integer, ForeignKey("roles.id"), nullable=False, default=2)  # 2 = user por defecto
+    # Relación con roles (Foreign Key). Indexada para conteos por rol y el EXISTS al eliminar roles.
+    role_id = Column(Integer, ForeignKey("roles.id"), nullable=False, default=2, index=True)  # 2 = user por defecto
 
     # Estado activo del usuario (para poder habilitar/deshabilitar usuarios).
     is_active = Column(Boolean, default=True, nullable=False)
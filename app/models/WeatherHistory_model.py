@@ -0,0 +1,41 @@
+"""
+Modelo del histórico de clima por equipo
+Una fila por equipo y por intervalo de tiempo (bucket), con valores numéricos compactos
+"""
+from sqlalchemy import Column, Integer, SmallInteger, String, ForeignKey, UniqueConstraint
+from app.config.NBA_database import Base
+
+
+class WeatherHistory(Base):
+    """
+    Observación de clima de un equipo en un intervalo de tiempo.
+
+    `bucket` es el inicio del intervalo en segundos Unix (UTC). Dentro de un
+    mismo intervalo se conserva la última observación.
+
+    Para ocupar poco espacio los decimales se guardan como enteros pequeños:
+    - temperature_dc / feels_like_dc: décimas de °C (22.5 °C → 225)
+    - wind_dkmh: décimas de km/h
+    - visibility_hm: hectómetros (10 km → 100)
+    """
+    __tablename__ = "weather_history"
+    __table_args__ = (
+        # También sirve para las consultas por rango (team_id, bucket BETWEEN ...)
+        UniqueConstraint("team_id", "bucket", name="uq_weather_history_team_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+    bucket = Column(Integer, nullable=False, index=True)   # índice propio para la purga por antigüedad
+
+    temperature_dc = Column(SmallInteger, nullable=False)
+    feels_like_dc = Column(SmallInteger, nullable=True)
+    humidity = Column(SmallInteger, nullable=True)          # %
+    pressure = Column(SmallInteger, nullable=True)          # hPa
+    wind_dkmh = Column(SmallInteger, nullable=True)
+    clouds = Column(SmallInteger, nullable=True)            # %
+    visibility_hm = Column(SmallInteger, nullable=True)
+    icon = Column(String(4), nullable=True)                 # código de ícono de OpenWeatherMap (ej. "01d")
+
+    def __repr__(self):
+        return f"<WeatherHistory(team_id={self.team_id}, bucket={self.bucket}, temperature_dc={self.temperature_dc})>"
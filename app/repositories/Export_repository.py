@@ -0,0 +1,42 @@
+"""
+Repositorio de lectura por lotes para exportaciones masivas
+Lee columnas seleccionadas con cursor del lado del servidor (yield_per)
+"""
+from typing import Iterator, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.NBA_model import Player
+from app.models.Team_model import Team
+
+# Tablas exportables → modelo
+EXPORT_MODELS = {"players": Player, "teams": Team}
+
+
+class ExportRepository:
+    """Lectura secuencial de tablas completas en lotes acotados"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def iter_batches(self, table: str, columns: Sequence[str], batch_size: int) -> Iterator[List[tuple]]:
+        """
+        Filas de la tabla ordenadas por id, en lotes de `batch_size` tuplas.
+
+        Con yield_per SQLAlchemy usa un cursor del lado del servidor en
+        PostgreSQL (psycopg2 named cursor): el motor envía las filas de a un
+        lote y nunca se cargan todas en memoria. En SQLite se leen con fetchmany.
+        """
+        model = EXPORT_MODELS[table]
+        statement = (
+            select(*(getattr(model, column) for column in columns))
+            .order_by(model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = self.db.execute(statement)
+        try:
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+        finally:
+            result.close()
@@ -1,7 +1,99 @@
+from sqlalchemy import text, case, func
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.NBA_model import Player
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
+from datetime import date, datetime
+import logging
+
+logger = logging.getLogger('nba_api.repositories.nba')
+
+
+# Columnas por las que se permite ordenar el listado de jugadores.
+# Todas están cubiertas por un índice: la clave primaria (id), (team, position)
+# para team y los índices simples de Player.__table_args__ para el resto.
+PLAYER_SORT_FIELDS = {
+    "id": Player.id,
+    "name": Player.name,
+    "team": Player.team,
+    "position": Player.position,
+    "height_m": Player.height_m,
+    "weight_kg": Player.weight_kg,
+    "birth_date": Player.birth_date,
+    "created_at": Player.created_at,
+}
+
+# Largo mínimo del texto de búsqueda por nombre: con menos de 3 caracteres
+# '%xx%' no tiene ningún trigrama completo y pg_trgm no puede usar el índice.
+NAME_SEARCH_MIN_LENGTH = 3
+
+# Indica qué índice de búsqueda por nombre quedó disponible al iniciar la app:
+# "trgm" (PostgreSQL + pg_trgm), "fts5" (SQLite) o None (se usa LIKE).
+_NAME_SEARCH_BACKEND: Optional[str] = None
+
+
+def ensure_name_search_index(engine) -> Optional[str]:
+    """
+    Crea (si no existen) los índices de búsqueda por nombre de jugador.
+
+    - PostgreSQL: extensión pg_trgm + índice GIN sobre lower(name).
+    - SQLite: tabla virtual FTS5 sincronizada con 'players' mediante triggers.
+
+    Si el motor no soporta la funcionalidad (p. ej. usuario sin permisos para
+    crear la extensión) se registra una advertencia y la búsqueda usa LIKE.
+    """
+    global _NAME_SEARCH_BACKEND
+    dialect = engine.dialect.name
+
+    try:
+        if dialect == "postgresql":
+            with engine.begin() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_players_name_trgm "
+                    "ON players USING gin (lower(name) gin_trgm_ops)"
+                ))
+            _NAME_SEARCH_BACKEND = "trgm"
+
+        elif dialect == "sqlite":
+            with engine.begin() as conn:
+                exists = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='players_fts'"
+                )).first()
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS players_fts USING fts5("
+                    "name, content='players', content_rowid='id', "
+                    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+                ))
+                conn.execute(text(
+                    "CREATE TRIGGER IF NOT EXISTS players_fts_ai AFTER INSERT ON players BEGIN "
+                    "INSERT INTO players_fts(rowid, name) VALUES (new.id, new.name); END"
+                ))
+                conn.execute(text(
+                    "CREATE TRIGGER IF NOT EXISTS players_fts_ad AFTER DELETE ON players BEGIN "
+                    "INSERT INTO players_fts(players_fts, rowid, name) VALUES ('delete', old.id, old.name); END"
+                ))
+                conn.execute(text(
+                    "CREATE TRIGGER IF NOT EXISTS players_fts_au AFTER UPDATE OF name ON players BEGIN "
+                    "INSERT INTO players_fts(players_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+                    "INSERT INTO players_fts(rowid, name) VALUES (new.id, new.name); END"
+                ))
+                if not exists:
+                    # Indexar las filas que ya existían antes de crear la tabla virtual
+                    conn.execute(text("INSERT INTO players_fts(players_fts) VALUES ('rebuild')"))
+            _NAME_SEARCH_BACKEND = "fts5"
+
+    except SQLAlchemyError as e:
+        logger.warning(f"⚠️ No se pudo crear el índice de búsqueda por nombre ({dialect}): {e}. Se usará LIKE.")
+        _NAME_SEARCH_BACKEND = None
+
+    return _NAME_SEARCH_BACKEND
+
+
+def _escape_like(value: str) -> str:
+    """Escapa los comodines de LIKE para buscar el texto literal"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 class PlayerRepository:
@@ -17,6 +109,158 @@ class PlayerRepository:
         """Retorna todos los jugadores con paginación"""
         return self.db.query(Player).offset(skip).limit(limit).all()
 
+    def _filtered_query(
+        self,
+        team: Optional[str] = None,
+        position: Optional[str] = None,
+        min_height: Optional[float] = None,
+        max_height: Optional[float] = None,
+        min_weight: Optional[float] = None,
+        max_weight: Optional[float] = None,
+        born_after: Optional[date] = None,
+        born_before: Optional[date] = None,
+    ):
+        """Construye la consulta base con los filtros indicados (los None se ignoran)"""
+        query = self.db.query(Player)
+        if team is not None:
+            query = query.filter(Player.team == team)
+        if position is not None:
+            query = query.filter(Player.position == position)
+        if min_height is not None:
+            query = query.filter(Player.height_m >= min_height)
+        if max_height is not None:
+            query = query.filter(Player.height_m <= max_height)
+        if min_weight is not None:
+            query = query.filter(Player.weight_kg >= min_weight)
+        if max_weight is not None:
+            query = query.filter(Player.weight_kg <= max_weight)
+        if born_after is not None:
+            query = query.filter(Player.birth_date >= born_after)
+        if born_before is not None:
+            query = query.filter(Player.birth_date <= born_before)
+        return query
+
+    def get_players_filtered(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        sort_by: str = "id",
+        order: str = "asc",
+        **filters
+    ) -> List[Player]:
+        """
+        Retorna jugadores aplicando filtros, ordenamiento y paginación en SQL.
+        Se agrega el id como criterio de desempate para que la paginación sea estable.
+        """
+        return self._sorted_query(sort_by, order, **filters).offset(skip).limit(limit).all()
+
+    def get_players_rows_filtered(
+        self,
+        columns: Sequence[str],
+        skip: int = 0,
+        limit: int = 100,
+        sort_by: str = "id",
+        order: str = "asc",
+        **filters
+    ) -> List[Row]:
+        """
+        Igual que get_players_filtered pero retorna solo las columnas pedidas como filas
+        livianas (sin instanciar objetos ORM), para serializarlas directamente.
+        """
+        entities = [getattr(Player, column) for column in columns]
+        query = self._sorted_query(sort_by, order, **filters).with_entities(*entities)
+        return query.offset(skip).limit(limit).all()
+
+    def _sorted_query(self, sort_by: str = "id", order: str = "asc", **filters):
+        """Aplica filtros y ordenamiento (con el id como desempate para paginación estable)"""
+        column = PLAYER_SORT_FIELDS.get(sort_by, Player.id)
+        direction = column.desc() if order == "desc" else column.asc()
+        tiebreaker = Player.id.desc() if order == "desc" else Player.id.asc()
+
+        query = self._filtered_query(**filters).order_by(direction)
+        if column is not Player.id:
+            query = query.order_by(tiebreaker)
+        return query
+
+    def search_players_by_name(self, query: str, limit: int = 10) -> List[dict]:
+        """
+        Busca jugadores por nombre para autocompletado.
+        Prioriza coincidencias al inicio del nombre, luego al inicio de una palabra y
+        finalmente coincidencias aproximadas (tolerantes a errores en PostgreSQL).
+        Siempre retorna como máximo `limit` filas.
+        """
+        term = " ".join(query.lower().split())
+        if not term:
+            return []
+
+        if _NAME_SEARCH_BACKEND == "trgm":
+            rows = self.db.execute(text(
+                "SELECT id, name, team, position FROM players "
+                "WHERE lower(name) LIKE :contains ESCAPE '\\' OR :term <% lower(name) "
+                "ORDER BY "
+                "  CASE WHEN lower(name) LIKE :prefix ESCAPE '\\' THEN 0 "
+                "       WHEN lower(name) LIKE :word ESCAPE '\\' THEN 1 ELSE 2 END, "
+                "  word_similarity(:term, lower(name)) DESC, name "
+                "LIMIT :limit"
+            ), {
+                "term": term,
+                "prefix": f"{_escape_like(term)}%",
+                "word": f"% {_escape_like(term)}%",
+                "contains": f"%{_escape_like(term)}%",
+                "limit": limit,
+            }).mappings().all()
+            return [dict(row) for row in rows]
+
+        if _NAME_SEARCH_BACKEND == "fts5":
+            # Cada palabra se convierte en una consulta de prefijo: "lebr"* AND "ja"*
+            tokens = ['"' + token.replace('"', '""') + '"*' for token in term.split()]
+            rows = self.db.execute(text(
+                "SELECT p.id, p.name, p.team, p.position FROM players_fts "
+                "JOIN players p ON p.id = players_fts.rowid "
+                "WHERE players_fts MATCH :match "
+                "ORDER BY CASE WHEN lower(p.name) LIKE :prefix ESCAPE '\\' THEN 0 ELSE 1 END, "
+                "  bm25(players_fts), p.name "
+                "LIMIT :limit"
+            ), {
+                "match": " AND ".join(tokens),
+                "prefix": f"{_escape_like(term)}%",
+                "limit": limit,
+            }).mappings().all()
+            return [dict(row) for row in rows]
+
+        # Sin índice especializado: LIKE con la misma prioridad de prefijo
+        prefix_rank = case((Player.name.ilike(f"{_escape_like(term)}%", escape="\\"), 0), else_=1)
+        rows = (
+            self.db.query(Player.id, Player.name, Player.team, Player.position)
+            .filter(Player.name.ilike(f"%{_escape_like(term)}%", escape="\\"))
+            .order_by(prefix_rank, Player.name)
+            .limit(limit)
+            .all()
+        )
+        return [row._asdict() for row in rows]
+
+    def get_player_version(self, player_id: int) -> Optional[datetime]:
+        """
+        Retorna el updated_at de un jugador (None si no existe).
+        Solo lee una columna por clave primaria, sin cargar la fila completa.
+        """
+        return self.db.query(Player.updated_at).filter(Player.id == player_id).scalar()
+
+    def get_players_version(self, **filters) -> Tuple[int, Optional[int], Optional[datetime]]:
+        """
+        Retorna (conteo, max(id), max(updated_at)) de los jugadores que cumplen los filtros.
+        Detecta altas (conteo/max id), cambios (max updated_at) y bajas (conteo).
+        """
+        query = self._filtered_query(**filters).with_entities(
+            func.count(Player.id), func.max(Player.id), func.max(Player.updated_at)
+        )
+        count, max_id, max_updated = query.one()
+        return count, max_id, max_updated
+
+    def get_player_team_names(self) -> List[Tuple[int, str, str]]:
+        """Retorna (id, nombre, equipo) de todos los jugadores, ordenados por id"""
+        return self.db.query(Player.id, Player.name, Player.team).order_by(Player.id).all()
+
     def get_player_by_id(self, player_id: int) -> Optional[Player]:
         """Busca un jugador por su ID numérico"""
         return self.db.query(Player).filter(Player.id == player_id).first()
@@ -0,0 +1,104 @@
+"""
+Repositorio de estadísticas por partido y agregados por temporada
+Carga masiva idempotente (ON CONFLICT DO NOTHING) y deltas por temporada en la misma transacción
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.NBA_model import Player
+from app.models.PlayerGameStats_model import STAT_COLUMNS, PlayerGameStats, PlayerSeasonStats
+from app.utils.upsert import insert_statement, supports_on_conflict, upsert_rows
+
+
+def season_deltas(games: Iterable[Dict]) -> List[Dict]:
+    """Suma por (player_id, season) de los partidos recién insertados"""
+    totals: Dict[tuple, Dict] = defaultdict(lambda: dict.fromkeys(("games",) + STAT_COLUMNS, 0))
+    for game in games:
+        total = totals[(game["player_id"], game["season"])]
+        total["games"] += 1
+        for column in STAT_COLUMNS:
+            total[column] += game[column]
+    return [
+        {"player_id": player_id, "season": season, **total}
+        for (player_id, season), total in totals.items()
+    ]
+
+
+class PlayerStatsRepository:
+    """Acceso a player_game_stats y player_season_stats"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_existing_player_ids(self, player_ids: Iterable[int]) -> Set[int]:
+        """IDs de la lista que existen en players"""
+        ids = list(set(player_ids))
+        if not ids:
+            return set()
+        return {row[0] for row in self.db.query(Player.id).filter(Player.id.in_(ids)).all()}
+
+    def insert_games(self, rows: List[Dict]) -> int:
+        """
+        Inserta un lote de box scores y suma los partidos nuevos a los
+        agregados por temporada, en una sola transacción.
+
+        Los partidos ya cargados (misma season, player_id y game_id) se
+        ignoran con ON CONFLICT DO NOTHING; RETURNING indica cuáles entraron,
+        así reingestar un archivo no duplica los agregados.
+
+        Returns:
+            int: Partidos insertados
+        """
+        if not rows:
+            return 0
+        try:
+            if supports_on_conflict(self.db):
+                statement = (
+                    insert_statement(self.db, PlayerGameStats)
+                    .on_conflict_do_nothing(index_elements=["season", "player_id", "game_id"])
+                    .returning(PlayerGameStats.player_id, PlayerGameStats.season,
+                               *(getattr(PlayerGameStats, column) for column in STAT_COLUMNS))
+                )
+                inserted = [dict(row._mapping) for row in self.db.execute(statement, rows)]
+            else:
+                inserted = []
+                for row in rows:
+                    if self.db.get(PlayerGameStats, (row["season"], row["player_id"], row["game_id"])) is None:
+                        self.db.add(PlayerGameStats(**row))
+                        inserted.append(row)
+                self.db.flush()
+
+            upsert_rows(
+                self.db,
+                PlayerSeasonStats,
+                season_deltas(inserted),
+                ("player_id", "season"),
+                accumulate=("games",) + STAT_COLUMNS,
+            )
+            self.db.commit()
+            return len(inserted)
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+
+    def get_season_stats(self, player_id: int, season: Optional[int] = None) -> List[PlayerSeasonStats]:
+        """Agregados del jugador (lectura por clave primaria), temporada más reciente primero"""
+        query = self.db.query(PlayerSeasonStats).filter(PlayerSeasonStats.player_id == player_id)
+        if season is not None:
+            query = query.filter(PlayerSeasonStats.season == season)
+        return query.order_by(PlayerSeasonStats.season.desc()).all()
+
+    def get_games(self, player_id: int, season: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[PlayerGameStats]:
+        """Partidos del jugador, más recientes primero (índice player_id, season, game_date)"""
+        query = self.db.query(PlayerGameStats).filter(PlayerGameStats.player_id == player_id)
+        if season is not None:
+            query = query.filter(PlayerGameStats.season == season)
+        return (
+            query.order_by(PlayerGameStats.season.desc(), PlayerGameStats.game_date.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
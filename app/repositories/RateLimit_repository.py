@@ -0,0 +1,87 @@
+from typing import Callable, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.models.RateLimit_model import RateLimitCounter
+from app.utils.rate_limiter import RateLimitBackend, refill_bucket, roll_window, window_estimate
+
+
+class DatabaseRateLimitBackend(RateLimitBackend):
+    """
+    Backend compartido del limitador sobre la tabla rate_limit_counters.
+    Todos los workers ven el mismo estado; cada operación es una transacción
+    corta con bloqueo de fila (SELECT ... FOR UPDATE en PostgreSQL).
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+
+    def _locked_row(self, db: Session, key: str, now: float) -> RateLimitCounter:
+        row = db.query(RateLimitCounter).filter(RateLimitCounter.key == key).with_for_update().first()
+        if row is None:
+            row = RateLimitCounter(key=key, updated_at=now)
+            db.add(row)
+        return row
+
+    def _run(self, operation):
+        """Ejecuta la operación en su propia transacción; reintenta una vez si otra la creó en paralelo"""
+        for attempt in range(2):
+            db = self.session_factory()
+            try:
+                result = operation(db)
+                db.commit()
+                return result
+            except IntegrityError:
+                db.rollback()
+                if attempt:
+                    raise
+            except SQLAlchemyError:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+    def consume(self, key: str, capacity: float, refill_per_second: float, now: float) -> float:
+        def operation(db: Session) -> float:
+            row = self._locked_row(db, key, now)
+            tokens = capacity if row.tokens is None else refill_bucket(row.tokens, row.updated_at, now, capacity, refill_per_second)
+            row.updated_at = now
+            if tokens >= 1.0:
+                row.tokens = tokens - 1.0
+                return 0.0
+            row.tokens = tokens
+            return (1.0 - tokens) / refill_per_second
+        return self._run(operation)
+
+    def increment(self, key: str, window: float, now: float) -> float:
+        def operation(db: Session) -> float:
+            row = self._locked_row(db, key, now)
+            if row.window_start is None:
+                start, current, previous = now, 0.0, 0.0
+            else:
+                start, current, previous = roll_window(row.window_start, row.current, row.previous, now, window)
+            current += 1.0
+            row.window_start, row.current, row.previous, row.updated_at = start, current, previous, now
+            return window_estimate(start, current, previous, now, window)
+        return self._run(operation)
+
+    def count(self, key: str, window: float, now: float) -> Tuple[float, float]:
+        db = self.session_factory()
+        try:
+            row = db.query(RateLimitCounter).filter(RateLimitCounter.key == key).first()
+            if row is None or row.window_start is None:
+                return 0.0, 0.0
+            start, current, previous = roll_window(row.window_start, row.current, row.previous, now, window)
+            return window_estimate(start, current, previous, now, window), start + window - now
+        finally:
+            db.close()
+
+    def reset(self, key: str) -> None:
+        def operation(db: Session) -> None:
+            db.query(RateLimitCounter).filter(RateLimitCounter.key == key).delete(synchronize_session=False)
+        self._run(operation)
+
+    def delete_stale(self, older_than: float) -> int:
+        """Elimina contadores sin actividad desde `older_than` (limpieza periódica, ver LoginThrottle.prune)"""
+        def operation(db: Session) -> int:
+            return db.query(RateLimitCounter).filter(RateLimitCounter.updated_at < older_than).delete(synchronize_session=False)
+        return self._run(operation)
@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.RefreshToken_model import RefreshToken
+
+
+class RefreshTokenRepository:
+    """
+    Repositorio para los refresh tokens.
+    Solo maneja persistencia; la lógica de rotación vive en AuthService.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def create_token(self, user_id: int, token_hash: str, family_id: str, expires_at: datetime) -> RefreshToken:
+        """Registra un nuevo refresh token (sin confirmar la transacción)"""
+        token = RefreshToken(
+            user_id=user_id,
+            token_hash=token_hash,
+            family_id=family_id,
+            expires_at=expires_at
+        )
+        self.db.add(token)
+        self.db.flush()
+        return token
+
+    def get_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        """Busca un refresh token por su hash"""
+        return self.db.query(RefreshToken).filter(RefreshToken.token_hash == token_hash).first()
+
+    def mark_rotated(self, token_id: int, now: datetime) -> bool:
+        """
+        Revoca el token solo si sigue vigente (UPDATE condicional).
+        Retorna False si otra petición ya lo había usado: eso es una reutilización.
+        """
+        result = self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == token_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        return result.rowcount == 1
+
+    def set_replaced_by(self, token_id: int, replaced_by_id: int) -> None:
+        """Enlaza el token rotado con su reemplazo"""
+        self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == token_id)
+            .values(replaced_by_id=replaced_by_id)
+        )
+
+    def revoke_family(self, family_id: str, now: datetime) -> int:
+        """Revoca todos los tokens vigentes de una sesión"""
+        try:
+            result = self.db.execute(
+                update(RefreshToken)
+                .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=now)
+            )
+            self.db.commit()
+            return result.rowcount
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+
+    def revoke_user_tokens(self, user_id: int, now: datetime) -> int:
+        """Revoca todas las sesiones de un usuario"""
+        try:
+            result = self.db.execute(
+                update(RefreshToken)
+                .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=now)
+            )
+            self.db.commit()
+            return result.rowcount
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+
+    def delete_expired(self, now: datetime) -> int:
+        """Elimina los tokens vencidos (mantenimiento de la tabla)"""
+        try:
+            deleted = self.db.query(RefreshToken).filter(RefreshToken.expires_at < now).delete(synchronize_session=False)
+            self.db.commit()
+            return deleted
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
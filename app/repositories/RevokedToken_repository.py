@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, exists, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.RevokedToken_model import RevokedToken
+
+
+class RevokedTokenRepository:
+    """
+    Repositorio de la lista de revocación de tokens.
+    Solo maneja persistencia; el filtro en memoria vive en app/utils/token_revocation.py.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def _add(self, entry: RevokedToken) -> RevokedToken:
+        try:
+            self.db.add(entry)
+            self.db.commit()
+            self.db.refresh(entry)
+            return entry
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+
+    def revoke_jti(self, jti: str, user_id: Optional[int], expires_at: datetime, reason: str) -> RevokedToken:
+        """Revoca un access token puntual hasta su vencimiento"""
+        return self._add(RevokedToken(jti=jti, user_id=user_id, reason=reason, expires_at=expires_at))
+
+    def revoke_user(self, user_id: int, revoked_at: datetime, expires_at: datetime, reason: str) -> RevokedToken:
+        """Revoca todos los tokens del usuario emitidos hasta `revoked_at`"""
+        return self._add(RevokedToken(user_id=user_id, reason=reason, revoked_at=revoked_at, expires_at=expires_at))
+
+    def get_entries_after(self, after_id: int, now: datetime) -> List[Tuple[int, Optional[str], Optional[int]]]:
+        """Retorna (id, jti, user_id) de las revocaciones vigentes con id mayor a `after_id`"""
+        return (
+            self.db.query(RevokedToken.id, RevokedToken.jti, RevokedToken.user_id)
+            .filter(RevokedToken.id > after_id, RevokedToken.expires_at > now)
+            .order_by(RevokedToken.id)
+            .all()
+        )
+
+    def is_revoked(self, jti: Optional[str], user_id: Optional[int], issued_at: Optional[datetime]) -> bool:
+        """
+        Verificación exacta (solo se llama cuando el filtro de Bloom da positivo):
+        el jti está revocado, o existe una revocación del usuario en el mismo milisegundo
+        de la emisión o después (`revoked_at` e iat se guardan con milisegundos)
+        """
+        conditions = []
+        if jti:
+            conditions.append(RevokedToken.jti == jti)
+        if user_id is not None:
+            user_condition = and_(RevokedToken.user_id == user_id, RevokedToken.jti.is_(None))
+            if issued_at is not None:
+                user_condition = and_(user_condition, RevokedToken.revoked_at >= issued_at)
+            conditions.append(user_condition)
+        if not conditions:
+            return False
+        return self.db.query(exists().where(or_(*conditions))).scalar()
+
+    def delete_expired(self, now: datetime) -> int:
+        """Elimina las revocaciones que ya no afectan a ningún token vigente"""
+        try:
+            deleted = self.db.query(RevokedToken).filter(RevokedToken.expires_at <= now).delete(synchronize_session=False)
+            self.db.commit()
+            return deleted
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
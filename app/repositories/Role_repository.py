@@ -2,11 +2,14 @@
 Repositorio de Roles
 Maneja las operaciones CRUD de roles en la base de datos
 """
+from sqlalchemy import func, exists, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.Role_model import Role
+from app.models.User_model import User
 from app.Schema.Role_Schema import RoleCreate, RoleUpdate
-from typing import List, Optional
+from app.utils.permissions import compile_permissions_mask
+from typing import List, Optional, Tuple
 
 
 class RoleRepository:
@@ -22,6 +25,35 @@ class RoleRepository:
         except SQLAlchemyError as e:
             raise Exception(f"Error al obtener roles: {str(e)}")
 
+    def get_roles_with_user_count(self, skip: int = 0, limit: int = 100) -> List[Tuple[Role, int]]:
+        """
+        Obtiene los roles con su cantidad de usuarios en una sola consulta.
+        El conteo se hace con GROUP BY sobre users.role_id, sin cargar los usuarios.
+        """
+        try:
+            counts = (
+                select(User.role_id, func.count(User.id).label("users_count"))
+                .group_by(User.role_id)
+                .subquery()
+            )
+            return (
+                self.db.query(Role, func.coalesce(counts.c.users_count, 0))
+                .outerjoin(counts, counts.c.role_id == Role.id)
+                .order_by(Role.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener roles con usuarios: {str(e)}")
+
+    def role_has_users(self, role_id: int) -> bool:
+        """Verifica con EXISTS si el rol tiene al menos un usuario asignado"""
+        try:
+            return self.db.query(exists().where(User.role_id == role_id)).scalar()
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al verificar usuarios del rol: {str(e)}")
+
     def get_role_by_id(self, role_id: int) -> Optional[Role]:
         """Obtiene un rol por ID"""
         try:
@@ -45,6 +77,8 @@ class RoleRepository:
                 raise ValueError(f"El rol '{role_data.name}' ya existe")
 
             new_role = Role(**role_data.model_dump())
+            new_role.permissions_mask = compile_permissions_mask(new_role)
+            new_role.permissions_version = 1
             self.db.add(new_role)
             self.db.commit()
             self.db.refresh(new_role)
@@ -60,11 +94,20 @@ class RoleRepository:
             if not role:
                 return None
 
+            previous_name = role.name
+
             # Actualizar solo los campos proporcionados
             update_data = role_data.model_dump(exclude_unset=True)
             for key, value in update_data.items():
                 setattr(role, key, value)
 
+            # Recompilar la máscara; si cambió (o el nombre, usado para is_admin),
+            # nueva versión: los claims de los tokens previos dejan de ser válidos
+            new_mask = compile_permissions_mask(role)
+            if new_mask != role.permissions_mask or role.name != previous_name:
+                role.permissions_mask = new_mask
+                role.permissions_version = (role.permissions_version or 0) + 1
+
             self.db.commit()
             self.db.refresh(role)
             return role
@@ -72,6 +115,38 @@ class RoleRepository:
             self.db.rollback()
             raise Exception(f"Error al actualizar rol: {str(e)}")
 
+    def get_role_permissions(self, role_id: int) -> Optional[Tuple[int, int, str]]:
+        """Obtiene (máscara, versión, nombre) de un rol sin cargar la entidad completa"""
+        try:
+            return (
+                self.db.query(Role.permissions_mask, Role.permissions_version, Role.name)
+                .filter(Role.id == role_id)
+                .first()
+            )
+        except SQLAlchemyError as e:
+            raise Exception(f"Error al obtener permisos del rol: {str(e)}")
+
+    def sync_permission_masks(self) -> int:
+        """
+        Recompila la máscara de todos los roles: roles creados por SQL y roles
+        de bases anteriores, cuya columna agrega ensure_schema_upgrades con
+        máscara 0. Retorna la cantidad de roles actualizados.
+        """
+        try:
+            updated = 0
+            for role in self.db.query(Role).all():
+                mask = compile_permissions_mask(role)
+                if role.permissions_mask != mask:
+                    role.permissions_mask = mask
+                    role.permissions_version = (role.permissions_version or 0) + 1
+                    updated += 1
+            if updated:
+                self.db.commit()
+            return updated
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Error al sincronizar permisos de roles: {str(e)}")
+
     def delete_role(self, role_id: int) -> bool:
         """Elimina un rol (solo si no tiene usuarios asignados)"""
         try:
@@ -79,8 +154,8 @@ class RoleRepository:
             if not role:
                 return False
 
-            # Verificar si tiene usuarios asignados
-            if role.users:
+            # Verificar si tiene usuarios asignados (EXISTS, sin cargar los usuarios)
+            if self.role_has_users(role_id):
                 raise ValueError(f"No se puede eliminar el rol '{role.name}' porque tiene usuarios asignados")
 
             self.db.delete(role)
@@ -0,0 +1,119 @@
+"""
+Repositorio de agregados de la plantilla calculados en la base de datos
+GROUP BY por equipo, posición o conferencia sobre players (+ teams para la conferencia)
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, literal
+from sqlalchemy.orm import Session
+
+from app.models.NBA_model import Player
+from app.models.Team_model import Team
+
+# Dimensiones de agrupación permitidas
+GROUP_DIMENSIONS = ("team", "position", "conference", "all")
+
+# Jugadores cuyo equipo no está en la tabla teams
+UNKNOWN_CONFERENCE = "N/D"
+
+# Métricas agregadas: nombre → columna (la fecha de nacimiento se agrega como días desde 1970-01-01)
+METRICS = ("height", "weight", "birth")
+
+
+class RosterAnalyticsRepository:
+    """Consultas de agregación sobre la tabla players"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    def _birth_days(self):
+        """Fecha de nacimiento como días desde 1970-01-01 (expresión según el motor)"""
+        if self.dialect == "postgresql":
+            return Player.birth_date - func.date("1970-01-01")
+        return func.julianday(Player.birth_date) - 2440587.5
+
+    def _metric_columns(self) -> Dict[str, object]:
+        return {"height": Player.height_m, "weight": Player.weight_kg, "birth": self._birth_days()}
+
+    def _grouped(self, dimension: str, columns: Sequence, keys: Optional[Iterable[str]] = None):
+        """Consulta agrupada por la dimensión con las columnas indicadas"""
+        if dimension == "team":
+            group = Player.team
+        elif dimension == "position":
+            group = Player.position
+        elif dimension == "conference":
+            group = func.coalesce(Team.conference, UNKNOWN_CONFERENCE)
+        elif dimension == "all":
+            group = literal("all")
+        else:
+            raise ValueError(f"Dimensión no soportada: {dimension}")
+
+        query = self.db.query(group.label("key"), *columns)
+        if dimension == "conference":
+            query = query.select_from(Player).outerjoin(Team, Team.name == Player.team)
+        if keys is not None:
+            query = query.filter(group.in_(list(keys)))
+        if dimension != "all":
+            query = query.group_by(group)
+        return query, group
+
+    def get_group_summaries(self, dimension: str, keys: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Conteo, suma, suma de cuadrados, mínimo y máximo de cada métrica por grupo,
+        en una sola consulta GROUP BY.
+        """
+        columns = [func.count(Player.id).label("players")]
+        for name, column in self._metric_columns().items():
+            columns += [
+                func.sum(column).label(f"{name}_sum"),
+                func.sum(column * column).label(f"{name}_sumsq"),
+                func.min(column).label(f"{name}_min"),
+                func.max(column).label(f"{name}_max"),
+            ]
+        query, _ = self._grouped(dimension, columns, keys)
+        return [dict(row._mapping) for row in query.all() if row.players]
+
+    def get_group_quantiles(
+        self, dimension: str, percentiles: Sequence[int], keys: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Percentiles de cada métrica por grupo: {grupo: {métrica: {"p10": .., ...}}}.
+
+        PostgreSQL los calcula con percentile_cont en el mismo GROUP BY. Otros
+        motores (SQLite) no tienen funciones de percentil: se leen los valores
+        ordenados por grupo y se calculan con NumPy (misma interpolación lineal).
+        """
+        metric_columns = self._metric_columns()
+        if self.dialect == "postgresql":
+            columns = [
+                func.percentile_cont(p / 100).within_group(column).label(f"{name}_p{p}")
+                for name, column in metric_columns.items()
+                for p in percentiles
+            ]
+            query, _ = self._grouped(dimension, columns, keys)
+            return {
+                row.key: {
+                    name: {f"p{p}": getattr(row, f"{name}_p{p}") for p in percentiles}
+                    for name in metric_columns
+                }
+                for row in query.all()
+            }
+
+        query, group = self._grouped(dimension, list(metric_columns.values()), keys)
+        if dimension != "all":
+            query = query.group_by(None).order_by(group)
+        values: Dict[str, List[Tuple[float, ...]]] = {}
+        for key, *row in query.all():
+            values.setdefault(key, []).append(row)
+
+        quantiles = {}
+        for key, rows in values.items():
+            matrix = np.asarray(rows, dtype=np.float64)
+            points = np.percentile(matrix, percentiles, axis=0)   # una fila por percentil
+            quantiles[key] = {
+                name: {f"p{p}": float(points[i, j]) for i, p in enumerate(percentiles)}
+                for j, name in enumerate(metric_columns)
+            }
+        return quantiles
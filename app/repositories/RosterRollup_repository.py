@@ -0,0 +1,103 @@
+"""
+Repositorio de los agregados precalculados de la plantilla (tabla roster_rollups)
+Deltas incrementales por escritura de jugadores, reconstrucción completa y lectura
+"""
+from datetime import datetime
+from typing import Dict, List
+
+import orjson
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.RosterRollup_model import RosterRollup
+from app.utils.upsert import upsert_rows
+
+# Columnas que se suman con cada delta
+SUM_COLUMNS = (
+    "players",
+    "height_sum", "height_sumsq",
+    "weight_sum", "weight_sumsq",
+    "birth_sum", "birth_sumsq",
+)
+
+
+class RosterRollupRepository:
+    """Acceso a la tabla roster_rollups"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_deltas(self, deltas: List[Dict]) -> None:
+        """
+        Suma los deltas a sus grupos (creándolos si no existen) y los marca para
+        recalcular percentiles. Los grupos que quedan sin jugadores se eliminan.
+
+        Args:
+            deltas: Diccionarios con dimension, key y las columnas de SUM_COLUMNS
+        """
+        if not deltas:
+            return
+        try:
+            upsert_rows(
+                self.db,
+                RosterRollup,
+                [{**delta, "quantiles_stale": True} for delta in deltas],
+                ("dimension", "key"),
+                update=("quantiles_stale",),
+                accumulate=SUM_COLUMNS,
+            )
+            self.db.query(RosterRollup).filter(RosterRollup.players <= 0).delete(synchronize_session=False)
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+
+    def replace_all(self, rows: List[Dict]) -> int:
+        """Reemplaza todos los agregados en una transacción (reconstrucción completa)"""
+        try:
+            self.db.query(RosterRollup).delete(synchronize_session=False)
+            if rows:
+                self.db.bulk_insert_mappings(RosterRollup, rows)
+            self.db.commit()
+            return len(rows)
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+
+    def get_rollups(self, dimension: str) -> List[RosterRollup]:
+        """Agregados de una dimensión ordenados por grupo"""
+        return (
+            self.db.query(RosterRollup)
+            .filter(RosterRollup.dimension == dimension)
+            .order_by(RosterRollup.key)
+            .all()
+        )
+
+    def get_stale_versions(self, dimension: str) -> Dict[str, datetime]:
+        """Grupos de la dimensión con percentiles pendientes de recalcular → su updated_at"""
+        return dict(
+            self.db.query(RosterRollup.key, RosterRollup.updated_at)
+            .filter(RosterRollup.dimension == dimension, RosterRollup.quantiles_stale.is_(True))
+            .all()
+        )
+
+    def set_quantiles(self, dimension: str, quantiles: Dict[str, Dict], versions: Dict[str, datetime]) -> None:
+        """
+        Guarda los percentiles recalculados de varios grupos y los marca como vigentes.
+        Un grupo que recibió otro delta mientras se calculaba (updated_at distinto)
+        queda pendiente para la próxima lectura.
+        """
+        try:
+            for key, values in quantiles.items():
+                self.db.query(RosterRollup).filter(
+                    RosterRollup.dimension == dimension,
+                    RosterRollup.key == key,
+                    RosterRollup.updated_at == versions[key],
+                ).update(
+                    {"quantiles": orjson.dumps(values).decode(), "quantiles_stale": False},
+                    synchronize_session=False,
+                )
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
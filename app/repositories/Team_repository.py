@@ -4,11 +4,27 @@ Maneja las operaciones CRUD de la tabla 'teams'
 """
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
+from datetime import datetime
 
 from app.models.Team_model import Team
 from app.models.NBA_model import Player
 
+# Funciones a ejecutar tras cada alta, cambio o baja de equipos confirmada
+# (cachés en memoria derivadas de la tabla, como el snapshot del mapa)
+_team_change_listeners: List[Callable[[], None]] = []
+
+
+def on_team_change(listener: Callable[[], None]) -> Callable[[], None]:
+    """Registra una función que se llama cuando cambia la tabla de equipos"""
+    _team_change_listeners.append(listener)
+    return listener
+
+
+def _notify_team_change() -> None:
+    for listener in _team_change_listeners:
+        listener()
+
 
 class TeamRepository:
     """
@@ -39,6 +55,7 @@ class TeamRepository:
         self.db.add(team)
         self.db.commit()
         self.db.refresh(team)
+        _notify_team_change()
         return team
     
     def get_team_by_id(self, team_id: int) -> Optional[Team]:
@@ -78,6 +95,15 @@ class TeamRepository:
         """
         return self.db.query(Team).offset(skip).limit(limit).all()
     
+    def get_all_teams_ordered(self) -> List[Team]:
+        """
+        Obtiene todos los equipos ordenados por ID, sin paginación.
+        
+        Returns:
+            List[Team]: Lista completa de equipos
+        """
+        return self.db.query(Team).order_by(Team.id).all()
+    
     def get_teams_by_conference(self, conference: str) -> List[Team]:
         """
         Obtiene equipos filtrados por conferencia.
@@ -123,8 +149,28 @@ class TeamRepository:
         
         self.db.commit()
         self.db.refresh(team)
+        _notify_team_change()
         return team
     
+    def set_owm_city_id(self, name: str, city_id: int) -> bool:
+        """
+        Guarda el ID de ciudad de OpenWeatherMap resuelto para un equipo.
+        
+        Args:
+            name: Nombre del equipo
+            city_id: ID de ciudad de OpenWeatherMap
+            
+        Returns:
+            bool: True si se actualizó, False si el equipo no existe
+        """
+        updated = (
+            self.db.query(Team)
+            .filter(Team.name == name)
+            .update({Team.owm_city_id: city_id}, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated > 0
+    
     def delete_team(self, team_id: int) -> bool:
         """
         Elimina un equipo de la base de datos.
@@ -141,8 +187,39 @@ class TeamRepository:
         
         self.db.delete(team)
         self.db.commit()
+        _notify_team_change()
         return True
     
+    def get_teams_version(self) -> Tuple[int, Optional[datetime]]:
+        """
+        Obtiene la versión de la tabla de equipos: (conteo, última modificación).
+        Los equipos sin updated_at usan su created_at.
+        
+        Returns:
+            Tuple[int, Optional[datetime]]: Conteo y fecha de la última modificación
+        """
+        count, last_change = self.db.query(
+            func.count(Team.id),
+            func.max(func.coalesce(Team.updated_at, Team.created_at))
+        ).one()
+        return count, last_change
+    
+    def get_team_version(self, name: str) -> Optional[Tuple[int, Optional[datetime]]]:
+        """
+        Obtiene la versión de un equipo por nombre: (id, última modificación).
+        
+        Args:
+            name: Nombre del equipo
+            
+        Returns:
+            Optional[Tuple[int, Optional[datetime]]]: Versión del equipo o None si no existe
+        """
+        row = self.db.query(
+            Team.id,
+            func.coalesce(Team.updated_at, Team.created_at)
+        ).filter(Team.name == name).first()
+        return tuple(row) if row else None
+    
     def get_teams_with_player_count(self) -> List[dict]:
         """
         Obtiene todos los equipos con la cantidad de jugadores.
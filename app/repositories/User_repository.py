@@ -1,7 +1,7 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.User_model import User
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 class UserRepository:
@@ -17,6 +17,42 @@ class UserRepository:
         """Retorna todos los usuarios con paginación"""
         return self.db.query(User).offset(skip).limit(limit).all()
 
+    def _filtered_query(self, is_active: Optional[bool] = None, role_id: Optional[int] = None):
+        """Consulta base de usuarios con filtros opcionales (los None se ignoran)"""
+        query = self.db.query(User)
+        if is_active is not None:
+            query = query.filter(User.is_active == is_active)
+        if role_id is not None:
+            query = query.filter(User.role_id == role_id)
+        return query
+
+    def get_users_page(
+        self,
+        after_id: Optional[int] = None,
+        limit: int = 50,
+        is_active: Optional[bool] = None,
+        role_id: Optional[int] = None
+    ) -> Tuple[List[User], Optional[int]]:
+        """
+        Retorna una página de usuarios usando paginación por cursor (keyset) sobre el id.
+        El rol se carga con selectinload: una sola consulta extra para toda la página.
+        Retorna (usuarios, cursor_siguiente); el cursor es None si no hay más páginas.
+        """
+        query = self._filtered_query(is_active, role_id).options(selectinload(User.role))
+        if after_id is not None:
+            query = query.filter(User.id > after_id)
+
+        # Se pide una fila extra para saber si existe una página siguiente
+        users = query.order_by(User.id).limit(limit + 1).all()
+        if len(users) > limit:
+            users = users[:limit]
+            return users, users[-1].id
+        return users, None
+
+    def count_users(self, is_active: Optional[bool] = None, role_id: Optional[int] = None) -> int:
+        """Cuenta los usuarios que cumplen los filtros"""
+        return self._filtered_query(is_active, role_id).count()
+
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Busca un usuario por su ID numérico"""
         return self.db.query(User).filter(User.id == user_id).first()
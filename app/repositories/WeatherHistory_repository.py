@@ -0,0 +1,85 @@
+"""
+Repositorio del histórico de clima por equipo
+Escrituras por lotes (upsert por equipo + bucket), purga por antigüedad y consultas locales
+"""
+from typing import Dict, List, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.WeatherHistory_model import WeatherHistory
+from app.models.Team_model import Team
+from app.utils.upsert import upsert_rows
+
+# Columnas que se actualizan cuando llega otra observación del mismo equipo y bucket
+VALUE_COLUMNS = (
+    "temperature_dc", "feels_like_dc", "humidity", "pressure",
+    "wind_dkmh", "clouds", "visibility_hm", "icon",
+)
+
+
+class WeatherHistoryRepository:
+    """Acceso a la tabla weather_history"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def upsert_many(self, rows: List[Dict]) -> int:
+        """
+        Inserta o actualiza un lote de observaciones (un solo INSERT ... ON CONFLICT).
+        Ante un (team_id, bucket) existente conserva la observación nueva.
+
+        Args:
+            rows: Diccionarios con team_id, bucket y las columnas de valores
+
+        Returns:
+            int: Filas enviadas
+        """
+        if not rows:
+            return 0
+        try:
+            upsert_rows(self.db, WeatherHistory, rows, ("team_id", "bucket"), update=VALUE_COLUMNS)
+            self.db.commit()
+            return len(rows)
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+
+    def delete_before(self, bucket: int) -> int:
+        """Elimina las observaciones anteriores al bucket indicado (política de retención)"""
+        deleted = (
+            self.db.query(WeatherHistory)
+            .filter(WeatherHistory.bucket < bucket)
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        return deleted
+
+    def get_range(self, team_id: int, start_bucket: int, end_bucket: int, limit: int) -> List[WeatherHistory]:
+        """Observaciones de un equipo entre dos buckets (inclusive), en orden cronológico"""
+        return (
+            self.db.query(WeatherHistory)
+            .filter(
+                WeatherHistory.team_id == team_id,
+                WeatherHistory.bucket >= start_bucket,
+                WeatherHistory.bucket <= end_bucket,
+            )
+            .order_by(WeatherHistory.bucket)
+            .limit(limit)
+            .all()
+        )
+
+    def get_latest(self) -> List[Tuple[str, WeatherHistory]]:
+        """Última observación de cada equipo junto con el nombre del equipo"""
+        latest = (
+            self.db.query(WeatherHistory.team_id, func.max(WeatherHistory.bucket).label("bucket"))
+            .group_by(WeatherHistory.team_id)
+            .subquery()
+        )
+        return (
+            self.db.query(Team.name, WeatherHistory)
+            .join(latest, (WeatherHistory.team_id == latest.c.team_id) & (WeatherHistory.bucket == latest.c.bucket))
+            .join(Team, Team.id == WeatherHistory.team_id)
+            .order_by(Team.id)
+            .all()
+        )
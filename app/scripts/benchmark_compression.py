@@ -0,0 +1,105 @@
+"""
+Script para medir el efecto de la compresión de respuestas
+Reporta bytes transferidos y costo de CPU por endpoint para gzip y Brotli
+
+Uso:
+    python -m app.scripts.benchmark_compression
+"""
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from app.middleware.compression_middleware import brotli, compress_bytes
+from app.scripts.populate_teams import NBA_TEAMS_DATA
+
+POSITIONS = ["Point Guard", "Shooting Guard", "Small Forward", "Power Forward", "Center"]
+ITERATIONS = 200
+
+
+def build_players_page(size: int = 100) -> bytes:
+    """Simula la respuesta de GET /api/v1/players/?limit=100"""
+    random.seed(42)
+    players = []
+    for player_id in range(1, size + 1):
+        team = random.choice(NBA_TEAMS_DATA)["name"]
+        players.append({
+            "name": f"Jugador {player_id} {random.choice(['Smith', 'Johnson', 'Williams', 'Brown'])}",
+            "team": team,
+            "position": random.choice(POSITIONS),
+            "id": player_id,
+            "height_m": round(random.uniform(1.80, 2.20), 2),
+            "weight_kg": round(random.uniform(80, 125), 1),
+            "birth_date": datetime.combine(date(1985, 1, 1) + timedelta(days=random.randint(0, 6000)), datetime.min.time()).isoformat(),
+            "created_at": datetime(2025, 9, 4, 12, 0, 0).isoformat(),
+        })
+    return json.dumps(players).encode("utf-8")
+
+
+def build_teams_locations(players_per_team: int = 15) -> bytes:
+    """Simula la respuesta de GET /api/v1/nba-map/teams-locations"""
+    random.seed(7)
+    locations = []
+    for team in NBA_TEAMS_DATA:
+        locations.append({
+            "team": team["name"],
+            "city": team["city"],
+            "state": team["state"],
+            "latitude": team["latitude"],
+            "longitude": team["longitude"],
+            "stadium": team["stadium"],
+            "conference": team["conference"],
+            "division": team["division"],
+            "players_count": players_per_team,
+            "players": [f"Jugador {team['city']} {n}" for n in range(players_per_team)],
+            "weather": {
+                "temperature": round(random.uniform(-5, 35), 1),
+                "feels_like": round(random.uniform(-5, 35), 1),
+                "temp_min": round(random.uniform(-5, 35), 1),
+                "temp_max": round(random.uniform(-5, 35), 1),
+                "humidity": random.randint(20, 95),
+                "pressure": random.randint(990, 1030),
+                "description": random.choice(["cielo claro", "nubes dispersas", "lluvia ligera"]),
+                "icon": random.choice(["01d", "03d", "10n"]),
+                "wind_speed": round(random.uniform(0, 40), 1),
+                "clouds": random.randint(0, 100),
+                "visibility": 10.0,
+                "timestamp": datetime(2025, 9, 4, 12, 0, 0).isoformat(),
+            },
+        })
+    return json.dumps(locations).encode("utf-8")
+
+
+def measure(payload: bytes, encoding: str, level: int) -> tuple:
+    """Retorna (bytes comprimidos, ms de CPU por respuesta)"""
+    kwargs = {"brotli_quality": level} if encoding == "br" else {"gzip_level": level}
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        compressed = compress_bytes(payload, encoding, **kwargs)
+    elapsed = time.process_time() - start
+    return len(compressed), elapsed / ITERATIONS * 1000
+
+
+def main():
+    """Función principal"""
+    endpoints = {
+        "GET /api/v1/players/?limit=100": build_players_page(),
+        "GET /api/v1/nba-map/teams-locations": build_teams_locations(),
+    }
+    variants = [("gzip", 1), ("gzip", 6), ("gzip", 9)]
+    if brotli is not None:
+        variants += [("br", 1), ("br", 4), ("br", 11)]
+    else:
+        print("⚠️  Brotli no está instalado: solo se mide gzip\n")
+
+    for endpoint, payload in endpoints.items():
+        print(f"📦 {endpoint}: {len(payload):,} bytes sin comprimir")
+        print(f"   {'codificación':<12} {'bytes':>8} {'ratio':>7} {'CPU ms':>8}")
+        for encoding, level in variants:
+            size, cpu_ms = measure(payload, encoding, level)
+            print(f"   {encoding + ' ' + str(level):<12} {size:>8,} {size / len(payload):>7.1%} {cpu_ms:>8.3f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
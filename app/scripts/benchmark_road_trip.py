@@ -0,0 +1,76 @@
+"""
+Script para medir el optimizador de giras (vecino más cercano + 2-opt)
+Casos: los 30 estadios de la NBA (datos de populate_teams) e instancias sintéticas de 1000 puntos
+
+Uso:
+    python -m app.scripts.benchmark_road_trip
+    python -m app.scripts.benchmark_road_trip --nodes 1000 --instances 3 --time-limit 2
+"""
+import argparse
+import statistics
+
+import numpy as np
+
+from app.scripts.populate_teams import NBA_TEAMS_DATA
+from app.utils.geo import distance_matrix_km, to_radians
+from app.utils.route_optimizer import optimize_route
+
+
+def nba_distances() -> np.ndarray:
+    """Matriz de distancias entre los estadios reales"""
+    lat, lon = to_radians(
+        [team["latitude"] for team in NBA_TEAMS_DATA],
+        [team["longitude"] for team in NBA_TEAMS_DATA],
+    )
+    return distance_matrix_km(lat, lon)
+
+
+def synthetic_distances(nodes: int, seed: int) -> np.ndarray:
+    """Puntos aleatorios dentro del área continental de EE.UU."""
+    rng = np.random.default_rng(seed)
+    lat, lon = to_radians(rng.uniform(25, 49, nodes), rng.uniform(-124, -67, nodes))
+    return distance_matrix_km(lat, lon)
+
+
+def run_case(name: str, distances: np.ndarray, closed: bool, time_limit: float, repeat: int):
+    """Optimiza la instancia `repeat` veces y muestra distancia y tiempos"""
+    results = [optimize_route(distances, start=0, closed=closed, time_limit=time_limit) for _ in range(repeat)]
+    best = results[0]
+    gain = (1 - best.length / best.initial_length) * 100 if best.initial_length else 0.0
+    times = [result.elapsed_ms for result in results]
+    print(
+        f"{name:<32} {len(distances):>5} {best.initial_length:>12.0f} {best.length:>12.0f} {gain:>7.1f}% "
+        f"{best.improvements:>7} {'sí' if best.converged else 'no':>5} "
+        f"{statistics.median(times):>10.1f} {max(times):>10.1f}"
+    )
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Benchmark del optimizador de giras")
+    parser.add_argument("--nodes", type=int, default=1000, help="Puntos de las instancias sintéticas")
+    parser.add_argument("--instances", type=int, default=3, help="Instancias sintéticas")
+    parser.add_argument("--time-limit", type=float, default=2.0, help="Segundos por optimización")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones de los casos NBA")
+    args = parser.parse_args()
+
+    print("=" * 118)
+    print(f"{'Caso':<32} {'Nodos':>5} {'Inicial km':>12} {'2-opt km':>12} {'Mejora':>8} {'Mejoras':>7} "
+          f"{'Conv.':>5} {'Mediana ms':>10} {'Máx. ms':>10}")
+    print("-" * 118)
+
+    nba = nba_distances()
+    run_case("NBA 30 estadios (abierto)", nba, False, args.time_limit, args.repeat)
+    run_case("NBA 30 estadios (circuito)", nba, True, args.time_limit, args.repeat)
+
+    for seed in range(args.instances):
+        synthetic = synthetic_distances(args.nodes, seed)
+        run_case(f"Sintético #{seed + 1} (circuito)", synthetic, True, args.time_limit, 1)
+
+    print("=" * 118)
+    print(f"Límite de tiempo por optimización: {args.time_limit * 1000:.0f} ms "
+          f"(Conv. = no indica que 2-opt se cortó por tiempo)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Script para medir el tiempo de serialización de listados de jugadores
+Compara el camino estándar de FastAPI (Pydantic + json) con el camino rápido (filas + orjson)
+
+Uso:
+    python -m app.scripts.benchmark_serialization
+"""
+import json
+import random
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.models.NBA_model import Player
+from app.Schema.NBA_Schema import PlayerResponse
+from app.utils.fast_serialization import PLAYER_RESPONSE_FIELDS, player_rows_to_dicts
+
+PlayerRow = namedtuple("PlayerRow", PLAYER_RESPONSE_FIELDS)
+# Las filas de SQLAlchemy exponen _mapping; namedtuple expone _asdict
+PlayerRow._mapping = property(lambda self: self._asdict())
+
+PLAYERS_ADAPTER = TypeAdapter(list[PlayerResponse])
+
+
+def build_players(size: int):
+    """Genera jugadores como objetos ORM (camino estándar) y como filas livianas (camino rápido)"""
+    random.seed(size)
+    objects, rows = [], []
+    for player_id in range(1, size + 1):
+        values = {
+            "name": f"Jugador {player_id}",
+            "team": "Los Angeles Lakers",
+            "position": random.choice(["PG", "SG", "SF", "PF", "C"]),
+            "id": player_id,
+            "height_m": round(random.uniform(1.80, 2.20), 2),
+            "weight_kg": round(random.uniform(80, 125), 1),
+            "birth_date": date(1985, 1, 1) + timedelta(days=random.randint(0, 6000)),
+            "created_at": datetime(2025, 9, 4, 12, 0, 0, random.randint(0, 999999)),
+        }
+        objects.append(Player(**values))
+        rows.append(PlayerRow(**values))
+    return objects, rows
+
+
+def standard_path(objects) -> bytes:
+    """response_model=list[PlayerResponse] + JSONResponse (lo que hace FastAPI por defecto)"""
+    validated = PLAYERS_ADAPTER.validate_python(objects, from_attributes=True)
+    content = PLAYERS_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def pydantic_orjson_path(objects) -> bytes:
+    """response_model + ORJSONResponse (solo cambia el codificador final)"""
+    validated = PLAYERS_ADAPTER.validate_python(objects, from_attributes=True)
+    return orjson.dumps(PLAYERS_ADAPTER.dump_python(validated, mode="json"))
+
+
+def fast_path(rows) -> bytes:
+    """Filas livianas → diccionarios → orjson (sin segunda pasada de Pydantic)"""
+    return orjson.dumps(player_rows_to_dicts(rows))
+
+
+def timeit(func, payload, repeat: int) -> float:
+    """Retorna los milisegundos promedio por llamada"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(payload)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    """Función principal"""
+    for size, repeat in [(100, 500), (10_000, 10)]:
+        objects, rows = build_players(size)
+        assert orjson.loads(standard_path(objects)) == orjson.loads(fast_path(rows))
+
+        standard = timeit(standard_path, objects, repeat)
+        pydantic_orjson = timeit(pydantic_orjson_path, objects, repeat)
+        fast = timeit(fast_path, rows, repeat)
+
+        print(f"📦 {size:,} jugadores")
+        print(f"   Pydantic + json (estándar): {standard:9.3f} ms")
+        print(f"   Pydantic + orjson:          {pydantic_orjson:9.3f} ms")
+        print(f"   Filas + orjson (rápido):    {fast:9.3f} ms  ({standard / fast:.1f}x)")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Script para exportar jugadores o equipos a Apache Arrow IPC o Parquet
+Usa la base de datos configurada (DATABASE_URL) y la misma lectura por lotes que el endpoint /api/v1/export
+
+Uso:
+    python -m app.scripts.export_columnar players --format parquet --output players.parquet
+    python -m app.scripts.export_columnar teams --format arrow
+    python -m app.scripts.export_columnar players --batch-size 100000
+"""
+import argparse
+import os
+import time
+
+from app.services.Export_service import EXPORT_SCHEMAS, export_to_file, validate_export
+from app.utils.columnar_export import EXPORT_FORMATS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exportación columnar de la base NBA")
+    parser.add_argument("table", choices=sorted(EXPORT_SCHEMAS), help="Tabla a exportar")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="parquet", help="Formato de salida")
+    parser.add_argument("--output", help="Archivo de salida (por defecto <tabla>.<extensión>)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Filas por lote (por defecto EXPORT_BATCH_SIZE)")
+    args = parser.parse_args()
+
+    _, filename = validate_export(args.table, args.format)
+    output = args.output or filename
+
+    started = time.perf_counter()
+    rows = export_to_file(args.table, args.format, output, args.batch_size)
+    elapsed = time.perf_counter() - started
+
+    size_mb = os.path.getsize(output) / (1024 * 1024)
+    print(f"✅ {rows} filas de '{args.table}' exportadas a {output} ({size_mb:.2f} MB) en {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Script para cargar box scores (estadísticas por partido) desde archivos NDJSON o CSV
+Usa la base de datos configurada (DATABASE_URL) y la misma carga por lotes que /api/v1/stats/games/ingest
+
+Uso:
+    python -m app.scripts.ingest_box_scores games_2024.ndjson
+    python -m app.scripts.ingest_box_scores box_scores.csv --batch-size 10000
+    python -m app.scripts.ingest_box_scores export.txt --format csv
+"""
+import argparse
+import os
+from itertools import islice
+
+from app.config.NBA_database import Base, SessionLocal, engine
+from app.models.NBA_model import Player  # noqa: F401 (tabla referenciada por las claves foráneas)
+from app.models.PlayerGameStats_model import PlayerGameStats, PlayerSeasonStats  # noqa: F401
+from app.services.PlayerStats_service import BoxScoreIngestor
+from app.utils.box_scores import BOX_SCORE_FORMATS
+
+# Extensión → formato cuando no se indica --format
+EXTENSION_FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "ndjson", ".csv": "csv"}
+
+LINES_PER_CHUNK = 2000
+
+
+def ingest_file(path: str, fmt: str, batch_size: int = None) -> dict:
+    """Carga un archivo leyéndolo por bloques de líneas"""
+    db = SessionLocal()
+    try:
+        ingestor = BoxScoreIngestor(db, fmt, batch_size)
+        with open(path, encoding="utf-8-sig", newline="") as handle:
+            while True:
+                lines = list(islice(handle, LINES_PER_CHUNK))
+                if not lines:
+                    break
+                ingestor.feed(line.rstrip("\r\n") for line in lines)
+        return ingestor.finish()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga de box scores NBA")
+    parser.add_argument("paths", nargs="+", help="Archivos NDJSON o CSV")
+    parser.add_argument("--format", choices=BOX_SCORE_FORMATS, help="Formato (por defecto según la extensión)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Registros por transacción (por defecto STATS_INGEST_BATCH_SIZE)")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine, tables=[PlayerGameStats.__table__, PlayerSeasonStats.__table__])
+
+    for path in args.paths:
+        fmt = args.format or EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            print(f"❌ {path}: no se puede deducir el formato, usar --format")
+            continue
+        summary = ingest_file(path, fmt, args.batch_size)
+        rate = summary["received"] / (summary["elapsed_ms"] / 1000) if summary["elapsed_ms"] else 0
+        print(
+            f"✅ {path}: {summary['inserted']} nuevos, {summary['duplicates']} repetidos, "
+            f"{summary['rejected']} rechazados en {summary['elapsed_ms'] / 1000:.2f} s ({rate:,.0f} registros/s)"
+        )
+        for error in summary["errors"]:
+            print(f"   línea {error['line']}: {error['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Servidor de prueba que imita la API de OpenWeatherMap
+Responde /data/2.5/weather (por coordenadas) y /data/2.5/group (hasta 20 IDs)
+con datos deterministas, sin red ni API key real
+
+Uso:
+    python -m app.scripts.weather_stub_server --port 8089
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8089/data/2.5 uvicorn app.main:app
+
+Opciones para probar el actualizador del clima:
+    --rate-limit N    Responde 429 (con Retry-After) a partir de N llamadas por minuto
+    --fail-rate P     Responde 500 con probabilidad P (0-1)
+    --latency S       Segundos de espera antes de cada respuesta
+
+GET /stats retorna las llamadas recibidas por endpoint.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+GROUP_MAX_IDS = 20
+DESCRIPTIONS = [("cielo claro", "01d"), ("nubes dispersas", "03d"), ("lluvia ligera", "10d"), ("nieve", "13d")]
+
+
+class StubState:
+    """Ciudades conocidas y contadores compartidos entre hilos del servidor"""
+
+    def __init__(self, rate_limit: int, fail_rate: float, latency: float):
+        self.rate_limit = rate_limit
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.cities = {}            # id → (lat, lon)
+        self.calls = {"weather": 0, "group": 0, "rate_limited": 0, "failed": 0}
+        self.minute_start = time.time()
+        self.minute_calls = 0
+
+    def city_id(self, lat: float, lon: float) -> int:
+        """ID estable derivado de las coordenadas (redondeadas a 2 decimales)"""
+        key = f"{lat:.2f},{lon:.2f}".encode()
+        city_id = 1_000_000 + zlib.crc32(key) % 8_000_000
+        with self.lock:
+            self.cities[city_id] = (lat, lon)
+        return city_id
+
+    def admit(self):
+        """Retorna None si la llamada pasa, o (status, retry_after) si se rechaza"""
+        with self.lock:
+            now = time.time()
+            if now - self.minute_start >= 60:
+                self.minute_start, self.minute_calls = now, 0
+            self.minute_calls += 1
+            if self.rate_limit and self.minute_calls > self.rate_limit:
+                self.calls["rate_limited"] += 1
+                return 429, int(60 - (now - self.minute_start)) + 1
+            if self.fail_rate and random.random() < self.fail_rate:
+                self.calls["failed"] += 1
+                return 500, None
+        return None
+
+
+def city_weather(city_id: int, lat: float, lon: float) -> dict:
+    """Clima sintético: depende de la ciudad y del cuarto de hora actual"""
+    seed = random.Random(city_id * 97 + int(time.time() // 900))
+    temp = round(25 - abs(lat - 25) * 0.6 + seed.uniform(-4, 4), 2)
+    description, icon = seed.choice(DESCRIPTIONS)
+    return {
+        "id": city_id,
+        "name": f"Stub City {city_id}",
+        "coord": {"lat": lat, "lon": lon},
+        "main": {
+            "temp": temp,
+            "feels_like": round(temp + seed.uniform(-2, 2), 2),
+            "temp_min": round(temp - seed.uniform(0, 3), 2),
+            "temp_max": round(temp + seed.uniform(0, 3), 2),
+            "humidity": seed.randint(20, 95),
+            "pressure": seed.randint(995, 1030),
+        },
+        "weather": [{"description": description, "icon": icon}],
+        "wind": {"speed": round(seed.uniform(0, 12), 2)},
+        "clouds": {"all": seed.randint(0, 100)},
+        "visibility": 10000,
+    }
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: dict, headers: dict = None):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+            if url.path == "/stats":
+                with state.lock:
+                    return self._send(200, {**state.calls, "known_cities": len(state.cities)})
+
+            if url.path not in ("/data/2.5/weather", "/data/2.5/group"):
+                return self._send(404, {"cod": "404", "message": "Internal error"})
+
+            if state.latency:
+                time.sleep(state.latency)
+            rejected = state.admit()
+            if rejected:
+                status, retry_after = rejected
+                headers = {"Retry-After": str(retry_after)} if retry_after else None
+                return self._send(status, {"cod": status, "message": "stub error"}, headers)
+
+            if url.path == "/data/2.5/weather":
+                with state.lock:
+                    state.calls["weather"] += 1
+                try:
+                    lat, lon = float(params["lat"]), float(params["lon"])
+                except (KeyError, ValueError):
+                    return self._send(400, {"cod": "400", "message": "wrong latitude"})
+                return self._send(200, city_weather(state.city_id(lat, lon), lat, lon))
+
+            with state.lock:
+                state.calls["group"] += 1
+            try:
+                ids = [int(city_id) for city_id in params.get("id", "").split(",") if city_id]
+            except ValueError:
+                return self._send(400, {"cod": "400", "message": "wrong id"})
+            if not ids or len(ids) > GROUP_MAX_IDS:
+                return self._send(400, {"cod": "400", "message": f"1-{GROUP_MAX_IDS} ids required"})
+            with state.lock:
+                known = [(city_id, state.cities.get(city_id)) for city_id in ids]
+            items = [city_weather(city_id, *coords) for city_id, coords in known if coords]
+            return self._send(200, {"cnt": len(items), "list": items})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Servidor de prueba de OpenWeatherMap")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--rate-limit", type=int, default=0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    state = StubState(args.rate_limit, args.fail_rate, args.latency)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"🌤️  Stub de OpenWeatherMap en http://{args.host}:{args.port}/data/2.5")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Estadísticas agregadas de la plantilla por equipo, posición y conferencia.
+
+- Consulta en vivo: GROUP BY en la base de datos (conteo, sumas, mínimos,
+  máximos y percentiles); solo viajan las filas de resultado.
+- Rollups: la tabla roster_rollups guarda conteo y sumas por grupo y se
+  actualiza con deltas en cada alta, cambio o baja de jugador. Media y
+  desviación estándar salen de las sumas. La escritura solo suma los deltas
+  (costo acotado, sin recorrer la tabla) y marca los grupos como pendientes;
+  el reconciliador de fondo recalcula sus mínimos, máximos y percentiles.
+- La lectura no escribe: los grupos pendientes se calculan en vivo (solo
+  esos grupos) hasta que el reconciliador guarda sus percentiles.
+- La edad se deriva al responder a partir de la fecha de nacimiento media
+  y sus percentiles, así los agregados guardados no envejecen.
+"""
+import asyncio
+import logging
+import math
+import threading
+import time
+from datetime import date
+from typing import Dict, List, Optional
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app.config.NBA_database import SessionLocal
+from app.repositories.RosterAnalytics_repository import (
+    GROUP_DIMENSIONS,
+    METRICS,
+    UNKNOWN_CONFERENCE,
+    RosterAnalyticsRepository,
+)
+from app.repositories.RosterRollup_repository import SUM_COLUMNS, RosterRollupRepository
+from app.repositories.Team_repository import TeamRepository, on_team_change
+
+logger = logging.getLogger('nba_api.services.analytics')
+
+# Percentiles que se reportan (el p50 se expone como "median")
+PERCENTILES = (10, 25, 50, 75, 90)
+
+EPOCH = date(1970, 1, 1)
+DAYS_PER_YEAR = 365.25
+
+# Cada cuántos segundos el reconciliador atiende invalidaciones y percentiles pendientes
+_INVALIDATION_POLL_SECONDS = 1.0
+
+# Métrica interna → campo de la respuesta y decimales
+_OUTPUT_FIELDS = {"height": ("height_m", 3), "weight": ("weight_kg", 1)}
+
+# Un cambio de conferencia de un equipo mueve a todos sus jugadores de grupo:
+# el reconciliador reconstruye los rollups en su próxima vuelta
+_rollups_invalidated = threading.Event()
+on_team_change(_rollups_invalidated.set)
+
+# Una escritura de jugador dejó grupos con percentiles pendientes
+_quantiles_pending = threading.Event()
+
+
+def _birth_days(birth_date) -> float:
+    if hasattr(birth_date, "date"):
+        birth_date = birth_date.date()
+    return float((birth_date - EPOCH).days)
+
+
+def _moments(players: int, total: float, total_sq: float):
+    """Media y desviación estándar poblacional a partir de las sumas"""
+    mean = total / players
+    variance = max(total_sq / players - mean * mean, 0.0)
+    return mean, math.sqrt(variance)
+
+
+def _metric_stats(mean: float, std: float, points: Dict[str, float], digits: int) -> Dict:
+    stats = {"mean": round(mean, digits), "std": round(std, digits), "min": round(points["min"], digits)}
+    for p in PERCENTILES:
+        stats["median" if p == 50 else f"p{p}"] = round(points[f"p{p}"], digits)
+    stats["max"] = round(points["max"], digits)
+    return stats
+
+
+def _age_stats(mean: float, std: float, points: Dict[str, float], today: float) -> Dict:
+    """La edad crece cuando la fecha de nacimiento decrece: el pX de la edad es el p(100-X) del nacimiento"""
+    def age(days: float) -> float:
+        return round((today - days) / DAYS_PER_YEAR, 1)
+
+    stats = {"mean": age(mean), "std": round(std / DAYS_PER_YEAR, 1), "min": age(points["max"])}
+    for p in PERCENTILES:
+        stats["median" if p == 50 else f"p{p}"] = age(points[f"p{100 - p}"])
+    stats["max"] = age(points["min"])
+    return stats
+
+
+def format_group(key: str, players: int, sums: Dict[str, float], points: Dict[str, Dict[str, float]], today: float) -> Dict:
+    """
+    Estadísticas de un grupo con la forma de la respuesta.
+
+    Args:
+        sums: `{metric}_sum` y `{metric}_sumsq` de cada métrica
+        points: {métrica: {"min", "max", "p10", ...}}
+    """
+    group = {"key": key, "players": players}
+    for metric in METRICS:
+        mean, std = _moments(players, sums[f"{metric}_sum"], sums[f"{metric}_sumsq"])
+        if metric == "birth":
+            group["age"] = _age_stats(mean, std, points[metric], today)
+        else:
+            field, digits = _OUTPUT_FIELDS[metric]
+            group[field] = _metric_stats(mean, std, points[metric], digits)
+    return group
+
+
+def _merge_points(summary: Dict, quantiles: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Une mínimos/máximos del resumen con los percentiles del grupo"""
+    return {
+        metric: {"min": summary[f"{metric}_min"], "max": summary[f"{metric}_max"], **quantiles[metric]}
+        for metric in METRICS
+    }
+
+
+class AnalyticsService:
+    """Estadísticas de la plantilla en vivo y precalculadas"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.analytics = RosterAnalyticsRepository(db)
+        self.rollups = RosterRollupRepository(db)
+
+    @staticmethod
+    def _validate_dimension(group_by: str) -> None:
+        if group_by not in GROUP_DIMENSIONS:
+            raise ValueError(f"group_by debe ser uno de: {', '.join(GROUP_DIMENSIONS)}")
+
+    def _live_groups(self, dimension: str, keys=None) -> List[Dict]:
+        """Resúmenes GROUP BY con sus percentiles: [(resumen, puntos)]"""
+        summaries = self.analytics.get_group_summaries(dimension, keys)
+        quantiles = self.analytics.get_group_quantiles(dimension, PERCENTILES, keys)
+        return [(summary, _merge_points(summary, quantiles[summary["key"]])) for summary in summaries]
+
+    def get_live_stats(self, group_by: str) -> List[Dict]:
+        """Estadísticas calculadas en este momento sobre la tabla players"""
+        self._validate_dimension(group_by)
+        today = float((date.today() - EPOCH).days)
+        groups = [
+            format_group(summary["key"], summary["players"], summary, points, today)
+            for summary, points in self._live_groups(group_by)
+        ]
+        return sorted(groups, key=lambda group: group["key"])
+
+    def get_rollup_stats(self, group_by: str) -> List[Dict]:
+        """
+        Estadísticas desde la tabla de rollups (solo lectura). Los grupos con
+        percentiles pendientes o sin calcular se calculan en vivo sin guardarlos.
+        """
+        self._validate_dimension(group_by)
+        rows = self.rollups.get_rollups(group_by)
+        pending = {row.key for row in rows if row.quantiles_stale or not row.quantiles}
+        live = {summary["key"]: points for summary, points in self._live_groups(group_by, pending)} if pending else {}
+
+        today = float((date.today() - EPOCH).days)
+        groups = []
+        for row in rows:
+            points = live.get(row.key) if row.key in pending else orjson.loads(row.quantiles)
+            if points is None:
+                continue
+            sums = {column: getattr(row, column) for column in SUM_COLUMNS}
+            groups.append(format_group(row.key, row.players, sums, points, today))
+        return groups
+
+    def refresh_stale_quantiles(self, dimensions=GROUP_DIMENSIONS) -> int:
+        """Recalcula los percentiles de los grupos marcados como pendientes. Retorna cuántos guardó"""
+        _quantiles_pending.clear()
+        refreshed = 0
+        for dimension in dimensions:
+            versions = self.rollups.get_stale_versions(dimension)
+            if not versions:
+                continue
+            points = {summary["key"]: points for summary, points in self._live_groups(dimension, versions.keys())}
+            self.rollups.set_quantiles(dimension, points, versions)
+            refreshed += len(points)
+            logger.debug(f"📊 Percentiles recalculados para {len(points)} grupos de '{dimension}'")
+        return refreshed
+
+    def rebuild_rollups(self) -> int:
+        """Reconstruye todos los rollups con GROUP BY completos (una transacción)"""
+        _rollups_invalidated.clear()
+        rows = []
+        for dimension in GROUP_DIMENSIONS:
+            for summary, points in self._live_groups(dimension):
+                rows.append({
+                    "dimension": dimension,
+                    "key": summary["key"],
+                    **{column: summary[column] for column in SUM_COLUMNS},
+                    "quantiles": orjson.dumps(points).decode(),
+                    "quantiles_stale": False,
+                })
+        count = self.rollups.replace_all(rows)
+        logger.info(f"📊 ACCIÓN: Rollups de la plantilla reconstruidos ({count} grupos)")
+        return count
+
+    def reconcile_rollups(self) -> bool:
+        """
+        Compara conteo y sumas de cada grupo con la tabla players y reconstruye
+        si difieren (cambios hechos fuera de la API). Si coinciden, recalcula los
+        percentiles que hayan quedado pendientes. Retorna True si reconstruyó.
+        """
+        if _rollups_invalidated.is_set():
+            self.rebuild_rollups()
+            return True
+        for dimension in GROUP_DIMENSIONS:
+            live = {summary["key"]: summary for summary in self.analytics.get_group_summaries(dimension)}
+            stored = {row.key: row for row in self.rollups.get_rollups(dimension)}
+            if live.keys() != stored.keys() or any(
+                stored[key].players != summary["players"]
+                or any(
+                    not math.isclose(getattr(stored[key], column), summary[column], rel_tol=1e-9, abs_tol=1e-6)
+                    for column in SUM_COLUMNS[1:]
+                )
+                for key, summary in live.items()
+            ):
+                self.rebuild_rollups()
+                return True
+        self.refresh_stale_quantiles()
+        return False
+
+    def _player_groups(self, values: Dict) -> Dict[str, str]:
+        """Grupo del jugador en cada dimensión"""
+        team = TeamRepository(self.db).get_team_by_name(values["team"])
+        return {
+            "team": values["team"],
+            "position": values["position"],
+            "conference": team.conference if team and team.conference else UNKNOWN_CONFERENCE,
+            "all": "all",
+        }
+
+    def _player_deltas(self, values: Dict, sign: int) -> List[Dict]:
+        height, weight, birth = values["height_m"], values["weight_kg"], _birth_days(values["birth_date"])
+        contribution = {
+            "players": sign,
+            "height_sum": sign * height, "height_sumsq": sign * height * height,
+            "weight_sum": sign * weight, "weight_sumsq": sign * weight * weight,
+            "birth_sum": sign * birth, "birth_sumsq": sign * birth * birth,
+        }
+        return [
+            {"dimension": dimension, "key": key, **contribution}
+            for dimension, key in self._player_groups(values).items()
+        ]
+
+    def record_player_change(self, before: Optional[Dict], after: Optional[Dict]) -> None:
+        """
+        Aplica a los rollups el cambio de un jugador: alta (before=None), baja
+        (after=None) o modificación (se resta el estado anterior y se suma el nuevo).
+        Solo se suman deltas: los percentiles de los grupos afectados los recalcula
+        el reconciliador de fondo. Un error aquí no revierte la escritura del jugador: se registra y la
+        reconciliación periódica corrige los rollups.
+        """
+        try:
+            deltas = []
+            if before is not None:
+                deltas += self._player_deltas(before, -1)
+            if after is not None:
+                deltas += self._player_deltas(after, 1)
+            self.rollups.apply_deltas(deltas)
+            _quantiles_pending.set()
+        except Exception as e:
+            logger.error(f"❌ Error al actualizar los rollups de la plantilla: {e}")
+
+
+def _reconcile_with_new_session() -> bool:
+    db = SessionLocal()
+    try:
+        return AnalyticsService(db).reconcile_rollups()
+    finally:
+        db.close()
+
+
+def _refresh_quantiles_with_new_session() -> int:
+    db = SessionLocal()
+    try:
+        return AnalyticsService(db).refresh_stale_quantiles()
+    finally:
+        db.close()
+
+
+async def run_rollup_reconciler(interval: float) -> None:
+    """
+    Tarea de fondo: verifica los rollups contra la tabla players al iniciar y
+    luego cada `interval` segundos. Cada _INVALIDATION_POLL_SECONDS atiende lo
+    pendiente: reconstruye si un cambio de equipos invalidó los rollups y recalcula
+    los percentiles de los grupos que cambiaron por escrituras de jugadores.
+    Las consultas corren en un hilo.
+    """
+    next_check = 0.0
+    while True:
+        try:
+            if _rollups_invalidated.is_set() or time.monotonic() >= next_check:
+                next_check = time.monotonic() + interval
+                if await asyncio.to_thread(_reconcile_with_new_session):
+                    logger.info("🔄 Rollups de la plantilla reconstruidos por cambios externos")
+            elif _quantiles_pending.is_set():
+                await asyncio.to_thread(_refresh_quantiles_with_new_session)
+        except Exception as e:
+            logger.error(f"❌ Error al reconciliar los rollups de la plantilla: {e}")
+        await asyncio.sleep(_INVALIDATION_POLL_SECONDS)
@@ -1,8 +1,15 @@
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import uuid4
 from sqlalchemy.orm import Session
 from app.repositories.User_repository import UserRepository
+from app.repositories.RefreshToken_repository import RefreshTokenRepository
+from app.repositories.RevokedToken_repository import RevokedTokenRepository
 from app.models.User_model import User
-from app.utils.jwt_utils import jwt_manager
+from app.models.RefreshToken_model import RefreshToken
+from app.utils.jwt_utils import jwt_manager, truncate_to_millis
+from app.utils.token_revocation import token_revocation_list
+from app.config.jwt_config import jwt_config
 from app.Schema.Auth_Schema import TokenResponse, UserProfile
 import logging
 
@@ -17,7 +24,10 @@ class AuthService:
     """
     
     def __init__(self, db_session: Session):
+        self.db = db_session
         self.repository = UserRepository(db_session)
+        self.refresh_repository = RefreshTokenRepository(db_session)
+        self.revoked_repository = RevokedTokenRepository(db_session)
     
     def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """
@@ -29,11 +39,14 @@ class AuthService:
             user = self.repository.get_user_by_username(username)
             
             if not user:
+                # Verificación ficticia: mismo costo bcrypt que un usuario existente
+                jwt_manager.verify_dummy_password(password)
                 logger.warning(f"Intento de login fallido: usuario '{username}' no encontrado")
                 return None
             
             # Verificar si el usuario está activo
             if not user.is_active:
+                jwt_manager.verify_dummy_password(password)
                 logger.warning(f"Intento de login con usuario inactivo: '{username}'")
                 return None
             
@@ -49,13 +62,30 @@ class AuthService:
             logger.error(f"Error durante autenticación: {str(e)}")
             raise ValueError(f"Error durante la autenticación: {str(e)}")
     
-    def create_access_token(self, user: User) -> TokenResponse:
-        """Crea un token JWT para el usuario autenticado"""
+    @staticmethod
+    def _build_token_data(user: User) -> dict:
+        """
+        Claims del token: identidad del usuario y permisos de su rol compilados
+        en máscara de bits, con la versión del rol para detectar cambios posteriores
+        """
         token_data = {
             "sub": user.username,
             "user_id": user.id,
-            "username": user.username
+            "username": user.username,
+            "role_id": user.role_id
         }
+        role = user.role
+        if role is not None:
+            token_data.update({
+                "role": role.name,
+                "perms": role.permissions_mask,
+                "role_ver": role.permissions_version
+            })
+        return token_data
+    
+    def create_access_token(self, user: User) -> TokenResponse:
+        """Crea un token JWT para el usuario autenticado"""
+        token_data = self._build_token_data(user)
         
         access_token = jwt_manager.create_access_token(data=token_data)
         
@@ -65,15 +95,137 @@ class AuthService:
             expires_in=jwt_manager.get_token_expires_seconds()
         )
     
+    def _issue_refresh_token(self, user_id: int, family_id: str, now: datetime) -> Tuple[str, RefreshToken]:
+        """Genera un refresh token y guarda su hash (sin commit). Retorna (valor en claro, registro)"""
+        refresh_token = jwt_manager.generate_refresh_token()
+        stored = self.refresh_repository.create_token(
+            user_id=user_id,
+            token_hash=jwt_manager.hash_refresh_token(refresh_token),
+            family_id=family_id,
+            expires_at=now + jwt_config.get_refresh_expires_delta()
+        )
+        return refresh_token, stored
+    
+    def _with_refresh_token(self, token_response: TokenResponse, refresh_token: str) -> TokenResponse:
+        token_response.refresh_token = refresh_token
+        token_response.refresh_expires_in = jwt_manager.get_refresh_token_expires_seconds()
+        return token_response
+    
+    def create_session_tokens(self, user: User) -> TokenResponse:
+        """
+        Crea el access token y un refresh token que inicia una nueva sesión (familia)
+        Usado por el login: es el único punto donde se verifica la contraseña
+        """
+        now = datetime.utcnow()
+        refresh_token, _ = self._issue_refresh_token(user.id, uuid4().hex, now)
+        self.db.commit()
+        return self._with_refresh_token(self.create_access_token(user), refresh_token)
+    
+    def refresh_session(self, refresh_token: str) -> Optional[TokenResponse]:
+        """
+        Renueva la sesión con un refresh token (sin bcrypt)
+        
+        - El token presentado se revoca y se emite uno nuevo de la misma familia (rotación).
+        - Si se presenta un token ya rotado o revocado, se asume robo del token:
+          se revoca la familia completa y el usuario debe volver a iniciar sesión.
+        Retorna None si el token no es válido.
+        """
+        now = datetime.utcnow()
+        stored = self.refresh_repository.get_by_hash(jwt_manager.hash_refresh_token(refresh_token))
+        
+        if not stored:
+            logger.warning("Intento de renovación con refresh token desconocido")
+            return None
+        
+        if stored.revoked_at is not None:
+            revoked = self.refresh_repository.revoke_family(stored.family_id, now)
+            logger.warning(
+                f"⚠️ Reutilización de refresh token detectada (usuario ID {stored.user_id}): "
+                f"sesión {stored.family_id} revocada ({revoked} tokens)"
+            )
+            return None
+        
+        if stored.expires_at <= now:
+            logger.info(f"Refresh token vencido para usuario ID {stored.user_id}")
+            return None
+        
+        user = self.repository.get_user_by_id(stored.user_id)
+        if not user or not user.is_active:
+            self.refresh_repository.revoke_family(stored.family_id, now)
+            logger.warning(f"Renovación rechazada: usuario ID {stored.user_id} inexistente o inactivo")
+            return None
+        
+        # UPDATE condicional: si dos peticiones usan el mismo token a la vez, solo una rota
+        if not self.refresh_repository.mark_rotated(stored.id, now):
+            self.db.rollback()
+            self.refresh_repository.revoke_family(stored.family_id, now)
+            logger.warning(f"⚠️ Uso concurrente del mismo refresh token: sesión {stored.family_id} revocada")
+            return None
+        
+        new_refresh_token, new_stored = self._issue_refresh_token(user.id, stored.family_id, now)
+        self.refresh_repository.set_replaced_by(stored.id, new_stored.id)
+        self.db.commit()
+        
+        logger.info(f"Sesión renovada para usuario: '{user.username}'")
+        return self._with_refresh_token(self.create_access_token(user), new_refresh_token)
+    
+    def revoke_access_token(self, claims: dict, reason: str = "logout") -> None:
+        """Revoca un access token puntual (por su jti) hasta su vencimiento"""
+        jti = claims.get("jti")
+        if not jti:
+            return
+        self.revoked_repository.revoke_jti(
+            jti=jti,
+            user_id=claims.get("user_id"),
+            expires_at=datetime.utcfromtimestamp(claims["exp"]),
+            reason=reason
+        )
+        token_revocation_list.add(jti=jti)
+    
+    def revoke_user_sessions(self, user_id: int, reason: str, include_refresh_tokens: bool = True) -> None:
+        """
+        Revoca todos los access tokens emitidos hasta ahora para el usuario
+        y, opcionalmente, sus refresh tokens (la sesión no puede renovarse).
+
+        La fila vive lo mismo que el access token más largo que se puede emitir
+        (create_access_token_custom está acotado a esa vida). En este worker el
+        efecto es inmediato; en los demás, tras su próxima sincronización
+        (hasta TOKEN_REVOCATION_REFRESH_SECONDS).
+        """
+        # Misma precisión que el iat de los tokens: los emitidos después no quedan revocados
+        now = truncate_to_millis(datetime.utcnow())
+        self.revoked_repository.revoke_user(
+            user_id=user_id,
+            revoked_at=now,
+            expires_at=now + jwt_config.get_expires_delta(),
+            reason=reason
+        )
+        token_revocation_list.add(user_id=user_id)
+        if include_refresh_tokens:
+            self.refresh_repository.revoke_user_tokens(user_id, now)
+        logger.info(f"Sesiones del usuario ID {user_id} revocadas ({reason})")
+    
+    def logout(self, claims: dict, refresh_token: Optional[str] = None) -> None:
+        """Cierra la sesión: revoca el access token actual y la familia del refresh token"""
+        self.revoke_access_token(claims, reason="logout")
+        if refresh_token:
+            stored = self.refresh_repository.get_by_hash(jwt_manager.hash_refresh_token(refresh_token))
+            if stored and stored.user_id == claims.get("user_id"):
+                self.refresh_repository.revoke_family(stored.family_id, datetime.utcnow())
+    
     def create_access_token_custom(self, user: User, expires_in_seconds: int) -> TokenResponse:
-        """Crea un token JWT con tiempo de expiración personalizado (SOLO PARA PRUEBAS)"""
+        """
+        Crea un token JWT con tiempo de expiración personalizado (SOLO PARA PRUEBAS).
+        La vida máxima es la de un access token normal: las revocaciones por usuario
+        (revoke_user_sessions) duran eso y un token más largo volvería a ser válido.
+        """
         from datetime import timedelta
         
-        token_data = {
-            "sub": user.username,
-            "user_id": user.id,
-            "username": user.username
-        }
+        max_seconds = jwt_manager.get_token_expires_seconds()
+        if not 1 <= expires_in_seconds <= max_seconds:
+            raise ValueError(f"La expiración debe estar entre 1 y {max_seconds} segundos")
+        
+        token_data = self._build_token_data(user)
         
         custom_expires = timedelta(seconds=expires_in_seconds)
         access_token = jwt_manager.create_access_token(data=token_data, expires_delta=custom_expires)
@@ -0,0 +1,119 @@
+"""
+Eventos en tiempo real para el frontend (Server-Sent Events).
+
+Los cambios de jugadores y las actualizaciones del clima se publican como
+deltas compactos en el broadcaster del worker; cada conexión abierta en
+/api/v1/events/stream los recibe sin volver a pedir los listados completos.
+
+Eventos:
+- player.created / player.updated: {id, name, team, position}
+- player.deleted: {id}
+- weather.updated: {teams: {equipo: {temperature, description, icon}}} (solo los que cambiaron)
+- resync: se perdieron eventos (cliente lento o reconexión sin historial); recargar los datos
+- token-expired: venció o se revocó el access token (o se perdió el permiso);
+  reconectar con uno nuevo
+"""
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Callable, Dict, Optional
+
+from app.config.events_config import events_config
+from app.config.jwt_config import jwt_config
+from app.utils.broadcaster import Broadcaster, BroadcasterFullError
+
+logger = logging.getLogger('nba_api.services.events')
+
+# Campos del clima que viajan en weather.updated
+WEATHER_EVENT_FIELDS = ("temperature", "description", "icon")
+
+RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+TOKEN_EXPIRED_FRAME = b"event: token-expired\ndata: {}\n\n"
+HEARTBEAT_FRAME = b": ping\n\n"
+
+event_broadcaster = Broadcaster(
+    queue_size=events_config.get_queue_size(),
+    replay_size=events_config.get_replay_size(),
+    max_subscribers=events_config.get_max_subscribers(),
+)
+
+
+def _player_delta(player) -> Dict:
+    return {"id": player.id, "name": player.name, "team": player.team, "position": player.position}
+
+
+def publish_player_created(player) -> None:
+    event_broadcaster.publish("player.created", _player_delta(player))
+
+
+def publish_player_updated(player) -> None:
+    event_broadcaster.publish("player.updated", _player_delta(player))
+
+
+def publish_player_deleted(player_id: int) -> None:
+    event_broadcaster.publish("player.deleted", {"id": player_id})
+
+
+def publish_weather_updated(teams: Dict[str, Dict]) -> None:
+    """Publica el clima de los equipos cuyos datos visibles cambiaron"""
+    if teams:
+        event_broadcaster.publish("weather.updated", {"teams": teams})
+
+
+async def event_stream(
+    last_event_id: Optional[str],
+    expires_at: float,
+    is_authorized: Optional[Callable[[], bool]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Cuerpo de la respuesta text/event-stream de una conexión.
+
+    Se suscribe al empezar a enviar la respuesta y se da de baja en el mismo
+    try/finally: si el cliente se desconecta antes de que arranque el stream
+    no queda ningún suscriptor registrado.
+
+    Envía los eventos a medida que llegan y un comentario keep-alive cada
+    EVENTS_HEARTBEAT_SECONDS. Con la misma frecuencia vuelve a ejecutar
+    `is_authorized` (síncrona, en un hilo): si el token fue revocado o perdió el
+    permiso envía token-expired y cierra. Termina también cuando vence el token
+    (`expires_at`, epoch), a más tardar a la vida de un access token normal, o
+    cuando se apaga la aplicación.
+    """
+    heartbeat = events_config.get_heartbeat_seconds()
+    expires_at = min(expires_at, time.time() + jwt_config.get_expires_delta().total_seconds())
+    next_authorization = time.monotonic() + heartbeat
+    subscription = None
+    try:
+        try:
+            subscription = event_broadcaster.subscribe(last_event_id)
+        except BroadcasterFullError as e:
+            # Otra conexión ocupó el último lugar después de la verificación del endpoint
+            logger.warning(f"⚠️ Stream de eventos cerrado sin suscribir: {e}")
+            yield b"retry: 30000\n\n"
+            return
+        # El navegador reintenta la conexión a los 3 s si se corta
+        yield b"retry: 3000\n\n"
+        while True:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                yield TOKEN_EXPIRED_FRAME
+                return
+            if is_authorized is not None and time.monotonic() >= next_authorization:
+                next_authorization = time.monotonic() + heartbeat
+                if not await asyncio.to_thread(is_authorized):
+                    logger.info("🔒 Stream de eventos cerrado: token revocado o sin permiso de lectura")
+                    yield TOKEN_EXPIRED_FRAME
+                    return
+            frames = await subscription.next_frames(min(heartbeat, remaining))
+            if subscription.lost:
+                subscription.lost = False
+                frames.insert(0, RESYNC_FRAME)
+            if frames:
+                yield b"".join(frames)
+            elif subscription.closed:
+                return
+            else:
+                yield HEARTBEAT_FRAME
+    finally:
+        if subscription is not None:
+            event_broadcaster.unsubscribe(subscription)
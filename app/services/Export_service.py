@@ -0,0 +1,85 @@
+"""
+Exportación de jugadores y equipos a Apache Arrow IPC o Parquet.
+
+Las filas se leen por lotes con cursor del lado del servidor y cada lote se
+escribe como RecordBatch (Arrow) o row group (Parquet) antes de leer el
+siguiente: exportar millones de filas usa la memoria de un solo lote.
+"""
+import logging
+import time
+from typing import Iterator, Optional, Tuple
+
+from app.config.NBA_database import SessionLocal
+from app.config.export_config import export_config
+from app.repositories.Export_repository import ExportRepository
+from app.utils.columnar_export import (
+    EXPORT_FORMATS,
+    PLAYERS_SCHEMA,
+    TEAMS_SCHEMA,
+    iter_columnar_bytes,
+    write_columnar_file,
+)
+
+logger = logging.getLogger('nba_api.services.export')
+
+# Tabla exportable → esquema Arrow (el orden de los campos es el de las columnas leídas)
+EXPORT_SCHEMAS = {"players": PLAYERS_SCHEMA, "teams": TEAMS_SCHEMA}
+
+
+def validate_export(table: str, fmt: str) -> Tuple[str, str]:
+    """
+    Verifica tabla y formato. Retorna (content-type, nombre de archivo).
+
+    Raises:
+        ValueError: Si la tabla o el formato no son soportados
+    """
+    if table not in EXPORT_SCHEMAS:
+        raise ValueError(f"Tabla no soportada: {table}. Opciones: {', '.join(EXPORT_SCHEMAS)}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato no soportado: {fmt}. Opciones: {', '.join(EXPORT_FORMATS)}")
+    media_type, extension = EXPORT_FORMATS[fmt]
+    return media_type, f"{table}.{extension}"
+
+
+def _row_batches(db, table: str, batch_size: Optional[int]):
+    schema = EXPORT_SCHEMAS[table]
+    return ExportRepository(db).iter_batches(table, schema.names, batch_size or export_config.get_batch_size())
+
+
+def stream_export(table: str, fmt: str, batch_size: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Bytes del archivo exportado a medida que se generan (cuerpo de StreamingResponse).
+
+    Abre su propia sesión: la exportación puede durar más que la petición que
+    la inició y la sesión debe vivir mientras se envía la respuesta.
+    """
+    validate_export(table, fmt)
+    started = time.perf_counter()
+    sent = 0
+    db = SessionLocal()
+    try:
+        for chunk in iter_columnar_bytes(
+            EXPORT_SCHEMAS[table], fmt, _row_batches(db, table, batch_size),
+            compression=export_config.get_parquet_compression(),
+        ):
+            sent += len(chunk)
+            yield chunk
+        logger.info(
+            f"📦 ACCIÓN: Exportación {table}.{fmt} enviada ({sent} bytes en "
+            f"{(time.perf_counter() - started) * 1000:.0f} ms)"
+        )
+    finally:
+        db.close()
+
+
+def export_to_file(table: str, fmt: str, path: str, batch_size: Optional[int] = None) -> int:
+    """Exporta la tabla a un archivo local. Retorna la cantidad de filas"""
+    validate_export(table, fmt)
+    db = SessionLocal()
+    try:
+        return write_columnar_file(
+            EXPORT_SCHEMAS[table], fmt, _row_batches(db, table, batch_size), path,
+            compression=export_config.get_parquet_compression(),
+        )
+    finally:
+        db.close()
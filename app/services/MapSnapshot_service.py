@@ -0,0 +1,302 @@
+"""
+Snapshot en memoria de la parte de base de datos del mapa de equipos.
+
+La respuesta de /nba-map/teams-locations depende solo de la tabla `teams`,
+de los jugadores de cada equipo y del clima. Los dos primeros se materializan
+aquí una vez al iniciar y se parchean de forma incremental:
+
+- Altas, cambios y bajas de jugadores: PlayerService aplica el cambio al
+  snapshot después de confirmar la transacción y el snapshot adopta la
+  nueva versión de las tablas si es exactamente la anterior más ese cambio.
+- Cambios de equipos (poco frecuentes): se invalida y reconstruye completo.
+- Cambios hechos por otros workers o fuera de la API: una tarea periódica
+  compara la versión de las tablas y reconstruye si difieren.
+
+La lectura del mapa queda como una lectura de diccionarios, sin SQL.
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config.NBA_database import SessionLocal
+from app.repositories.NBA_repository import PlayerRepository
+from app.repositories.Team_repository import TeamRepository, on_team_change
+
+logger = logging.getLogger('nba_api.services.map_snapshot')
+
+# Campos del equipo que se copian a cada ubicación del mapa
+TEAM_LOCATION_FIELDS = ("city", "state", "latitude", "longitude", "stadium", "conference", "division")
+
+
+class MapSnapshot:
+    """
+    Equipos y jugadores por equipo del mapa, protegidos por un lock.
+
+    La versión es un hash del contenido: dos workers con los mismos datos
+    generan el mismo ETag, y uno desactualizado nunca responde 304 por error.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()            # una sola construcción a la vez (fuera de _lock)
+        self._teams: Dict[str, Dict] = {}               # nombre → ubicación del equipo (orden por ID)
+        self._players: Dict[str, Dict[int, str]] = {}   # equipo → {id jugador: nombre}
+        self._player_team: Dict[int, str] = {}          # id jugador → equipo
+        self._owm_city_ids: Dict[str, Optional[int]] = {}  # equipo → ID de ciudad de OpenWeatherMap
+        self._team_ids: Dict[str, int] = {}             # equipo → ID en la tabla teams
+        self._source_version: Optional[Tuple] = None   # versión de las tablas al construir
+        self._stale = True
+        self._version: Optional[str] = None
+        self._changes = 0                               # parches aplicados (detecta carreras con build)
+        self.built_at: Optional[float] = None
+
+    @staticmethod
+    def _read_source_version(db: Session) -> Tuple:
+        return (
+            TeamRepository(db).get_teams_version(),
+            PlayerRepository(db).get_players_version(),
+        )
+
+    def build(self, db: Session) -> None:
+        """Carga equipos y jugadores desde la base de datos y reemplaza el snapshot"""
+        # La versión se lee antes que los datos: un cambio concurrente con la carga
+        # deja una versión vieja y la próxima reconciliación vuelve a construir
+        changes_before = self._changes
+        source_version = self._read_source_version(db)
+        team_rows = TeamRepository(db).get_all_teams_ordered()
+        teams = {
+            team.name: {"team": team.name, **{field: getattr(team, field) for field in TEAM_LOCATION_FIELDS}}
+            for team in team_rows
+        }
+        owm_city_ids = {team.name: team.owm_city_id for team in team_rows}
+        team_ids = {team.name: team.id for team in team_rows}
+        players: Dict[str, Dict[int, str]] = {}
+        player_team: Dict[int, str] = {}
+        for player_id, name, team in PlayerRepository(db).get_player_team_names():
+            players.setdefault(team, {})[player_id] = name
+            player_team[player_id] = team
+
+        with self._lock:
+            self._teams = teams
+            self._players = players
+            self._player_team = player_team
+            self._owm_city_ids = owm_city_ids
+            self._team_ids = team_ids
+            self._source_version = source_version
+            # Un parche aplicado durante la carga puede no estar en los datos leídos
+            self._stale = self._changes != changes_before
+            self._version = None
+            self.built_at = time.time()
+
+        logger.info(f"🗺️ Snapshot del mapa construido: {len(teams)} equipos, {len(player_team)} jugadores")
+
+    def ensure_built(self, db: Session) -> None:
+        """
+        Construye el snapshot si nunca se construyó o fue invalidado.
+        Las consultas no toman `_lock`: las lecturas siguen respondiendo con
+        el snapshot anterior mientras se construye.
+        """
+        if self._stale:
+            with self._build_lock:
+                if self._stale:
+                    self.build(db)
+
+    async def ensure_built_async(self) -> None:
+        """ensure_built para handlers async: construye en un hilo con su propia sesión"""
+        if self._stale:
+            await asyncio.to_thread(_ensure_built_with_new_session)
+
+    def invalidate(self) -> None:
+        """Marca el snapshot para reconstruirlo en la próxima lectura"""
+        with self._lock:
+            self._stale = True
+
+    def reconcile(self, db: Session) -> bool:
+        """
+        Compara la versión de las tablas con la del snapshot y reconstruye si difieren.
+        Los parches locales ya avanzaron la versión del snapshot: solo los cambios
+        de otros workers o hechos fuera de la API provocan una reconstrucción.
+
+        Returns:
+            bool: True si se reconstruyó
+        """
+        if not self._stale and self._read_source_version(db) == self._source_version:
+            return False
+        self.build(db)
+        return True
+
+    def _set_player(self, player_id: int, name: str, team: str) -> None:
+        previous_team = self._player_team.get(player_id)
+        if previous_team is not None and previous_team != team:
+            self._players.get(previous_team, {}).pop(player_id, None)
+        self._players.setdefault(team, {})[player_id] = name
+        self._player_team[player_id] = team
+        self._changes += 1
+        self._version = None
+
+    def _advance_source_version(
+        self,
+        db: Optional[Session],
+        base: Optional[Tuple],
+        count_delta: int,
+        player_id: int,
+        updated_at: Optional[datetime],
+    ) -> None:
+        """
+        Después de un parche local lee la versión de las tablas y la adopta si es
+        la esperada: la versión previa (`base`) más este cambio. Si hubo otro cambio
+        en el medio (otro worker, SQL externo) la deja y la reconciliación reconstruye.
+        """
+        if db is None or base is None:
+            return
+        try:
+            source_version = self._read_source_version(db)
+        except SQLAlchemyError as e:
+            logger.warning(f"⚠️ No se pudo leer la versión del mapa después del cambio: {e}")
+            return
+        teams_version, (count, max_id, max_updated) = source_version
+        base_teams, (base_count, base_max_id, base_max_updated) = base
+        if teams_version != base_teams or count != base_count + count_delta:
+            return
+        if count_delta < 0:
+            # Una baja no agrega IDs ni modificaciones nuevas
+            expected = (max_id or 0) <= (base_max_id or 0) and (
+                max_updated is None or base_max_updated is None or max_updated <= base_max_updated
+            )
+        else:
+            # Un alta o cambio deja a este jugador como el último modificado
+            expected = max_updated == updated_at and max_id == (
+                max(base_max_id or 0, player_id) if count_delta else base_max_id
+            )
+        if not expected:
+            return
+        with self._lock:
+            if not self._stale and self._source_version == base:
+                self._source_version = source_version
+
+    def player_created(
+        self, player_id: int, name: str, team: str,
+        db: Optional[Session] = None, updated_at: Optional[datetime] = None
+    ) -> None:
+        """Agrega un jugador recién creado (con `db` y `updated_at` avanza la versión del snapshot)"""
+        with self._lock:
+            self._set_player(player_id, name, team)
+            base = self._source_version
+        self._advance_source_version(db, base, 1, player_id, updated_at)
+
+    def player_updated(
+        self, player_id: int, name: str, team: str,
+        db: Optional[Session] = None, updated_at: Optional[datetime] = None
+    ) -> None:
+        """Actualiza nombre y/o equipo de un jugador (lo mueve de equipo si cambió)"""
+        with self._lock:
+            self._set_player(player_id, name, team)
+            base = self._source_version
+        self._advance_source_version(db, base, 0, player_id, updated_at)
+
+    def player_deleted(self, player_id: int, db: Optional[Session] = None) -> None:
+        """Quita un jugador eliminado"""
+        with self._lock:
+            team = self._player_team.pop(player_id, None)
+            if team is not None:
+                self._players.get(team, {}).pop(player_id, None)
+                self._changes += 1
+                self._version = None
+            base = self._source_version
+        self._advance_source_version(db, base, -1, player_id, None)
+
+    def get_locations(self) -> List[Dict]:
+        """
+        Ubicaciones de todos los equipos con sus jugadores, sin clima.
+        Retorna copias: quien las recibe puede agregarles campos.
+        """
+        with self._lock:
+            locations = []
+            for name, team in self._teams.items():
+                players = self._players.get(name, {})
+                locations.append({
+                    **team,
+                    "players_count": len(players),
+                    "players": list(players.values()),
+                })
+            return locations
+
+    def get_location(self, name: str) -> Optional[Dict]:
+        """Ubicación de un equipo con sus jugadores (copia), o None si no existe"""
+        with self._lock:
+            team = self._teams.get(name)
+            if team is None:
+                return None
+            players = self._players.get(name, {})
+            return {**team, "players_count": len(players), "players": list(players.values())}
+
+    def get_team_id(self, name: str) -> Optional[int]:
+        """ID del equipo en la tabla teams (None si no existe)"""
+        return self._team_ids.get(name)
+
+    def get_weather_targets(self) -> List[Dict]:
+        """Nombre, coordenadas e ID de ciudad de OpenWeatherMap de cada equipo (para el clima)"""
+        with self._lock:
+            return [
+                {
+                    "team": name,
+                    "latitude": team["latitude"],
+                    "longitude": team["longitude"],
+                    "owm_city_id": self._owm_city_ids.get(name),
+                }
+                for name, team in self._teams.items()
+            ]
+
+    def get_version(self) -> str:
+        """Hash del contenido actual (se recalcula solo después de un cambio)"""
+        with self._lock:
+            if self._version is None:
+                digest = hashlib.blake2b(digest_size=12)
+                for name, team in self._teams.items():
+                    digest.update(repr(sorted(team.items())).encode())
+                    digest.update(repr(sorted(self._players.get(name, {}).items())).encode())
+                self._version = digest.hexdigest()
+            return self._version
+
+
+map_snapshot = MapSnapshot()
+
+# Los equipos cambian rara vez (scripts de carga): se reconstruye completo en la próxima lectura
+on_team_change(map_snapshot.invalidate)
+
+
+def _ensure_built_with_new_session() -> None:
+    db = SessionLocal()
+    try:
+        map_snapshot.ensure_built(db)
+    finally:
+        db.close()
+
+
+def _reconcile_with_new_session() -> bool:
+    db = SessionLocal()
+    try:
+        return map_snapshot.reconcile(db)
+    finally:
+        db.close()
+
+
+async def run_snapshot_reconciler(interval: float) -> None:
+    """
+    Tarea de fondo: reconcilia el snapshot con la base de datos cada `interval` segundos.
+    Las consultas corren en un hilo para no bloquear el event loop.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if await asyncio.to_thread(_reconcile_with_new_session):
+                logger.info("🔄 Snapshot del mapa reconstruido por cambios externos")
+        except Exception as e:
+            logger.error(f"❌ Error al reconciliar el snapshot del mapa: {e}")
@@ -4,19 +4,81 @@ Maneja la lógica de negocio para obtener y procesar ubicaciones de equipos
 AHORA USA LA BASE DE DATOS E INCLUYE INFORMACIÓN DEL CLIMA
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from typing import List, Dict, Optional
 import logging
 import asyncio
+import threading
+import time
 
+import orjson
+
+from app.config.NBA_database import SessionLocal
 from app.repositories.Team_repository import TeamRepository
 from app.repositories.NBA_repository import PlayerRepository
-from app.models.NBA_model import Player
-from app.models.Team_model import Team
 from app.services.Weather_service import WeatherService
+from app.services.MapSnapshot_service import map_snapshot
+from app.services.WeatherPrefetch_service import weather_prefetcher
+from app.services.WeatherHistory_service import weather_history
+from app.config.weather_config import weather_config
+from app.utils.single_flight import SingleFlight
 
 logger = logging.getLogger('nba_api.services.nba_map')
 
+# Con la actualización en segundo plano desactivada el clima se consulta en vivo:
+# las versiones (ETag) del mapa cambian al menos cada ventana para que los
+# clientes no conserven datos meteorológicos viejos.
+WEATHER_ETAG_WINDOW_SECONDS = 600
+
+# Peticiones concurrentes idénticas de /teams-locations comparten una sola ejecución
+teams_locations_flight = SingleFlight("teams-locations")
+
+# Propiedades livianas de cada feature GeoJSON (lo necesario para dibujar el marcador);
+# el contenido del popup se pide aparte con /team-details/{team_name}
+GEOJSON_WEATHER_FIELDS = ("temperature", "icon")
+
+
+def build_feature_collection(locations: List[Dict]) -> Dict:
+    """Convierte las ubicaciones del mapa en un FeatureCollection de puntos"""
+    features = []
+    for location in locations:
+        weather = location.get("weather") or {}
+        features.append({
+            "type": "Feature",
+            "id": map_snapshot.get_team_id(location["team"]),
+            "geometry": {
+                "type": "Point",
+                # GeoJSON usa el orden [longitud, latitud]
+                "coordinates": [location["longitude"], location["latitude"]],
+            },
+            "properties": {
+                "team": location["team"],
+                "city": location["city"],
+                "players_count": location["players_count"],
+                **{field: weather.get(field) for field in GEOJSON_WEATHER_FIELDS},
+            },
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+class _SerializedCache:
+    """Último cuerpo serializado por versión (se reutilizan los mismos bytes hasta que cambia)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._payload: Optional[bytes] = None
+
+    def get(self, key) -> Optional[bytes]:
+        with self._lock:
+            return self._payload if self._key == key else None
+
+    def put(self, key, payload: bytes) -> None:
+        with self._lock:
+            self._key, self._payload = key, payload
+
+
+teams_geojson_cache = _SerializedCache()
+
 
 class NBAMapService:
     """
@@ -41,16 +103,126 @@ class NBAMapService:
         self.player_repository = PlayerRepository(db)
         self.weather_service = WeatherService()
     
+    async def get_locations_version(self) -> tuple:
+        """
+        Obtiene la versión de los datos del mapa sin construir la respuesta.
+        
+        Combina la versión del snapshot en memoria (equipos y jugadores) y la
+        del caché de clima (o la ventana de tiempo si el clima se consulta en
+        vivo). No consulta la base de datos salvo que el snapshot esté invalidado;
+        en ese caso lo construye en un hilo, fuera del event loop.
+        
+        Returns:
+            tuple: Partes que identifican la versión actual del mapa
+        """
+        await map_snapshot.ensure_built_async()
+        if weather_config.is_prefetch_enabled():
+            weather_version = weather_prefetcher.get_version()
+        else:
+            weather_version = int(time.time() // WEATHER_ETAG_WINDOW_SECONDS)
+        return (map_snapshot.get_version(), weather_version)
+    
+    def get_team_info_version(self, team_name: str) -> Optional[tuple]:
+        """
+        Obtiene la versión de la información de un equipo (equipo + sus jugadores).
+        
+        Args:
+            team_name: Nombre del equipo
+            
+        Returns:
+            Optional[tuple]: Versión del equipo o None si no existe
+        """
+        team_version = self.team_repository.get_team_version(team_name)
+        if team_version is None:
+            return None
+        return (team_version, self.player_repository.get_players_version(team=team_name))
+    
+    async def get_teams_locations_coalesced(self, authorization_class: str, version_key: str) -> List[Dict]:
+        """
+        Obtiene las ubicaciones compartiendo la ejecución con las peticiones
+        concurrentes de la misma clase de autorización y versión de datos.
+        
+        La ejecución compartida usa su propia sesión de base de datos: no depende
+        de la petición que la inició (que puede cancelarse).
+        
+        Args:
+            authorization_class: Permiso que habilita la respuesta (ej. "can_read_players")
+            version_key: Versión de los datos (ETag) con la que se calcula
+            
+        Returns:
+            List[Dict]: Resultado compartido (no debe modificarse)
+        """
+        async def compute() -> List[Dict]:
+            db = SessionLocal()
+            try:
+                return await NBAMapService(db).get_teams_locations()
+            finally:
+                db.close()
+        
+        return await teams_locations_flight.do(("teams-locations", authorization_class, version_key), compute)
+    
+    async def get_teams_geojson_coalesced(self, authorization_class: str, version_key: str) -> bytes:
+        """
+        Obtiene el FeatureCollection de los equipos ya serializado.
+
+        Los bytes se construyen una vez por versión de datos (ETag) y se
+        reutilizan en las peticiones siguientes; las concurrentes comparten
+        una sola construcción.
+
+        Args:
+            authorization_class: Permiso que habilita la respuesta
+            version_key: Versión de los datos (ETag)
+
+        Returns:
+            bytes: Cuerpo application/geo+json
+        """
+        cache_key = (authorization_class, version_key)
+        payload = teams_geojson_cache.get(cache_key)
+        if payload is not None:
+            return payload
+
+        async def compute() -> bytes:
+            db = SessionLocal()
+            try:
+                locations = await NBAMapService(db).get_teams_locations()
+            finally:
+                db.close()
+            body = orjson.dumps(build_feature_collection(locations))
+            teams_geojson_cache.put(cache_key, body)
+            return body
+
+        return await teams_locations_flight.do(("teams-geojson", authorization_class, version_key), compute)
+
+    async def get_team_details(self, team_name: str) -> Optional[Dict]:
+        """
+        Contenido del popup de un equipo (pedido al abrirlo): ubicación,
+        estadio, jugadores y clima completo. Se lee del snapshot, sin SQL.
+
+        Args:
+            team_name: Nombre del equipo
+
+        Returns:
+            Optional[Dict]: Detalle del equipo o None si no existe
+        """
+        await map_snapshot.ensure_built_async()
+        details = map_snapshot.get_location(team_name)
+        if details is None:
+            return None
+        if weather_config.is_prefetch_enabled():
+            details["weather"] = weather_prefetcher.get(team_name)
+        else:
+            details["weather"] = await self.weather_service.get_weather(details["latitude"], details["longitude"])
+        return details
+
     async def get_teams_locations(self) -> List[Dict]:
         """
         Obtiene las ubicaciones de todos los equipos con sus jugadores Y CLIMA.
         
         Proceso:
-        1. Obtiene todos los equipos de la base de datos
-        2. Para cada equipo, cuenta cuántos jugadores tiene
-        3. Obtiene los nombres de los jugadores
-        4. Consulta el clima actual de cada ciudad (API OpenWeatherMap)
-        5. Retorna lista de equipos con ubicación, jugadores y clima
+        1. Lee equipos y jugadores del snapshot en memoria (sin SQL)
+        2. Toma el clima de cada ciudad del caché actualizado en segundo plano
+           (o lo consulta en vivo a OpenWeatherMap si está desactivado)
+        3. Retorna lista de equipos con ubicación, jugadores y clima
         
         Returns:
             List[Dict]: Lista de equipos con sus coordenadas, jugadores y clima
@@ -76,62 +248,39 @@ class NBAMapService:
             ]
         """
         try:
-            logger.info("🗺️ Obteniendo ubicaciones de equipos desde la BD...")
-            
-            # Obtener todos los equipos con JOIN a jugadores
-            results = (
-                self.db.query(
-                    Team,
-                    func.count(Player.id).label('players_count')
-                )
-                .outerjoin(Player, Team.name == Player.team)
-                .group_by(Team.id)
-                .all()
-            )
+            logger.info("🗺️ Obteniendo ubicaciones de equipos desde el snapshot...")
             
-            logger.info(f"📊 Se encontraron {len(results)} equipos en la BD")
+            # Equipos con sus jugadores (copias del snapshot, se pueden completar)
+            await map_snapshot.ensure_built_async()
+            locations = map_snapshot.get_locations()
             
-            # Construir la lista de ubicaciones
-            locations = []
+            logger.info(f"📊 Se encontraron {len(locations)} equipos en el snapshot")
             
-            # Obtener clima para cada equipo de forma asíncrona
-            for team, players_count in results:
-                # Obtener los jugadores del equipo
-                players = self.db.query(Player).filter(Player.team == team.name).all()
-                
-                # Obtener información del clima
-                logger.info(f"🌤️ Consultando clima para {team.city}...")
-                weather_data = await self.weather_service.get_weather(
-                    team.latitude, 
-                    team.longitude
-                )
-                
-                location_data = {
-                    "team": team.name,
-                    "city": team.city,
-                    "state": team.state,
-                    "latitude": team.latitude,
-                    "longitude": team.longitude,
-                    "stadium": team.stadium,
-                    "conference": team.conference,
-                    "division": team.division,
-                    "players_count": players_count,
-                    "players": [player.name for player in players],
-                    "weather": weather_data  # Agregar datos del clima
-                }
-                
-                locations.append(location_data)
+            prefetched = weather_config.is_prefetch_enabled()
+            for location_data in locations:
+                # Obtener información del clima (la petición nunca espera a la API si hay caché)
+                if prefetched:
+                    weather_data = weather_prefetcher.get(location_data["team"])
+                else:
+                    logger.info(f"🌤️ Consultando clima para {location_data['city']}...")
+                    weather_data = await self.weather_service.get_weather(
+                        location_data["latitude"], 
+                        location_data["longitude"]
+                    )
+                    if weather_config.is_history_enabled():
+                        weather_history.record(location_data["team"], weather_data)
+                location_data["weather"] = weather_data  # Agregar datos del clima
                 
                 # Log con emoji según temperatura
                 if weather_data:
                     temp = weather_data.get('temperature', 0)
                     emoji = "🥵" if temp > 30 else "🌡️" if temp > 20 else "🥶"
                     logger.debug(
-                        f"   ✅ {team.name}: {players_count} jugadores, "
+                        f"   ✅ {location_data['team']}: {location_data['players_count']} jugadores, "
                         f"{emoji} {temp}°C - {weather_data.get('description', 'N/A')}"
                     )
                 else:
-                    logger.debug(f"   ✅ {team.name}: {players_count} jugadores (sin datos de clima)")
+                    logger.debug(f"   ✅ {location_data['team']}: {location_data['players_count']} jugadores (sin datos de clima)")
             
             logger.info(f"✅ Ubicaciones obtenidas: {len(locations)} equipos con clima")
             return locations
@@ -141,6 +290,15 @@ class NBAMapService:
             logger.exception(e)
             raise
     
+    def get_weather_status(self) -> Dict:
+        """
+        Obtiene la frescura del clima en caché de cada equipo.
+        
+        Returns:
+            Dict: Estado del actualizador y antigüedad del clima por equipo
+        """
+        return {"prefetch_enabled": weather_config.is_prefetch_enabled(), **weather_prefetcher.get_status()}
+    
     def get_team_info(self, team_name: str) -> Optional[Dict]:
         """
         Obtiene información detallada de un equipo específico.
@@ -159,9 +317,10 @@ class NBAMapService:
                 logger.warning(f"⚠️ Equipo no encontrado: {team_name}")
                 return None
             
-            # Obtener jugadores del equipo
-            all_players = self.player_repository.listar_jugadores(skip=0, limit=1000)
-            team_players = [p for p in all_players if p.team == team_name]
+            # Obtener jugadores del equipo (filtrado en SQL)
+            team_players = self.player_repository.get_players_filtered(
+                skip=0, limit=1000, team=team_name
+            )
             
             # Construir respuesta
             team_info = {
@@ -1,7 +1,14 @@
 from datetime import date
 from sqlalchemy.orm import Session
-from app.repositories.NBA_repository import PlayerRepository
+from app.repositories.NBA_repository import NAME_SEARCH_MIN_LENGTH, PlayerRepository
 from app.models.NBA_model import Player
+from app.utils.fast_serialization import PLAYER_RESPONSE_FIELDS, player_rows_to_dicts
+from app.services.MapSnapshot_service import map_snapshot
+from app.services.Events_service import publish_player_created, publish_player_deleted, publish_player_updated
+from app.services.Analytics_service import AnalyticsService
+
+# Campos del jugador que alimentan los rollups de la plantilla
+ROLLUP_FIELDS = ("team", "position", "height_m", "weight_kg", "birth_date")
 
 
 """
@@ -24,12 +31,71 @@ class PlayerService:
         """
         self.repository = PlayerRepository(db_session)
 
-    def listar_jugadores(self, skip: int = 0, limit: int = 100):
+    @staticmethod
+    def _valores_rollup(player) -> dict:
+        return {field: getattr(player, field) for field in ROLLUP_FIELDS}
+
+    def listar_jugadores(self, skip: int = 0, limit: int = 100, sort_by: str = "id", order: str = "asc", **filters):
+        """
+        Recupera y retorna los jugadores con soporte para paginación, filtros y ordenamiento.
+        Los filtros (team, position, rangos de altura/peso y de fecha de nacimiento) se
+        traducen a SQL en el repositorio, por lo que solo viajan las filas solicitadas.
+        """
+        self._validar_rangos(filters)
+        return self.repository.get_players_filtered(
+            skip=skip, limit=limit, sort_by=sort_by, order=order, **filters
+        )
+
+    def buscar_jugadores(self, query: str, limit: int = 10):
+        """
+        Busca jugadores por nombre (autocompletado).
+        El texto debe tener al menos NAME_SEARCH_MIN_LENGTH caracteres útiles (así
+        el índice de trigramas siempre aplica) y el resultado está acotado por `limit`.
+        """
+        query = " ".join((query or "").split())
+        if len(query) < NAME_SEARCH_MIN_LENGTH:
+            raise ValueError(f"La búsqueda debe tener al menos {NAME_SEARCH_MIN_LENGTH} caracteres")
+        return self.repository.search_players_by_name(query, limit=limit)
+
+    @staticmethod
+    def _validar_rangos(filters: dict):
+        """Verifica que los rangos recibidos tengan el mínimo menor o igual al máximo."""
+        rangos = [
+            ("min_height", "max_height", "La altura mínima no puede ser mayor a la máxima"),
+            ("min_weight", "max_weight", "El peso mínimo no puede ser mayor al máximo"),
+            ("born_after", "born_before", "La fecha inicial de nacimiento no puede ser posterior a la final"),
+        ]
+        for minimo, maximo, mensaje in rangos:
+            if filters.get(minimo) is not None and filters.get(maximo) is not None:
+                if filters[minimo] > filters[maximo]:
+                    raise ValueError(mensaje)
+
+    def listar_jugadores_serializados(self, skip: int = 0, limit: int = 100, sort_by: str = "id", order: str = "asc", **filters):
+        """
+        Igual que listar_jugadores pero retorna diccionarios listos para serializar
+        con la forma de PlayerResponse, leyendo solo las columnas necesarias.
+        Evita crear objetos ORM y la segunda validación con Pydantic en listados.
+        """
+        self._validar_rangos(filters)
+        rows = self.repository.get_players_rows_filtered(
+            PLAYER_RESPONSE_FIELDS, skip=skip, limit=limit, sort_by=sort_by, order=order, **filters
+        )
+        return player_rows_to_dicts(rows)
+
+    def obtener_version_listado(self, **filters):
         """
-        Recupera y retorna todos los jugadores con soporte para paginación.
-        Útil para catálogos, listados o vistas generales.
+        Retorna la versión (conteo, max id, max updated_at) del listado filtrado.
+        Se usa para construir el ETag sin cargar las filas.
         """
-        return self.repository.get_all_players(skip=skip, limit=limit)
+        self._validar_rangos(filters)
+        return self.repository.get_players_version(**filters)
+
+    def obtener_version_jugador(self, player_id: int):
+        """
+        Retorna el updated_at del jugador o None si no existe.
+        Se usa para construir el ETag/Last-Modified sin cargar la fila completa.
+        """
+        return self.repository.get_player_version(player_id)
 
     def obtener_jugador(self, player_id: int):
         """
@@ -74,7 +140,12 @@ class PlayerService:
             birth_date=birth_date
         )
 
-        return self.repository.create_player(new_player)
+        player = self.repository.create_player(new_player)
+        # Mantener el snapshot del mapa al día sin reconstruirlo
+        map_snapshot.player_created(player.id, player.name, player.team, self.repository.db, player.updated_at)
+        publish_player_created(player)
+        AnalyticsService(self.repository.db).record_player_change(None, self._valores_rollup(player))
+        return player
 
     def actualizar_jugador(self, player_id: int, update_data: dict):
         """
@@ -101,11 +172,17 @@ class PlayerService:
                 raise ValueError("La fecha de nacimiento no puede estar en el futuro")
             update_data["birth_date"] = birth_date
 
+        anterior = self._valores_rollup(player)
+
         # Aplicar cambios
         for key, value in update_data.items():
             setattr(player, key, value)
 
-        return self.repository.update_player(player)
+        player = self.repository.update_player(player)
+        map_snapshot.player_updated(player.id, player.name, player.team, self.repository.db, player.updated_at)
+        publish_player_updated(player)
+        AnalyticsService(self.repository.db).record_player_change(anterior, self._valores_rollup(player))
+        return player
 
     def eliminar_jugador(self, player_id: int):
         """
@@ -116,7 +193,12 @@ class PlayerService:
         if not player:
             raise ValueError(f"No se encontró un jugador con ID {player_id}")
 
-        return self.repository.delete_player(player)
+        anterior = self._valores_rollup(player)
+        result = self.repository.delete_player(player)
+        map_snapshot.player_deleted(player_id, self.repository.db)
+        publish_player_deleted(player_id)
+        AnalyticsService(self.repository.db).record_player_change(anterior, None)
+        return result
 
 # Funciones globales para exponer los métodos de PlayerService
 def listar_jugadores(db, skip=0, limit=100):
@@ -0,0 +1,132 @@
+"""
+Estadísticas de jugadores por partido y promedios por temporada.
+
+- Ingesta: los box scores (NDJSON o CSV) se validan línea a línea y se
+  cargan en lotes de STATS_INGEST_BATCH_SIZE. Cada lote es un INSERT masivo
+  idempotente más la suma de los partidos nuevos a player_season_stats, en
+  la misma transacción.
+- Consulta: los promedios por temporada se calculan desde los agregados
+  (una fila por jugador y temporada), sin recorrer los partidos.
+"""
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config.stats_config import stats_config
+from app.models.PlayerGameStats_model import STAT_COLUMNS
+from app.repositories.PlayerStats_repository import PlayerStatsRepository
+from app.utils.box_scores import BoxScoreReader
+
+logger = logging.getLogger('nba_api.services.player_stats')
+
+# Promedio por partido: campo de la respuesta → columna sumada
+_PER_GAME = {
+    "points": "points", "rebounds": "rebounds", "assists": "assists",
+    "steals": "steals", "blocks": "blocks", "turnovers": "turnovers",
+}
+
+# Porcentaje de tiro: campo → (convertidos, intentados)
+_PERCENTAGES = {"fg_pct": ("fgm", "fga"), "fg3_pct": ("fg3m", "fg3a"), "ft_pct": ("ftm", "fta")}
+
+
+class BoxScoreIngestor:
+    """
+    Carga incremental de un archivo de box scores.
+
+    Se alimenta con bloques de líneas (`feed`) y escribe cada vez que junta
+    `batch_size` registros válidos; `finish` escribe el resto y retorna el resumen.
+
+    Args:
+        db: Sesión de base de datos
+        fmt: "ndjson" o "csv"
+        batch_size: Registros por transacción (por defecto STATS_INGEST_BATCH_SIZE)
+    """
+
+    def __init__(self, db: Session, fmt: str, batch_size: Optional[int] = None):
+        self.reader = BoxScoreReader(fmt)
+        self.repository = PlayerStatsRepository(db)
+        self.batch_size = batch_size or stats_config.get_batch_size()
+        self.max_errors = stats_config.get_max_errors()
+        self._pending: List[Dict] = []
+        self._started = time.perf_counter()
+        self.received = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.errors: List[Dict] = []
+
+    def _reject(self, line: int, message: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": message})
+
+    def feed(self, lines: Iterable[str]) -> None:
+        rows, errors = self.reader.feed(list(lines))
+        for line, message in errors:
+            self._reject(line, message)
+        self.received += len(rows) + len(errors)
+        self._pending.extend(rows)
+        while len(self._pending) >= self.batch_size:
+            batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+            self._flush(batch)
+
+    def _flush(self, rows: List[Dict]) -> None:
+        # Las filas de jugadores inexistentes harían fallar el lote completo por la clave foránea
+        known = self.repository.get_existing_player_ids(row["player_id"] for row in rows)
+        valid = []
+        for row in rows:
+            if row["player_id"] in known:
+                valid.append(row)
+            else:
+                self._reject(0, f"Jugador {row['player_id']} inexistente (game_id {row['game_id']})")
+        self.inserted += self.repository.insert_games(valid)
+
+    def finish(self) -> Dict:
+        """Escribe los registros pendientes y retorna el resumen de la carga"""
+        if self._pending:
+            self._flush(self._pending)
+            self._pending = []
+        summary = {
+            "received": self.received,
+            "inserted": self.inserted,
+            "duplicates": self.received - self.rejected - self.inserted,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "elapsed_ms": round((time.perf_counter() - self._started) * 1000, 1),
+        }
+        logger.info(
+            f"📥 ACCIÓN: Box scores cargados: {summary['inserted']} nuevos, {summary['duplicates']} repetidos, "
+            f"{summary['rejected']} rechazados en {summary['elapsed_ms']} ms"
+        )
+        return summary
+
+
+def season_averages(season) -> Dict:
+    """Promedios y porcentajes de una fila de player_season_stats"""
+    games = season.games or 0
+    averages = {
+        "season": season.season,
+        "games": games,
+        "minutes": round(season.seconds / 60 / games, 1) if games else 0.0,
+    }
+    for field, column in _PER_GAME.items():
+        averages[field] = round(getattr(season, column) / games, 1) if games else 0.0
+    for field, (made, attempted) in _PERCENTAGES.items():
+        attempts = getattr(season, attempted)
+        averages[field] = round(getattr(season, made) / attempts, 3) if attempts else None
+    averages["totals"] = {column: getattr(season, column) for column in STAT_COLUMNS}
+    return averages
+
+
+class PlayerStatsService:
+    """Consultas de estadísticas por jugador"""
+
+    def __init__(self, db: Session):
+        self.repository = PlayerStatsRepository(db)
+
+    def get_season_averages(self, player_id: int, season: Optional[int] = None) -> List[Dict]:
+        return [season_averages(row) for row in self.repository.get_season_stats(player_id, season)]
+
+    def get_player_games(self, player_id: int, season: Optional[int] = None, skip: int = 0, limit: int = 100):
+        return self.repository.get_games(player_id, season, skip=skip, limit=limit)
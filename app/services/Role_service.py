@@ -5,6 +5,7 @@ Contiene la lógica de negocio para gestión de roles
 from sqlalchemy.orm import Session
 from app.repositories.Role_repository import RoleRepository
 from app.Schema.Role_Schema import RoleCreate, RoleUpdate, RoleResponse, RoleWithUsers
+from app.utils.permissions import role_permissions_cache
 from typing import List
 from fastapi import HTTPException, status
 
@@ -26,6 +27,20 @@ class RoleService:
                 detail=f"Error al obtener roles: {str(e)}"
             )
 
+    def get_all_roles_with_users(self, skip: int = 0, limit: int = 100) -> List[RoleWithUsers]:
+        """Obtiene todos los roles con su cantidad de usuarios (un solo GROUP BY)"""
+        try:
+            rows = self.role_repository.get_roles_with_user_count(skip=skip, limit=limit)
+            return [
+                RoleWithUsers.model_validate(role).model_copy(update={"users_count": users_count})
+                for role, users_count in rows
+            ]
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al obtener roles con usuarios: {str(e)}"
+            )
+
     def get_role_by_id(self, role_id: int) -> RoleResponse:
         """Obtiene un rol por ID"""
         try:
@@ -69,6 +84,8 @@ class RoleService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Rol con ID {role_id} no encontrado"
                 )
+            # Los tokens con la versión anterior dejan de usar sus claims de permisos
+            role_permissions_cache.invalidate(role_id)
             return RoleResponse.model_validate(updated_role)
         except HTTPException:
             raise
@@ -87,6 +104,7 @@ class RoleService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Rol con ID {role_id} no encontrado"
                 )
+            role_permissions_cache.invalidate(role_id)
             return {"message": f"Rol con ID {role_id} eliminado exitosamente"}
         except ValueError as e:
             raise HTTPException(
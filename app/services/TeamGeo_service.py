@@ -0,0 +1,261 @@
+"""
+Índice espacial en memoria de los estadios de los equipos.
+
+Las coordenadas de la tabla `teams` se cargan en arreglos NumPy contiguos y
+las consultas (más cercanos, dentro de un radio, matriz de distancias) se
+resuelven con haversine vectorizado. Los resultados se guardan en caché
+hasta que cambian los equipos:
+
+- Altas, cambios y bajas hechas con TeamRepository invalidan el índice.
+- Cambios externos (scripts, otros workers) se detectan comparando la
+  versión de la tabla cada `recheck_seconds`.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import orjson
+from sqlalchemy.orm import Session
+
+from app.config.map_config import map_config
+from app.repositories.Team_repository import TeamRepository, on_team_change
+from app.utils.geo import distance_matrix_km, haversine_km, to_radians
+from app.utils.route_optimizer import optimize_route
+
+logger = logging.getLogger('nba_api.services.team_geo')
+
+
+class TeamSpatialIndex:
+    """
+    Coordenadas de los equipos en arreglos contiguos con caché de resultados.
+
+    Args:
+        recheck_seconds: Segundos entre verificaciones de la versión de la tabla
+        cache_size: Consultas (más cercanos / radio) que se recuerdan
+    """
+
+    def __init__(self, recheck_seconds: float, cache_size: int = 256):
+        self.recheck_seconds = recheck_seconds
+        self.cache_size = cache_size
+        self._lock = threading.RLock()
+        self._teams: List[Dict] = []
+        self._positions: Dict[int, int] = {}         # id de equipo → posición en los arreglos
+        self._lat = np.empty(0)
+        self._lon = np.empty(0)
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_payload: Optional[bytes] = None
+        self._results: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+        self._source_version: Optional[Tuple] = None
+        self._version: Optional[str] = None
+        self._stale = True
+        self._checked_at = 0.0
+        self.builds = 0
+
+    @property
+    def version(self) -> Optional[str]:
+        """Hash de los equipos y coordenadas indexados (cambia solo si cambia el contenido)"""
+        return self._version
+
+    def build(self, db: Session) -> None:
+        """Carga las coordenadas de todos los equipos y descarta la caché"""
+        repository = TeamRepository(db)
+        source_version = repository.get_teams_version()
+        teams = [
+            {"id": team.id, "team": team.name, "city": team.city, "latitude": team.latitude, "longitude": team.longitude}
+            for team in repository.get_all_teams_ordered()
+        ]
+        lat, lon = to_radians([t["latitude"] for t in teams], [t["longitude"] for t in teams])
+        digest = hashlib.blake2b(digest_size=12)
+        for team in teams:
+            digest.update(repr(sorted(team.items())).encode())
+
+        with self._lock:
+            self._teams = teams
+            self._positions = {team["id"]: position for position, team in enumerate(teams)}
+            self._lat, self._lon = lat, lon
+            self._matrix = None
+            self._matrix_payload = None
+            self._results.clear()
+            self._source_version = source_version
+            self._version = digest.hexdigest()
+            self._stale = False
+            self._checked_at = time.monotonic()
+            self.builds += 1
+
+        logger.info(f"📍 Índice espacial de equipos construido: {len(teams)} estadios")
+
+    def invalidate(self) -> None:
+        """Marca el índice para reconstruirlo en la próxima consulta"""
+        with self._lock:
+            self._stale = True
+
+    def ensure_fresh(self, db: Session) -> None:
+        """Reconstruye si fue invalidado o si la tabla cambió desde la última verificación"""
+        with self._lock:
+            if self._stale:
+                self.build(db)
+                return
+            if time.monotonic() - self._checked_at < self.recheck_seconds:
+                return
+            self._checked_at = time.monotonic()
+            if TeamRepository(db).get_teams_version() != self._source_version:
+                self.build(db)
+
+    # ------------------------------------------------------------------ consultas
+
+    def _cached(self, key: Tuple, compute) -> List[Dict]:
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return result
+            result = compute()
+            self._results[key] = result
+            if len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+            return result
+
+    def _distances_from(self, latitude: float, longitude: float) -> np.ndarray:
+        point_lat, point_lon = to_radians(latitude, longitude)
+        return haversine_km(point_lat, point_lon, self._lat, self._lon)
+
+    def _with_distances(self, positions: np.ndarray, distances: np.ndarray) -> List[Dict]:
+        return [
+            {**self._teams[position], "distance_km": round(float(distances[position]), 1)}
+            for position in positions
+        ]
+
+    def nearest(self, latitude: float, longitude: float, limit: int) -> List[Dict]:
+        """Los `limit` equipos más cercanos al punto, del más cercano al más lejano"""
+        def compute() -> List[Dict]:
+            if not self._teams:
+                return []
+            distances = self._distances_from(latitude, longitude)
+            k = min(limit, len(distances))
+            # argpartition: O(n) para separar los k menores; solo esos se ordenan
+            candidates = np.argpartition(distances, k - 1)[:k]
+            return self._with_distances(candidates[np.argsort(distances[candidates])], distances)
+
+        # Coordenadas redondeadas a ~10 m para que consultas equivalentes compartan caché
+        return self._cached(("nearest", round(latitude, 4), round(longitude, 4), limit), compute)
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> List[Dict]:
+        """Equipos a `radius_km` o menos del punto, del más cercano al más lejano"""
+        def compute() -> List[Dict]:
+            if not self._teams:
+                return []
+            distances = self._distances_from(latitude, longitude)
+            inside = np.flatnonzero(distances <= radius_km)
+            return self._with_distances(inside[np.argsort(distances[inside])], distances)
+
+        return self._cached(("within", round(latitude, 4), round(longitude, 4), round(radius_km, 1)), compute)
+
+    def distance_matrix(self) -> np.ndarray:
+        """Matriz N×N de distancias en km (se calcula una vez por versión del índice)"""
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = distance_matrix_km(self._lat, self._lon)
+            return self._matrix
+
+    def distance_matrix_payload(self) -> bytes:
+        """Respuesta JSON de la matriz ya serializada (se reutilizan los mismos bytes)"""
+        with self._lock:
+            if self._matrix_payload is None:
+                self._matrix_payload = orjson.dumps(
+                    {
+                        "teams": [{"id": team["id"], "team": team["team"]} for team in self._teams],
+                        "distances_km": np.round(self.distance_matrix(), 1),
+                    },
+                    option=orjson.OPT_SERIALIZE_NUMPY,
+                )
+            return self._matrix_payload
+
+    def route_inputs(self, team_ids: List[int]) -> Tuple[List[Dict], np.ndarray]:
+        """
+        Equipos y submatriz de distancias para un conjunto de IDs (en ese orden).
+
+        Raises:
+            ValueError: Si algún ID no corresponde a un equipo
+        """
+        with self._lock:
+            missing = [team_id for team_id in team_ids if team_id not in self._positions]
+            if missing:
+                raise ValueError(f"Equipos no encontrados: {missing}")
+            positions = np.array([self._positions[team_id] for team_id in team_ids], dtype=np.intp)
+            teams = [self._teams[position] for position in positions]
+            return teams, self.distance_matrix()[np.ix_(positions, positions)]
+
+
+team_spatial_index = TeamSpatialIndex(recheck_seconds=map_config.get_snapshot_reconcile_seconds())
+
+# Cualquier cambio de equipos hecho por el repositorio (incluidas coordenadas) invalida el índice
+on_team_change(team_spatial_index.invalidate)
+
+
+class TeamGeoService:
+    """Consultas de proximidad entre estadios sobre el índice espacial"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.index = team_spatial_index
+
+    def get_version(self) -> Optional[str]:
+        self.index.ensure_fresh(self.db)
+        return self.index.version
+
+    def get_nearest_teams(self, latitude: float, longitude: float, limit: int) -> List[Dict]:
+        self.index.ensure_fresh(self.db)
+        return self.index.nearest(latitude, longitude, limit)
+
+    def get_teams_within(self, latitude: float, longitude: float, radius_km: float) -> List[Dict]:
+        self.index.ensure_fresh(self.db)
+        return self.index.within(latitude, longitude, radius_km)
+
+    def get_distance_matrix_payload(self) -> bytes:
+        self.index.ensure_fresh(self.db)
+        return self.index.distance_matrix_payload()
+
+    def plan_road_trip(
+        self,
+        start_team_id: int,
+        team_ids: List[int],
+        return_to_start: bool,
+        time_limit_ms: int,
+    ) -> Dict:
+        """
+        Orden de visita corto para una gira: empieza en `start_team_id` y
+        visita cada equipo de `team_ids` una vez.
+
+        Raises:
+            ValueError: Si algún equipo no existe
+        """
+        self.index.ensure_fresh(self.db)
+        stops = [start_team_id] + list(dict.fromkeys(t for t in team_ids if t != start_team_id))
+        teams, distances = self.index.route_inputs(stops)
+        route = optimize_route(distances, start=0, closed=return_to_start, time_limit=time_limit_ms / 1000)
+
+        itinerary = []
+        for step, position in enumerate(route.order):
+            leg = 0.0 if step == 0 else float(distances[route.order[step - 1], position])
+            itinerary.append({**teams[position], "leg_km": round(leg, 1)})
+        if return_to_start and len(route.order) > 1:
+            leg = float(distances[route.order[-1], 0])
+            itinerary.append({**teams[0], "leg_km": round(leg, 1)})
+
+        logger.info(
+            f"🧭 Gira de {len(stops)} estadios: {route.length:.0f} km "
+            f"(inicial {route.initial_length:.0f} km, {route.improvements} mejoras 2-opt, {route.elapsed_ms:.1f} ms)"
+        )
+        return {
+            "itinerary": itinerary,
+            "total_km": round(route.length, 1),
+            "initial_km": round(route.initial_length, 1),
+            "return_to_start": return_to_start,
+            "improvements": route.improvements,
+            "converged": route.converged,
+            "elapsed_ms": round(route.elapsed_ms, 2),
+        }
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from app.repositories.User_repository import UserRepository
 from app.models.User_model import User
 from app.utils.jwt_utils import jwt_manager
+from app.services.Auth_service import AuthService
 
 
 """
@@ -24,6 +25,7 @@ class UserService:
         Inicializa el servicio de usuarios con una sesión de base de datos y un repositorio de usuarios.
         """
         self.repository = UserRepository(db_session)
+        self.auth_service = AuthService(db_session)
 
     def _hash_password(self, password: str) -> str:
         """Hashea una contraseña usando bcrypt a través del jwt_manager"""
@@ -36,6 +38,22 @@ class UserService:
         """
         return self.repository.get_all_users(skip=skip, limit=limit)
 
+    def listar_usuarios_paginado(self, cursor: int = None, limit: int = 50, is_active: bool = None, role_id: int = None):
+        """
+        Recupera una página de usuarios con paginación por cursor y filtros opcionales.
+        El total solo se calcula en la primera página (sin cursor); las páginas
+        siguientes no repiten el COUNT(*).
+        Retorna (usuarios, cursor_siguiente, total o None).
+        """
+        users, next_cursor = self.repository.get_users_page(
+            after_id=cursor, limit=limit, is_active=is_active, role_id=role_id
+        )
+        total = None
+        if cursor is None:
+            # Si la primera página no se llenó, el total ya es conocido
+            total = len(users) if next_cursor is None else self.repository.count_users(is_active, role_id)
+        return users, next_cursor, total
+
     def obtener_usuario(self, user_id: int):
         """
         Busca y retorna un usuario específico por su ID numérico.
@@ -91,18 +109,22 @@ class UserService:
 
         return self.repository.create_user(new_user)
 
-    def actualizar_usuario(self, user_id: int, username: str = None, password: str = None, role_id: int = None):
+    def actualizar_usuario(self, user_id: int, username: str = None, password: str = None, role_id: int = None, is_active: bool = None):
         """
         Actualiza un usuario existente con validaciones:
         - Usuario debe existir.
         - Si se proporciona username, debe ser único.
         - Si se proporciona password, se hashea antes de almacenar.
         - Si se proporciona role_id, se actualiza el rol.
+        - Si se proporciona is_active, se activa/desactiva el usuario.
+        Los tokens emitidos antes del cambio se revocan: la identidad y el rol viajan en el token.
         """
         user = self.repository.get_user_by_id(user_id)
         if not user:
             raise ValueError(f"Usuario con ID {user_id} no encontrado")
 
+        previous_username, previous_role_id, was_active = user.username, user.role_id, user.is_active
+
         # Validar y actualizar username si se proporciona
         if username is not None:
             if not username or username.strip() == "":
@@ -136,7 +158,25 @@ class UserService:
         if role_id is not None:
             user.role_id = role_id
 
-        return self.repository.update_user(user)
+        # Activar / desactivar el usuario si se proporciona
+        if is_active is not None:
+            user.is_active = is_active
+
+        updated_user = self.repository.update_user(user)
+
+        # Cambios que invalidan los tokens vigentes
+        deactivated = was_active and not updated_user.is_active
+        identity_changed = updated_user.username != previous_username or updated_user.role_id != previous_role_id
+
+        if deactivated or password is not None:
+            # La sesión completa deja de ser válida (incluidos los refresh tokens)
+            reason = "user_deactivated" if deactivated else "password_changed"
+            self.auth_service.revoke_user_sessions(user_id, reason=reason)
+        elif identity_changed:
+            # Los claims quedaron desactualizados: se renuevan con el refresh token
+            self.auth_service.revoke_user_sessions(user_id, reason="identity_changed", include_refresh_tokens=False)
+
+        return updated_user
 
     def eliminar_usuario(self, user_id: int):
         """
@@ -148,6 +188,7 @@ class UserService:
             raise ValueError(f"Usuario con ID {user_id} no encontrado")
         
         self.repository.delete_user(user)
+        self.auth_service.revoke_user_sessions(user_id, reason="user_deleted")
         return user
 
 
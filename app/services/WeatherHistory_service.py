@@ -0,0 +1,207 @@
+"""
+Histórico de clima por equipo.
+
+Cada clima obtenido de OpenWeatherMap (actualización en segundo plano o
+consulta en vivo) se acumula en memoria y se escribe por lotes en la tabla
+`weather_history`: una fila por equipo y bucket de tiempo, con valores
+numéricos compactos. Las consultas de rangos y últimos valores se sirven
+solo desde esa tabla, sin llamar a la API externa.
+"""
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config.NBA_database import SessionLocal
+from app.config.weather_config import weather_config
+from app.models.WeatherHistory_model import WeatherHistory
+from app.repositories.Team_repository import TeamRepository
+from app.repositories.WeatherHistory_repository import WeatherHistoryRepository
+from app.services.MapSnapshot_service import map_snapshot
+
+logger = logging.getLogger('nba_api.services.weather_history')
+
+
+def _scaled(value: Optional[float], factor: int) -> Optional[int]:
+    return None if value is None else int(round(value * factor))
+
+
+def encode_observation(team_id: int, bucket: int, weather: Dict) -> Dict:
+    """Convierte el clima de WeatherService en una fila compacta de weather_history"""
+    return {
+        "team_id": team_id,
+        "bucket": bucket,
+        "temperature_dc": _scaled(weather["temperature"], 10),
+        "feels_like_dc": _scaled(weather.get("feels_like"), 10),
+        "humidity": weather.get("humidity"),
+        "pressure": weather.get("pressure"),
+        "wind_dkmh": _scaled(weather.get("wind_speed"), 10),
+        "clouds": weather.get("clouds"),
+        "visibility_hm": _scaled(weather.get("visibility"), 10),
+        "icon": weather.get("icon"),
+    }
+
+
+def decode_observation(row: WeatherHistory) -> Dict:
+    """Convierte una fila de weather_history a las unidades de la API"""
+    def unscaled(value: Optional[int]) -> Optional[float]:
+        return None if value is None else value / 10
+
+    return {
+        "bucket_start": datetime.fromtimestamp(row.bucket, tz=timezone.utc).isoformat(),
+        "temperature": unscaled(row.temperature_dc),
+        "feels_like": unscaled(row.feels_like_dc),
+        "humidity": row.humidity,
+        "pressure": row.pressure,
+        "wind_speed": unscaled(row.wind_dkmh),
+        "clouds": row.clouds,
+        "visibility": unscaled(row.visibility_hm),
+        "icon": row.icon,
+    }
+
+
+class WeatherHistoryRecorder:
+    """
+    Acumula observaciones en memoria y las escribe por lotes.
+
+    Dentro de un bucket solo se conserva la última observación de cada equipo,
+    así el lote pendiente nunca crece más que equipos × buckets sin escribir.
+
+    Args:
+        bucket_seconds: Duración de cada bucket
+        batch_size: Observaciones pendientes que fuerzan una escritura anticipada
+        retention_days: Días de histórico que se conservan
+    """
+
+    def __init__(self, bucket_seconds: int, batch_size: int, retention_days: int):
+        self.bucket_seconds = bucket_seconds
+        self.batch_size = batch_size
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[int, int], Dict] = {}
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._next_purge = 0.0
+        self.written = 0
+
+    def bucket_of(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds) * self.bucket_seconds
+
+    def record(self, team: str, weather: Optional[Dict], observed_at: Optional[float] = None) -> None:
+        """Agrega una observación del equipo (nombre) al lote pendiente"""
+        if not weather or weather.get("temperature") is None:
+            return
+        team_id = map_snapshot.get_team_id(team)
+        if team_id is None:
+            return
+        bucket = self.bucket_of(time.time() if observed_at is None else observed_at)
+        with self._lock:
+            self._pending[(team_id, bucket)] = encode_observation(team_id, bucket, weather)
+            full = len(self._pending) >= self.batch_size
+        if full and self._flush_requested is not None:
+            self._flush_requested.set()
+
+    def flush(self) -> int:
+        """
+        Escribe el lote pendiente (una sentencia) y purga lo vencido si corresponde.
+        Si la escritura falla el lote vuelve a quedar pendiente.
+        """
+        with self._lock:
+            rows, self._pending = list(self._pending.values()), {}
+
+        db = SessionLocal()
+        try:
+            if rows:
+                try:
+                    WeatherHistoryRepository(db).upsert_many(rows)
+                except Exception:
+                    with self._lock:
+                        for row in rows:
+                            # Lo registrado mientras tanto tiene prioridad
+                            self._pending.setdefault((row["team_id"], row["bucket"]), row)
+                    raise
+                self.written += len(rows)
+            if time.monotonic() >= self._next_purge:
+                self._next_purge = time.monotonic() + 3600
+                cutoff = self.bucket_of(time.time() - self.retention_days * 86400)
+                purged = WeatherHistoryRepository(db).delete_before(cutoff)
+                if purged:
+                    logger.info(f"🧹 Histórico de clima: {purged} observaciones fuera de retención eliminadas")
+        finally:
+            db.close()
+        return len(rows)
+
+    async def run(self, flush_interval: float) -> None:
+        """Tarea de fondo: escribe el lote cada `flush_interval` segundos o al llenarse"""
+        self._flush_requested = asyncio.Event()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._flush_requested.wait(), timeout=flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_requested.clear()
+                try:
+                    written = await asyncio.to_thread(self.flush)
+                    if written:
+                        logger.debug(f"💾 Histórico de clima: {written} observaciones escritas")
+                except Exception as e:
+                    logger.error(f"❌ Error al escribir el histórico de clima: {e}")
+        finally:
+            # Al cerrar la aplicación se escribe lo pendiente
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"❌ Error al escribir el histórico de clima pendiente: {e}")
+
+
+class WeatherHistoryService:
+    """Consultas del histórico de clima (solo base de datos local)"""
+
+    # Máximo de observaciones por consulta de rango
+    MAX_POINTS = 5000
+
+    def __init__(self, db: Session):
+        self.repository = WeatherHistoryRepository(db)
+        self.team_repository = TeamRepository(db)
+
+    def get_team_history(self, team_name: str, start: datetime, end: datetime) -> Optional[Dict]:
+        """
+        Observaciones de un equipo entre dos fechas.
+
+        Returns:
+            Optional[Dict]: Equipo, rango y observaciones; None si el equipo no existe
+        """
+        team = self.team_repository.get_team_by_name(team_name)
+        if team is None:
+            return None
+        rows = self.repository.get_range(
+            team.id,
+            weather_history.bucket_of(start.timestamp()),
+            int(end.timestamp()),
+            self.MAX_POINTS,
+        )
+        return {
+            "team": team.name,
+            "bucket_minutes": weather_history.bucket_seconds // 60,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "observations": [decode_observation(row) for row in rows],
+        }
+
+    def get_latest(self) -> List[Dict]:
+        """Última observación guardada de cada equipo"""
+        return [
+            {"team": team_name, **decode_observation(row)}
+            for team_name, row in self.repository.get_latest()
+        ]
+
+
+weather_history = WeatherHistoryRecorder(
+    bucket_seconds=weather_config.get_history_bucket_seconds(),
+    batch_size=weather_config.get_history_batch_size(),
+    retention_days=weather_config.get_history_retention_days(),
+)
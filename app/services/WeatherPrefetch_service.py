@@ -0,0 +1,391 @@
+"""
+Actualización del clima de los equipos en segundo plano.
+
+Una tarea iniciada en el lifespan consulta OpenWeatherMap para las
+coordenadas de cada equipo y guarda el resultado en memoria; el mapa solo
+lee ese caché, así ninguna petición de usuario espera a la API externa.
+
+- Calendario con jitter: cada equipo se actualiza cada `refresh_seconds`
+  ± `jitter`, repartiendo las llamadas en el tiempo.
+- Consultas agrupadas: los equipos con ID de ciudad de OpenWeatherMap se
+  piden de a 20 por llamada (endpoint /group); el ID se resuelve una vez
+  con la consulta por coordenadas y se guarda en la tabla `teams`.
+- Presupuesto de llamadas: token bucket de `rate_per_minute` compartido
+  por todas las consultas del proceso.
+- Backoff exponencial por equipo ante errores; ante un 429 se pausan
+  todas las consultas (respetando Retry-After si viene).
+- Frescura por equipo: antigüedad, errores consecutivos y próximo intento.
+"""
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from app.config.NBA_database import SessionLocal
+from app.config.weather_config import weather_config
+from app.repositories.Team_repository import TeamRepository
+from app.services.Weather_service import WeatherAPIError, WeatherCircuitOpenError, WeatherService
+from app.services.WeatherHistory_service import weather_history
+from app.services.Events_service import WEATHER_EVENT_FIELDS, publish_weather_updated
+from app.utils.rate_limiter import refill_bucket
+
+logger = logging.getLogger('nba_api.services.weather_prefetch')
+
+
+@dataclass
+class TeamWeatherState:
+    """Clima en caché y estado de actualización de un equipo"""
+    team: str
+    latitude: float
+    longitude: float
+    owm_city_id: Optional[int] = None
+    weather: Optional[Dict] = None
+    fetched_at: Optional[float] = None   # reloj de pared (time.time)
+    next_attempt: float = 0.0            # reloj monotónico
+    failures: int = 0
+    last_error: Optional[str] = None
+
+
+class WeatherPrefetcher:
+    """
+    Caché de clima por equipo alimentado por una tarea de fondo.
+
+    Args:
+        weather_service: Cliente de OpenWeatherMap
+        refresh_seconds: Intervalo de actualización de cada equipo
+        jitter: Variación aleatoria del intervalo (fracción, ej. 0.1 = ±10%)
+        rate_per_minute: Llamadas a la API permitidas por minuto
+        backoff_initial / backoff_max: Espera tras errores (se duplica por fallo)
+        max_age: Antigüedad a partir de la cual el clima no se considera fresco
+        city_id_saver: Función que persiste el ID de ciudad resuelto de un equipo
+        on_weather: Función que recibe cada clima obtenido (equipo, clima, momento)
+        on_refresh: Función que recibe, al final de cada vuelta, los campos visibles
+            (`refresh_fields`) de los equipos cuyo clima cambió
+    """
+
+    def __init__(
+        self,
+        weather_service: WeatherService,
+        refresh_seconds: float,
+        jitter: float,
+        rate_per_minute: float,
+        backoff_initial: float,
+        backoff_max: float,
+        max_age: float,
+        city_id_saver: Optional[Callable[[str, int], None]] = None,
+        on_weather: Optional[Callable[[str, Dict, float], None]] = None,
+        on_refresh: Optional[Callable[[Dict[str, Dict]], None]] = None,
+        refresh_fields: Iterable[str] = (),
+    ):
+        self.weather_service = weather_service
+        self.refresh_seconds = refresh_seconds
+        self.jitter = jitter
+        self.rate_per_second = rate_per_minute / 60.0
+        self.budget_capacity = max(1.0, rate_per_minute / 4)
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.max_age = max_age
+        self.city_id_saver = city_id_saver
+        self.on_weather = on_weather
+        self.on_refresh = on_refresh
+        self.refresh_fields = tuple(refresh_fields)
+        self._changed: Dict[str, Dict] = {}
+        # Los equipos que vencen dentro de este margen se suman a la consulta agrupada
+        self.batch_horizon = 2 * jitter * refresh_seconds
+        self._states: Dict[str, TeamWeatherState] = {}
+        self._tokens = self.budget_capacity
+        self._tokens_updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._rate_limited_streak = 0
+        self._version: Optional[str] = None
+        self.api_calls = 0
+        self.api_errors = 0
+
+    # ------------------------------------------------------------------ calendario
+
+    def _next_refresh_delay(self) -> float:
+        return self.refresh_seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _backoff_delay(self, failures: int) -> float:
+        delay = min(self.backoff_max, self.backoff_initial * 2 ** (failures - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def sync_teams(self, teams: Iterable[Dict]) -> None:
+        """
+        Alinea los equipos a actualizar con la lista recibida (nombre, coordenadas
+        y ID de ciudad si ya se resolvió). Los equipos nuevos o que cambiaron de
+        ubicación se consultan de inmediato.
+        """
+        now = time.monotonic()
+        current = {}
+        for team in teams:
+            state = self._states.get(team["team"])
+            if state is None or (state.latitude, state.longitude) != (team["latitude"], team["longitude"]):
+                state = TeamWeatherState(
+                    team["team"], team["latitude"], team["longitude"],
+                    owm_city_id=team.get("owm_city_id"), next_attempt=now
+                )
+            elif state.owm_city_id is None:
+                state.owm_city_id = team.get("owm_city_id")
+            current[team["team"]] = state
+        if current.keys() != self._states.keys():
+            self._version = None
+        self._states = current
+
+    def seconds_until_next_attempt(self) -> float:
+        """Segundos hasta el próximo equipo pendiente (entre 1 y refresh_seconds)"""
+        now = time.monotonic()
+        next_attempt = min((state.next_attempt for state in self._states.values()), default=now + self.refresh_seconds)
+        return min(self.refresh_seconds, max(1.0, next_attempt - now, self._paused_until - now))
+
+    # ------------------------------------------------------------------ presupuesto
+
+    async def _acquire_budget(self) -> None:
+        """Espera hasta que haya una llamada disponible en el presupuesto"""
+        while True:
+            now = time.monotonic()
+            self._tokens = refill_bucket(
+                self._tokens, self._tokens_updated_at, now, self.budget_capacity, self.rate_per_second
+            )
+            self._tokens_updated_at = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self._tokens) / self.rate_per_second)
+
+    # ------------------------------------------------------------------ actualización
+
+    def _record_success(self, state: TeamWeatherState, weather: Dict) -> None:
+        visible = {field: weather.get(field) for field in self.refresh_fields}
+        if state.weather is None or visible != {field: state.weather.get(field) for field in self.refresh_fields}:
+            self._changed[state.team] = visible
+        state.weather = weather
+        state.fetched_at = time.time()
+        state.failures = 0
+        state.last_error = None
+        state.next_attempt = time.monotonic() + self._next_refresh_delay()
+        self._rate_limited_streak = 0
+        self._version = None
+        if self.on_weather is not None:
+            self.on_weather(state.team, weather, state.fetched_at)
+
+    def _record_failure(self, states: List[TeamWeatherState], error: WeatherAPIError) -> None:
+        """Registra una llamada fallida que afectó a uno o varios equipos"""
+        now = time.monotonic()
+        self.api_errors += 1
+        if error.is_rate_limited:
+            # Límite de la API: se pausan todas las consultas, no solo estos equipos
+            self._rate_limited_streak += 1
+            pause = max(error.retry_after or 0.0, self._backoff_delay(self._rate_limited_streak))
+            self._paused_until = now + pause
+            logger.warning(f"⏳ API de clima limitó la tasa (429): consultas pausadas {pause:.0f}s")
+
+        for state in states:
+            state.failures += 1
+            state.last_error = str(error)
+            if error.is_rate_limited:
+                state.next_attempt = self._paused_until
+            else:
+                state.next_attempt = now + self._backoff_delay(state.failures)
+        if not error.is_rate_limited:
+            logger.warning(f"⚠️ Clima de {len(states)} equipo(s) falló: {error}")
+
+    async def _call(self, request: Awaitable) -> Any:
+        """Ejecuta y cuenta una llamada a la API; cualquier falla sale como WeatherAPIError"""
+        try:
+            result = await request
+        except WeatherCircuitOpenError:
+            # Rechazada por el circuit breaker: no llegó a la API
+            raise
+        except WeatherAPIError:
+            self.api_calls += 1
+            raise
+        except Exception as e:
+            # Respuesta inesperada (formato, parseo): se trata como un error más
+            self.api_calls += 1
+            raise WeatherAPIError(f"Respuesta de clima inválida: {e}") from e
+        self.api_calls += 1
+        return result
+
+    def _pause_for_open_circuit(self, error: WeatherCircuitOpenError) -> None:
+        """Con el circuito abierto no se intenta nada hasta que admita llamadas de prueba"""
+        self._paused_until = time.monotonic() + max(1.0, error.retry_after or 0.0)
+
+    async def _save_city_id(self, state: TeamWeatherState, city_id: int) -> None:
+        state.owm_city_id = city_id
+        if self.city_id_saver is None:
+            return
+        try:
+            await asyncio.to_thread(self.city_id_saver, state.team, city_id)
+        except Exception as e:
+            logger.error(f"❌ No se pudo guardar el ID de ciudad de {state.team}: {e}")
+
+    async def refresh_due(self, client: Optional[httpx.AsyncClient] = None) -> int:
+        """
+        Consulta el clima de los equipos cuyo próximo intento ya venció.
+
+        Los equipos con ID de ciudad se piden en grupos de hasta GROUP_MAX_IDS,
+        sumando los que vencen pronto para compartir la llamada. Los que aún no
+        tienen ID se consultan por coordenadas y el ID queda guardado.
+
+        Returns:
+            int: Equipos actualizados correctamente
+        """
+        now = time.monotonic()
+        states = list(self._states.values())
+        if not any(state.next_attempt <= now for state in states):
+            return 0
+
+        grouped = sorted(
+            (
+                state for state in states
+                if state.owm_city_id is not None and (
+                    state.next_attempt <= now
+                    # Adelantar solo a los que no están en backoff
+                    or (state.failures == 0 and state.next_attempt <= now + self.batch_horizon)
+                )
+            ),
+            key=lambda state: state.next_attempt,
+        )
+        unresolved = [state for state in states if state.owm_city_id is None and state.next_attempt <= now]
+
+        updated = 0
+        group_size = self.weather_service.GROUP_MAX_IDS
+        for start in range(0, len(grouped), group_size):
+            chunk = grouped[start:start + group_size]
+            if time.monotonic() < self._paused_until:
+                return updated
+            await self._acquire_budget()
+            try:
+                results = await self._call(
+                    self.weather_service.fetch_weather_group([state.owm_city_id for state in chunk], client)
+                )
+            except WeatherCircuitOpenError as e:
+                self._pause_for_open_circuit(e)
+                return updated
+            except WeatherAPIError as e:
+                self._record_failure(chunk, e)
+                continue
+            missing = []
+            for state in chunk:
+                weather = results.get(state.owm_city_id)
+                if weather is None:
+                    missing.append(state)
+                else:
+                    self._record_success(state, weather)
+                    updated += 1
+            if missing:
+                self._record_failure(missing, WeatherAPIError("Ciudad ausente en la respuesta agrupada"))
+
+        for state in unresolved:
+            if time.monotonic() < self._paused_until:
+                break
+            await self._acquire_budget()
+            try:
+                city_id, weather = await self._call(
+                    self.weather_service.fetch_weather_with_city_id(state.latitude, state.longitude, client)
+                )
+            except WeatherCircuitOpenError as e:
+                self._pause_for_open_circuit(e)
+                break
+            except WeatherAPIError as e:
+                self._record_failure([state], e)
+                continue
+            self._record_success(state, weather)
+            updated += 1
+            if city_id:
+                await self._save_city_id(state, city_id)
+        return updated
+
+    async def run(self, teams_loader: Callable[[], Iterable[Dict]]) -> None:
+        """
+        Bucle de la tarea de fondo. `teams_loader()` retorna los equipos con sus
+        coordenadas e ID de ciudad (se relee en cada vuelta para incorporar altas y bajas).
+        """
+        async with httpx.AsyncClient(timeout=weather_config.get_timeout_seconds()) as client:
+            while True:
+                try:
+                    self.sync_teams(teams_loader())
+                    updated = await self.refresh_due(client)
+                    if updated:
+                        logger.info(f"🌤️ Clima actualizado en segundo plano para {updated} equipos")
+                    if self._changed and self.on_refresh is not None:
+                        changed, self._changed = self._changed, {}
+                        self.on_refresh(changed)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"❌ Error en la actualización del clima: {e}")
+                await asyncio.sleep(self.seconds_until_next_attempt())
+
+    # ------------------------------------------------------------------ lectura
+
+    def get(self, team: str) -> Optional[Dict]:
+        """Último clima conocido del equipo (None si aún no hay datos)"""
+        state = self._states.get(team)
+        return state.weather if state else None
+
+    def get_version(self) -> str:
+        """Hash de los momentos de actualización: cambia solo cuando cambia algún clima"""
+        if self._version is None:
+            digest = hashlib.blake2b(digest_size=8)
+            for name in sorted(self._states):
+                digest.update(f"{name}:{self._states[name].fetched_at}".encode())
+            self._version = digest.hexdigest()
+        return self._version
+
+    def get_status(self) -> Dict:
+        """Frescura del clima por equipo y estado general del actualizador"""
+        wall_now = time.time()
+        now = time.monotonic()
+        teams: List[Dict] = []
+        for state in self._states.values():
+            age = wall_now - state.fetched_at if state.fetched_at is not None else None
+            teams.append({
+                "team": state.team,
+                "fresh": age is not None and age <= self.max_age,
+                "age_seconds": round(age, 1) if age is not None else None,
+                "fetched_at": datetime.fromtimestamp(state.fetched_at).isoformat() if state.fetched_at else None,
+                "next_refresh_in_seconds": round(max(0.0, state.next_attempt - now), 1),
+                "consecutive_failures": state.failures,
+                "last_error": state.last_error,
+            })
+        return {
+            "refresh_seconds": self.refresh_seconds,
+            "max_age_seconds": self.max_age,
+            "paused_for_seconds": round(max(0.0, self._paused_until - now), 1),
+            "api_calls": self.api_calls,
+            "api_errors": self.api_errors,
+            "fresh_teams": sum(1 for team in teams if team["fresh"]),
+            "total_teams": len(teams),
+            "teams": teams,
+        }
+
+
+def _save_team_city_id(team: str, city_id: int) -> None:
+    db = SessionLocal()
+    try:
+        TeamRepository(db).set_owm_city_id(team, city_id)
+    finally:
+        db.close()
+
+
+weather_prefetcher = WeatherPrefetcher(
+    WeatherService(),
+    refresh_seconds=weather_config.get_refresh_seconds(),
+    jitter=weather_config.get_refresh_jitter(),
+    rate_per_minute=weather_config.get_rate_limit_per_minute(),
+    backoff_initial=weather_config.get_backoff_initial_seconds(),
+    backoff_max=weather_config.get_backoff_max_seconds(),
+    max_age=weather_config.get_max_age_seconds(),
+    city_id_saver=_save_team_city_id,
+    on_weather=weather_history.record if weather_config.is_history_enabled() else None,
+    on_refresh=publish_weather_updated,
+    refresh_fields=WEATHER_EVENT_FIELDS,
+)
@@ -2,13 +2,58 @@
 Servicio para obtener información del clima usando OpenWeatherMap API
 Similar al notebook de referencia con Folium y clima
 """
+import asyncio
 import httpx
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from app.config.weather_config import weather_config
+from app.utils.circuit_breaker import CircuitBreaker
+
 logger = logging.getLogger('nba_api.services.weather')
 
+# Un solo circuito para OpenWeatherMap compartido por todas las instancias del servicio
+weather_circuit_breaker = CircuitBreaker("openweathermap", **weather_config.get_breaker_settings())
+
+# Contadores de peticiones cubiertas (hedging) para /metrics
+hedge_stats = {"sent": 0, "won": 0}
+
+
+class WeatherAPIError(Exception):
+    """
+    Error al consultar OpenWeatherMap.
+    
+    Attributes:
+        status_code: Código HTTP de la respuesta (None si no hubo respuesta)
+        retry_after: Segundos indicados por el header Retry-After, si vino
+    """
+    
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+    
+    @property
+    def is_rate_limited(self) -> bool:
+        return self.status_code == 429
+    
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "WeatherAPIError":
+        retry_after = response.headers.get("Retry-After")
+        try:
+            retry_after = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            retry_after = None
+        return cls(f"API de clima respondió {response.status_code}", response.status_code, retry_after)
+
+
+class WeatherCircuitOpenError(WeatherAPIError):
+    """La API de clima se considera caída: la llamada se rechazó sin hacerse"""
+    
+    def __init__(self, retry_after: float):
+        super().__init__("Circuito de la API de clima abierto", None, retry_after)
+
 
 class WeatherService:
     """
@@ -17,13 +62,207 @@ class WeatherService:
     """
     
     # API Key de OpenWeatherMap
-    API_KEY = "3d4ed16bf828ee79b0b0fa9176dd9a12"
-    BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
+    API_KEY = weather_config.get_api_key()
+    BASE_URL = f"{weather_config.get_base_url()}/weather"
+    GROUP_URL = f"{weather_config.get_base_url()}/group"
+    # Máximo de ciudades por consulta agrupada que acepta la API
+    GROUP_MAX_IDS = 20
+    
+    # Último clima obtenido por coordenadas: se devuelve mientras el circuito está abierto
+    _last_known: Dict[Tuple[float, float], Dict] = {}
     
     def __init__(self):
         """Inicializa el servicio de clima"""
         self.api_key = self.API_KEY
         self.base_url = self.BASE_URL
+        self.group_url = self.GROUP_URL
+        self.timeout = weather_config.get_timeout_seconds()
+        self.circuit_breaker = weather_circuit_breaker
+    
+    @staticmethod
+    def _parse_weather(data: Dict) -> Dict:
+        """Extrae la información relevante de una respuesta de OpenWeatherMap"""
+        return {
+            "temperature": round(data["main"]["temp"], 1),
+            "feels_like": round(data["main"]["feels_like"], 1),
+            "temp_min": round(data["main"]["temp_min"], 1),
+            "temp_max": round(data["main"]["temp_max"], 1),
+            "humidity": data["main"]["humidity"],
+            "pressure": data["main"]["pressure"],
+            "description": data["weather"][0]["description"],
+            "icon": data["weather"][0]["icon"],
+            "wind_speed": round(data["wind"]["speed"] * 3.6, 1),  # m/s a km/h
+            "clouds": data["clouds"]["all"],
+            "visibility": data.get("visibility", 0) / 1000,  # metros a km
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    async def fetch_weather(
+        self,
+        latitude: float,
+        longitude: float,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Dict:
+        """
+        Obtiene el clima actual para unas coordenadas y propaga los errores.
+        
+        A diferencia de get_weather, no oculta las fallas: quien llama puede
+        distinguir un límite de tasa (429) de otros errores y reaccionar.
+        
+        Args:
+            latitude: Latitud de la ubicación
+            longitude: Longitud de la ubicación
+            client: Cliente HTTP reutilizable (si no se indica se crea uno)
+            
+        Returns:
+            Dict con información del clima
+            
+        Raises:
+            WeatherAPIError: Si la API responde con error o no responde
+        """
+        city_id, weather_info = await self.fetch_weather_with_city_id(latitude, longitude, client)
+        return weather_info
+    
+    async def fetch_weather_with_city_id(
+        self,
+        latitude: float,
+        longitude: float,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Tuple[Optional[int], Dict]:
+        """
+        Obtiene el clima de unas coordenadas junto con el ID de ciudad de OpenWeatherMap.
+        
+        El ID se guarda en el equipo para consultarlo luego con fetch_weather_group.
+        
+        Returns:
+            Tuple[Optional[int], Dict]: (ID de ciudad, información del clima)
+            
+        Raises:
+            WeatherAPIError: Si la API responde con error o no responde
+        """
+        # Parámetros para la API
+        params = {
+            "lat": latitude,
+            "lon": longitude,
+            "appid": self.api_key,
+            "units": "metric",  # Para obtener temperatura en Celsius
+            "lang": "es"  # Descripciones en español
+        }
+        data = await self._request(self.base_url, params, client)
+        return data.get("id") or None, self._parse_weather(data)
+    
+    async def fetch_weather_group(
+        self,
+        city_ids: List[int],
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Dict[int, Dict]:
+        """
+        Obtiene el clima de varias ciudades en una sola llamada (endpoint /group).
+        
+        Args:
+            city_ids: IDs de ciudad de OpenWeatherMap (máximo GROUP_MAX_IDS)
+            client: Cliente HTTP reutilizable (si no se indica se crea uno)
+            
+        Returns:
+            Dict[int, Dict]: Clima por ID de ciudad (las ciudades que la API no
+            devolvió no aparecen)
+            
+        Raises:
+            ValueError: Si se piden más ciudades de las permitidas
+            WeatherAPIError: Si la API responde con error o no responde
+        """
+        if len(city_ids) > self.GROUP_MAX_IDS:
+            raise ValueError(f"La consulta agrupada admite hasta {self.GROUP_MAX_IDS} ciudades")
+        if not city_ids:
+            return {}
+        
+        params = {
+            "id": ",".join(str(city_id) for city_id in city_ids),
+            "appid": self.api_key,
+            "units": "metric",
+            "lang": "es"
+        }
+        data = await self._request(self.group_url, params, client)
+        return {item["id"]: self._parse_weather(item) for item in data.get("list", [])}
+    
+    async def _request(self, url: str, params: Dict, client: Optional[httpx.AsyncClient]) -> Dict:
+        """
+        Ejecuta la petición y retorna el JSON; convierte cualquier falla en WeatherAPIError.
+        
+        Pasa por el circuit breaker: con el circuito abierto falla al instante
+        (WeatherCircuitOpenError). Los timeouts, errores de conexión, 5xx y 429
+        cuentan como fallos de la dependencia; otros 4xx no afectan al circuito.
+        """
+        if not self.circuit_breaker.allow_request():
+            raise WeatherCircuitOpenError(self.circuit_breaker.retry_after())
+        
+        recorded = False
+        try:
+            try:
+                if client is None:
+                    async with httpx.AsyncClient(timeout=self.timeout) as own_client:
+                        response = await self._send(own_client, url, params)
+                else:
+                    response = await self._send(client, url, params)
+            except httpx.TimeoutException as e:
+                self.circuit_breaker.record_failure()
+                recorded = True
+                raise WeatherAPIError("Timeout al consultar API de clima") from e
+            except httpx.HTTPError as e:
+                self.circuit_breaker.record_failure()
+                recorded = True
+                raise WeatherAPIError(f"Error de conexión con API de clima: {e}") from e
+            
+            if response.status_code >= 500 or response.status_code == 429:
+                self.circuit_breaker.record_failure()
+                recorded = True
+                raise WeatherAPIError.from_response(response)
+            if response.status_code != 200:
+                raise WeatherAPIError.from_response(response)
+            
+            self.circuit_breaker.record_success()
+            recorded = True
+        finally:
+            # Llamada cancelada o error sin relación con la salud de la API
+            if not recorded:
+                self.circuit_breaker.release()
+        
+        try:
+            return response.json()
+        except ValueError as e:
+            raise WeatherAPIError("Respuesta de la API de clima no es JSON válido") from e
+    
+    async def _send(self, client: httpx.AsyncClient, url: str, params: Dict) -> httpx.Response:
+        """
+        Envía el GET. Con hedging activo, si no hay respuesta tras el retardo
+        configurado lanza una segunda petición idéntica y usa la primera que
+        termine bien (la otra se cancela).
+        """
+        if not weather_config.is_hedge_enabled():
+            return await client.get(url, params=params)
+        
+        primary = asyncio.ensure_future(client.get(url, params=params))
+        done, _ = await asyncio.wait({primary}, timeout=weather_config.get_hedge_delay_seconds())
+        if done:
+            return primary.result()
+        
+        hedge_stats["sent"] += 1
+        hedge = asyncio.ensure_future(client.get(url, params=params))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            hedge_stats["won"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
     
     async def get_weather(self, latitude: float, longitude: float) -> Optional[Dict]:
         """
@@ -34,7 +273,8 @@ class WeatherService:
             longitude: Longitud de la ubicación
             
         Returns:
-            Dict con información del clima o None si falla
+            Dict con información del clima o None si falla. Con el circuito
+            abierto retorna el último clima conocido de esas coordenadas.
             
         Example:
             {
@@ -51,51 +291,20 @@ class WeatherService:
             }
         """
         try:
-            # Parámetros para la API
-            params = {
-                "lat": latitude,
-                "lon": longitude,
-                "appid": self.api_key,
-                "units": "metric",  # Para obtener temperatura en Celsius
-                "lang": "es"  # Descripciones en español
-            }
+            weather_info = await self.fetch_weather(latitude, longitude)
+            logger.info(f"🌤️ Clima obtenido: {weather_info['temperature']}°C - {weather_info['description']}")
+            self._last_known[(latitude, longitude)] = weather_info
+            return weather_info
             
-            # Hacer petición asíncrona
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(self.base_url, params=params)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Extraer información relevante
-                    weather_info = {
-                        "temperature": round(data["main"]["temp"], 1),
-                        "feels_like": round(data["main"]["feels_like"], 1),
-                        "temp_min": round(data["main"]["temp_min"], 1),
-                        "temp_max": round(data["main"]["temp_max"], 1),
-                        "humidity": data["main"]["humidity"],
-                        "pressure": data["main"]["pressure"],
-                        "description": data["weather"][0]["description"],
-                        "icon": data["weather"][0]["icon"],
-                        "wind_speed": round(data["wind"]["speed"] * 3.6, 1),  # m/s a km/h
-                        "clouds": data["clouds"]["all"],
-                        "visibility": data.get("visibility", 0) / 1000,  # metros a km
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    
-                    logger.info(f"🌤️ Clima obtenido: {weather_info['temperature']}°C - {weather_info['description']}")
-                    return weather_info
-                    
-                elif response.status_code == 401:
-                    logger.error("❌ API Key inválida para OpenWeatherMap")
-                    return None
-                    
-                else:
-                    logger.error(f"❌ Error en API de clima: {response.status_code}")
-                    return None
-                    
-        except httpx.TimeoutException:
-            logger.error("⏱️ Timeout al consultar API de clima")
+        except WeatherCircuitOpenError:
+            # La API está caída: se responde al instante con el último dato conocido (o None)
+            return self._last_known.get((latitude, longitude))
+            
+        except WeatherAPIError as e:
+            if e.status_code == 401:
+                logger.error("❌ API Key inválida para OpenWeatherMap")
+            else:
+                logger.error(f"❌ Error en API de clima: {e}")
             return None
             
         except Exception as e:
@@ -121,35 +330,21 @@ class WeatherService:
                 "lang": "es"
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(self.base_url, params=params)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    weather_info = {
-                        "temperature": round(data["main"]["temp"], 1),
-                        "feels_like": round(data["main"]["feels_like"], 1),
-                        "temp_min": round(data["main"]["temp_min"], 1),
-                        "temp_max": round(data["main"]["temp_max"], 1),
-                        "humidity": data["main"]["humidity"],
-                        "pressure": data["main"]["pressure"],
-                        "description": data["weather"][0]["description"],
-                        "icon": data["weather"][0]["icon"],
-                        "wind_speed": round(data["wind"]["speed"] * 3.6, 1),
-                        "clouds": data["clouds"]["all"],
-                        "visibility": data.get("visibility", 0) / 1000,
-                        "city_name": data["name"],
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    
-                    logger.info(f"🌤️ Clima en {city}: {weather_info['temperature']}°C")
-                    return weather_info
-                    
-                else:
-                    logger.error(f"❌ Ciudad no encontrada: {city}")
-                    return None
-                    
+            data = await self._request(self.base_url, params, None)
+            
+            weather_info = self._parse_weather(data)
+            weather_info["city_name"] = data["name"]
+            
+            logger.info(f"🌤️ Clima en {city}: {weather_info['temperature']}°C")
+            return weather_info
+            
+        except WeatherAPIError as e:
+            if e.status_code == 404:
+                logger.error(f"❌ Ciudad no encontrada: {city}")
+            else:
+                logger.error(f"❌ Error en API de clima para {city}: {e}")
+            return None
+            
         except Exception as e:
             logger.error(f"❌ Error al obtener clima de {city}: {str(e)}")
             return None
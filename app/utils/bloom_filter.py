@@ -0,0 +1,53 @@
+"""
+Filtro de Bloom en memoria.
+
+Responde "definitivamente no está" o "posiblemente está" con unos pocos
+hashes y sin I/O. Se usa delante de la lista de tokens revocados: el caso
+común (token no revocado) se resuelve sin consultar la base de datos.
+"""
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom de tamaño fijo.
+
+    Args:
+        capacity: Cantidad de elementos esperados
+        error_rate: Tasa de falsos positivos objetivo con `capacity` elementos
+    """
+
+    def __init__(self, capacity: int = 10000, error_rate: float = 0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        # m = -n·ln(p) / ln(2)²   ·   k = (m / n)·ln(2)
+        self.size = max(8, int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / self.capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # Doble hashing (Kirsch–Mitzenmacher): dos hashes de 64 bits generan los k índices
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        """Agrega una clave al filtro"""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        for position in self._positions(key):
+            if not self._bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def is_saturated(self) -> bool:
+        """True si superó la capacidad y la tasa de falsos positivos ya no es la objetivo"""
+        return self.count > self.capacity
@@ -0,0 +1,178 @@
+"""
+Lectura de box scores (estadísticas por partido) en NDJSON o CSV.
+
+Los archivos se procesan línea a línea: `BoxScoreReader.feed` recibe un
+bloque de líneas y retorna los registros normalizados y los errores con su
+número de línea, sin cargar el archivo completo.
+
+Campos por registro (CSV: nombres de columna en la primera línea):
+- Obligatorios: player_id, game_id, game_date (YYYY-MM-DD)
+- Opcionales: season (año de inicio; si falta se deriva de game_date), team,
+  opponent, minutes ("34:12" o 34.2) o seconds, y los conteos points,
+  rebounds, assists, steals, blocks, turnovers, fgm, fga, fg3m, fg3a, ftm, fta
+"""
+import csv
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+from app.models.PlayerGameStats_model import STAT_COLUMNS
+
+BOX_SCORE_FORMATS = ("ndjson", "csv")
+
+# Conteos del box score (sin los segundos jugados, que se derivan de minutes)
+COUNT_FIELDS = tuple(column for column in STAT_COLUMNS if column != "seconds")
+
+# Pares (convertidos, intentados)
+_SHOT_PAIRS = (("fgm", "fga"), ("fg3m", "fg3a"), ("ftm", "fta"))
+
+# Límite de las columnas SmallInteger
+_MAX_COUNT = 32767
+
+# La temporada NBA empieza en octubre: los partidos desde agosto cuentan para la temporada que empieza ese año
+_SEASON_START_MONTH = 8
+
+
+def season_for(game_date: date) -> int:
+    """Año de inicio de la temporada a la que pertenece un partido"""
+    return game_date.year if game_date.month >= _SEASON_START_MONTH else game_date.year - 1
+
+
+def _to_int(value, field: str) -> int:
+    if value is None or value == "":
+        return 0
+    if isinstance(value, bool):
+        raise ValueError(f"{field} debe ser un entero")
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"{field} debe ser un entero")
+        return int(value)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} debe ser un entero")
+
+
+def _to_seconds(record: Dict) -> int:
+    """Segundos jugados a partir de seconds o minutes ("MM:SS" o decimal)"""
+    if record.get("seconds") not in (None, ""):
+        return _to_int(record["seconds"], "seconds")
+    minutes = record.get("minutes")
+    if minutes is None or minutes == "":
+        return 0
+    if isinstance(minutes, str) and ":" in minutes:
+        whole, _, rest = minutes.partition(":")
+        return _to_int(whole, "minutes") * 60 + _to_int(rest, "minutes")
+    try:
+        return round(float(minutes) * 60)
+    except (TypeError, ValueError):
+        raise ValueError("minutes debe tener el formato MM:SS o ser un número")
+
+
+def _optional_text(value, field: str, max_length: int = 255) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    value = str(value).strip()
+    if len(value) > max_length:
+        raise ValueError(f"{field} supera los {max_length} caracteres")
+    return value or None
+
+
+def parse_box_score(record: Dict) -> Dict:
+    """
+    Valida y normaliza un registro.
+
+    Raises:
+        ValueError: Si falta un campo obligatorio o algún valor es inválido
+    """
+    if not isinstance(record, dict):
+        raise ValueError("El registro debe ser un objeto")
+
+    player_id = _to_int(record.get("player_id"), "player_id")
+    if player_id <= 0:
+        raise ValueError("player_id es obligatorio y debe ser positivo")
+
+    game_id = _optional_text(record.get("game_id"), "game_id", max_length=32)
+    if not game_id:
+        raise ValueError("game_id es obligatorio")
+
+    raw_date = record.get("game_date")
+    try:
+        game_date = date.fromisoformat(str(raw_date)[:10])
+    except (TypeError, ValueError):
+        raise ValueError("game_date es obligatorio con formato YYYY-MM-DD")
+
+    season = record.get("season")
+    season = _to_int(season, "season") if season not in (None, "") else season_for(game_date)
+    if not 1946 <= season <= 2100:
+        raise ValueError("season fuera de rango")
+
+    row = {
+        "season": season,
+        "player_id": player_id,
+        "game_id": game_id,
+        "game_date": game_date,
+        "team": _optional_text(record.get("team"), "team"),
+        "opponent": _optional_text(record.get("opponent"), "opponent"),
+        "seconds": _to_seconds(record),
+    }
+    if not 0 <= row["seconds"] <= 4 * 3600:
+        raise ValueError("Minutos jugados fuera de rango")
+    for field in COUNT_FIELDS:
+        value = _to_int(record.get(field), field)
+        if not 0 <= value <= _MAX_COUNT:
+            raise ValueError(f"{field} fuera de rango")
+        row[field] = value
+    for made, attempted in _SHOT_PAIRS:
+        if row[made] > row[attempted]:
+            raise ValueError(f"{made} no puede ser mayor que {attempted}")
+    return row
+
+
+class BoxScoreReader:
+    """
+    Convierte bloques de líneas NDJSON o CSV en registros normalizados.
+
+    Args:
+        fmt: "ndjson" o "csv" (en CSV la primera línea no vacía es el encabezado)
+    """
+
+    def __init__(self, fmt: str):
+        if fmt not in BOX_SCORE_FORMATS:
+            raise ValueError(f"Formato no soportado: {fmt}. Opciones: {', '.join(BOX_SCORE_FORMATS)}")
+        self.fmt = fmt
+        self.line_number = 0
+        self._header: Optional[List[str]] = None
+
+    def feed(self, lines: Sequence[str]) -> Tuple[List[Dict], List[Tuple[int, str]]]:
+        """Retorna (registros válidos, [(línea, error)]) del bloque"""
+        rows: List[Dict] = []
+        errors: List[Tuple[int, str]] = []
+        if self.fmt == "csv":
+            records = csv.reader(lines)
+        else:
+            records = lines
+        for record in records:
+            self.line_number += 1
+            try:
+                if self.fmt == "csv":
+                    if not any(field.strip() for field in record):
+                        continue
+                    if self._header is None:
+                        self._header = [field.strip() for field in record]
+                        continue
+                    if len(record) != len(self._header):
+                        raise ValueError(f"Se esperaban {len(self._header)} columnas y hay {len(record)}")
+                    record = dict(zip(self._header, record))
+                else:
+                    if not record.strip():
+                        continue
+                    try:
+                        record = orjson.loads(record)
+                    except orjson.JSONDecodeError:
+                        raise ValueError("JSON inválido")
+                rows.append(parse_box_score(record))
+            except ValueError as e:
+                errors.append((self.line_number, str(e)))
+        return rows, errors
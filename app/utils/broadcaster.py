@@ -0,0 +1,196 @@
+"""
+Pub/sub en proceso para enviar eventos a muchas conexiones abiertas.
+
+- Cada evento se serializa una sola vez (bytes en formato SSE) y los mismos
+  bytes se entregan a todos los suscriptores.
+- `publish` puede llamarse desde cualquier hilo (los endpoints síncronos
+  corren en el threadpool): el reparto se agenda en el event loop con una
+  sola llamada a call_soon_threadsafe por evento, no una por suscriptor.
+- Cada suscriptor es un deque acotado y un asyncio.Event: una conexión
+  inactiva no ocupa hilos ni tareas extra. Si un cliente lento llena su cola
+  se descartan sus eventos más viejos y se marca para que recargue los datos.
+- Los últimos eventos se conservan para reenviarlos a quien reconecta con
+  Last-Event-ID. Los IDs llevan un prefijo propio de cada proceso: si el
+  cliente reconecta a otro worker (o después de un reinicio) se le pide
+  recargar en lugar de reenviar eventos de otra secuencia.
+"""
+import asyncio
+import logging
+import secrets
+import threading
+from collections import deque
+from typing import Deque, List, Optional, Set, Tuple
+
+import orjson
+
+logger = logging.getLogger('nba_api.utils.broadcaster')
+
+
+class BroadcasterFullError(Exception):
+    """Se alcanzó el máximo de suscriptores del worker"""
+
+
+def encode_sse(event_id: str, event: str, data) -> bytes:
+    """Evento en formato text/event-stream"""
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (event_id.encode(), event.encode(), orjson.dumps(data))
+
+
+class Subscription:
+    """Cola acotada de eventos de una conexión"""
+
+    __slots__ = ("_frames", "_ready", "last_id", "lost", "closed")
+
+    def __init__(self, queue_size: int):
+        self._frames: Deque[bytes] = deque(maxlen=queue_size)
+        self._ready = asyncio.Event()
+        self.last_id = 0
+        self.lost = False           # Se descartaron eventos: el cliente debe recargar
+        self.closed = False
+
+    def push(self, event_id: int, frame: bytes) -> bool:
+        """Encola un evento (en el hilo del event loop). Retorna False si se descartó uno viejo"""
+        if event_id <= self.last_id:
+            return True             # Ya entregado por el reenvío al suscribirse
+        self.last_id = event_id
+        dropped = len(self._frames) == self._frames.maxlen
+        if dropped:
+            self.lost = True
+        self._frames.append(frame)
+        self._ready.set()
+        return not dropped
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+    async def next_frames(self, timeout: float) -> List[bytes]:
+        """Espera eventos hasta `timeout` segundos y retorna todos los pendientes"""
+        if not self._frames and not self.closed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._ready.clear()
+        frames = list(self._frames)
+        self._frames.clear()
+        return frames
+
+
+class Broadcaster:
+    """
+    Reparte eventos a todos los suscriptores del worker.
+
+    Args:
+        queue_size: Eventos pendientes por suscriptor
+        replay_size: Eventos recientes que se conservan para reconexiones
+        max_subscribers: Conexiones simultáneas permitidas
+    """
+
+    def __init__(self, queue_size: int, replay_size: int, max_subscribers: int):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Set[Subscription] = set()
+        self._history: Deque[Tuple[int, bytes]] = deque(maxlen=replay_size)
+        self._last_id = 0
+        self.epoch = secrets.token_hex(4)
+        self.published = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Event loop donde viven las conexiones (se llama al iniciar la aplicación)"""
+        self._loop = loop
+
+    def publish(self, event: str, data) -> int:
+        """Publica un evento desde cualquier hilo. Retorna su número de secuencia"""
+        with self._lock:
+            self._last_id += 1
+            event_id = self._last_id
+            frame = encode_sse(f"{self.epoch}-{event_id}", event, data)
+            self._history.append((event_id, frame))
+            self.published += 1
+
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return event_id
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fan_out(event_id, frame)
+        else:
+            loop.call_soon_threadsafe(self._fan_out, event_id, frame)
+        return event_id
+
+    def _fan_out(self, event_id: int, frame: bytes) -> None:
+        for subscription in self._subscribers:
+            if not subscription.push(event_id, frame):
+                self.dropped += 1
+
+    def _parse_event_id(self, last_event_id: str) -> Optional[int]:
+        """Secuencia de un Last-Event-ID de este proceso (None si es de otro o inválido)"""
+        epoch, _, sequence = last_event_id.partition("-")
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        return int(sequence)
+
+    def check_capacity(self) -> None:
+        """
+        Verifica que haya lugar para otra conexión.
+
+        Raises:
+            BroadcasterFullError: Si se alcanzó el máximo de suscriptores
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            self.rejected += 1
+            raise BroadcasterFullError(f"Máximo de {self.max_subscribers} conexiones alcanzado")
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Registra una conexión (en el event loop). Con `last_event_id` reenvía los
+        eventos posteriores; si ya no están en el historial (o el ID es de otro
+        proceso) la marca para recargar.
+
+        Raises:
+            BroadcasterFullError: Si se alcanzó el máximo de suscriptores
+        """
+        self.check_capacity()
+
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            history = list(self._history)
+            subscription.last_id = self._last_id
+        if last_event_id:
+            sequence = self._parse_event_id(last_event_id)
+            if sequence is None or sequence > subscription.last_id:
+                subscription.lost = True
+            elif sequence < subscription.last_id:
+                missed = [(event_id, frame) for event_id, frame in history if event_id > sequence]
+                if not missed or missed[0][0] != sequence + 1 or len(missed) > self.queue_size:
+                    subscription.lost = True
+                subscription.last_id = sequence
+                for event_id, frame in missed[-self.queue_size:]:
+                    subscription.push(event_id, frame)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def close(self) -> None:
+        """Cierra todas las conexiones (al apagar la aplicación)"""
+        for subscription in list(self._subscribers):
+            subscription.close()
+        self._subscribers.clear()
+
+    def snapshot(self) -> dict:
+        """Contadores (para /metrics)"""
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+        }
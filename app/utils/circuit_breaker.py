@@ -0,0 +1,160 @@
+"""
+Circuit breaker para dependencias externas.
+
+Estados:
+- closed: las llamadas pasan; se registra el resultado en una ventana de tiempo.
+- open: la tasa de fallos de la ventana superó el umbral; las llamadas se
+  rechazan al instante durante `open_seconds` (sin esperar timeouts).
+- half_open: pasado ese tiempo se permiten unas pocas llamadas de prueba; si
+  salen bien se cierra, si fallan se vuelve a abrir.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Tuple
+
+logger = logging.getLogger('nba_api.utils.circuit_breaker')
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Valor numérico de cada estado para /metrics
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por tasa de fallos en una ventana deslizante.
+
+    Args:
+        name: Nombre de la dependencia (para logs y métricas)
+        failure_rate_threshold: Fracción de fallos (0-1) que abre el circuito
+        window_seconds: Duración de la ventana de resultados
+        min_calls: Llamadas mínimas en la ventana para evaluar la tasa
+        open_seconds: Tiempo que el circuito permanece abierto
+        half_open_max_calls: Llamadas de prueba simultáneas en half_open
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        window_seconds: float = 60,
+        min_calls: int = 5,
+        open_seconds: float = 30,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._events: Deque[Tuple[float, bool]] = deque()   # (momento, éxito) dentro de la ventana
+        self._window_failures = 0                            # fallos en _events (sin recorrerla)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._advance(time.monotonic())
+            return self._state
+
+    def _advance(self, now: float) -> None:
+        if self._state == OPEN and now >= self._opened_at + self.open_seconds:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+            logger.info(f"🟡 Circuito '{self.name}' en half-open: se permiten llamadas de prueba")
+
+    def _reset_window(self) -> None:
+        self._events.clear()
+        self._window_failures = 0
+
+    def _trim(self, now: float) -> None:
+        """Descarta los resultados que quedaron fuera de la ventana"""
+        limit = now - self.window_seconds
+        while self._events and self._events[0][0] < limit:
+            _, ok = self._events.popleft()
+            if not ok:
+                self._window_failures -= 1
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._reset_window()
+        self.times_opened += 1
+        logger.warning(f"🔴 Circuito '{self.name}' abierto por {self.open_seconds:.0f}s")
+
+    def allow_request(self) -> bool:
+        """Indica si la llamada puede hacerse. Si retorna True hay que registrar el resultado"""
+        with self._lock:
+            self._advance(time.monotonic())
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.successes += 1
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._reset_window()
+                logger.info(f"🟢 Circuito '{self.name}' cerrado: la dependencia respondió")
+                return
+            self._events.append((now, True))
+            self._trim(now)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.failures += 1
+            if self._state == HALF_OPEN:
+                self._open(now)
+                return
+            if self._state == OPEN:
+                return
+            self._events.append((now, False))
+            self._window_failures += 1
+            self._trim(now)
+            if len(self._events) >= self.min_calls:
+                if self._window_failures / len(self._events) >= self.failure_rate_threshold:
+                    self._open(now)
+
+    def release(self) -> None:
+        """Libera una llamada permitida cuyo resultado no indica la salud de la dependencia"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def retry_after(self) -> float:
+        """Segundos hasta que el circuito abierto admita llamadas de prueba"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def snapshot(self) -> dict:
+        """Estado y contadores (para /metrics)"""
+        state = self.state
+        return {
+            "state": state,
+            "state_value": STATE_VALUES[state],
+            "successes": self.successes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
@@ -0,0 +1,203 @@
+"""
+Exportación columnar (Apache Arrow IPC / Parquet) por lotes.
+
+- Cada lote de filas de la base de datos se convierte en un RecordBatch con
+  el esquema tipado de la tabla y se escribe de inmediato: la memoria queda
+  acotada por el tamaño del lote, no por el total de filas.
+- Las columnas de texto con pocos valores (equipo, posición, conferencia)
+  se codifican como diccionario. El diccionario se mantiene entre lotes y
+  solo crece, así el stream Arrow envía deltas en lugar de repetirlo.
+- Arrow se escribe en formato stream (.arrows): no necesita volver atrás al
+  final del archivo y se puede enviar por HTTP a medida que se genera.
+"""
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Formato → (content-type, extensión)
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+_DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+_TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+PLAYERS_SCHEMA = pa.schema(
+    [
+        pa.field("id", pa.int32(), nullable=False),
+        pa.field("name", pa.string(), nullable=False),
+        pa.field("team", _DICTIONARY, nullable=False),
+        pa.field("position", _DICTIONARY, nullable=False),
+        pa.field("height_m", pa.float32(), nullable=False),
+        pa.field("weight_kg", pa.float32(), nullable=False),
+        pa.field("birth_date", pa.date32(), nullable=False),
+        pa.field("created_at", _TIMESTAMP),
+        pa.field("updated_at", _TIMESTAMP),
+    ],
+    metadata={"table": "players"},
+)
+
+TEAMS_SCHEMA = pa.schema(
+    [
+        pa.field("id", pa.int32(), nullable=False),
+        pa.field("name", pa.string(), nullable=False),
+        pa.field("city", pa.string(), nullable=False),
+        pa.field("state", pa.string(), nullable=False),
+        pa.field("stadium", pa.string(), nullable=False),
+        pa.field("latitude", pa.float64(), nullable=False),
+        pa.field("longitude", pa.float64(), nullable=False),
+        pa.field("conference", _DICTIONARY, nullable=False),
+        pa.field("division", _DICTIONARY, nullable=False),
+        pa.field("owm_city_id", pa.int32()),
+        pa.field("created_at", _TIMESTAMP),
+        pa.field("updated_at", _TIMESTAMP),
+    ],
+    metadata={"table": "teams"},
+)
+
+
+class _GrowingDictionary:
+    """Diccionario de una columna compartido por todos los lotes (solo agrega valores)"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def encode(self, values: Sequence[str]) -> pa.DictionaryArray:
+        # dictionary_encode trabaja en C; en Python solo se recorren los valores distintos del lote
+        local = pa.array(values, type=pa.string()).dictionary_encode()
+        mapping = []
+        for value in local.dictionary.to_pylist():
+            code = self._codes.get(value)
+            if code is None:
+                code = self._codes[value] = len(self.values)
+                self.values.append(value)
+            mapping.append(code)
+        indices = pa.array(mapping, type=pa.int32()).take(local.indices)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(self.values, type=pa.string()))
+
+
+def _as_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class RecordBatchBuilder:
+    """Convierte lotes de filas (tuplas en el orden del esquema) en RecordBatch"""
+
+    def __init__(self, schema: pa.Schema):
+        self.schema = schema
+        self._dictionaries = {
+            field.name: _GrowingDictionary() for field in schema if pa.types.is_dictionary(field.type)
+        }
+
+    def build(self, rows: Sequence[Sequence]) -> pa.RecordBatch:
+        columns = list(zip(*rows)) if rows else [() for _ in self.schema]
+        arrays = []
+        for field, values in zip(self.schema, columns):
+            if field.name in self._dictionaries:
+                arrays.append(self._dictionaries[field.name].encode(values))
+            elif pa.types.is_date32(field.type):
+                arrays.append(pa.array([_as_date(value) for value in values], type=field.type))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+class _ChunkSink:
+    """Destino en memoria que entrega lo escrito desde la última lectura"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ColumnarWriter:
+    """
+    Escritor Arrow IPC (stream) o Parquet sobre un archivo o un objeto con write().
+
+    Args:
+        schema: Esquema de la tabla
+        fmt: "arrow" o "parquet"
+        sink: Ruta o destino de escritura
+        compression: Códec de Parquet (zstd, snappy, gzip, none)
+    """
+
+    def __init__(self, schema: pa.Schema, fmt: str, sink, compression: str = "zstd"):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Formato no soportado: {fmt}. Opciones: {', '.join(EXPORT_FORMATS)}")
+        self.builder = RecordBatchBuilder(schema)
+        self.rows = 0
+        if not isinstance(sink, str):
+            sink = pa.PythonFile(sink, mode="w")
+        if fmt == "arrow":
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self._writer = pa.ipc.new_stream(sink, schema, options=options)
+        else:
+            self._writer = pq.ParquetWriter(
+                sink, schema, compression=None if compression == "none" else compression
+            )
+
+    def write_rows(self, rows: Sequence[Sequence]) -> None:
+        if not rows:
+            return
+        self._writer.write_batch(self.builder.build(rows))
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def iter_columnar_bytes(
+    schema: pa.Schema, fmt: str, batches: Iterable[Sequence[Sequence]], compression: str = "zstd"
+) -> Iterator[bytes]:
+    """Genera los bytes del archivo a medida que se escribe cada lote (para respuestas en streaming)"""
+    sink = _ChunkSink()
+    writer = ColumnarWriter(schema, fmt, sink, compression)
+    for rows in batches:
+        writer.write_rows(rows)
+        data = sink.drain()
+        if data:
+            yield data
+    writer.close()
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def write_columnar_file(
+    schema: pa.Schema, fmt: str, batches: Iterable[Sequence[Sequence]], path: str, compression: str = "zstd"
+) -> int:
+    """Escribe todos los lotes en `path`. Retorna la cantidad de filas"""
+    writer = ColumnarWriter(schema, fmt, path, compression)
+    try:
+        for rows in batches:
+            writer.write_rows(rows)
+    finally:
+        writer.close()
+    return writer.rows
@@ -0,0 +1,45 @@
+"""
+Serialización rápida de respuestas con orjson.
+
+Los endpoints de listado leen solo las columnas necesarias y construyen los
+diccionarios de respuesta directamente, evitando una segunda validación con
+Pydantic: los datos ya fueron validados al escribirse en la base de datos.
+"""
+from datetime import date, datetime, time
+from typing import Any, Iterable, List, Mapping, Optional
+
+from fastapi.responses import ORJSONResponse
+
+from app.Schema.NBA_Schema import PlayerResponse
+
+# Campos (y orden) de PlayerResponse; el contrato JSON es el mismo que con response_model
+PLAYER_RESPONSE_FIELDS = tuple(PlayerResponse.model_fields)
+
+
+def _as_datetime(value: Any) -> Any:
+    """PlayerResponse expone birth_date como datetime aunque la columna sea Date"""
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, time.min)
+    return value
+
+
+def player_rows_to_dicts(rows: Iterable[Any]) -> List[dict]:
+    """
+    Convierte filas livianas (Row con las columnas de PLAYER_RESPONSE_FIELDS)
+    en diccionarios con la misma forma que PlayerResponse.
+    """
+    result = []
+    for row in rows:
+        item = dict(row._mapping)
+        item["birth_date"] = _as_datetime(item["birth_date"])
+        result.append(item)
+    return result
+
+
+def fast_json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> ORJSONResponse:
+    """Crea una respuesta JSON serializada con orjson (fechas y floats nativos)"""
+    return ORJSONResponse(content=content, status_code=status_code, headers=dict(headers or {}))
@@ -0,0 +1,33 @@
+"""
+Cálculos geográficos vectorizados con NumPy.
+
+Las coordenadas se guardan en arreglos contiguos (float64, radianes) y las
+distancias se calculan con la fórmula de haversine sobre todo el arreglo a
+la vez, sin bucles de Python.
+"""
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def to_radians(latitudes, longitudes):
+    """Convierte listas de grados a arreglos contiguos de radianes"""
+    lat = np.ascontiguousarray(np.radians(np.asarray(latitudes, dtype=np.float64)))
+    lon = np.ascontiguousarray(np.radians(np.asarray(longitudes, dtype=np.float64)))
+    return lat, lon
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Distancia de círculo máximo en km entre puntos en radianes.
+    Admite broadcasting: un punto contra un arreglo, o filas contra columnas.
+    """
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def distance_matrix_km(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Matriz simétrica N×N de distancias entre todos los puntos"""
+    return haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
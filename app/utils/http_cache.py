@@ -0,0 +1,77 @@
+"""
+Utilidades para peticiones HTTP condicionales (ETag / Last-Modified).
+
+Permiten responder 304 Not Modified cuando el cliente ya tiene la versión actual
+de un recurso, calculando la versión a partir de metadatos livianos (id, conteo,
+max(updated_at)) en lugar de cargar y serializar las filas completas.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+# Los recursos dependen del token del usuario: solo caché privada y siempre revalidar
+CACHE_CONTROL = "private, no-cache"
+
+
+def build_weak_etag(*parts: Any) -> str:
+    """
+    Construye un ETag débil a partir de las partes que identifican la versión del recurso.
+
+    Example:
+        build_weak_etag("player", 1, updated_at) -> 'W/"3f2a9c..."'
+    """
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _to_utc(value: datetime) -> datetime:
+    # Las columnas DateTime sin zona horaria se guardan en UTC (datetime.utcnow)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evalúa If-None-Match (comparación débil) y, solo si no viene, If-Modified-Since.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = _strip_weak(etag)
+        return any(_strip_weak(tag) == current for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # Last-Modified tiene resolución de segundos
+        return _to_utc(last_modified).replace(microsecond=0) <= _to_utc(since)
+
+    return False
+
+
+def set_cache_headers(response: Response, etag: str, last_modified: Optional[datetime] = None) -> None:
+    """Agrega ETag, Cache-Control y (opcionalmente) Last-Modified a la respuesta"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(_to_utc(last_modified), usegmt=True)
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Respuesta 304 sin cuerpo con los mismos validadores"""
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, last_modified)
+    return response
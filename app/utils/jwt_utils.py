@@ -1,5 +1,8 @@
+import hashlib
+import secrets
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+from uuid import uuid4
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config.jwt_config import jwt_config
@@ -7,6 +10,16 @@ from app.config.jwt_config import jwt_config
 # Contexto para hasheo de contraseñas
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Hash de referencia para igualar tiempos de login con usuarios inexistentes (se genera al primer uso)
+_dummy_password_hash: Optional[str] = None
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def truncate_to_millis(value: datetime) -> datetime:
+    """Fecha con precisión de milisegundos (la misma que el claim iat)"""
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
 class JWTManager:
     """Gestor de JWT siguiendo el patrón del repositorio de referencia"""
     
@@ -15,6 +28,19 @@ class JWTManager:
         """Verifica una contraseña contra su hash"""
         return pwd_context.verify(plain_password, hashed_password)
     
+    @staticmethod
+    def verify_dummy_password(plain_password: str) -> bool:
+        """
+        Ejecuta una verificación bcrypt contra un hash ficticio y retorna False.
+        Se usa cuando el usuario no existe o está inactivo, para que el tiempo de
+        respuesta no revele qué usernames son válidos.
+        """
+        global _dummy_password_hash
+        if _dummy_password_hash is None:
+            _dummy_password_hash = pwd_context.hash(secrets.token_urlsafe(16))
+        pwd_context.verify(plain_password, _dummy_password_hash)
+        return False
+    
     @staticmethod
     def get_password_hash(password: str) -> str:
         """Genera el hash de una contraseña"""
@@ -27,13 +53,18 @@ class JWTManager:
     def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
         """Crea un token JWT de acceso"""
         to_encode = data.copy()
+        now = truncate_to_millis(datetime.utcnow())
         
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + expires_delta
         else:
-            expire = datetime.utcnow() + jwt_config.get_expires_delta()
+            expire = now + jwt_config.get_expires_delta()
         
-        to_encode.update({"exp": expire})
+        # jti identifica el token en la lista de revocación; iat permite revocar por usuario.
+        # iat lleva milisegundos (NumericDate admite decimales): con segundos enteros, un
+        # token emitido en el mismo segundo que una revocación por usuario quedaría revocado.
+        to_encode.update({"exp": expire, "iat": round((now - _EPOCH).total_seconds(), 3)})
+        to_encode.setdefault("jti", uuid4().hex)
         
         encoded_jwt = jwt.encode(
             to_encode, 
@@ -43,6 +74,13 @@ class JWTManager:
         
         return encoded_jwt
     
+    @staticmethod
+    def get_issued_at(payload: Dict[str, Any]) -> Optional[datetime]:
+        """Claim iat como datetime UTC (milisegundos; los tokens anteriores traen segundos enteros)"""
+        if "iat" not in payload:
+            return None
+        return _EPOCH + timedelta(milliseconds=round(float(payload["iat"]) * 1000))
+    
     @staticmethod
     def verify_token(token: str) -> Optional[Dict[str, Any]]:
         """Verifica y decodifica un token JWT"""
@@ -60,5 +98,23 @@ class JWTManager:
     def get_token_expires_seconds() -> int:
         """Obtiene el tiempo de expiración en segundos"""
         return int(jwt_config.get_expires_delta().total_seconds())
+    
+    @staticmethod
+    def generate_refresh_token() -> str:
+        """Genera un refresh token opaco (256 bits aleatorios, URL-safe)"""
+        return secrets.token_urlsafe(32)
+    
+    @staticmethod
+    def hash_refresh_token(token: str) -> str:
+        """
+        Hash SHA-256 del refresh token para almacenarlo
+        (el token ya es aleatorio de alta entropía: no necesita bcrypt)
+        """
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def get_refresh_token_expires_seconds() -> int:
+        """Obtiene el tiempo de expiración del refresh token en segundos"""
+        return int(jwt_config.get_refresh_expires_delta().total_seconds())
 
 jwt_manager = JWTManager()
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""
+Formato de texto de Prometheus para el endpoint /metrics.
+
+Cada componente expone sus contadores con snapshot(); aquí solo se
+convierten a líneas `nombre{etiquetas} valor` con su HELP y TYPE.
+"""
+from typing import Dict, List, Optional, Tuple
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsText:
+    """Acumula métricas y las serializa en el formato de exposición de Prometheus"""
+
+    def __init__(self):
+        # nombre → (tipo, ayuda, [(etiquetas, valor)])
+        self._metrics: Dict[str, Tuple[str, str, List[Tuple[Dict[str, str], float]]]] = {}
+
+    def add(self, name: str, value: float, help_text: str, kind: str = "gauge",
+            labels: Optional[Dict[str, str]] = None) -> None:
+        """Agrega una muestra. `kind` es "gauge" o "counter" (los counters terminan en _total)"""
+        _, _, samples = self._metrics.setdefault(name, (kind, help_text, []))
+        samples.append((labels or {}, value))
+
+    def render(self) -> str:
+        lines = []
+        for name, (kind, help_text, samples) in self._metrics.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,82 @@
+"""
+Máscara de bits de permisos de roles.
+
+Los cinco permisos booleanos de Role se compilan en un entero que viaja en el
+token JWT (claim "perms"), de modo que cada verificación de permiso es una
+operación de bits sobre los claims, sin consultar la tabla de roles.
+"""
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.config.jwt_config import jwt_config
+
+# Un bit por permiso. El orden es parte del contrato del token: solo agregar al final.
+PERMISSION_BITS = {
+    "can_create_players": 1 << 0,
+    "can_read_players": 1 << 1,
+    "can_update_players": 1 << 2,
+    "can_delete_players": 1 << 3,
+    "can_manage_users": 1 << 4,
+}
+
+
+def compile_permissions_mask(role: Any) -> int:
+    """Compila los permisos booleanos de un rol (o schema) en una máscara de bits"""
+    mask = 0
+    for permission_name, bit in PERMISSION_BITS.items():
+        if getattr(role, permission_name, False):
+            mask |= bit
+    return mask
+
+
+def has_permission(mask: int, permission_name: str) -> bool:
+    """Verifica si la máscara incluye el permiso indicado"""
+    bit = PERMISSION_BITS.get(permission_name)
+    if bit is None:
+        return False
+    return bool(mask & bit)
+
+
+def permissions_from_mask(mask: int) -> Iterable[str]:
+    """Nombres de los permisos incluidos en la máscara"""
+    return [name for name, bit in PERMISSION_BITS.items() if mask & bit]
+
+
+class RolePermissionsCache:
+    """
+    Cache en proceso de (máscara, versión, nombre) por rol con expiración (TTL).
+
+    Permite comparar el claim "role_ver" del token con la versión vigente del rol
+    sin consultar la base de datos en cada petición. La carga se delega en una
+    función para no acoplar este módulo a los repositorios.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, Tuple[float, Tuple[int, int, str]]] = {}
+
+    def get(self, role_id: int, loader: Callable[[], Optional[Tuple[int, int, str]]]) -> Optional[Tuple[int, int, str]]:
+        """Retorna el snapshot del rol, recargándolo con `loader` si expiró"""
+        now = time.monotonic()
+        entry = self._entries.get(role_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        snapshot = loader()
+        if snapshot is None:
+            self._entries.pop(role_id, None)
+            return None
+
+        value = (int(snapshot[0] or 0), int(snapshot[1] or 0), snapshot[2])
+        self._entries[role_id] = (now + self.ttl_seconds, value)
+        return value
+
+    def invalidate(self, role_id: Optional[int] = None) -> None:
+        """Descarta un rol (o todos) para forzar la recarga en la próxima petición"""
+        if role_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(role_id, None)
+
+
+role_permissions_cache = RolePermissionsCache(jwt_config.get_role_permissions_cache_ttl())
@@ -0,0 +1,224 @@
+"""
+Limitador de intentos de login (token bucket + ventanas deslizantes).
+
+- Token bucket por IP y por username: limita la tasa de intentos.
+- Contador de ventana deslizante de fallos por IP y por username: bloquea
+  temporalmente tras demasiadas contraseñas incorrectas.
+
+Las peticiones rechazadas se resuelven antes de verificar la contraseña, así
+un ataque de fuerza bruta no consume CPU en bcrypt. El almacenamiento es
+intercambiable: en memoria (un proceso) o compartido (varios workers).
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+def refill_bucket(tokens: float, updated_at: float, now: float, capacity: float, refill_per_second: float) -> float:
+    """Tokens disponibles tras recargar el bucket desde `updated_at` hasta `now`"""
+    return min(capacity, tokens + max(0.0, now - updated_at) * refill_per_second)
+
+
+def roll_window(window_start: float, current: float, previous: float, now: float, window: float) -> Tuple[float, float, float]:
+    """Avanza la ventana fija actual si corresponde. Retorna (inicio, actual, anterior)"""
+    elapsed_windows = int((now - window_start) // window)
+    if elapsed_windows <= 0:
+        return window_start, current, previous
+    new_start = window_start + elapsed_windows * window
+    # Si pasó más de una ventana, la anterior quedó vacía
+    return new_start, 0.0, current if elapsed_windows == 1 else 0.0
+
+
+def window_estimate(window_start: float, current: float, previous: float, now: float, window: float) -> float:
+    """Estimación de la ventana deslizante: fracción proporcional de la anterior + la actual"""
+    overlap = max(0.0, 1.0 - (now - window_start) / window)
+    return previous * overlap + current
+
+
+class RateLimitBackend:
+    """
+    Interfaz de almacenamiento del limitador.
+    Todas las operaciones reciben `now` (segundos de reloj de pared) para que
+    varios procesos compartan la misma referencia de tiempo.
+    """
+
+    def consume(self, key: str, capacity: float, refill_per_second: float, now: float) -> float:
+        """Consume un token. Retorna 0 si se permitió o los segundos hasta el próximo token"""
+        raise NotImplementedError
+
+    def increment(self, key: str, window: float, now: float) -> float:
+        """Suma un evento a la ventana deslizante y retorna la estimación actual"""
+        raise NotImplementedError
+
+    def count(self, key: str, window: float, now: float) -> Tuple[float, float]:
+        """Retorna (estimación actual, segundos hasta el fin de la ventana actual)"""
+        raise NotImplementedError
+
+    def reset(self, key: str) -> None:
+        """Elimina el estado de una clave"""
+        raise NotImplementedError
+
+    def delete_stale(self, older_than: float) -> int:
+        """Elimina las claves sin actividad desde `older_than`. Retorna cuántas eliminó"""
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Backend en memoria de un solo proceso.
+
+    Cada clave ocupa una lista de 4 floats; cuando se supera `max_keys`
+    se eliminan las claves cuyo estado ya no limita a nadie (bucket lleno o
+    ventana vencida).
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key → [tokens, updated_at, capacity, refill_per_second]
+        self._buckets: Dict[str, List[float]] = {}
+        # key → [window_start, current, previous, window]
+        self._windows: Dict[str, List[float]] = {}
+
+    def consume(self, key: str, capacity: float, refill_per_second: float, now: float) -> float:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            tokens = capacity if bucket is None else refill_bucket(bucket[0], bucket[1], now, capacity, refill_per_second)
+            if tokens >= 1.0:
+                self._buckets[key] = [tokens - 1.0, now, capacity, refill_per_second]
+                self._evict_if_needed(now)
+                return 0.0
+            self._buckets[key] = [tokens, now, capacity, refill_per_second]
+            return (1.0 - tokens) / refill_per_second
+
+    def increment(self, key: str, window: float, now: float) -> float:
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None:
+                start, current, previous = now, 0.0, 0.0
+            else:
+                start, current, previous = roll_window(state[0], state[1], state[2], now, window)
+            current += 1.0
+            self._windows[key] = [start, current, previous, window]
+            return window_estimate(start, current, previous, now, window)
+
+    def count(self, key: str, window: float, now: float) -> Tuple[float, float]:
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None:
+                return 0.0, 0.0
+            start, current, previous = roll_window(state[0], state[1], state[2], now, window)
+            return window_estimate(start, current, previous, now, window), start + window - now
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._buckets.pop(key, None)
+            self._windows.pop(key, None)
+
+    def delete_stale(self, older_than: float) -> int:
+        with self._lock:
+            before = len(self._buckets) + len(self._windows)
+            self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[1] >= older_than}
+            self._windows = {key: state for key, state in self._windows.items() if state[0] >= older_than}
+            return before - len(self._buckets) - len(self._windows)
+
+    def _evict_if_needed(self, now: float) -> None:
+        if len(self._buckets) + len(self._windows) <= self.max_keys:
+            return
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if refill_bucket(bucket[0], bucket[1], now, bucket[2], bucket[3]) < bucket[2]
+        }
+        self._windows = {
+            key: state for key, state in self._windows.items()
+            if now - state[0] < 2 * state[3]
+        }
+
+
+class LoginThrottle:
+    """
+    Política de limitación de intentos de login.
+
+    Args:
+        backend: Almacenamiento del estado (memoria o compartido)
+        ip_capacity / ip_refill_per_minute: Token bucket por IP
+        user_capacity / user_refill_per_minute: Token bucket por username
+        failure_window_seconds: Ventana deslizante de fallos
+        max_failures_per_ip / max_failures_per_user: Fallos tolerados en la ventana
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        ip_capacity: int = 20,
+        ip_refill_per_minute: float = 10,
+        user_capacity: int = 5,
+        user_refill_per_minute: float = 2,
+        failure_window_seconds: float = 900,
+        max_failures_per_ip: int = 50,
+        max_failures_per_user: int = 10,
+    ):
+        self.backend = backend
+        self.ip_capacity = ip_capacity
+        self.ip_refill = ip_refill_per_minute / 60.0
+        self.user_capacity = user_capacity
+        self.user_refill = user_refill_per_minute / 60.0
+        self.failure_window = failure_window_seconds
+        self.max_failures_per_ip = max_failures_per_ip
+        self.max_failures_per_user = max_failures_per_user
+
+    @property
+    def stale_after_seconds(self) -> float:
+        """
+        Inactividad tras la cual una clave ya no limita a nadie: el bucket volvió
+        a estar lleno y la ventana de fallos (actual + anterior) venció
+        """
+        return max(
+            2 * self.failure_window,
+            self.ip_capacity / self.ip_refill,
+            self.user_capacity / self.user_refill,
+        )
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Elimina el estado de las claves inactivas. Las claves incluyen usernames
+        elegidos por quien intenta el login: sin esta limpieza crecen sin límite.
+        """
+        now = time.time() if now is None else now
+        return self.backend.delete_stale(now - self.stale_after_seconds)
+
+    @staticmethod
+    def _user_key(username: str) -> str:
+        return username.strip().lower()
+
+    def check(self, ip: str, username: str, now: Optional[float] = None) -> Optional[float]:
+        """
+        Decide si el intento puede continuar. Retorna None si se permite o los
+        segundos que el cliente debe esperar (para el header Retry-After)
+        """
+        now = time.time() if now is None else now
+        user = self._user_key(username)
+
+        # Bloqueo por fallos recientes (ventana deslizante)
+        for key, limit in ((f"fail:ip:{ip}", self.max_failures_per_ip),
+                           (f"fail:user:{user}", self.max_failures_per_user)):
+            failures, remaining = self.backend.count(key, self.failure_window, now)
+            if failures >= limit:
+                return max(1.0, remaining)
+
+        # Tasa de intentos (token bucket): primero la IP, luego el username
+        retry_after = self.backend.consume(f"bucket:ip:{ip}", self.ip_capacity, self.ip_refill, now)
+        if retry_after:
+            return retry_after
+        retry_after = self.backend.consume(f"bucket:user:{user}", self.user_capacity, self.user_refill, now)
+        return retry_after or None
+
+    def record_failure(self, ip: str, username: str, now: Optional[float] = None) -> None:
+        """Registra una contraseña incorrecta (o usuario inexistente)"""
+        now = time.time() if now is None else now
+        self.backend.increment(f"fail:ip:{ip}", self.failure_window, now)
+        self.backend.increment(f"fail:user:{self._user_key(username)}", self.failure_window, now)
+
+    def record_success(self, username: str) -> None:
+        """Un login correcto limpia los fallos del usuario"""
+        self.backend.reset(f"fail:user:{self._user_key(username)}")
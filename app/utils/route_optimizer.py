@@ -0,0 +1,140 @@
+"""
+Optimización de recorridos sobre una matriz de distancias.
+
+Heurísticas clásicas para el problema del viajante:
+- Vecino más cercano: construye un recorrido inicial en O(n²).
+- 2-opt: invierte tramos del recorrido mientras eso lo acorte. Para cada
+  arista se evalúan con NumPy todas las inversiones posibles a la vez y se
+  aplica la de mayor ganancia.
+
+La búsqueda 2-opt se detiene al llegar a un óptimo local o al vencer el
+plazo; en ambos casos retorna el mejor recorrido encontrado.
+"""
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+# Ganancias menores se consideran ruido de punto flotante
+_MIN_GAIN = 1e-9
+
+
+@dataclass
+class RouteResult:
+    """Recorrido optimizado y estadísticas de la búsqueda"""
+    order: List[int]                 # Índices de la matriz en orden de visita (empieza en el origen)
+    length: float                    # Longitud total (incluye el regreso si es circuito)
+    initial_length: float            # Longitud del recorrido del vecino más cercano
+    improvements: int                # Inversiones 2-opt aplicadas
+    converged: bool                  # False si el plazo venció antes del óptimo local
+    elapsed_ms: float
+
+
+def route_length(distances: np.ndarray, order, closed: bool) -> float:
+    """Longitud de un recorrido (con o sin regreso al origen)"""
+    order = np.asarray(order)
+    if len(order) < 2:
+        return 0.0
+    length = float(distances[order[:-1], order[1:]].sum())
+    if closed:
+        length += float(distances[order[-1], order[0]])
+    return length
+
+
+def nearest_neighbour(distances: np.ndarray, start: int) -> np.ndarray:
+    """Recorrido que siempre avanza al punto no visitado más cercano"""
+    size = len(distances)
+    order = np.empty(size, dtype=np.intp)
+    visited = np.zeros(size, dtype=bool)
+    current = start
+    for step in range(size):
+        order[step] = current
+        visited[current] = True
+        if step == size - 1:
+            break
+        row = np.where(visited, np.inf, distances[current])
+        current = int(np.argmin(row))
+    return order
+
+
+def two_opt(distances: np.ndarray, order: np.ndarray, closed: bool, deadline: float):
+    """
+    Mejora el recorrido con inversiones 2-opt sin mover el origen (order[0]).
+
+    Para recorridos abiertos se agrega un nodo ficticio a distancia 0 de todos
+    al final: así el último tramo también puede invertirse y el recorrido
+    termina en cualquier punto.
+
+    Returns:
+        (recorrido, inversiones aplicadas, convergió)
+    """
+    if not closed:
+        distances = np.pad(distances, ((0, 1), (0, 1)))
+        order = np.append(order, len(distances) - 1)
+    tour = order.copy()
+    size = len(tour)
+    # En el abierto el nodo ficticio (última posición) queda fijo
+    last_j = size - 1 if closed else size - 2
+    improvements = 0
+    converged = False
+    timed_out = False
+    while not timed_out:
+        improved = False
+        for i in range(last_j - 1):
+            if time.perf_counter() >= deadline:
+                timed_out = True
+                break
+            js = np.arange(i + 2, last_j + 1)
+            a, b = tour[i], tour[i + 1]
+            c, d = tour[js], tour[(js + 1) % size]
+            # Se quitan (a,b) y (c,d); se agregan (a,c) y (b,d)
+            gains = distances[a, b] + distances[c, d] - distances[a, c] - distances[b, d]
+            best = int(np.argmax(gains))
+            if gains[best] > _MIN_GAIN:
+                j = int(js[best])
+                tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1]
+                improvements += 1
+                improved = True
+        if not improved and not timed_out:
+            converged = True
+            break
+
+    if not closed:
+        tour = tour[:-1]
+    return tour, improvements, converged
+
+
+def optimize_route(
+    distances: np.ndarray,
+    start: int = 0,
+    closed: bool = False,
+    time_limit: float = 0.2,
+    deadline: Optional[float] = None,
+) -> RouteResult:
+    """
+    Recorrido corto que visita todos los puntos de la matriz empezando en `start`.
+
+    Args:
+        distances: Matriz N×N de distancias
+        start: Índice del origen
+        closed: Si el recorrido regresa al origen
+        time_limit: Segundos disponibles (se ignora si se pasa `deadline`)
+        deadline: Instante de time.perf_counter() en el que hay que terminar
+    """
+    started = time.perf_counter()
+    if deadline is None:
+        deadline = started + time_limit
+
+    initial = nearest_neighbour(distances, start)
+    initial_length = route_length(distances, initial, closed)
+    tour, improvements, converged = two_opt(distances, initial, closed, deadline)
+
+    return RouteResult(
+        order=[int(index) for index in tour],
+        length=route_length(distances, tour, closed),
+        initial_length=initial_length,
+        improvements=improvements,
+        converged=converged,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
@@ -0,0 +1,57 @@
+"""
+Coalescencia de peticiones (single-flight).
+
+Las llamadas concurrentes con la misma clave comparten una única ejecución en
+curso y reciben su mismo resultado (o excepción). Una avalancha de peticiones
+idénticas con el caché frío se reduce a una sola ejecución.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger('nba_api.utils.single_flight')
+
+
+class SingleFlight:
+    """
+    Grupo de llamadas coalescidas por clave.
+
+    La ejecución corre en una tarea propia: si el cliente que la inició se
+    desconecta (su petición se cancela), las demás siguen esperando el resultado.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Ejecuta `func` o se une a la ejecución en curso con la misma clave"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            self.executions += 1
+            task.add_done_callback(lambda _task, key=key: self._forget(key, _task))
+        else:
+            self.coalesced += 1
+            logger.debug(f"🔗 {self.name}: petición unida a la ejecución en curso ({key})")
+
+        # shield: cancelar a un solicitante no cancela la ejecución compartida
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Evita el aviso "exception was never retrieved" si todos los solicitantes se cancelaron
+        if not task.cancelled():
+            task.exception()
+
+    def snapshot(self) -> dict:
+        """Contadores para /metrics"""
+        return {
+            "inflight": len(self._inflight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,109 @@
+"""
+Lista de revocación de tokens en memoria (filtro de Bloom).
+
+La tabla `revoked_tokens` es la fuente de verdad. Cada proceso mantiene un
+filtro de Bloom con sus claves ("jti:<id>" y "user:<id>") que se sincroniza
+de forma incremental (id > último visto) cada pocos segundos:
+
+- Si ninguna clave del token está en el filtro → no está revocado (sin SQL).
+- Si alguna posiblemente está → se confirma con una consulta exacta.
+
+Las revocaciones hechas en este proceso se agregan al filtro de inmediato.
+Las hechas en otros workers se ven en la próxima sincronización: hasta
+`refresh_interval` segundos (TOKEN_REVOCATION_REFRESH_SECONDS) el filtro de
+este proceso todavía puede responder "no revocado". Es el costo de no
+consultar la base en cada petición; bajar el intervalo acota esa ventana.
+La carga se delega en funciones para no acoplar este módulo a los repositorios.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Iterable, Optional, Tuple
+
+from app.config.jwt_config import jwt_config
+from app.utils.bloom_filter import BloomFilter
+
+logger = logging.getLogger('nba_api.utils.token_revocation')
+
+# (id, jti, user_id) de cada fila de revoked_tokens
+RevocationEntry = Tuple[int, Optional[str], Optional[int]]
+
+
+def _entry_keys(jti: Optional[str], user_id: Optional[int]) -> Iterable[str]:
+    if jti:
+        yield f"jti:{jti}"
+    elif user_id is not None:
+        yield f"user:{user_id}"
+
+
+class TokenRevocationList:
+    """
+    Filtro de Bloom de tokens revocados con sincronización incremental.
+
+    Args:
+        refresh_interval: Segundos entre sincronizaciones con la base de datos
+        rebuild_interval: Segundos entre reconstrucciones completas (descarta
+            revocaciones vencidas; conviene igualarlo a la vida del access token)
+        capacity: Capacidad inicial del filtro (se duplica al saturarse)
+    """
+
+    def __init__(self, refresh_interval: float, rebuild_interval: float, capacity: int = 10000):
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity)
+        self._last_seen_id = 0
+        self._next_refresh = 0.0
+        self._next_rebuild = 0.0
+
+    def add(self, jti: Optional[str] = None, user_id: Optional[int] = None) -> None:
+        """Agrega una revocación hecha en este proceso (efecto inmediato)"""
+        with self._lock:
+            for key in _entry_keys(jti, user_id):
+                self._bloom.add(key)
+
+    def refresh(self, loader: Callable[[int], Iterable[RevocationEntry]], force: bool = False) -> None:
+        """
+        Sincroniza el filtro si corresponde. `loader(after_id)` retorna las
+        revocaciones vigentes con id mayor a `after_id`, ordenadas por id.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_refresh:
+            return
+
+        with self._lock:
+            if not force and now < self._next_refresh:
+                return
+
+            rebuild = now >= self._next_rebuild or self._bloom.is_saturated
+            if rebuild:
+                if self._bloom.is_saturated:
+                    self.capacity *= 2
+                self._bloom = BloomFilter(self.capacity)
+                self._last_seen_id = 0
+                self._next_rebuild = now + self.rebuild_interval
+
+            loaded = 0
+            for entry_id, jti, user_id in loader(self._last_seen_id):
+                for key in _entry_keys(jti, user_id):
+                    self._bloom.add(key)
+                self._last_seen_id = max(self._last_seen_id, entry_id)
+                loaded += 1
+
+            self._next_refresh = now + self.refresh_interval
+
+        if rebuild:
+            logger.info(f"🛡️ Lista de revocación reconstruida: {loaded} entradas (capacidad {self.capacity})")
+
+    def might_be_revoked(self, jti: Optional[str], user_id: Optional[int]) -> bool:
+        """False garantiza que el token no está revocado; True requiere verificación exacta"""
+        if jti and f"jti:{jti}" in self._bloom:
+            return True
+        return user_id is not None and f"user:{user_id}" in self._bloom
+
+
+token_revocation_list = TokenRevocationList(
+    refresh_interval=jwt_config.get_revocation_refresh_seconds(),
+    rebuild_interval=jwt_config.get_expires_delta().total_seconds(),
+)
@@ -0,0 +1,83 @@
+"""
+INSERT ... ON CONFLICT compartido por los repositorios de carga masiva.
+
+- PostgreSQL y SQLite: una sentencia con ON CONFLICT del dialecto, ejecutada
+  con todas las filas del lote (executemany).
+- Otros motores: fila por fila con el ORM (buscar por las columnas del
+  conflicto, insertar o actualizar).
+
+ON CONFLICT DO UPDATE no aplica el `onupdate` de las columnas (p. ej.
+updated_at): `upsert_statement` los agrega al SET con su valor por defecto.
+"""
+from typing import Dict, Iterable, List, Sequence
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Motor → INSERT con soporte de ON CONFLICT
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def supports_on_conflict(db: Session) -> bool:
+    """True si el motor de la sesión soporta INSERT ... ON CONFLICT"""
+    return db.get_bind().dialect.name in _DIALECT_INSERTS
+
+
+def insert_statement(db: Session, model):
+    """INSERT del dialecto de la sesión (con on_conflict_do_nothing / on_conflict_do_update)"""
+    return _DIALECT_INSERTS[db.get_bind().dialect.name](model)
+
+
+def upsert_statement(
+    db: Session,
+    model,
+    conflict_columns: Sequence[str],
+    update: Iterable[str] = (),
+    accumulate: Iterable[str] = (),
+):
+    """
+    INSERT ... ON CONFLICT (conflict_columns) DO UPDATE.
+
+    Args:
+        update: Columnas que toman el valor de la fila nueva
+        accumulate: Columnas a las que se suma el valor de la fila nueva (deltas)
+    """
+    statement = insert_statement(db, model)
+    set_ = {column: statement.excluded[column] for column in update}
+    set_.update({column: getattr(model, column) + statement.excluded[column] for column in accumulate})
+    for column in model.__table__.columns:
+        onupdate = column.onupdate
+        if onupdate is not None and column.name not in set_:
+            set_[column.name] = onupdate.arg(None) if onupdate.is_callable else onupdate.arg
+    return statement.on_conflict_do_update(index_elements=list(conflict_columns), set_=set_)
+
+
+def upsert_rows(
+    db: Session,
+    model,
+    rows: List[Dict],
+    conflict_columns: Sequence[str],
+    update: Iterable[str] = (),
+    accumulate: Iterable[str] = (),
+) -> None:
+    """
+    Inserta las filas o, si ya existe una con las mismas `conflict_columns`,
+    actualiza `update` y suma `accumulate`. No confirma la transacción.
+    """
+    if not rows:
+        return
+    update, accumulate = tuple(update), tuple(accumulate)
+    if supports_on_conflict(db):
+        db.execute(upsert_statement(db, model, conflict_columns, update, accumulate), rows)
+        return
+
+    # Otros motores: una fila a la vez
+    for row in rows:
+        existing = db.query(model).filter_by(**{column: row[column] for column in conflict_columns}).first()
+        if existing is None:
+            db.add(model(**row))
+            continue
+        for column in update:
+            setattr(existing, column, row.get(column))
+        for column in accumulate:
+            setattr(existing, column, getattr(existing, column) + row[column])
@@ -0,0 +1,86 @@
+"""
+Fixtures de pruebas: base SQLite temporal con roles, usuarios, equipos y jugadores
+y un TestClient con el ciclo de vida (lifespan) de la aplicación activo.
+
+Ejecutar desde la raíz del repositorio:
+    python -m pytest -q
+"""
+import os
+import random
+import sys
+import tempfile
+from datetime import date
+
+# La base SQLite de desarrollo es relativa al directorio actual (./test_local.db):
+# las pruebas corren en un directorio temporal, sin tocar la base local
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(tempfile.mkdtemp(prefix="nba_api_tests_"))
+os.environ.pop("DATABASE_URL", None)
+os.environ.setdefault("GITHUB_ACTIONS", "true")         # no cargar el .env local
+os.environ["WEATHER_PREFETCH_ENABLED"] = "false"        # sin llamadas a OpenWeatherMap
+os.environ["WEATHER_HISTORY_ENABLED"] = "false"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config.NBA_database import Base, SessionLocal, engine
+from app.main import app
+from app.models.NBA_model import Player
+from app.models.Role_model import Role
+from app.models.Team_model import Team
+from app.models.User_model import User
+from app.scripts.populate_teams import NBA_TEAMS_DATA
+from app.utils.jwt_utils import jwt_manager
+
+PASSWORD = "secret1"
+POSITIONS = ("PG", "SG", "SF", "PF", "C")
+
+
+def _seed() -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add(Role(id=1, name="admin", can_create_players=True, can_read_players=True,
+                    can_update_players=True, can_delete_players=True, can_manage_users=True))
+        db.add(Role(id=2, name="user", can_read_players=True))
+        db.commit()
+        password = jwt_manager.get_password_hash(PASSWORD)
+        db.add(User(username="admin", password=password, role_id=1))
+        db.add(User(username="reader", password=password, role_id=2))
+        for team in NBA_TEAMS_DATA:
+            db.add(Team(**team))
+        rng = random.Random(1)
+        teams = [team["name"] for team in NBA_TEAMS_DATA]
+        for i in range(120):
+            db.add(Player(
+                name=f"Player {i}", team=rng.choice(teams), position=rng.choice(POSITIONS),
+                height_m=round(rng.uniform(1.8, 2.2), 2), weight_kg=round(rng.uniform(80, 120), 1),
+                birth_date=date(1980 + rng.randint(0, 20), 1 + rng.randint(0, 11), 1 + rng.randint(0, 27)),
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def client():
+    _seed()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def login(client: TestClient, username: str = "admin") -> dict:
+    """Tokens de inicio de sesión del usuario"""
+    response = client.post("/api/v1/auth/login", json={"username": username, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def bearer(tokens: dict) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    return bearer(login(client, "admin"))
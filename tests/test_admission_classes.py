@@ -0,0 +1,30 @@
+"""
+Control de admisión: las transferencias masivas usan su propia clase y no
+ocupan cupos de lectura ni de escritura mientras duran.
+"""
+from app.config.admission_config import admission_config
+from app.middleware.admission_middleware import AdmissionControlMiddleware, admission_registry
+
+
+def _middleware() -> AdmissionControlMiddleware:
+    middleware = AdmissionControlMiddleware(
+        app=None,
+        limits=admission_config.get_route_class_limits(),
+        exempt_paths=admission_config.get_exempt_paths(),
+    )
+    admission_registry.remove(middleware)
+    return middleware
+
+
+def _class_of(middleware: AdmissionControlMiddleware, method: str, path: str) -> str:
+    return middleware._classify({"type": "http", "method": method, "path": path}).name
+
+
+def test_bulk_transfers_have_their_own_class():
+    middleware = _middleware()
+    assert _class_of(middleware, "GET", "/api/v1/export/players") == "bulk"
+    assert _class_of(middleware, "POST", "/api/v1/stats/games/ingest") == "bulk"
+
+    assert _class_of(middleware, "GET", "/api/v1/stats/players/1/games") == "read"
+    assert _class_of(middleware, "GET", "/api/v1/players/") == "read"
+    assert _class_of(middleware, "POST", "/api/v1/players/") == "write"
@@ -0,0 +1,88 @@
+"""
+Los rollups precalculados coinciden con las estadísticas en vivo después de
+cada alta, cambio y baja de jugador (antes y después de que se recalculen los
+percentiles pendientes), y la lectura de rollups no escribe.
+"""
+import pytest
+
+from app.config.NBA_database import SessionLocal
+from app.models.RosterRollup_model import RosterRollup
+from app.repositories.RosterAnalytics_repository import GROUP_DIMENSIONS
+from app.services.Analytics_service import AnalyticsService
+
+PLAYERS = "/api/v1/players"
+
+
+def _assert_rollups_match_live(client, headers):
+    for group_by in GROUP_DIMENSIONS:
+        live = client.get("/api/v1/analytics/players", params={"group_by": group_by}, headers=headers)
+        rollups = client.get("/api/v1/analytics/rollups", params={"group_by": group_by}, headers=headers)
+        assert live.status_code == 200 and rollups.status_code == 200
+        assert rollups.json() == live.json(), group_by
+
+
+def _refresh_pending_quantiles() -> None:
+    """Lo que hace el reconciliador de fondo con los grupos que cambiaron"""
+    db = SessionLocal()
+    try:
+        AnalyticsService(db).refresh_stale_quantiles()
+    finally:
+        db.close()
+
+
+def _assert_consistent(client, headers):
+    _assert_rollups_match_live(client, headers)
+    _refresh_pending_quantiles()
+    assert _stale_groups() == 0
+    _assert_rollups_match_live(client, headers)
+
+
+def _stale_groups() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(RosterRollup).filter(RosterRollup.quantiles_stale.is_(True)).count()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def rebuilt(client, admin_headers):
+    response = client.post("/api/v1/analytics/rollups/rebuild", headers=admin_headers)
+    assert response.status_code == 200
+    _assert_rollups_match_live(client, admin_headers)
+
+
+def test_rollups_follow_player_writes(client, admin_headers, rebuilt):
+    created = client.post(f"{PLAYERS}/", headers=admin_headers, json={
+        "name": "Rollup Tester", "team": "Boston Celtics", "position": "C",
+        "height_m": 2.31, "weight_kg": 131.5, "birth_date": "2004-02-29",
+    })
+    assert created.status_code in (200, 201), created.text
+    player_id = created.json()["id"]
+    _assert_consistent(client, admin_headers)
+
+    updated = client.put(f"{PLAYERS}/{player_id}", headers=admin_headers, json={
+        "team": "Denver Nuggets", "position": "PF", "height_m": 1.75,
+    })
+    assert updated.status_code == 200, updated.text
+    _assert_consistent(client, admin_headers)
+
+    client.delete(f"{PLAYERS}/{player_id}", headers=admin_headers)
+    assert client.get(f"{PLAYERS}/{player_id}", headers=admin_headers).status_code == 404
+    _assert_consistent(client, admin_headers)
+
+
+def test_rollup_read_does_not_write(client, admin_headers, rebuilt):
+    db = SessionLocal()
+    try:
+        db.query(RosterRollup).filter(RosterRollup.dimension == "team").update(
+            {"quantiles_stale": True}, synchronize_session=False
+        )
+        db.commit()
+        stale = _stale_groups()
+        assert client.get("/api/v1/analytics/rollups", params={"group_by": "team"}, headers=admin_headers).status_code == 200
+        assert _stale_groups() == stale
+    finally:
+        db.query(RosterRollup).update({"quantiles_stale": False}, synchronize_session=False)
+        db.commit()
+        db.close()
@@ -0,0 +1,52 @@
+"""
+Carga de box scores: reingestar el mismo archivo no cambia los agregados por temporada
+(con INSERT ... ON CONFLICT y con el camino fila a fila de otros motores).
+"""
+import orjson
+import pytest
+
+import app.repositories.PlayerStats_repository as player_stats_repository
+import app.utils.upsert as upsert
+
+INGEST = "/api/v1/stats/games/ingest"
+
+
+def _box_scores(player_ids, prefix):
+    lines = []
+    for player_id in player_ids:
+        for game in range(3):
+            lines.append(orjson.dumps({
+                "player_id": player_id, "game_id": f"{prefix}-{game}", "game_date": f"2024-11-0{game + 1}",
+                "minutes": "31:30", "points": 10 + game + player_id % 7, "rebounds": 5, "assists": game,
+                "fgm": 4 + game, "fga": 9, "fg3m": 1, "fg3a": 3, "ftm": 2, "fta": 2,
+            }).decode())
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _seasons(client, headers, player_ids):
+    return {
+        player_id: client.get(f"/api/v1/stats/players/{player_id}/seasons", headers=headers).json()
+        for player_id in player_ids
+    }
+
+
+@pytest.mark.parametrize("on_conflict", [True, False], ids=["on-conflict", "row-by-row"])
+def test_reingesting_same_file_keeps_aggregates(client, admin_headers, monkeypatch, on_conflict):
+    if not on_conflict:
+        for module in (player_stats_repository, upsert):
+            monkeypatch.setattr(module, "supports_on_conflict", lambda db: False)
+    player_ids = (11, 12, 13) if on_conflict else (21, 22, 23)
+    body = _box_scores(player_ids, "rerun" if on_conflict else "rerun-orm")
+    headers = {**admin_headers, "Content-Type": "application/x-ndjson"}
+
+    first = client.post(INGEST, content=body, headers=headers)
+    assert first.status_code == 200, first.text
+    assert first.json()["inserted"] == 9
+    seasons = _seasons(client, admin_headers, player_ids)
+    assert all(rows[0]["games"] == 3 for rows in seasons.values())
+
+    again = client.post(INGEST, content=body, headers=headers)
+    assert again.status_code == 200, again.text
+    assert again.json()["inserted"] == 0
+    assert again.json()["duplicates"] == 9
+    assert _seasons(client, admin_headers, player_ids) == seasons
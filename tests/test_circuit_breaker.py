@@ -0,0 +1,34 @@
+"""
+Ventana del circuit breaker: los éxitos también descartan resultados viejos
+"""
+import app.utils.circuit_breaker as circuit_breaker
+from app.utils.circuit_breaker import CLOSED, OPEN, CircuitBreaker
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_successes_keep_window_bounded(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    breaker = CircuitBreaker("test", window_seconds=10, min_calls=3)
+
+    for _ in range(1000):
+        breaker.record_success()
+        clock.now += 1
+    assert len(breaker._events) <= 11
+
+    # Solo cuentan los fallos dentro de la ventana
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    clock.now += 20
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == OPEN
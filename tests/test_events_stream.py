@@ -0,0 +1,108 @@
+"""
+Stream de eventos: la suscripción se abre y se cierra dentro del generador, y
+la conexión se corta cuando el token se revoca o alcanza la vida de un access token.
+"""
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.config.events_config import EventsConfig
+from app.config.jwt_config import JWTConfig
+from app.config.NBA_database import SessionLocal
+from app.dependencies.auth_dependencies import TokenPrincipal
+from app.dependencies.permission_dependencies import still_can_read_players
+from app.models.User_model import User
+from app.services.Auth_service import AuthService
+from app.services.Events_service import TOKEN_EXPIRED_FRAME, event_broadcaster, event_stream
+from app.utils.broadcaster import BroadcasterFullError
+from app.utils.jwt_utils import jwt_manager
+
+
+def test_stream_not_started_leaves_no_subscriber():
+    async def scenario():
+        before = event_broadcaster.snapshot()["subscribers"]
+        stream = event_stream(None, time.time() + 60)
+        # Cliente desconectado antes de que arranque la respuesta
+        await stream.aclose()
+        return before, event_broadcaster.snapshot()["subscribers"]
+
+    before, after = asyncio.run(scenario())
+    assert after == before
+
+
+def test_stream_unsubscribes_on_close(monkeypatch):
+    async def scenario():
+        monkeypatch.setattr(event_broadcaster, "_loop", asyncio.get_running_loop())
+        before = event_broadcaster.snapshot()["subscribers"]
+        stream = event_stream(None, time.time() + 60)
+        assert await stream.__anext__() == b"retry: 3000\n\n"
+        event_broadcaster.publish("player.deleted", {"id": 1})
+        frame = await stream.__anext__()
+        during = event_broadcaster.snapshot()["subscribers"]
+        await stream.aclose()
+        return before, during, frame, event_broadcaster.snapshot()["subscribers"]
+
+    before, during, frame, after = asyncio.run(scenario())
+    assert b"event: player.deleted" in frame
+    assert during == before + 1
+    assert after == before
+
+
+def test_check_capacity_rejects_when_full(monkeypatch):
+    monkeypatch.setattr(event_broadcaster, "max_subscribers", 0)
+    rejected = event_broadcaster.rejected
+    with pytest.raises(BroadcasterFullError):
+        event_broadcaster.check_capacity()
+    assert event_broadcaster.rejected == rejected + 1
+
+
+async def _frames_until_closed(stream, limit: int = 20):
+    frames = []
+    async for frame in stream:
+        frames.append(frame)
+        if len(frames) >= limit:
+            break
+    await stream.aclose()
+    return frames
+
+
+def test_stream_closes_when_authorization_is_lost(monkeypatch):
+    monkeypatch.setattr(EventsConfig, "EVENTS_HEARTBEAT_SECONDS", 0.01)
+    checks = []
+
+    def is_authorized() -> bool:
+        checks.append(time.monotonic())
+        return len(checks) < 2
+
+    before = event_broadcaster.snapshot()["subscribers"]
+    frames = asyncio.run(_frames_until_closed(event_stream(None, time.time() + 60, is_authorized)))
+    assert len(checks) == 2
+    assert frames[-1] == TOKEN_EXPIRED_FRAME
+    assert event_broadcaster.snapshot()["subscribers"] == before
+
+
+def test_stream_lifetime_is_capped_at_access_token_lifetime(monkeypatch):
+    monkeypatch.setattr(EventsConfig, "EVENTS_HEARTBEAT_SECONDS", 0.01)
+    monkeypatch.setattr(JWTConfig, "JWT_ACCESS_TOKEN_EXPIRES", timedelta(seconds=0.05))
+    # Un token con exp dentro de un año no mantiene la conexión abierta más que un access token
+    frames = asyncio.run(_frames_until_closed(event_stream(None, time.time() + 365 * 86400), limit=1000))
+    assert frames[-1] == TOKEN_EXPIRED_FRAME
+
+
+def test_still_can_read_players_follows_revocation(client):
+    db = SessionLocal()
+    try:
+        user = User(username="stream_reader", password="x", role_id=2)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        claims = jwt_manager.verify_token(jwt_manager.create_access_token(AuthService._build_token_data(user)))
+        principal = TokenPrincipal(id=user.id, username=user.username, role_id=user.role_id)
+        assert still_can_read_players(claims, principal) is True
+
+        AuthService(db).revoke_user_sessions(user.id, reason="test")
+        assert still_can_read_players(claims, principal) is False
+    finally:
+        db.close()
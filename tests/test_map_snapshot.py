@@ -0,0 +1,77 @@
+"""
+Snapshot del mapa: los parches locales avanzan su versión (la reconciliación
+no reconstruye) y los cambios externos siguen provocando una reconstrucción.
+"""
+import asyncio
+from datetime import datetime
+
+from app.config.NBA_database import SessionLocal
+from app.models.NBA_model import Player
+from app.services.MapSnapshot_service import MapSnapshot, map_snapshot
+
+PLAYERS = "/api/v1/players"
+
+
+def _reconcile_and_compare() -> bool:
+    """Reconciliación del snapshot global y comparación con uno construido desde cero"""
+    db = SessionLocal()
+    try:
+        rebuilt = map_snapshot.reconcile(db)
+        fresh = MapSnapshot()
+        fresh.build(db)
+        assert map_snapshot.get_version() == fresh.get_version()
+        return rebuilt
+    finally:
+        db.close()
+
+
+def test_local_patches_do_not_trigger_rebuild(client, admin_headers):
+    _reconcile_and_compare()
+
+    created = client.post(f"{PLAYERS}/", headers=admin_headers, json={
+        "name": "Snapshot Tester", "team": "Boston Celtics", "position": "SG",
+        "height_m": 1.95, "weight_kg": 92.0, "birth_date": "1999-05-05",
+    })
+    assert created.status_code in (200, 201), created.text
+    player_id = created.json()["id"]
+    assert _reconcile_and_compare() is False
+
+    updated = client.put(f"{PLAYERS}/{player_id}", headers=admin_headers, json={"team": "Miami Heat"})
+    assert updated.status_code == 200, updated.text
+    assert _reconcile_and_compare() is False
+
+    client.delete(f"{PLAYERS}/{player_id}", headers=admin_headers)
+    assert client.get(f"{PLAYERS}/{player_id}", headers=admin_headers).status_code == 404
+    assert _reconcile_and_compare() is False
+
+
+def test_external_change_triggers_rebuild(client, admin_headers):
+    _reconcile_and_compare()
+    db = SessionLocal()
+    try:
+        player = db.query(Player).order_by(Player.id).first()
+        player.name = f"{player.name} (SQL)"
+        player.updated_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+    assert _reconcile_and_compare() is True
+
+
+def test_stale_snapshot_is_built_off_the_event_loop(client, admin_headers, monkeypatch):
+    built_on_loop = []
+    original_build = map_snapshot.build
+
+    def recording_build(db):
+        try:
+            asyncio.get_running_loop()
+            built_on_loop.append(True)
+        except RuntimeError:
+            built_on_loop.append(False)
+        original_build(db)
+
+    monkeypatch.setattr(map_snapshot, "build", recording_build)
+    map_snapshot.invalidate()
+    response = client.get("/api/v1/nba-map/team-details/Boston Celtics", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert built_on_loop == [False]
@@ -0,0 +1,19 @@
+"""
+Búsqueda de jugadores por nombre: mínimo de 3 caracteres (índice de trigramas)
+"""
+import pytest
+
+SEARCH = "/api/v1/players/search"
+
+
+@pytest.mark.parametrize("q", ["pl", "  p ", "p"])
+def test_short_search_is_rejected(client, admin_headers, q):
+    assert client.get(SEARCH, params={"q": q}, headers=admin_headers).status_code in (400, 422)
+
+
+def test_three_characters_search(client, admin_headers):
+    response = client.get(SEARCH, params={"q": "pla", "limit": 5}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    results = response.json()
+    assert 0 < len(results) <= 5
+    assert all(result["name"].lower().startswith("pla") for result in results)
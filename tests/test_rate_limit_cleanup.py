@@ -0,0 +1,48 @@
+"""
+Limpieza de los contadores del limitador de login (user-036): las claves por
+username inactivas se eliminan y las que todavía limitan se conservan.
+"""
+from app.config.NBA_database import SessionLocal
+from app.models.RateLimit_model import RateLimitCounter
+from app.repositories.RateLimit_repository import DatabaseRateLimitBackend
+from app.utils.rate_limiter import InMemoryRateLimitBackend, LoginThrottle
+
+
+def _throttle(backend) -> LoginThrottle:
+    return LoginThrottle(backend, failure_window_seconds=900)
+
+
+def _exercise(throttle: LoginThrottle, now: float) -> None:
+    for i in range(50):
+        throttle.check("10.0.0.1", f"ghost_{i}", now=now)
+        throttle.record_failure("10.0.0.1", f"ghost_{i}", now=now)
+    throttle.check("10.0.0.2", "recent", now=now + 3000)
+    throttle.record_failure("10.0.0.2", "recent", now=now + 3000)
+
+
+def test_database_backend_prunes_inactive_counters(client):
+    throttle = _throttle(DatabaseRateLimitBackend(SessionLocal))
+    _exercise(throttle, now=1_000_000.0)
+
+    deleted = throttle.prune(now=1_000_000.0 + 3000)
+    db = SessionLocal()
+    try:
+        keys = {key for (key,) in db.query(RateLimitCounter.key).all()}
+    finally:
+        db.close()
+
+    # 50 ventanas de fallos por username, 20 buckets de username (luego el bucket de la IP,
+    # de capacidad 20, corta antes de consumirlos) y el bucket y los fallos de la IP
+    assert deleted == 72
+    assert not any("ghost_" in key for key in keys)
+    assert {"bucket:user:recent", "fail:user:recent"} <= keys
+
+
+def test_memory_backend_prunes_inactive_counters():
+    backend = InMemoryRateLimitBackend()
+    throttle = _throttle(backend)
+    _exercise(throttle, now=1_000_000.0)
+
+    assert throttle.prune(now=1_000_000.0 + 3000) == 72
+    assert throttle.check("10.0.0.2", "recent", now=1_000_000.0 + 3001) is None
+    assert set(backend._buckets) == {"bucket:ip:10.0.0.2", "bucket:user:recent"}
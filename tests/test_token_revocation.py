@@ -0,0 +1,91 @@
+"""
+Revocación de tokens por usuario: la comparación con el iat del
+token usa milisegundos, así un token emitido justo después de la revocación
+(en el mismo segundo) sigue siendo válido.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config.NBA_database import SessionLocal
+from app.models.User_model import User
+from app.repositories.RevokedToken_repository import RevokedTokenRepository
+from app.services.Auth_service import AuthService
+from app.utils.jwt_utils import jwt_manager
+
+from tests.conftest import bearer, login, PASSWORD
+
+
+def _epoch_seconds(value: datetime) -> float:
+    return (value - datetime(1970, 1, 1)).total_seconds()
+
+
+def test_user_revocation_compares_issued_at_in_milliseconds(client):
+    revoked_at = datetime(2026, 1, 1, 12, 0, 0, 400000)
+    db = SessionLocal()
+    try:
+        repository = RevokedTokenRepository(db)
+        repository.revoke_user(
+            user_id=9001, revoked_at=revoked_at,
+            expires_at=revoked_at + timedelta(days=1), reason="identity_changed"
+        )
+
+        def revoked(iat: float) -> bool:
+            return repository.is_revoked(None, 9001, jwt_manager.get_issued_at({"iat": iat}))
+
+        base = _epoch_seconds(datetime(2026, 1, 1, 12, 0, 0))
+        assert revoked(base + 0.1)          # emitido antes, en el mismo segundo
+        assert revoked(base)                # tokens anteriores con iat en segundos enteros
+        assert revoked(base + 0.4)          # mismo milisegundo
+        assert not revoked(base + 0.7)      # emitido después, en el mismo segundo
+    finally:
+        db.close()
+
+
+def test_access_token_carries_millisecond_issued_at(client):
+    token = jwt_manager.create_access_token({"sub": "someone"})
+    issued_at = jwt_manager.get_issued_at(jwt_manager.verify_token(token))
+    assert issued_at.microsecond % 1000 == 0
+    assert abs((datetime.utcnow() - issued_at).total_seconds()) < 5
+
+
+def test_refresh_after_role_change_returns_usable_token(client, admin_headers):
+    created = client.post(
+        "/api/v1/users/", headers=admin_headers,
+        json={"username": "role_flip", "password": PASSWORD, "role_id": 2},
+    )
+    assert created.status_code in (200, 201), created.text
+    user_id = created.json()["id"]
+
+    tokens = login(client, "role_flip")
+    assert client.get("/api/v1/users/me", headers=bearer(tokens)).status_code == 200
+
+    # Cambiar el rol revoca los access tokens vigentes del usuario
+    updated = client.put(f"/api/v1/users/{user_id}", headers=admin_headers, json={"role_id": 1})
+    assert updated.status_code == 200, updated.text
+    assert client.get("/api/v1/users/me", headers=bearer(tokens)).status_code == 401
+
+    # El token renovado de inmediato (mismo segundo que la revocación) es válido
+    refreshed = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert refreshed.status_code == 200, refreshed.text
+    assert client.get("/api/v1/users/me", headers=bearer(refreshed.json())).status_code == 200
+
+
+def test_test_tokens_never_outlive_user_revocations(client):
+    # Una revocación por usuario dura la vida de un access token normal: un token
+    # de prueba más largo volvería a ser válido cuando se purgue la fila
+    max_seconds = jwt_manager.get_token_expires_seconds()
+    too_long = client.post(
+        "/api/v1/auth/login-test", params={"expires_in_seconds": max_seconds + 1},
+        json={"username": "reader", "password": PASSWORD},
+    )
+    assert too_long.status_code == 422
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == "reader").first()
+        with pytest.raises(ValueError):
+            AuthService(db).create_access_token_custom(user, max_seconds + 1)
+        assert AuthService(db).create_access_token_custom(user, max_seconds).expires_in == max_seconds
+    finally:
+        db.close()